@@ -70,6 +70,26 @@ CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
 # Docker 컨테이너 내부에서는 실제 호스트 IP를 알 수 없으므로 환경변수로 설정
 SERVER_IP = os.getenv("SERVER_IP", "localhost")
 
+# ============================================
+# WebSocket Configuration
+# ============================================
+# 재연결한 학생에게 다시 보낼 수 있는 최근 브로드캐스트 수
+WS_REPLAY_BUFFER_SIZE = int(os.getenv("WS_REPLAY_BUFFER_SIZE", "256"))
+
+# 학생 접속 폭주 제어 (동시 핸드셰이크 수, 대기열 길이, 대기 기한, 재시도 기본값)
+WS_ADMISSION_MAX_CONCURRENT = int(os.getenv("WS_ADMISSION_MAX_CONCURRENT", "8"))
+WS_ADMISSION_MAX_QUEUE = int(os.getenv("WS_ADMISSION_MAX_QUEUE", "64"))
+WS_ADMISSION_QUEUE_TIMEOUT = float(os.getenv("WS_ADMISSION_QUEUE_TIMEOUT", "2.0"))
+WS_ADMISSION_RETRY_AFTER = float(os.getenv("WS_ADMISSION_RETRY_AFTER", "1.0"))
+
+# 프로토콜 레벨 ping/pong (uvicorn이 처리, 응답 없으면 연결 종료)
+WS_PING_INTERVAL = float(os.getenv("WS_PING_INTERVAL", "20"))
+WS_PING_TIMEOUT = float(os.getenv("WS_PING_TIMEOUT", "20"))
+
+# 죽은/유휴 연결 정리 주기 및 유휴 판정 시간 (0이면 유휴 판정 안 함)
+WS_REAP_INTERVAL = float(os.getenv("WS_REAP_INTERVAL", "15"))
+WS_IDLE_TIMEOUT = float(os.getenv("WS_IDLE_TIMEOUT", "0"))
+
 # ============================================
 # Database Configuration
 # ============================================
@@ -79,6 +99,66 @@ MONGO_URL = os.getenv(
 )
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 
+# 이벤트 버스 ("auto": MODE=standalone이거나 Redis 연결 실패 시 메모리 버스,
+#             "redis": Redis만 사용, "memory": 항상 프로세스 내 버스)
+EVENT_BUS = os.getenv("EVENT_BUS", "auto")
+
+# Redis 이벤트 발행 묶음 처리 (N개 또는 flush 간격 중 먼저 도달 시 파이프라인 전송)
+REDIS_PUBLISH_BATCH_SIZE = int(os.getenv("REDIS_PUBLISH_BATCH_SIZE", "100"))
+REDIS_PUBLISH_FLUSH_MS = float(os.getenv("REDIS_PUBLISH_FLUSH_MS", "5"))
+# 대기열 최대 길이 및 초과 시 정책 ("block": 발행자 대기, "drop": 새 메시지 버림)
+REDIS_PUBLISH_MAX_QUEUE = int(os.getenv("REDIS_PUBLISH_MAX_QUEUE", "10000"))
+REDIS_PUBLISH_OVERFLOW = os.getenv("REDIS_PUBLISH_OVERFLOW", "block")
+
+# 참여도 이벤트 전송 방식 ("pubsub": 기존 fire-and-forget, "streams": Redis Streams 내구 로그)
+ENGAGEMENT_EVENT_TRANSPORT = os.getenv("ENGAGEMENT_EVENT_TRANSPORT", "pubsub")
+ENGAGEMENT_STREAM_MAXLEN = int(os.getenv("ENGAGEMENT_STREAM_MAXLEN", "100000"))
+ENGAGEMENT_STREAM_SESSION_MAXLEN = int(
+    os.getenv("ENGAGEMENT_STREAM_SESSION_MAXLEN", "20000")
+)
+# 전체 세션 참여도 이벤트 처리 워커 수 및 워커별 대기열 길이 (pubsub 전송)
+ENGAGEMENT_LISTENER_WORKERS = int(os.getenv("ENGAGEMENT_LISTENER_WORKERS", "4"))
+ENGAGEMENT_LISTENER_QUEUE_SIZE = int(
+    os.getenv("ENGAGEMENT_LISTENER_QUEUE_SIZE", "1000")
+)
+# 참여도 DB 반영 방식: true면 변경을 모아 flush 간격마다 bulk_write (요청 경로에서 DB 대기 없음)
+ENGAGEMENT_WRITE_BEHIND = os.getenv("ENGAGEMENT_WRITE_BEHIND", "true").lower() == "true"
+ENGAGEMENT_FLUSH_MS = float(os.getenv("ENGAGEMENT_FLUSH_MS", "200"))
+# 학생별 점수 시계열 (추세 분석): 최대 샘플 수, 샘플을 합치는 구간 길이(초)
+ENGAGEMENT_TREND_SAMPLES = int(os.getenv("ENGAGEMENT_TREND_SAMPLES", "240"))
+ENGAGEMENT_TREND_RESOLUTION_SEC = float(
+    os.getenv("ENGAGEMENT_TREND_RESOLUTION_SEC", "5")
+)
+# 시청(presence) heartbeat: 기본 heartbeat 간격(초), 메모리 집계를 attention_score에 반영하는 주기(초)
+ENGAGEMENT_PRESENCE_HEARTBEAT_SEC = float(
+    os.getenv("ENGAGEMENT_PRESENCE_HEARTBEAT_SEC", "15")
+)
+ENGAGEMENT_PRESENCE_FLUSH_SEC = float(os.getenv("ENGAGEMENT_PRESENCE_FLUSH_SEC", "10"))
+
+# 세션 수명 관리: 유휴 세션 정리 기준(초), 점검 주기(초), 세션 캐시 전체 메모리 예산(MB, 0이면 제한 없음)
+SESSION_IDLE_TTL_SEC = float(os.getenv("SESSION_IDLE_TTL_SEC", "3600"))
+SESSION_SWEEP_INTERVAL_SEC = float(os.getenv("SESSION_SWEEP_INTERVAL_SEC", "60"))
+SESSION_MEMORY_BUDGET_MB = float(os.getenv("SESSION_MEMORY_BUDGET_MB", "512"))
+
+# 대시보드 스냅샷: 참여도 변경 후 재계산까지 모으는 시간 (ms)
+DASHBOARD_SNAPSHOT_DEBOUNCE_MS = int(os.getenv("DASHBOARD_SNAPSHOT_DEBOUNCE_MS", "250"))
+# 퀴즈 응답 수집: batch_size개가 모이거나 flush 간격이 지나면 bulk_write 한 번으로 저장
+QUIZ_INGEST_BATCH_SIZE = int(os.getenv("QUIZ_INGEST_BATCH_SIZE", "200"))
+QUIZ_INGEST_FLUSH_MS = float(os.getenv("QUIZ_INGEST_FLUSH_MS", "50"))
+# 발행된 퀴즈 정의 캐시 유지 시간 (다른 노드에서 삭제/수정된 경우의 최대 지연)
+QUIZ_DEFINITION_CACHE_TTL_SEC = float(os.getenv("QUIZ_DEFINITION_CACHE_TTL_SEC", "30"))
+# 실시간 퀴즈 통계 소켓별 최대 전송 횟수 (Hz, 그 사이 변경은 하나로 합쳐짐)
+QUIZ_STATS_MAX_RATE_HZ = float(os.getenv("QUIZ_STATS_MAX_RATE_HZ", "4"))
+# 스트림 소비 (Main 노드만): (session, student) 샤드 워커 수, ACK 없는 항목을 회수하기까지의 유휴 시간,
+# 항목별 최대 전달 횟수 (넘으면 dead-letter 스트림으로 옮기고 ACK)
+ENGAGEMENT_STREAM_WORKERS = int(os.getenv("ENGAGEMENT_STREAM_WORKERS", "2"))
+ENGAGEMENT_STREAM_CLAIM_IDLE_MS = int(
+    os.getenv("ENGAGEMENT_STREAM_CLAIM_IDLE_MS", "30000")
+)
+ENGAGEMENT_STREAM_MAX_DELIVERIES = int(
+    os.getenv("ENGAGEMENT_STREAM_MAX_DELIVERIES", "5")
+)
+
 # ============================================
 # API Configuration
 # ============================================
@@ -6,6 +6,7 @@ Core Infrastructure Package
 from .database import get_database_manager, DatabaseManager
 from .cache import get_cache, Cache
 from .messaging import get_messaging_system, MessagingSystem
+from .event_bus import EventBus, InMemoryEventBus, RedisEventBus
 from .cluster import cluster_manager, init_cluster_mode, shutdown_cluster, NodeInfo
 from .metrics import (
     http_requests_total,
@@ -21,6 +22,31 @@ from .metrics import (
     vod_views_total,
     ai_analysis_total,
     errors_total,
+    websocket_frame_bytes_total,
+    websocket_admission_queue_depth,
+    websocket_admission_wait_seconds,
+    websocket_admission_rejected_total,
+    redis_publish_queue_depth,
+    redis_publish_batch_size,
+    redis_publish_dropped_total,
+    event_bus_decode_errors_total,
+    engagement_worker_queue_depth,
+    engagement_event_processing_seconds,
+    engagement_stream_dead_letters_total,
+    engagement_write_flush_lag_seconds,
+    engagement_write_batch_size,
+    session_state_bytes,
+    session_state_budget_bytes,
+    session_lifecycle_sessions,
+    session_evictions_total,
+    session_spilled_documents_total,
+    dashboard_snapshot_recomputes_total,
+    dashboard_subscribers,
+    quiz_ingest_batch_size,
+    quiz_responses_ingested_total,
+    quiz_definition_cache_total,
+    quiz_stats_subscribers,
+    quiz_stats_pushes_total,
 )
 from .ai_keys import (
     encrypt_api_key,
@@ -42,6 +68,9 @@ __all__ = [
     # Messaging
     "get_messaging_system",
     "MessagingSystem",
+    "EventBus",
+    "InMemoryEventBus",
+    "RedisEventBus",
     # Cluster
     "cluster_manager",
     "init_cluster_mode",
@@ -61,6 +90,31 @@ __all__ = [
     "vod_views_total",
     "ai_analysis_total",
     "errors_total",
+    "websocket_frame_bytes_total",
+    "websocket_admission_queue_depth",
+    "websocket_admission_wait_seconds",
+    "websocket_admission_rejected_total",
+    "redis_publish_queue_depth",
+    "redis_publish_batch_size",
+    "redis_publish_dropped_total",
+    "event_bus_decode_errors_total",
+    "engagement_worker_queue_depth",
+    "engagement_event_processing_seconds",
+    "engagement_stream_dead_letters_total",
+    "engagement_write_flush_lag_seconds",
+    "engagement_write_batch_size",
+    "session_state_bytes",
+    "session_state_budget_bytes",
+    "session_lifecycle_sessions",
+    "session_evictions_total",
+    "session_spilled_documents_total",
+    "dashboard_snapshot_recomputes_total",
+    "dashboard_subscribers",
+    "quiz_ingest_batch_size",
+    "quiz_responses_ingested_total",
+    "quiz_definition_cache_total",
+    "quiz_stats_subscribers",
+    "quiz_stats_pushes_total",
     # AI Keys
     "encrypt_api_key",
     "decrypt_api_key",
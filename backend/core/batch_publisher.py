@@ -0,0 +1,166 @@
+"""
+AIRClass Batch Publisher
+Redis Pub/Sub 발행을 묶어서 파이프라인 한 번으로 전송
+
+- 발행 요청은 비동기 대기열에 넣고 즉시 반환
+- batch_size개가 모이거나 flush_interval이 지나면 (먼저 도달하는 쪽) 한 번에 전송
+- 단일 소비자 + FIFO 대기열 + 비트랜잭션 파이프라인 → 채널별 순서 보장
+- 대기열 길이 제한: "block"이면 발행자가 기다리고, "drop"이면 새 메시지를 버림
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.metrics import (
+    redis_publish_queue_depth,
+    redis_publish_batch_size,
+    redis_publish_dropped_total,
+)
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP = "drop"
+
+# 종료 요청 시 첫 메시지를 기다리는 소비자를 깨우는 표식
+_STOP = object()
+
+
+class BatchPublisher:
+    """Redis 발행 마이크로 배칭"""
+
+    def __init__(
+        self,
+        redis_client,
+        batch_size: int = 100,
+        flush_interval: float = 0.005,
+        max_queue: int = 10000,
+        overflow: str = OVERFLOW_BLOCK,
+    ):
+        """
+        Args:
+            redis_client: redis.asyncio 클라이언트
+            batch_size: 파이프라인 한 번에 보낼 최대 메시지 수
+            flush_interval: 첫 메시지 이후 최대 대기 시간 (초)
+            max_queue: 대기열 최대 길이
+            overflow: 대기열이 가득 찼을 때 정책 ("block" 또는 "drop")
+        """
+        if overflow not in (OVERFLOW_BLOCK, OVERFLOW_DROP):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.redis_client = redis_client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self._queue: asyncio.Queue[Tuple[str, Dict[str, Any]]] = asyncio.Queue(
+            maxsize=max_queue
+        )
+        self._batch_full = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> bool:
+        """
+        발행 요청 (직렬화/전송은 flush 시점에 처리)
+
+        Returns:
+            bool: 대기열에 들어갔으면 True, drop 정책으로 버려지면 False
+        """
+        if self.overflow == OVERFLOW_DROP:
+            try:
+                self._queue.put_nowait((channel, message))
+            except asyncio.QueueFull:
+                self.dropped += 1
+                redis_publish_dropped_total.labels(reason="queue_full").inc()
+                return False
+        else:
+            await self._queue.put((channel, message))
+
+        redis_publish_queue_depth.set(self._queue.qsize())
+        # 소비자가 이미 꺼낸 1개를 포함해 batch_size가 차면 즉시 flush
+        if self._queue.qsize() + 1 >= self.batch_size:
+            self._batch_full.set()
+        return True
+
+    def _drain(self, batch: List[Tuple[str, Dict[str, Any]]]):
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+
+    async def _flush(self, batch: List[Tuple[str, Dict[str, Any]]]):
+        """모은 메시지를 파이프라인 한 번으로 전송"""
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for channel, message in batch:
+                    pipe.publish(channel, json.dumps(message))
+                await pipe.execute()
+            self.published += len(batch)
+            redis_publish_batch_size.observe(len(batch))
+        except Exception as e:
+            self.dropped += len(batch)
+            redis_publish_dropped_total.labels(reason="flush_error").inc(len(batch))
+            logger.error(f"❌ Failed to flush {len(batch)} Redis messages: {e}")
+
+    async def _run(self):
+        # 파이프라인 전송 도중 취소되면 배치가 집계 없이 사라지므로 취소 대신 이벤트로 종료
+        while not self._stopping.is_set():
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+
+            # batch_size가 모이거나 flush_interval이 지날 때까지 모으기 (종료 요청이면 바로)
+            if self._queue.qsize() + 1 < self.batch_size and not self._stopping.is_set():
+                self._batch_full.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._batch_full.wait(), timeout=self.flush_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+            self._drain(batch)
+            redis_publish_queue_depth.set(self._queue.qsize())
+            await self._flush(batch)
+
+    def start(self):
+        """백그라운드 flush 시작"""
+        if not self.running:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"📦 Redis batch publisher started "
+                f"(batch_size={self.batch_size}, flush={self.flush_interval * 1000:g}ms)"
+            )
+
+    async def stop(self):
+        """백그라운드 flush 종료 (남은 메시지는 모두 전송)"""
+        if self._task is not None:
+            self._stopping.set()
+            self._batch_full.set()
+            try:
+                # 첫 메시지를 기다리는 중이면 깨움 (가득 차 있으면 소비자가 곧 종료 요청을 봄)
+                self._queue.put_nowait(_STOP)
+            except asyncio.QueueFull:
+                pass
+            await self._task
+            self._task = None
+
+        while not self._queue.empty():
+            batch: List[Tuple[str, Dict[str, Any]]] = []
+            self._drain(batch)
+            if batch:
+                await self._flush(batch)
+        redis_publish_queue_depth.set(0)
@@ -12,6 +12,7 @@ import logging
 import uuid
 import hmac
 import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
@@ -108,6 +109,7 @@ class ClusterManager:
         self.nodes: Dict[str, NodeInfo] = {}
         self.heartbeat_task: Optional[asyncio.Task] = None
         self.stream_assignments: Dict[str, str] = {}  # stream_id -> node_id mapping
+        self.stream_assigned_at: Dict[str, float] = {}  # stream_id -> 마지막 사용 시각
         self.main_node_id: Optional[str] = None  # 메인 노드 자신의 ID
 
     async def start(self):
@@ -140,6 +142,7 @@ class ClusterManager:
             ]
             for stream_id in streams_to_reassign:
                 del self.stream_assignments[stream_id]
+                self.stream_assigned_at.pop(stream_id, None)
                 logger.info(f"🔄 Stream {stream_id} will be reassigned on next request")
 
             return True
@@ -251,6 +254,7 @@ class ClusterManager:
             if assigned_node_id in self.nodes:
                 node = self.nodes[assigned_node_id]
                 if node.is_healthy and node.load_percentage < 90:
+                    self.stream_assigned_at[stream_id] = time.monotonic()
                     logger.info(
                         f"📌 Sticky session: stream '{stream_id}' → existing node '{node.node_name}'"
                     )
@@ -260,6 +264,7 @@ class ClusterManager:
                         f"⚠️ Assigned node '{node.node_name}' is unhealthy or overloaded, reassigning..."
                     )
                     del self.stream_assignments[stream_id]
+                    self.stream_assigned_at.pop(stream_id, None)
 
         # 2. Rendezvous Hashing으로 노드 선택
         node = self.get_node_rendezvous(stream_id)
@@ -277,12 +282,32 @@ class ClusterManager:
         # 스트림 할당 기록
         if node:
             self.stream_assignments[stream_id] = node.node_id
+            self.stream_assigned_at[stream_id] = time.monotonic()
             logger.info(
                 f"✅ Stream '{stream_id}' assigned to '{node.node_name}' (load: {node.load_percentage:.1f}%)"
             )
 
         return node
 
+    def prune_idle(self, idle_seconds: float) -> int:
+        """오래 사용되지 않은 스트림 할당 제거 (다음 요청 시 다시 할당)"""
+        cutoff = time.monotonic() - idle_seconds
+        stale = [
+            stream_id
+            for stream_id in self.stream_assignments
+            if self.stream_assigned_at.get(stream_id, 0.0) < cutoff
+        ]
+        for stream_id in stale:
+            del self.stream_assignments[stream_id]
+            self.stream_assigned_at.pop(stream_id, None)
+        return len(stale)
+
+    def memory_bytes(self) -> int:
+        """스트림 할당 테이블 크기 (바이트, 추정치)"""
+        from utils.memory import deep_sizeof
+
+        return deep_sizeof((self.stream_assignments, self.stream_assigned_at))
+
     def get_all_nodes(self) -> List[Dict]:
         """모든 노드 정보 반환"""
         return [asdict(node) for node in self.nodes.values()]
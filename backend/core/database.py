@@ -6,11 +6,184 @@ MongoDB 연결 및 데이터 작업
 import logging
 from datetime import datetime, UTC
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from typing import Optional, List, Dict
+from pymongo import DeleteMany, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from typing import Any, AsyncIterator, Optional, List, Dict, Tuple
 from schemas import *
 
 logger = logging.getLogger(__name__)
 
+# iter_* 스트리밍 조회에서 커서가 한 번에 가져오는 문서 수
+STREAM_BATCH_SIZE = 500
+
+# 퀴즈 통계 카운터 형식 버전 (이 값이 없는 퀴즈는 시작 시 응답 문서로 재구성)
+QUIZ_COUNTERS_VERSION = 1
+
+# MongoDB 중복 키 오류 코드 (E11000)
+DUPLICATE_KEY_ERROR = 11000
+
+# get_quiz_stats가 읽는 퀴즈 통계 카운터 필드
+QUIZ_STATS_PROJECTION = {
+    "_id": 0,
+    "total_responses": 1,
+    "correct_count": 1,
+    "option_counts": 1,
+    "response_time_sum": 1,
+}
+
+
+def option_counter_key(option_id: str) -> str:
+    """선택지 ID → option_counts 필드 이름 ('.'/'$'는 필드 경로에 못 써서 전각 문자로)"""
+    return option_id.replace(".", "\uff0e").replace("$", "\uff04")
+
+
+def option_id_from_counter_key(key: str) -> str:
+    return key.replace("\uff0e", ".").replace("\uff04", "$")
+
+
+def quiz_counter_inc(
+    option_id: str, is_correct: bool, response_time: float
+) -> Dict[str, Any]:
+    """응답 한 건 → 퀴즈 문서 카운터 $inc"""
+    return {
+        "total_responses": 1,
+        "correct_count": 1 if is_correct else 0,
+        f"option_counts.{option_counter_key(option_id)}": 1,
+        "response_time_sum": response_time,
+    }
+
+
+def quiz_counters_from_groups(groups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """(quiz_id, 선택지)별 응답 $group 결과 → 퀴즈 문서 카운터 필드"""
+    return {
+        "total_responses": sum(g["count"] for g in groups),
+        "correct_count": sum(g["correct"] for g in groups),
+        "option_counts": {
+            option_counter_key(g["_id"]["option_id"]): g["count"] for g in groups
+        },
+        "response_time_sum": float(sum(g["response_time"] for g in groups)),
+    }
+
+
+def quiz_stats_from_counters(quiz_id: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+    """퀴즈 문서 카운터 → 퀴즈 통계 응답"""
+    total_responses = doc.get("total_responses", 0)
+    correct_responses = doc.get("correct_count", 0)
+    accuracy = (
+        (correct_responses / total_responses * 100) if total_responses > 0 else 0.0
+    )
+
+    return {
+        "quiz_id": quiz_id,
+        "total_responses": total_responses,
+        "correct_responses": correct_responses,
+        "accuracy": round(accuracy, 2),
+        "option_distribution": {
+            option_id_from_counter_key(key): count
+            for key, count in doc.get("option_counts", {}).items()
+            if count
+        },
+        "average_response_time": round(
+            doc.get("response_time_sum", 0.0) / total_responses, 2
+        )
+        if total_responses > 0
+        else 0.0,
+    }
+
+
+def engagement_participation_score_expr(
+    chat_count: Any, quiz_count: Any, attendance_points: int = 10
+) -> Dict[str, Any]:
+    """EngagementCalculator.calculate_participation_score 집계 식 (참석 + 채팅 5점(최대 40) + 퀴즈 5점(최대 50))"""
+    return {
+        "$min": [
+            {
+                "$add": [
+                    attendance_points,
+                    {"$min": [{"$multiply": [chat_count, 5]}, 40]},
+                    {"$min": [{"$multiply": [quiz_count, 5]}, 50]},
+                ]
+            },
+            100,
+        ]
+    }
+
+
+def engagement_overall_score_expr(
+    attention: Any, participation_score: Any, accuracy: Any
+) -> Dict[str, Any]:
+    """EngagementCalculator.calculate_overall_engagement_score 집계 식 (집중 40% + 참여 40% + 정답률 20%)"""
+    return {
+        "$min": [
+            {
+                "$max": [
+                    {
+                        "$add": [
+                            {"$multiply": [{"$multiply": [attention, 100]}, 0.4]},
+                            {"$multiply": [participation_score, 0.4]},
+                            {"$multiply": [{"$multiply": [accuracy, 100]}, 0.2]},
+                        ]
+                    },
+                    0.0,
+                ]
+            },
+            100.0,
+        ]
+    }
+
+
+# 참여도 문서의 정렬 키 overall_score 재계산 (파이프라인 업데이트, 저장된 metrics 기준)
+# (session_id, overall_score, student_id) 인덱스로 점수순 조회·keyset 페이지네이션
+ENGAGEMENT_SCORE_UPDATE = [
+    {
+        "$set": {
+            "overall_score": engagement_overall_score_expr(
+                {"$ifNull": ["$metrics.attention_score", 0.0]},
+                engagement_participation_score_expr(
+                    {"$ifNull": ["$metrics.chat_message_count", 0]},
+                    {"$ifNull": ["$metrics.participation_count", 0]},
+                ),
+                {"$ifNull": ["$metrics.quiz_accuracy", 0.0]},
+            )
+        }
+    }
+]
+
+
+
+def engagement_update_pipeline(update: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    $set/$inc 필드 업데이트 → 정렬 키 재계산까지 포함한 파이프라인 업데이트
+
+    한 번의 쓰기로 카운터 합산과 overall_score 재계산이 함께 반영됨
+    ($inc 결과는 다른 노드의 반영분까지 포함한 DB 값 기준)
+    """
+    fields: Dict[str, Any] = {
+        path: {"$literal": value} for path, value in update.get("$set", {}).items()
+    }
+    for path, amount in update.get("$inc", {}).items():
+        fields[path] = {"$add": [{"$ifNull": [f"${path}", 0]}, amount]}
+    return [{"$set": fields}, *ENGAGEMENT_SCORE_UPDATE] if fields else ENGAGEMENT_SCORE_UPDATE
+
+
+# 점수순 정렬 (동점은 student_id 순)
+ENGAGEMENT_SCORE_SORT = [("overall_score", -1), ("student_id", 1)]
+
+# 채팅 메시지 조회 필드 — ChatMessage 스키마와 일치
+CHAT_MESSAGE_PROJECTION = {
+    "_id": 0,
+    "session_id": 1,
+    "student_id": 1,
+    "student_name": 1,
+    "message": 1,
+    "message_time": 1,
+    "is_question": 1,
+    "sentiment": 1,
+}
+
+# 최신순 정렬 (같은 시각은 _id 역순)
+CHAT_MESSAGE_SORT = [("message_time", -1), ("_id", -1)]
+
 
 class DatabaseManager:
     """MongoDB 데이터베이스 관리자"""
@@ -60,14 +233,15 @@ class DatabaseManager:
             await self.db.quiz_responses.create_index(
                 [("session_id", 1), ("quiz_id", 1), ("student_id", 1)]
             )
+            await self._ensure_unique_quiz_response_index()  # 학생당 퀴즈 응답 하나
             await self.db.quiz_responses.create_index(
                 [("session_id", 1), ("quiz_id", 1), ("responded_at", -1)]
             )  # 최신순 정렬용
 
             # Chat 인덱스 (복합 인덱스 강화)
             await self.db.chat_analytics.create_index(
-                [("session_id", 1), ("message_time", -1)]  # 최신순
-            )
+                [("session_id", 1), ("message_time", -1), ("_id", -1)]
+            )  # 최신순 (keyset 페이지네이션)
             await self.db.chat_analytics.create_index(
                 [("session_id", 1), ("student_id", 1), ("message_time", -1)]
             )  # 학생별 채팅 조회 최적화
@@ -80,8 +254,8 @@ class DatabaseManager:
                 [("session_id", 1), ("updated_at", -1)]
             )  # 최근 업데이트순
             await self.db.student_engagement.create_index(
-                [("session_id", 1), ("overall_score", -1)]
-            )  # 점수순 정렬용
+                [("session_id", 1), ("overall_score", -1), ("student_id", 1)]
+            )  # 점수순 정렬용 (keyset 페이지네이션)
 
             # Screenshot 인덱스 (복합 인덱스 강화)
             await self.db.screenshot_analysis.create_index(
@@ -94,6 +268,11 @@ class DatabaseManager:
                 [("student_id", 1), ("last_updated", -1)]
             )
 
+            # 세션 상태 보관 인덱스 (세션 수명 관리 spill)
+            await self.db.session_archive.create_index(
+                [("session_id", 1), ("component", 1)]
+            )
+
             # Teacher AI key 인덱스
             await self.db.teacher_ai_keys.create_index(
                 [("teacher_id", 1), ("provider", 1)], unique=True
@@ -104,6 +283,66 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"❌ Failed to create indexes: {e}")
 
+    async def _ensure_unique_quiz_response_index(self):
+        """
+        (quiz_id, student_id) 유니크 인덱스 생성
+
+        유니크가 아닌 이전 인덱스가 있으면 중복 응답을 먼저 정리하고 교체
+        """
+        keys = [("quiz_id", 1), ("student_id", 1)]
+        name = "quiz_id_1_student_id_1"
+        indexes = await self.db.quiz_responses.index_information()
+        if indexes.get(name, {}).get("unique"):
+            return
+
+        removed = await self.dedupe_quiz_responses()
+        if removed:
+            logger.warning(f"⚠️ Removed {removed} duplicate quiz responses")
+        if name in indexes:
+            await self.db.quiz_responses.drop_index(name)
+        await self.db.quiz_responses.create_index(keys, name=name, unique=True)
+
+    async def dedupe_quiz_responses(self) -> int:
+        """
+        학생당 퀴즈 응답 하나만 남기고 정리 (가장 먼저 저장된 응답 유지)
+
+        정리한 퀴즈는 통계 카운터도 응답 문서로 재구성
+
+        Returns:
+            int: 삭제한 응답 수
+        """
+        removed_ids = []
+        quiz_ids = set()
+        async for group in self.db.quiz_responses.aggregate(
+            [
+                {"$sort": {"responded_at": 1, "_id": 1}},
+                {
+                    "$group": {
+                        "_id": {"quiz_id": "$quiz_id", "student_id": "$student_id"},
+                        "ids": {"$push": "$_id"},
+                        "count": {"$sum": 1},
+                    }
+                },
+                {"$match": {"count": {"$gt": 1}}},
+            ],
+            allowDiskUse=True,
+        ):
+            removed_ids.extend(group["ids"][1:])
+            quiz_ids.add(group["_id"]["quiz_id"])
+
+        if not removed_ids:
+            return 0
+        await self.db.quiz_responses.bulk_write(
+            [
+                DeleteMany({"_id": {"$in": removed_ids[i : i + 1000]}})
+                for i in range(0, len(removed_ids), 1000)
+            ],
+            ordered=False,
+        )
+        for quiz_id in quiz_ids:
+            await self.rebuild_quiz_stats(quiz_id)
+        return len(removed_ids)
+
     # ============================================
     # Session Operations
     # ============================================
@@ -139,6 +378,9 @@ class DatabaseManager:
             "status": "draft",
             "total_responses": 0,
             "correct_count": 0,
+            "option_counts": {},
+            "response_time_sum": 0.0,
+            "counters_version": QUIZ_COUNTERS_VERSION,
         }
         await self.db.quizzes.insert_one(quiz_doc)
         return await self.get_quiz(quiz.quiz_id)
@@ -178,46 +420,92 @@ class DatabaseManager:
         return quizzes
 
     async def get_quiz_stats(self, quiz_id: str) -> dict:
-        """퀴즈 통계 조회"""
-        quiz = await self.get_quiz(quiz_id)
-        if not quiz:
+        """퀴즈 통계 조회 (응답 시 누적한 카운터만 projection으로 단건 조회)"""
+        doc = await self.db.quizzes.find_one(
+            {"quiz_id": quiz_id}, QUIZ_STATS_PROJECTION
+        )
+        if not doc:
             return None
-
-        responses = await self.get_quiz_responses(quiz_id)
-
-        # 옵션별 응답 분포 계산
-        option_distribution = {}
-        for resp in responses:
-            option_id = resp.selected_option_id
-            option_distribution[option_id] = option_distribution.get(option_id, 0) + 1
-
-        total_responses = len(responses)
-        correct_responses = sum(1 for r in responses if r.is_correct)
-        accuracy = (
-            (correct_responses / total_responses * 100) if total_responses > 0 else 0.0
+        return quiz_stats_from_counters(quiz_id, doc)
+
+    async def rebuild_quiz_stats(
+        self, quiz_id: Optional[str] = None, stale_only: bool = False
+    ) -> int:
+        """
+        응답 문서로 퀴즈 통계 카운터 재구성 (복구용)
+
+        응답 저장과 카운터 증가는 별도 쓰기라서 중간에 실패하면 어긋날 수 있음.
+        재구성 중 들어온 응답은 유실될 수 있으므로 응답이 없는 시점에 실행.
+
+        Args:
+            quiz_id: 특정 퀴즈만 (None이면 전체)
+            stale_only: counters_version이 현재 버전이 아닌 퀴즈만
+                (카운터 도입 이전 퀴즈 — 배포 후 들어온 응답만 반영된 부분 카운터 포함)
+
+        Returns:
+            int: 재구성한 퀴즈 수
+        """
+        quiz_match: Dict[str, Any] = {"quiz_id": quiz_id} if quiz_id else {}
+        if stale_only:
+            quiz_match["counters_version"] = {"$ne": QUIZ_COUNTERS_VERSION}
+        quiz_ids = await self.db.quizzes.distinct("quiz_id", quiz_match)
+        if not quiz_ids:
+            return 0
+        match = {"quiz_id": {"$in": quiz_ids}} if stale_only else quiz_match
+        counters = {qid: quiz_counters_from_groups([]) for qid in quiz_ids}
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        async for group in self.db.quiz_responses.aggregate(
+            [
+                {"$match": match},
+                {
+                    "$group": {
+                        "_id": {
+                            "quiz_id": "$quiz_id",
+                            "option_id": "$selected_option_id",
+                        },
+                        "count": {"$sum": 1},
+                        "correct": {"$sum": {"$cond": ["$is_correct", 1, 0]}},
+                        "response_time": {"$sum": "$response_time"},
+                    }
+                },
+            ]
+        ):
+            groups.setdefault(group["_id"]["quiz_id"], []).append(group)
+        for qid, quiz_groups in groups.items():
+            if qid in counters:
+                counters[qid] = quiz_counters_from_groups(quiz_groups)
+
+        await self.db.quizzes.bulk_write(
+            [
+                UpdateOne(
+                    {"quiz_id": qid},
+                    {"$set": {**c, "counters_version": QUIZ_COUNTERS_VERSION}},
+                )
+                for qid, c in counters.items()
+            ],
+            ordered=False,
         )
-
-        return {
-            "quiz_id": quiz_id,
-            "total_responses": total_responses,
-            "correct_responses": correct_responses,
-            "accuracy": round(accuracy, 2),
-            "option_distribution": option_distribution,
-            "average_response_time": round(
-                sum(r.response_time for r in responses) / total_responses, 2
-            )
-            if total_responses > 0
-            else 0.0,
-        }
+        logger.info(f"🔧 Rebuilt quiz stats counters: {len(counters)} quizzes")
+        return len(counters)
 
     # ============================================
     # Quiz Response Operations
     # ============================================
 
-    async def create_quiz_response(self, response: QuizResponseCreate) -> QuizResponse:
-        """퀴즈 응답 저장"""
-        quiz = await self.get_quiz(response.quiz_id)
-        is_correct = response.selected_option_id == quiz.correct_option_id
+    async def create_quiz_response(
+        self, response: QuizResponseCreate
+    ) -> Optional[QuizResponse]:
+        """
+        퀴즈 응답 저장 (퀴즈 문서의 통계 카운터도 원자적으로 증가)
+
+        Returns:
+            Optional[QuizResponse]: 저장된 응답 (이미 응답한 학생이면 None)
+        """
+        quiz = await self.db.quizzes.find_one(
+            {"quiz_id": response.quiz_id}, {"_id": 0, "correct_option_id": 1}
+        )
+        is_correct = response.selected_option_id == quiz["correct_option_id"]
 
         response_doc = {
             **response.model_dump(),
@@ -225,25 +513,88 @@ class DatabaseManager:
             "responded_at": datetime.now(UTC),
         }
 
-        await self.db.quiz_responses.insert_one(response_doc)
+        # (quiz_id, student_id) upsert: 이미 있으면 저장/집계하지 않음
+        try:
+            result = await self.db.quiz_responses.update_one(
+                {"quiz_id": response.quiz_id, "student_id": response.student_id},
+                {"$setOnInsert": response_doc},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # 동시에 들어온 같은 학생의 응답이 먼저 저장됨
+            return None
+        if result.upserted_id is None:
+            return None
 
-        # 퀴즈 통계 업데이트
+        # 퀴즈 통계 업데이트 (get_quiz_stats가 응답을 다시 읽지 않도록)
         await self.db.quizzes.update_one(
             {"quiz_id": response.quiz_id},
             {
-                "$inc": {
-                    "total_responses": 1,
-                    "correct_count": 1 if is_correct else 0,
-                }
+                "$inc": quiz_counter_inc(
+                    response.selected_option_id, is_correct, response.response_time
+                )
             },
         )
 
         return QuizResponse(**response_doc)
 
+    async def bulk_insert_quiz_responses(
+        self, docs: List[Dict[str, Any]]
+    ) -> List[bool]:
+        """
+        퀴즈 응답 일괄 저장 (bulk_write 한 번, 학생당 퀴즈 응답 하나)
+
+        (quiz_id, student_id)로 $setOnInsert upsert → 이미 응답한 학생은 저장하지 않음.
+        동시에 upsert한 같은 학생의 응답은 유니크 인덱스의 E11000으로 걸러짐
+
+        Returns:
+            List[bool]: 문서별 신규 저장 여부 (False면 중복 응답)
+        """
+        if not docs:
+            return []
+        try:
+            result = await self.db.quiz_responses.bulk_write(
+                [
+                    UpdateOne(
+                        {"quiz_id": doc["quiz_id"], "student_id": doc["student_id"]},
+                        {"$setOnInsert": doc},
+                        upsert=True,
+                    )
+                    for doc in docs
+                ],
+                ordered=False,
+            )
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+            upserted = {item["index"] for item in e.details.get("upserted", [])}
+            return [i in upserted for i in range(len(docs))]
+        return [i in result.upserted_ids for i in range(len(docs))]
+
+    async def increment_quiz_counters(
+        self, quiz_id: str, inc: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """퀴즈 통계 카운터를 한 번에 증가시키고 갱신된 통계 반환"""
+        doc = await self.db.quizzes.find_one_and_update(
+            {"quiz_id": quiz_id},
+            {"$inc": inc},
+            projection=QUIZ_STATS_PROJECTION,
+            return_document=ReturnDocument.AFTER,
+        )
+        return quiz_stats_from_counters(quiz_id, doc) if doc else None
+
     async def get_quiz_responses(self, quiz_id: str) -> List[QuizResponse]:
         """퀴즈 응답 목록 조회"""
-        docs = await self.db.quiz_responses.find({"quiz_id": quiz_id}).to_list(None)
-        return [QuizResponse(**doc) for doc in docs]
+        return [QuizResponse(**doc) async for doc in self.iter_quiz_responses(quiz_id)]
+
+    async def iter_quiz_responses(
+        self, quiz_id: str, batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """퀴즈 응답 스트리밍 조회 (batch_size개씩 가져와서 문서 하나씩 반환)"""
+        cursor = self.db.quiz_responses.find({"quiz_id": quiz_id}, {"_id": 0})
+        async for doc in cursor.batch_size(batch_size):
+            yield doc
 
     # ============================================
     # Chat Analytics Operations
@@ -262,27 +613,71 @@ class DatabaseManager:
         self, session_id: str, limit: int = None
     ) -> List[ChatMessage]:
         """세션의 채팅 메시지 조회 (Phase 3-4: 프로젝션 최적화)"""
-        # 필요한 필드만 조회 (프로젝션) — ChatMessage 스키마와 일치
-        projection = {
-            "_id": 0,
-            "session_id": 1,
-            "student_id": 1,
-            "student_name": 1,
-            "message": 1,
-            "message_time": 1,
-            "is_question": 1,
-            "sentiment": 1,
-        }
-
+        return [
+            ChatMessage(**doc)
+            async for doc in self.iter_chat_messages(session_id, limit=limit)
+        ]
+
+    async def iter_chat_messages(
+        self,
+        session_id: str,
+        limit: int = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """세션의 채팅 메시지 스트리밍 조회 (최신순)"""
         query = self.db.chat_analytics.find(
-            {"session_id": session_id}, projection
-        ).sort("message_time", -1)  # 최신순
+            {"session_id": session_id}, CHAT_MESSAGE_PROJECTION
+        ).sort(CHAT_MESSAGE_SORT)
 
         if limit:
             query = query.limit(limit)
 
-        docs = await query.to_list(None)
-        return [ChatMessage(**doc) for doc in docs]
+        async for doc in query.batch_size(batch_size):
+            yield doc
+
+    async def get_chat_messages_page(
+        self,
+        session_id: str,
+        limit: int = 50,
+        after: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        채팅 메시지 keyset 페이지 조회 (최신순)
+
+        (session_id, message_time, _id) 인덱스에서 직전 페이지 끝 다음부터 읽으므로
+        몇 번째 페이지든 비용이 같음
+
+        Args:
+            session_id: 세션 ID
+            limit: 페이지 크기
+            after: 직전 페이지의 다음 키 ({"message_time", "_id"}), 첫 페이지면 None
+
+        Returns:
+            (메시지 목록, 다음 페이지 키 — 마지막 페이지면 None)
+        """
+        query: Dict[str, Any] = {"session_id": session_id}
+        if after:
+            query["$or"] = [
+                {"message_time": {"$lt": after["message_time"]}},
+                {"message_time": after["message_time"], "_id": {"$lt": after["_id"]}},
+            ]
+
+        docs = (
+            await self.db.chat_analytics.find(
+                query, {**CHAT_MESSAGE_PROJECTION, "_id": 1}
+            )
+            .sort(CHAT_MESSAGE_SORT)
+            .limit(limit + 1)
+            .to_list(limit + 1)
+        )
+
+        next_key = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_key = {"message_time": docs[-1]["message_time"], "_id": docs[-1]["_id"]}
+        for doc in docs:
+            del doc["_id"]
+        return docs, next_key
 
     # ============================================
     # Student Engagement Operations
@@ -291,12 +686,14 @@ class DatabaseManager:
     async def update_student_engagement(self, engagement: StudentEngagement) -> bool:
         """학생 참여도 업데이트"""
         try:
-            result = await self.db.student_engagement.update_one(
-                {
-                    "session_id": engagement.session_id,
-                    "student_id": engagement.student_id,
-                },
-                {"$set": engagement.model_dump()},
+            filter_ = {
+                "session_id": engagement.session_id,
+                "student_id": engagement.student_id,
+            }
+            # 문서 저장과 정렬 키 재계산을 파이프라인 업데이트 한 번으로
+            await self.db.student_engagement.update_one(
+                filter_,
+                engagement_update_pipeline({"$set": engagement.model_dump()}),
                 upsert=True,
             )
             return True
@@ -304,10 +701,85 @@ class DatabaseManager:
             logger.error(f"❌ Failed to update engagement: {e}")
             return False
 
+    async def bulk_update_student_engagement(
+        self, updates: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> int:
+        """
+        학생 참여도 일괄 반영 (write-behind flush용, bulk_write 한 번)
+
+        학생별 업데이트 하나에 정렬 키(overall_score) 재계산까지 포함
+        ($inc는 여러 노드가 합산하므로 DB에 저장된 metrics 기준으로 계산)
+
+        Args:
+            updates: [(filter, update), ...] — update는 $inc/$set 필드 단위 변경
+
+        Returns:
+            int: 반영(수정+신규)된 문서 수
+
+        Raises:
+            BulkWriteError: 일부 업데이트 실패 (details["writeErrors"]의 index 외에는 반영됨)
+        """
+        if not updates:
+            return 0
+        result = await self.db.student_engagement.bulk_write(
+            [
+                UpdateOne(f, engagement_update_pipeline(u), upsert=True)
+                for f, u in updates
+            ],
+            ordered=False,
+        )
+        return result.modified_count + result.upserted_count
+
+    async def refresh_engagement_scores(
+        self, session_id: Optional[str] = None, missing_only: bool = True
+    ) -> int:
+        """
+        참여도 문서의 정렬 키(overall_score) 재계산 (서버 시작 시 백필)
+
+        Args:
+            session_id: 특정 세션만 (None이면 전체)
+            missing_only: True면 정렬 키가 없는 (이전 버전에서 저장된) 문서만
+
+        Returns:
+            int: 갱신된 문서 수
+        """
+        query: Dict[str, Any] = {"session_id": session_id} if session_id else {}
+        if missing_only:
+            query["overall_score"] = {"$exists": False}
+        result = await self.db.student_engagement.update_many(
+            query, ENGAGEMENT_SCORE_UPDATE
+        )
+        if result.modified_count:
+            logger.info(
+                f"🔧 Refreshed engagement scores for {result.modified_count} students"
+            )
+        return result.modified_count
+
+    async def get_student_engagement(
+        self, session_id: str, student_id: str
+    ) -> Optional[StudentEngagement]:
+        """학생 한 명의 참여도 조회 ((session_id, student_id) 유니크 인덱스 단건 조회)"""
+        doc = await self.db.student_engagement.find_one(
+            {"session_id": session_id, "student_id": student_id}, {"_id": 0}
+        )
+        return StudentEngagement(**doc) if doc else None
+
     async def get_session_engagement(
         self, session_id: str, summary_only: bool = False
     ) -> List[StudentEngagement]:
         """세션의 모든 학생 참여도 조회 (Phase 3-4: 프로젝션 최적화)"""
+        return [
+            StudentEngagement(**doc)
+            async for doc in self.iter_session_engagement(session_id, summary_only)
+        ]
+
+    async def iter_session_engagement(
+        self,
+        session_id: str,
+        summary_only: bool = False,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """세션의 학생 참여도 스트리밍 조회"""
 
         if summary_only:
             # 대시보드 요약용: StudentEngagement 필수 필드 + metrics (중첩)
@@ -322,16 +794,64 @@ class DatabaseManager:
             }
         else:
             # 상세 조회: 모든 필드
-            projection = None
+            projection = {"_id": 0}
+
+        cursor = self.db.student_engagement.find(
+            {"session_id": session_id}, projection
+        ).sort(ENGAGEMENT_SCORE_SORT)  # 점수 높은 순
+        async for doc in cursor.batch_size(batch_size):
+            yield doc
+
+    async def get_session_engagement_page(
+        self,
+        session_id: str,
+        limit: int = 50,
+        after: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        학생 참여도 keyset 페이지 조회 (점수 높은 순, 동점은 student_id 순)
+
+        (session_id, overall_score, student_id) 인덱스에서 직전 페이지 끝 다음부터 읽음
+
+        Args:
+            session_id: 세션 ID
+            limit: 페이지 크기
+            after: 직전 페이지의 다음 키 ({"overall_score", "student_id"}), 첫 페이지면 None
+
+        Returns:
+            (참여도 문서 목록, 다음 페이지 키 — 마지막 페이지면 None)
+        """
+        query: Dict[str, Any] = {"session_id": session_id}
+        if after:
+            query["$or"] = [
+                {"overall_score": {"$lt": after["overall_score"]}},
+                {
+                    "overall_score": after["overall_score"],
+                    "student_id": {"$gt": after["student_id"]},
+                },
+            ]
 
         docs = (
-            await self.db.student_engagement.find(
-                {"session_id": session_id}, projection
-            )
-            .sort("overall_score", -1)
-            .to_list(None)
-        )  # 점수 높은 순
-        return [StudentEngagement(**doc) for doc in docs]
+            await self.db.student_engagement.find(query, {"_id": 0})
+            .sort(ENGAGEMENT_SCORE_SORT)
+            .limit(limit + 1)
+            .to_list(limit + 1)
+        )
+
+        next_key = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_key = {
+                "overall_score": docs[-1]["overall_score"],
+                "student_id": docs[-1]["student_id"],
+            }
+        return docs, next_key
+
+    async def aggregate_student_engagement(
+        self, pipeline: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """참여도 집계 파이프라인 실행 (점수 계산·필터·정렬을 서버에서)"""
+        return await self.db.student_engagement.aggregate(pipeline).to_list(None)
 
     # ============================================
     # Screenshot Analysis Operations
@@ -350,12 +870,20 @@ class DatabaseManager:
         self, session_id: str
     ) -> List[ScreenshotAnalysis]:
         """세션의 스크린샷 분석 조회"""
-        docs = (
-            await self.db.screenshot_analysis.find({"session_id": session_id})
-            .sort("screenshot_time", 1)
-            .to_list(None)
-        )
-        return [ScreenshotAnalysis(**doc) for doc in docs]
+        return [
+            ScreenshotAnalysis(**doc)
+            async for doc in self.iter_session_screenshots(session_id)
+        ]
+
+    async def iter_session_screenshots(
+        self, session_id: str, batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """세션의 스크린샷 분석 스트리밍 조회 (시간순)"""
+        cursor = self.db.screenshot_analysis.find(
+            {"session_id": session_id}, {"_id": 0}
+        ).sort("screenshot_time", 1)
+        async for doc in cursor.batch_size(batch_size):
+            yield doc
 
     # ============================================
     # Learning Analytics Operations
@@ -395,6 +923,44 @@ class DatabaseManager:
         doc = await self.db.student_learning_paths.find_one({"student_id": student_id})
         return StudentLearningPath(**doc) if doc else None
 
+    # ============================================
+    # Session Archive Operations
+    # ============================================
+
+    async def archive_session_state(
+        self, session_id: str, component: str, documents: List[Dict[str, Any]]
+    ) -> bool:
+        """메모리에서 정리하는 세션 상태 보관 (세션 수명 관리)"""
+        if not documents:
+            return True
+        try:
+            archived_at = datetime.now(UTC)
+            await self.db.session_archive.insert_many(
+                [
+                    {
+                        "session_id": session_id,
+                        "component": component,
+                        "archived_at": archived_at,
+                        "data": doc,
+                    }
+                    for doc in documents
+                ],
+                ordered=False,
+            )
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to archive {component} state for {session_id}: {e}")
+            return False
+
+    async def get_archived_session_state(
+        self, session_id: str, component: str
+    ) -> List[Dict[str, Any]]:
+        """보관된 세션 상태 조회"""
+        docs = await self.db.session_archive.find(
+            {"session_id": session_id, "component": component}, {"_id": 0, "data": 1}
+        ).to_list(None)
+        return [doc["data"] for doc in docs]
+
     async def close(self):
         """MongoDB 연결 종료"""
         if self.client:
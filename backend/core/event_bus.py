@@ -0,0 +1,230 @@
+"""
+AIRClass Event Bus
+채널 단위 이벤트 발행/구독 인터페이스
+
+- RedisEventBus: Redis Pub/Sub (멀티노드, BatchPublisher로 묶어서 발행)
+- InMemoryEventBus: 단일 노드용 asyncio 구현 (직렬화/네트워크 왕복 없음)
+
+두 구현 모두 같은 채널 이름을 쓰고, 구독자는
+{"channel": str, "data": dict} 형태로 이벤트를 받는다.
+"""
+
+import asyncio
+import fnmatch
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from core.batch_publisher import BatchPublisher
+from core.metrics import event_bus_decode_errors_total, redis_publish_dropped_total
+
+logger = logging.getLogger(__name__)
+
+BUS_REDIS = "redis"
+BUS_MEMORY = "memory"
+
+
+class Subscription:
+    """채널 구독 (listen()으로 이벤트 수신)"""
+
+    def listen(self) -> AsyncIterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def close(self):
+        raise NotImplementedError
+
+
+class EventBus:
+    """이벤트 버스 인터페이스"""
+
+    name = ""
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> bool:
+        """채널에 이벤트 발행"""
+        raise NotImplementedError
+
+    async def subscribe(self, *channels: str) -> Subscription:
+        """채널 구독"""
+        raise NotImplementedError
+
+    async def psubscribe(self, *patterns: str) -> Subscription:
+        """패턴 구독 (glob 스타일, 예: airclass:session:*:engagement)"""
+        raise NotImplementedError
+
+    async def close(self):
+        """버스 종료"""
+
+
+# ============================================
+# In-Memory (단일 노드)
+# ============================================
+
+_CLOSED = object()
+
+
+class InMemorySubscription(Subscription):
+    """프로세스 내 구독자 (구독자별 제한된 대기열)"""
+
+    def __init__(
+        self,
+        bus: "InMemoryEventBus",
+        channels: tuple,
+        max_queue: int,
+        patterns: tuple = (),
+    ):
+        self.bus = bus
+        self.channels = channels
+        self.patterns = patterns
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def deliver(self, channel: str, message: Dict[str, Any]):
+        """이벤트 전달 (대기열이 가득 차면 가장 오래된 이벤트를 버림)"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            redis_publish_dropped_total.labels(reason="subscriber_full").inc()
+        self.queue.put_nowait({"channel": channel, "data": message})
+
+    async def listen(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            item = await self.queue.get()
+            if item is _CLOSED:
+                return
+            yield item
+
+    async def close(self):
+        self.bus._unsubscribe(self)
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_CLOSED)
+
+
+class InMemoryEventBus(EventBus):
+    """asyncio 기반 프로세스 내 이벤트 버스"""
+
+    name = BUS_MEMORY
+
+    def __init__(self, max_queue: int = 10000):
+        """
+        Args:
+            max_queue: 구독자별 최대 대기 이벤트 수
+        """
+        self.max_queue = max_queue
+        self._subscribers: Dict[str, Set[InMemorySubscription]] = {}
+        self._pattern_subscribers: Set[InMemorySubscription] = set()
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> bool:
+        # 같은 dict를 모든 구독자가 공유하므로 구독자는 수정하지 않아야 함
+        for subscription in self._subscribers.get(channel, ()):
+            subscription.deliver(channel, message)
+        for subscription in self._pattern_subscribers:
+            if any(fnmatch.fnmatchcase(channel, p) for p in subscription.patterns):
+                subscription.deliver(channel, message)
+        return True
+
+    async def subscribe(self, *channels: str) -> InMemorySubscription:
+        subscription = InMemorySubscription(self, channels, self.max_queue)
+        for channel in channels:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    async def psubscribe(self, *patterns: str) -> InMemorySubscription:
+        subscription = InMemorySubscription(
+            self, (), self.max_queue, patterns=patterns
+        )
+        self._pattern_subscribers.add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: InMemorySubscription):
+        self._pattern_subscribers.discard(subscription)
+        for channel in subscription.channels:
+            subscribers = self._subscribers.get(channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    async def close(self):
+        for subscribers in list(self._subscribers.values()):
+            for subscription in list(subscribers):
+                await subscription.close()
+        for subscription in list(self._pattern_subscribers):
+            await subscription.close()
+
+
+# ============================================
+# Redis (멀티노드)
+# ============================================
+
+
+class RedisSubscription(Subscription):
+    """Redis Pub/Sub 구독 (JSON 디코딩 후 전달, 디코딩할 수 없는 메시지는 버림)"""
+
+    def __init__(self, pubsub, pattern: bool = False):
+        self.pubsub = pubsub
+        self.pattern = pattern
+
+    async def listen(self) -> AsyncIterator[Dict[str, Any]]:
+        async for message in self.pubsub.listen():
+            if message["type"] not in ("message", "pmessage"):
+                continue
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            try:
+                data = json.loads(message["data"])
+            except (TypeError, ValueError):
+                data = None
+            if not isinstance(data, dict):
+                # 잘못된 메시지 하나로 구독 전체가 끝나지 않도록 건너뜀
+                event_bus_decode_errors_total.inc()
+                logger.warning(
+                    f"⚠️ Dropped malformed message on {channel}: "
+                    f"{message['data']!r:.200}"
+                )
+                continue
+            yield {"channel": channel, "data": data}
+
+    async def close(self):
+        if self.pattern:
+            await self.pubsub.punsubscribe()
+        else:
+            await self.pubsub.unsubscribe()
+        await self.pubsub.close()
+
+
+class RedisEventBus(EventBus):
+    """Redis Pub/Sub 이벤트 버스"""
+
+    name = BUS_REDIS
+
+    def __init__(self, redis_client, publisher: Optional[BatchPublisher] = None):
+        """
+        Args:
+            redis_client: redis.asyncio 클라이언트
+            publisher: 배치 발행기 (없거나 미시작이면 바로 PUBLISH)
+        """
+        self.redis_client = redis_client
+        self.publisher = publisher
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> bool:
+        if self.publisher and self.publisher.running:
+            return await self.publisher.publish(channel, message)
+
+        await self.redis_client.publish(channel, json.dumps(message))
+        return True
+
+    async def subscribe(self, *channels: str) -> RedisSubscription:
+        pubsub = self.redis_client.pubsub()
+        await pubsub.subscribe(*channels)
+        return RedisSubscription(pubsub)
+
+    async def psubscribe(self, *patterns: str) -> RedisSubscription:
+        pubsub = self.redis_client.pubsub()
+        await pubsub.psubscribe(*patterns)
+        return RedisSubscription(pubsub, pattern=True)
+
+    async def close(self):
+        if self.publisher:
+            await self.publisher.stop()
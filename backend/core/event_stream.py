@@ -0,0 +1,231 @@
+"""
+AIRClass Event Stream
+Redis Streams 기반 내구성 있는 참여도 이벤트 로그
+
+- 발행: XADD (MAXLEN ~ 로 길이 제한), 전체 스트림 + 세션별 로그에 같은 항목 ID로 함께 기록
+- 소비: XREADGROUP 컨슈머 그룹, 처리에 성공한 항목만 XACK
+- 복구: 죽은 워커가 ACK하지 못한 항목은 XAUTOCLAIM으로 회수
+- 재시도 한도를 넘은 항목은 dead-letter 스트림으로 옮긴 뒤 ACK (그룹이 막히지 않도록)
+- 재생: 세션별 로그를 XRANGE로 순회해 참여도 재계산
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger(__name__)
+
+ENGAGEMENT_STREAM_KEY = "airclass:stream:engagement"
+ENGAGEMENT_CONSUMER_GROUP = "engagement-listeners"
+DEAD_LETTER_MAXLEN = 10000
+
+StreamEntry = Tuple[str, Dict[str, Any]]
+
+# 전체 스트림에 XADD한 항목 ID를 세션 로그에도 그대로 사용 (재생 구간과 소비 위치 비교용)
+# KEYS: 전체 스트림[, 세션 로그] / ARGV: 전체 maxlen, 세션 maxlen, data
+APPEND_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[3])
+if KEYS[2] then
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], id, 'data', ARGV[3])
+end
+return id
+"""
+
+
+def session_log_key(session_id: str) -> str:
+    """세션별 이벤트 로그 키 (재생용)"""
+    return f"airclass:session:{session_id}:engagement:log"
+
+
+def dead_letter_key(stream_key: str) -> str:
+    """처리하지 못한 항목을 보관하는 스트림 키"""
+    return f"{stream_key}:dead"
+
+
+def entry_position(entry_id: str) -> Tuple[int, int]:
+    """스트림 항목 ID ("ms-seq") → 비교 가능한 위치"""
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _parse_entries(entries) -> List[StreamEntry]:
+    """[(id, {b"data": b"..."}), ...] → [(id, event), ...]"""
+    parsed = []
+    for entry_id, fields in entries or []:
+        if not fields:
+            # XAUTOCLAIM 중 MAXLEN으로 잘려 나간 항목
+            continue
+        data = fields.get(b"data", fields.get("data"))
+        parsed.append((_decode(entry_id), json.loads(data)))
+    return parsed
+
+
+class EventStream:
+    """Redis Streams 이벤트 로그 + 컨슈머 그룹"""
+
+    def __init__(
+        self,
+        redis_client,
+        stream_key: str = ENGAGEMENT_STREAM_KEY,
+        group: str = ENGAGEMENT_CONSUMER_GROUP,
+        maxlen: int = 100000,
+        session_maxlen: int = 20000,
+    ):
+        """
+        Args:
+            redis_client: redis.asyncio 클라이언트
+            stream_key: 워커가 소비하는 전체 스트림 키
+            group: 컨슈머 그룹 이름
+            maxlen: 전체 스트림 최대 길이 (근사치 트리밍)
+            session_maxlen: 세션별 로그 최대 길이
+        """
+        self.redis_client = redis_client
+        self.stream_key = stream_key
+        self.group = group
+        self.maxlen = maxlen
+        self.session_maxlen = session_maxlen
+
+    async def append(self, event: Dict[str, Any]) -> str:
+        """
+        이벤트 기록 (전체 스트림 + 세션 로그를 스크립트 한 번으로, 같은 항목 ID)
+
+        Returns:
+            str: 항목 ID
+        """
+        keys = [self.stream_key]
+        session_id = event.get("session_id")
+        if session_id:
+            keys.append(session_log_key(session_id))
+        entry_id = await self.redis_client.eval(
+            APPEND_SCRIPT,
+            len(keys),
+            *keys,
+            self.maxlen,
+            self.session_maxlen,
+            json.dumps(event),
+        )
+        return _decode(entry_id)
+
+    async def ensure_group(self):
+        """컨슈머 그룹 생성 (이미 있으면 무시)"""
+        try:
+            await self.redis_client.xgroup_create(
+                self.stream_key, self.group, id="0", mkstream=True
+            )
+            logger.info(f"✅ Consumer group created: {self.group}")
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def read(
+        self, consumer: str, count: int = 100, block_ms: int = 1000
+    ) -> List[StreamEntry]:
+        """아직 아무 워커에게도 전달되지 않은 새 항목 읽기"""
+        response = await self.redis_client.xreadgroup(
+            self.group,
+            consumer,
+            {self.stream_key: ">"},
+            count=count,
+            block=block_ms,
+        )
+        if not response:
+            return []
+        _, entries = response[0]
+        return _parse_entries(entries)
+
+    async def claim_stale(
+        self, consumer: str, min_idle_ms: int = 30000, count: int = 100
+    ) -> List[StreamEntry]:
+        """min_idle_ms 동안 ACK되지 않은 항목(죽은 워커 몫)을 가져오기"""
+        response = await self.redis_client.xautoclaim(
+            self.stream_key,
+            self.group,
+            consumer,
+            min_idle_time=min_idle_ms,
+            start_id="0-0",
+            count=count,
+        )
+        return _parse_entries(response[1])
+
+    async def ack(self, *entry_ids: str) -> int:
+        """처리 완료 ACK"""
+        if not entry_ids:
+            return 0
+        return await self.redis_client.xack(self.stream_key, self.group, *entry_ids)
+
+    async def delivery_count(self, entry_id: str) -> int:
+        """항목이 그룹 컨슈머에게 전달된 횟수 (대기 중이 아니면 0)"""
+        pending = await self.redis_client.xpending_range(
+            self.stream_key, self.group, min=entry_id, max=entry_id, count=1
+        )
+        return pending[0]["times_delivered"] if pending else 0
+
+    async def dead_letter(
+        self, entry_id: str, event: Dict[str, Any], error: str, deliveries: int = 0
+    ):
+        """처리하지 못한 항목을 dead-letter 스트림에 옮기고 ACK"""
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.xadd(
+                dead_letter_key(self.stream_key),
+                {
+                    "data": json.dumps(event),
+                    "entry_id": entry_id,
+                    "error": error,
+                    "deliveries": deliveries,
+                },
+                maxlen=DEAD_LETTER_MAXLEN,
+                approximate=True,
+            )
+            pipe.xack(self.stream_key, self.group, entry_id)
+            await pipe.execute()
+
+    async def read_session_entries(
+        self, session_id: str, batch_size: int = 500
+    ) -> AsyncIterator[StreamEntry]:
+        """세션 로그를 처음부터 순서대로 순회 (XRANGE 페이지 단위, 항목 ID 포함)"""
+        key = session_log_key(session_id)
+        start = "-"
+        while True:
+            entries = _parse_entries(
+                await self.redis_client.xrange(key, min=start, count=batch_size)
+            )
+            for entry in entries:
+                yield entry
+            if len(entries) < batch_size:
+                return
+            start = f"({entries[-1][0]}"
+
+    async def read_session(
+        self, session_id: str, batch_size: int = 500
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """세션 로그의 이벤트만 순서대로 순회"""
+        async for _, event in self.read_session_entries(session_id, batch_size):
+            yield event
+
+
+# 전역 인스턴스
+_engagement_stream: Optional[EventStream] = None
+
+
+def init_engagement_stream(redis_client) -> EventStream:
+    """참여도 EventStream 초기화 (설정값 적용)"""
+    global _engagement_stream
+    from config import ENGAGEMENT_STREAM_MAXLEN, ENGAGEMENT_STREAM_SESSION_MAXLEN
+
+    _engagement_stream = EventStream(
+        redis_client,
+        maxlen=ENGAGEMENT_STREAM_MAXLEN,
+        session_maxlen=ENGAGEMENT_STREAM_SESSION_MAXLEN,
+    )
+    return _engagement_stream
+
+
+def get_engagement_stream() -> Optional[EventStream]:
+    """참여도 EventStream 인스턴스 반환 (streams 전송 미사용 시 None)"""
+    return _engagement_stream
@@ -1,25 +1,66 @@
 """
 AIRClass Messaging System
 Redis Pub/Sub을 사용한 멀티노드 채팅 및 학생 목록 동기화
+
+단일 노드(MODE=standalone)이거나 Redis에 연결할 수 없으면
+프로세스 내 InMemoryEventBus로 자동 전환 (EVENT_BUS=auto)
 """
 
 import redis.asyncio as redis
-import json
 import logging
-from typing import Optional, Dict, Set, Callable
+import time
+from typing import Optional, Dict, Set, Callable, Tuple
 from datetime import datetime, UTC
 
+from core.batch_publisher import BatchPublisher
+from core.event_bus import (
+    BUS_MEMORY,
+    EventBus,
+    InMemoryEventBus,
+    RedisEventBus,
+)
+from core.event_stream import EventStream, init_engagement_stream
+
 logger = logging.getLogger(__name__)
 
+# 학생 집합 키 (세션별) 및 활성 세션 인덱스
+STUDENTS_KEY_PREFIX = "airclass:students:"
+ACTIVE_SESSIONS_KEY = "airclass:sessions:active"
+# 전체 접속 학생 수 카운터 (KEYS/SCARD 순회 없이 O(1) 조회)
+ONLINE_COUNT_KEY = "airclass:online_count"
+# 세션별 학생 수 로컬 캐시 TTL (다른 노드의 입장/퇴장 반영 지연 상한)
+STUDENT_COUNT_CACHE_TTL = 5.0
+
+# 학생 제거 + 접속자 카운터 + 빈 세션 인덱스 제외를 원자적으로 (다른 노드 입장과 경합 방지)
+# KEYS: 학생 집합, 활성 세션 인덱스, 접속자 카운터 / ARGV: session_id, student_id
+REMOVE_STUDENT_SCRIPT = """
+local removed = redis.call('SREM', KEYS[1], ARGV[2])
+if removed == 1 then
+    redis.call('DECR', KEYS[3])
+end
+if redis.call('SCARD', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[2], ARGV[1])
+end
+return removed
+"""
+
 
 class MessagingSystem:
-    """Redis 기반 멀티노드 메시징 시스템"""
+    """Redis 기반 멀티노드 메시징 시스템 (단일 노드는 메모리 버스)"""
 
     def __init__(self, redis_url: str = "redis://localhost:6379"):
         self.redis_url = redis_url
         self.redis_client = None
         self.pubsub = None
+        self.publisher: Optional[BatchPublisher] = None
+        self.bus: Optional[EventBus] = None
+        # ENGAGEMENT_EVENT_TRANSPORT=streams일 때만 사용
+        self.engagement_stream: Optional[EventStream] = None
         self.local_students: Set[str] = set()
+        # 메모리 버스 사용 시 세션별 학생 집합 (Redis 집합 대신)
+        self._local_sessions: Dict[str, Set[str]] = {}
+        # 세션별 학생 수 캐시: session_id -> (count, expires_at)
+        self._student_counts: Dict[str, Tuple[int, float]] = {}
         self.callbacks: Dict[str, list] = {
             "chat": [],
             "student_joined": [],
@@ -32,20 +73,83 @@ class MessagingSystem:
         logger.info(f"   Redis URL: {redis_url}")
 
     async def init(self) -> bool:
-        """Redis 연결 초기화"""
+        """
+        이벤트 버스 초기화
+
+        EVENT_BUS=auto면 MODE=standalone일 때와 Redis 연결 실패 시 메모리 버스 사용
+        """
+        from config import EVENT_BUS, MODE
+
+        if EVENT_BUS == BUS_MEMORY or (
+            EVENT_BUS == "auto" and MODE not in ("main", "sub")
+        ):
+            self._use_memory_bus()
+            return True
+
+        if await self._init_redis():
+            return True
+
+        if EVENT_BUS == "auto":
+            logger.warning("⚠️ Redis unavailable, falling back to in-memory event bus")
+            self._use_memory_bus()
+            return True
+
+        return False
+
+    def _use_memory_bus(self):
+        self.redis_client = None
+        self.bus = InMemoryEventBus()
+        logger.info("✅ In-memory event bus enabled (single node)")
+
+    async def _init_redis(self) -> bool:
+        """Redis 연결 및 Redis 이벤트 버스 초기화"""
         try:
-            self.redis_client = await redis.from_url(self.redis_url)
+            self.redis_client = await redis.from_url(
+                self.redis_url, socket_connect_timeout=2
+            )
             
             # Redis 연결 테스트
             await self.redis_client.ping()
             
             logger.info("✅ Redis connection established")
+
+            from config import (
+                REDIS_PUBLISH_BATCH_SIZE,
+                REDIS_PUBLISH_FLUSH_MS,
+                REDIS_PUBLISH_MAX_QUEUE,
+                REDIS_PUBLISH_OVERFLOW,
+                ENGAGEMENT_EVENT_TRANSPORT,
+            )
+
+            self.publisher = BatchPublisher(
+                self.redis_client,
+                batch_size=REDIS_PUBLISH_BATCH_SIZE,
+                flush_interval=REDIS_PUBLISH_FLUSH_MS / 1000,
+                max_queue=REDIS_PUBLISH_MAX_QUEUE,
+                overflow=REDIS_PUBLISH_OVERFLOW,
+            )
+            self.publisher.start()
+            self.bus = RedisEventBus(self.redis_client, self.publisher)
+
+            if ENGAGEMENT_EVENT_TRANSPORT == "streams":
+                self.engagement_stream = init_engagement_stream(self.redis_client)
+                logger.info("🌊 Engagement events use Redis Streams")
+
+            # 활성 세션 인덱스가 없으면 (업그레이드 직후) 한 번만 재구성
+            if not await self.redis_client.exists(ACTIVE_SESSIONS_KEY):
+                await self.rebuild_session_index()
+
             return True
             
         except Exception as e:
             logger.error(f"❌ Failed to connect to Redis: {e}")
+            self.redis_client = None
             return False
 
+    async def _publish(self, channel: str, message: dict) -> bool:
+        """이벤트 버스로 발행 (Redis면 배치 발행기, 메모리면 즉시 전달)"""
+        return await self.bus.publish(channel, message)
+
     async def publish_chat(self, session_id: str, user_id: str, user_name: str, 
                           message: str, user_type: str = "student") -> bool:
         """
@@ -58,8 +162,8 @@ class MessagingSystem:
             message: 메시지 내용
             user_type: 사용자 타입 (student, teacher, monitor)
         """
-        if not self.redis_client:
-            logger.warning("⚠️ Redis not connected")
+        if not self.bus:
+            logger.warning("⚠️ Event bus not initialized")
             return False
 
         try:
@@ -73,14 +177,13 @@ class MessagingSystem:
                 "timestamp": datetime.now(UTC).isoformat(),
             }
 
-            # Redis 채널에 발행 (모든 Sub 노드가 수신)
-            await self.redis_client.publish(
-                f"airclass:session:{session_id}:chat",
-                json.dumps(chat_message)
+            # Redis 채널에 발행 (모든 Sub 노드가 수신, 파이프라인으로 묶어서 전송)
+            published = await self._publish(
+                f"airclass:session:{session_id}:chat", chat_message
             )
 
             logger.debug(f"💬 Chat published: {user_name}: {message}")
-            return True
+            return published
 
         except Exception as e:
             logger.error(f"❌ Failed to publish chat: {e}")
@@ -97,8 +200,8 @@ class MessagingSystem:
             student_id: 학생 ID
             node_name: Sub 노드 이름
         """
-        if not self.redis_client:
-            logger.warning("⚠️ Redis not connected")
+        if not self.bus:
+            logger.warning("⚠️ Event bus not initialized")
             return False
 
         try:
@@ -107,6 +210,7 @@ class MessagingSystem:
                 self.local_students.add(student_id)
             elif event_type == "left":
                 self.local_students.discard(student_id)
+            self.invalidate_student_count(session_id)
 
             event = {
                 "type": "student_event",
@@ -117,13 +221,12 @@ class MessagingSystem:
                 "timestamp": datetime.now(UTC).isoformat(),
             }
 
-            await self.redis_client.publish(
-                f"airclass:session:{session_id}:events",
-                json.dumps(event)
+            published = await self._publish(
+                f"airclass:session:{session_id}:events", event
             )
 
             logger.info(f"👤 Student {event_type}: {student_id} on {node_name}")
-            return True
+            return published
 
         except Exception as e:
             logger.error(f"❌ Failed to publish student event: {e}")
@@ -133,49 +236,169 @@ class MessagingSystem:
         """
         모든 노드의 학생 목록 조회
         
-        Redis에 저장된 session:{session_id}:students 집합에서 조회
+        활성 세션 인덱스(airclass:sessions:active)에 있는 세션들의
+        airclass:students:{session_id} 집합을 SUNION 한 번으로 합침
+        (KEYS 전체 스캔 및 세션별 순차 SMEMBERS 없음)
         """
         if not self.redis_client:
-            logger.warning("⚠️ Redis not connected")
-            return set()
+            # 메모리 버스: 이 프로세스의 세션 집합만 합침
+            return set().union(*self._local_sessions.values())
 
         try:
-            # 현재 활성 세션 찾기 (간단한 구현)
-            # 프로덕션에서는 세션 ID를 명시적으로 관리해야 함
-            keys = await self.redis_client.keys("airclass:students:*")
-            
-            all_students = set()
-            for key in keys:
-                members = await self.redis_client.smembers(key)
-                all_students.update(members)
-            
-            return all_students
+            session_ids = await self.redis_client.smembers(ACTIVE_SESSIONS_KEY)
+            if not session_ids:
+                return set()
+
+            keys = [self._students_key(sid) for sid in session_ids]
+            return set(await self.redis_client.sunion(keys))
 
         except Exception as e:
             logger.error(f"❌ Failed to get students: {e}")
             return set()
 
+    async def get_session_student_count(self, session_id: str) -> int:
+        """
+        세션 학생 수 조회 (로컬 캐시 사용)
+
+        같은 노드의 입장/퇴장 시 즉시 무효화되고,
+        다른 노드의 변경은 STUDENT_COUNT_CACHE_TTL 이내에 반영됨
+        """
+        cached = self._student_counts.get(session_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        if not self.redis_client:
+            return len(self._local_sessions.get(session_id, ()))
+
+        try:
+            count = await self.redis_client.scard(self._students_key(session_id))
+            self._student_counts[session_id] = (
+                count,
+                time.monotonic() + STUDENT_COUNT_CACHE_TTL,
+            )
+            return count
+        except Exception as e:
+            logger.error(f"❌ Failed to count students: {e}")
+            return 0
+
+    async def get_online_count(self) -> int:
+        """전체 접속 학생 수 (카운터 키 GET 한 번)"""
+        if not self.redis_client:
+            return sum(len(students) for students in self._local_sessions.values())
+
+        try:
+            value = await self.redis_client.get(ONLINE_COUNT_KEY)
+            return max(int(value or 0), 0)
+        except Exception as e:
+            logger.error(f"❌ Failed to get online count: {e}")
+            return 0
+
+    def invalidate_student_count(self, session_id: str):
+        """세션 학생 수 캐시 무효화 (입장/퇴장 이벤트 시)"""
+        self._student_counts.pop(session_id, None)
+
+    async def rebuild_session_index(self) -> int:
+        """
+        기존 학생 집합 키로 활성 세션 인덱스와 접속자 카운터 재구성
+
+        SCAN으로 조금씩 순회하므로 Redis를 막지 않음 (업그레이드/복구용)
+
+        Returns:
+            int: 인덱스에 등록된 세션 수
+        """
+        if not self.redis_client:
+            return 0
+
+        try:
+            session_ids = []
+            async for key in self.redis_client.scan_iter(
+                match=f"{STUDENTS_KEY_PREFIX}*", count=500
+            ):
+                if isinstance(key, bytes):
+                    key = key.decode()
+                session_ids.append(key[len(STUDENTS_KEY_PREFIX):])
+
+            if not session_ids:
+                return 0
+
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for sid in session_ids:
+                    pipe.scard(self._students_key(sid))
+                counts = await pipe.execute()
+
+            active = [sid for sid, count in zip(session_ids, counts) if count]
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(ACTIVE_SESSIONS_KEY)
+                if active:
+                    pipe.sadd(ACTIVE_SESSIONS_KEY, *active)
+                pipe.set(ONLINE_COUNT_KEY, sum(counts))
+                await pipe.execute()
+
+            logger.info(f"🗂️ Session index rebuilt: {len(active)} active sessions")
+            return len(active)
+
+        except Exception as e:
+            logger.error(f"❌ Failed to rebuild session index: {e}")
+            return 0
+
+    @staticmethod
+    def _students_key(session_id) -> str:
+        if isinstance(session_id, bytes):
+            session_id = session_id.decode()
+        return f"{STUDENTS_KEY_PREFIX}{session_id}"
+
     async def add_student_to_session(self, session_id: str, student_id: str) -> bool:
-        """세션에 학생 추가"""
+        """세션에 학생 추가 (활성 세션 인덱스/접속자 카운터 함께 갱신)"""
         if not self.redis_client:
-            return False
+            if not self.bus:
+                return False
+            self._local_sessions.setdefault(session_id, set()).add(student_id)
+            self.local_students.add(student_id)
+            return True
 
         try:
-            await self.redis_client.sadd(f"airclass:students:{session_id}", student_id)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.sadd(self._students_key(session_id), student_id)
+                pipe.sadd(ACTIVE_SESSIONS_KEY, session_id)
+                added, _ = await pipe.execute()
+
+            # 실제로 새로 추가된 경우에만 카운터 증가 (중복 입장 무시)
+            if added:
+                await self.redis_client.incr(ONLINE_COUNT_KEY)
+
             self.local_students.add(student_id)
+            self.invalidate_student_count(session_id)
             return True
         except Exception as e:
             logger.error(f"❌ Failed to add student: {e}")
             return False
 
     async def remove_student_from_session(self, session_id: str, student_id: str) -> bool:
-        """세션에서 학생 제거"""
+        """세션에서 학생 제거 (빈 세션은 활성 인덱스에서 제외)"""
         if not self.redis_client:
-            return False
+            if not self.bus:
+                return False
+            students = self._local_sessions.get(session_id)
+            if students is not None:
+                students.discard(student_id)
+                if not students:
+                    del self._local_sessions[session_id]
+            self.local_students.discard(student_id)
+            return True
 
         try:
-            await self.redis_client.srem(f"airclass:students:{session_id}", student_id)
+            await self.redis_client.eval(
+                REMOVE_STUDENT_SCRIPT,
+                3,
+                self._students_key(session_id),
+                ACTIVE_SESSIONS_KEY,
+                ONLINE_COUNT_KEY,
+                session_id,
+                student_id,
+            )
+
             self.local_students.discard(student_id)
+            self.invalidate_student_count(session_id)
             return True
         except Exception as e:
             logger.error(f"❌ Failed to remove student: {e}")
@@ -192,7 +415,7 @@ class MessagingSystem:
             event_type: "published", "response", "closed"
             data: 이벤트 데이터
         """
-        if not self.redis_client:
+        if not self.bus:
             return False
 
         try:
@@ -205,13 +428,12 @@ class MessagingSystem:
                 **data,
             }
 
-            await self.redis_client.publish(
-                f"airclass:session:{session_id}:quiz",
-                json.dumps(event)
+            published = await self._publish(
+                f"airclass:session:{session_id}:quiz", event
             )
 
             logger.info(f"📝 Quiz event published: {event_type} ({quiz_id})")
-            return True
+            return published
 
         except Exception as e:
             logger.error(f"❌ Failed to publish quiz event: {e}")
@@ -228,7 +450,7 @@ class MessagingSystem:
             activity_type: "chat", "response", "presence"
             data: 추가 데이터
         """
-        if not self.redis_client:
+        if not self.bus:
             return False
 
         try:
@@ -243,13 +465,17 @@ class MessagingSystem:
             if data:
                 event.update(data)
 
-            await self.redis_client.publish(
-                f"airclass:session:{session_id}:engagement",
-                json.dumps(event)
-            )
+            if self.engagement_stream:
+                # 내구 로그에 기록 (리스너가 재시작 중이어도 유실 없음)
+                await self.engagement_stream.append(event)
+                published = True
+            else:
+                published = await self._publish(
+                    f"airclass:session:{session_id}:engagement", event
+                )
 
             logger.debug(f"📊 Engagement event: {student_id} - {activity_type}")
-            return True
+            return published
 
         except Exception as e:
             logger.error(f"❌ Failed to publish engagement event: {e}")
@@ -270,7 +496,12 @@ class MessagingSystem:
         logger.info(f"✅ Callback registered: {event_type}")
 
     async def close(self):
-        """Redis 연결 종료"""
+        """이벤트 버스 및 Redis 연결 종료 (대기 중인 발행 메시지 먼저 전송)"""
+        if self.bus:
+            await self.bus.close()
+            self.bus = None
+        self.publisher = None
+
         if self.redis_client:
             await self.redis_client.close()
             logger.info("✅ Redis connection closed")
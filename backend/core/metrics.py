@@ -89,3 +89,168 @@ errors_total = Counter(
     "Total errors",
     ["type"],  # auth, stream, cluster, websocket
 )
+
+# WebSocket 전송 바이트 카운터
+websocket_frame_bytes_total = Counter(
+    "airclass_websocket_frame_bytes_total",
+    "Total bytes of encoded WebSocket frames",
+    ["protocol", "message_type"],  # json, airclass.msgpack.v1
+)
+
+# WebSocket 접속 대기열 게이지
+websocket_admission_queue_depth = Gauge(
+    "airclass_websocket_admission_queue_depth",
+    "Number of WebSocket handshakes waiting for admission",
+)
+
+# WebSocket 접속 대기 시간 히스토그램
+websocket_admission_wait_seconds = Histogram(
+    "airclass_websocket_admission_wait_seconds",
+    "Time WebSocket handshakes spent waiting for admission",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0),
+)
+
+# WebSocket 접속 거절 카운터
+websocket_admission_rejected_total = Counter(
+    "airclass_websocket_admission_rejected_total",
+    "Total WebSocket handshakes rejected by admission control",
+    ["reason"],  # queue_full, timeout
+)
+
+# Redis 발행 대기열 깊이
+redis_publish_queue_depth = Gauge(
+    "airclass_redis_publish_queue_depth",
+    "Number of Redis pub/sub messages waiting to be flushed",
+)
+
+# Redis 파이프라인 한 번에 발행한 메시지 수
+redis_publish_batch_size = Histogram(
+    "airclass_redis_publish_batch_size",
+    "Number of messages flushed per Redis pipeline",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+
+# Redis 발행 드롭/실패 카운터
+redis_publish_dropped_total = Counter(
+    "airclass_redis_publish_dropped_total",
+    "Total Redis pub/sub messages dropped before reaching Redis",
+    ["reason"],  # queue_full, flush_error, subscriber_full (메모리 버스)
+)
+
+# 이벤트 버스: JSON이 아니거나 객체가 아니라서 버린 구독 메시지
+event_bus_decode_errors_total = Counter(
+    "airclass_event_bus_decode_errors_total",
+    "Subscribed pub/sub messages dropped because they were not JSON objects",
+)
+
+# 참여도 리스너 워커별 대기열 깊이
+engagement_worker_queue_depth = Gauge(
+    "airclass_engagement_worker_queue_depth",
+    "Number of engagement events waiting per listener worker",
+    ["worker"],
+)
+
+# 참여도 이벤트 처리 시간 (대기열 진입부터 처리 완료까지)
+engagement_event_processing_seconds = Histogram(
+    "airclass_engagement_event_processing_seconds",
+    "Time from dispatch to completion for engagement events",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+# 참여도 스트림: 재시도 한도를 넘었거나 처리할 수 없어 dead-letter 스트림으로 보낸 항목
+engagement_stream_dead_letters_total = Counter(
+    "airclass_engagement_stream_dead_letters_total",
+    "Engagement stream entries moved to the dead-letter stream",
+    ["reason"],  # invalid, max_deliveries
+)
+
+# 참여도 write-behind: 가장 오래된 미반영 변경이 기다린 시간
+engagement_write_flush_lag_seconds = Gauge(
+    "airclass_engagement_write_flush_lag_seconds",
+    "Age of the oldest engagement change not yet written to MongoDB",
+)
+
+# 참여도 write-behind: bulk_write 한 번에 반영한 학생 수
+engagement_write_batch_size = Histogram(
+    "airclass_engagement_write_batch_size",
+    "Number of student engagement updates per MongoDB bulk_write",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+# 세션 수명 관리: 컴포넌트별 인메모리 세션 상태 크기 (추정치)
+session_state_bytes = Gauge(
+    "airclass_session_state_bytes",
+    "Approximate bytes held by in-process session-scoped caches",
+    ["component"],  # engagement, nlp, vision, feedback, recording, cluster
+)
+
+# 세션 수명 관리: 전체 메모리 예산 (0이면 제한 없음)
+session_state_budget_bytes = Gauge(
+    "airclass_session_state_budget_bytes",
+    "Byte budget for in-process session-scoped caches (0 = unlimited)",
+)
+
+# 세션 수명 관리: 활동 중으로 추적하는 세션 수
+session_lifecycle_sessions = Gauge(
+    "airclass_session_lifecycle_sessions",
+    "Number of sessions with in-process state tracked by the lifecycle manager",
+)
+
+# 세션 수명 관리: 세션 상태 정리 횟수
+session_evictions_total = Counter(
+    "airclass_session_evictions_total",
+    "Total session state evictions",
+    ["reason"],  # ended, idle, budget
+)
+
+# 세션 수명 관리: 정리하면서 MongoDB에 보관한 문서 수
+session_spilled_documents_total = Counter(
+    "airclass_session_spilled_documents_total",
+    "Total documents spilled to MongoDB when evicting session state",
+    ["component"],
+)
+
+# 대시보드 스냅샷: 세션 스냅샷 재계산 횟수 (구독자 수와 무관하게 변경당 1회)
+dashboard_snapshot_recomputes_total = Counter(
+    "airclass_dashboard_snapshot_recomputes_total",
+    "Total dashboard snapshot recomputations",
+)
+
+# 대시보드 스냅샷: 구독 중인 대시보드 WebSocket 수
+dashboard_subscribers = Gauge(
+    "airclass_dashboard_subscribers",
+    "Number of dashboard WebSockets subscribed to session snapshots",
+)
+
+# 퀴즈 응답 수집: bulk_write 한 번에 저장한 응답 수
+quiz_ingest_batch_size = Histogram(
+    "airclass_quiz_ingest_batch_size",
+    "Number of quiz responses per MongoDB bulk_write",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+# 퀴즈 응답 수집 결과
+quiz_responses_ingested_total = Counter(
+    "airclass_quiz_responses_ingested_total",
+    "Total quiz responses processed by the ingestion pipeline",
+    ["result"],  # accepted, duplicate, failed
+)
+
+# 발행된 퀴즈 정의 캐시 조회
+quiz_definition_cache_total = Counter(
+    "airclass_quiz_definition_cache_total",
+    "Quiz definition cache lookups",
+    ["result"],  # hit, miss
+)
+
+# 실시간 퀴즈 통계: 구독 중인 교사/모니터 소켓 수
+quiz_stats_subscribers = Gauge(
+    "airclass_quiz_stats_subscribers",
+    "Number of quiz statistics WebSockets subscribed to live stats",
+)
+
+# 실시간 퀴즈 통계: 소켓으로 보낸 통계 수 (변경이 합쳐진 뒤 기준)
+quiz_stats_pushes_total = Counter(
+    "airclass_quiz_stats_pushes_total",
+    "Total live quiz statistics updates pushed to subscribers",
+)
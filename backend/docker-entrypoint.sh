@@ -54,4 +54,5 @@ print('✅ LiveKit config saved to /app/configs/livekit.yaml')
 
 # FastAPI 시작 (포그라운드로 실행) - LiveKit 서버는 livekit_manager.py에서 시작
 echo "🐍 Starting FastAPI in foreground..."
-exec uvicorn main:app --host 0.0.0.0 --port 8000
+exec uvicorn main:app --host 0.0.0.0 --port 8000 \
+    --ws-ping-interval "${WS_PING_INTERVAL:-20}" --ws-ping-timeout "${WS_PING_TIMEOUT:-20}"
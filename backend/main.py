@@ -90,12 +90,96 @@ async def lifespan(app: FastAPI):
 
     try:
         from core.database import init_database_manager
+        from config import MODE
 
-        await init_database_manager()
+        db_manager = await init_database_manager()
         logger.info("✅ DatabaseManager initialized")
+        if db_manager and MODE != "sub":
+            # 이전 버전에서 저장된 문서는 요청을 받기 전에 한 번 백필
+            # 카운터 형식이 이전 버전인 퀴즈는 응답 문서로 재구성
+            backfilled = await db_manager.rebuild_quiz_stats(stale_only=True)
+            if backfilled:
+                logger.info(f"✅ Quiz stats counters backfilled: {backfilled} quizzes")
+            # 정렬 키(overall_score) 없이 저장된 참여도 문서 채우기
+            await db_manager.refresh_engagement_scores()
     except Exception as e:
         logger.warning(f"⚠️ DatabaseManager initialization failed: {e}")
 
+    try:
+        from core.messaging import init_messaging_system
+
+        messaging = await init_messaging_system()
+        if messaging:
+            logger.info(f"✅ MessagingSystem initialized ({messaging.bus.name} bus)")
+    except Exception as e:
+        logger.warning(f"⚠️ MessagingSystem initialization failed: {e}")
+
+    try:
+        from core.database import get_database_manager
+        from core.messaging import get_messaging_system
+        from services.quiz_ingestion import init_quiz_ingestor
+        from services.quiz_stats_stream import init_quiz_stats_hub
+
+        db_manager = get_database_manager()
+        messaging = get_messaging_system()
+        ingestor = await init_quiz_ingestor(db_manager, messaging)
+        await init_quiz_stats_hub(db_manager, messaging, ingestor)
+    except Exception as e:
+        logger.warning(f"⚠️ Quiz ingestion initialization failed: {e}")
+
+    try:
+        from config import (
+            MODE,
+            NODE_NAME,
+            REDIS_URL,
+            ENGAGEMENT_EVENT_TRANSPORT,
+            ENGAGEMENT_LISTENER_WORKERS,
+            ENGAGEMENT_LISTENER_QUEUE_SIZE,
+            ENGAGEMENT_STREAM_WORKERS,
+            ENGAGEMENT_STREAM_CLAIM_IDLE_MS,
+            ENGAGEMENT_STREAM_MAX_DELIVERIES,
+        )
+        from core.database import get_database_manager
+        from core.messaging import get_messaging_system
+        from services.engagement_service import init_engagement_tracker
+        from services.engagement_listener import init_engagement_listener
+
+        from services.dashboard_snapshots import init_dashboard_snapshots
+
+        db_manager = get_database_manager()
+        tracker = await init_engagement_tracker(db_manager)
+        init_dashboard_snapshots(tracker)
+
+        # 트래커 하나가 세션 전체를 집계하므로 소비는 Main에서만 실행
+        # (Sub 노드가 함께 소비하면 같은 학생의 이벤트가 여러 트래커로 나뉨)
+        if MODE == "sub":
+            logger.info("ℹ️ Engagement events are consumed on the main node")
+        elif ENGAGEMENT_EVENT_TRANSPORT == "streams":
+            listener = await init_engagement_listener(REDIS_URL, tracker, db_manager)
+            if listener:
+                await listener.start_stream_workers(
+                    workers=ENGAGEMENT_STREAM_WORKERS,
+                    consumer=NODE_NAME,
+                    claim_idle_ms=ENGAGEMENT_STREAM_CLAIM_IDLE_MS,
+                    max_deliveries=ENGAGEMENT_STREAM_MAX_DELIVERIES,
+                    queue_size=ENGAGEMENT_LISTENER_QUEUE_SIZE,
+                )
+                logger.info("✅ Engagement stream workers started")
+        else:
+            # 메시징 시스템의 이벤트 버스를 공유 (Redis 또는 메모리)
+            messaging = get_messaging_system()
+            listener = await init_engagement_listener(
+                REDIS_URL, tracker, db_manager, bus=messaging.bus if messaging else None
+            )
+            if listener:
+                await listener.start_all(
+                    workers=ENGAGEMENT_LISTENER_WORKERS,
+                    queue_size=ENGAGEMENT_LISTENER_QUEUE_SIZE,
+                )
+                logger.info("✅ Engagement listener workers started")
+    except Exception as e:
+        logger.warning(f"⚠️ Engagement listener failed to start: {e}")
+
     try:
         from services.recording_service import init_recording_manager
 
@@ -136,6 +220,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ FeedbackGenerator initialization failed: {e}")
 
+    try:
+        from core.database import get_database_manager
+        from services.session_lifecycle import init_session_lifecycle
+
+        await init_session_lifecycle(get_database_manager())
+        logger.info("✅ SessionLifecycleManager initialized")
+    except Exception as e:
+        logger.warning(f"⚠️ SessionLifecycleManager initialization failed: {e}")
+
+    try:
+        from utils.heartbeat import init_heartbeat_monitor
+
+        await init_heartbeat_monitor()
+        logger.info("✅ WebSocket HeartbeatMonitor initialized")
+    except Exception as e:
+        logger.warning(f"⚠️ WebSocket HeartbeatMonitor initialization failed: {e}")
+
     # Print QR code for Android app connection
     local_ip = get_local_ip()
     print_qr_code(local_ip)
@@ -154,7 +255,62 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ LiveKit server shutdown failed: {e}")
 
-    # 2. 클러스터 종료
+    # 2. 참여도 리스너 워커 종료
+    try:
+        from services.engagement_listener import get_engagement_listener
+
+        listener = get_engagement_listener()
+        if listener:
+            await listener.close()
+    except Exception as e:
+        logger.error(f"❌ Engagement listener shutdown failed: {e}")
+
+    # 3. 세션 수명 관리 루프 / 대시보드 스냅샷 종료
+    try:
+        from services.session_lifecycle import shutdown_session_lifecycle
+        from services.dashboard_snapshots import shutdown_dashboard_snapshots
+
+        await shutdown_session_lifecycle()
+        shutdown_dashboard_snapshots()
+    except Exception as e:
+        logger.error(f"❌ SessionLifecycleManager shutdown failed: {e}")
+
+    # 4. 퀴즈 응답 수집 / 참여도 write-behind 종료 (대기 중인 응답·변경을 DB에 반영)
+    try:
+        from services.quiz_ingestion import shutdown_quiz_ingestor
+        from services.quiz_stats_stream import shutdown_quiz_stats_hub
+
+        await shutdown_quiz_stats_hub()
+        await shutdown_quiz_ingestor()
+    except Exception as e:
+        logger.error(f"❌ QuizResponseIngestor shutdown failed: {e}")
+
+    try:
+        from services.engagement_service import shutdown_engagement_tracker
+
+        await shutdown_engagement_tracker()
+    except Exception as e:
+        logger.error(f"❌ EngagementTracker shutdown failed: {e}")
+
+    # 5. 메시징 시스템 종료 (대기 중인 이벤트 발행)
+    try:
+        from core.messaging import get_messaging_system
+
+        messaging = get_messaging_system()
+        if messaging:
+            await messaging.close()
+    except Exception as e:
+        logger.error(f"❌ MessagingSystem shutdown failed: {e}")
+
+    # 6. WebSocket 연결 정리 작업 종료
+    try:
+        from utils.heartbeat import shutdown_heartbeat_monitor
+
+        await shutdown_heartbeat_monitor()
+    except Exception as e:
+        logger.error(f"❌ WebSocket HeartbeatMonitor shutdown failed: {e}")
+
+    # 7. 클러스터 종료
     await shutdown_cluster()
 
 
@@ -325,10 +481,14 @@ if __name__ == "__main__":
     print("📺 Monitor: http://localhost:5173/#/monitor")
     print("=" * 60)
 
+    from config import WS_PING_INTERVAL, WS_PING_TIMEOUT
+
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         reload=False,
         log_level="info",
+        ws_ping_interval=WS_PING_INTERVAL,
+        ws_ping_timeout=WS_PING_TIMEOUT,
     )
@@ -16,6 +16,8 @@ from services.ai.nlp import get_nlp_analyzer
 from services.ai.feedback import get_feedback_generator
 from core.cache import get_cache
 from core.database import get_database_manager
+from utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from utils.streaming import STREAM_FORMAT_PATTERN, stream_documents
 from services.ai.gemini import GeminiService
 from core.ai_keys import (
     delete_teacher_gemini_key,
@@ -68,6 +70,14 @@ def get_db():
     return dbm.db
 
 
+def get_db_manager():
+    """DatabaseManager 의존성 (스트리밍 조회용)"""
+    dbm = get_database_manager()
+    if not dbm or not dbm.db:
+        raise HTTPException(status_code=503, detail="Database not initialized")
+    return dbm
+
+
 # ============================================
 # Vision Analysis Endpoints
 # ============================================
@@ -182,6 +192,26 @@ async def list_vision_analyses(session_id: str, vision=Depends(get_vision)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/vision/session/{session_id}/export")
+async def export_vision_analyses(
+    session_id: str,
+    format: str = Query("ndjson", pattern=STREAM_FORMAT_PATTERN),
+    dbm=Depends(get_db_manager),
+):
+    """세션의 저장된 스크린샷 분석 전체 내보내기 (시간순, 커서 스트리밍)"""
+    try:
+        return await stream_documents(
+            dbm.iter_session_screenshots(session_id),
+            format,
+            envelope={"session_id": session_id},
+            items_key="screenshots",
+            count_key="count",
+        )
+    except Exception as e:
+        logger.error(f"❌ Failed to export screenshot analyses: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ============================================
 # NLP Analysis Endpoints
 # ============================================
@@ -310,6 +340,59 @@ async def list_session_messages(session_id: str, nlp=Depends(get_nlp)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/nlp/session/{session_id}/export")
+async def export_session_messages(
+    session_id: str,
+    format: str = Query("ndjson", pattern=STREAM_FORMAT_PATTERN),
+    limit: Optional[int] = Query(None, ge=1),
+    dbm=Depends(get_db_manager),
+):
+    """세션의 저장된 채팅 메시지 전체 내보내기 (최신순, 커서 스트리밍)"""
+    try:
+        return await stream_documents(
+            dbm.iter_chat_messages(session_id, limit=limit),
+            format,
+            envelope={"session_id": session_id},
+            items_key="messages",
+            count_key="count",
+        )
+    except Exception as e:
+        logger.error(f"❌ Failed to export messages: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/nlp/session/{session_id}/history")
+async def get_session_message_history(
+    session_id: str,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    dbm=Depends(get_db_manager),
+):
+    """
+    세션의 저장된 채팅 메시지 페이지 조회 (최신순, keyset)
+
+    next_cursor를 다음 요청의 cursor로 넘기면 이어서 조회 (마지막 페이지면 null)
+    """
+    try:
+        after = decode_cursor(cursor, ("message_time", "_id"))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        messages, next_key = await dbm.get_chat_messages_page(
+            session_id, limit=limit, after=after
+        )
+        return {
+            "session_id": session_id,
+            "count": len(messages),
+            "messages": messages,
+            "next_cursor": encode_cursor(next_key),
+        }
+    except Exception as e:
+        logger.error(f"❌ Failed to get message history: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/nlp/summarize-conversation")
 async def summarize_conversation(session_id: str, nlp=Depends(get_nlp)):
     """대화 요약"""
@@ -5,15 +5,30 @@ AIRClass Teacher Dashboard API
 
 import logging
 import asyncio
-from fastapi import APIRouter, HTTPException, Depends, WebSocket, Query
+from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect, Query
 from fastapi.responses import JSONResponse
 from typing import Optional, List, Dict
 from datetime import datetime, UTC
 
 from schemas import ActivityType
 from services.engagement_service import get_engagement_tracker, EngagementCalculator
+from services.dashboard_snapshots import get_dashboard_hub
+from services.engagement_pipelines import (
+    CONFUSION_ALERT_CONFIDENCE,
+    LOW_ACCURACY_THRESHOLD,
+    alerts_pipeline,
+    student_detail_pipeline,
+    students_pipeline,
+)
 from core.database import get_database_manager
 from core.messaging import get_messaging_system
+from utils.ws_protocol import (
+    get_message_encoder,
+    negotiate_subprotocol,
+    protocol_of,
+    receive_message,
+    send_frame,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -94,19 +109,17 @@ async def get_session_overview(
         if not stats:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        # 상세 분석
-        engagements = await db.get_session_engagement(session_id)
+        # 상세 분석 (트래커 캐시에서 조회)
+        engagements = await tracker.get_session_engagements(session_id)
         calculator = EngagementCalculator()
 
-        # 혼동 학생 감지
+        # 혼동 학생 감지 (세션 전체를 한 번에 계산)
+        scores = calculator.score_engagements(engagements, session_duration_minutes)
         confused_students = []
-        for eng in engagements:
-            is_confused, confidence = calculator.detect_confusion(
-                quiz_accuracy=eng.metrics.quiz_accuracy,
-                chat_activity_high=eng.metrics.chat_message_count > 5,
-                confusion_indicators=[],
-            )
-            if is_confused and confidence > 0.6:
+        for eng, is_confused, confidence in zip(
+            engagements, scores["is_confused"], scores["confidence"]
+        ):
+            if is_confused and confidence > CONFUSION_ALERT_CONFIDENCE:
                 confused_students.append(
                     {
                         "student_id": eng.student_id,
@@ -145,6 +158,7 @@ async def get_students_dashboard(
         "engagement", description="정렬 기준: engagement, name, accuracy"
     ),
     session_duration_minutes: float = Query(50.0, description="세션 진행 시간 (분)"),
+    limit: Optional[int] = Query(None, ge=1, description="상위 N명만 조회"),
     db=Depends(get_db),
 ):
     """
@@ -154,70 +168,50 @@ async def get_students_dashboard(
         session_id: 세션 ID
         sort_by: 정렬 기준 (engagement, name, accuracy)
         session_duration_minutes: 세션 진행 시간
+        limit: 정렬 후 상위 N명만 (없으면 전체)
 
     Returns:
         List[Dict]: 학생별 상세 정보 (참여도, 정답률, 반응 시간 등)
     """
     try:
-        engagements = await db.get_session_engagement(session_id)
+        # 점수/레벨/혼동 감지/정렬은 집계 파이프라인에서 (필요한 필드만 반환)
+        docs = await db.aggregate_student_engagement(
+            students_pipeline(session_id, session_duration_minutes, sort_by, limit)
+        )
         calculator = EngagementCalculator()
+        interpretations = {
+            level: calculator.interpret_engagement_level(min_score)
+            for level, min_score in calculator.LEVEL_MIN_SCORES.items()
+        }
 
         student_data = []
 
-        for eng in engagements:
-            # 참여도 점수 계산
-            participation_score = calculator.calculate_participation_score(
-                chat_message_count=eng.metrics.chat_message_count,
-                quiz_response_count=eng.metrics.participation_count,
-                session_duration_minutes=session_duration_minutes,
-            )
-
-            overall_score = calculator.calculate_overall_engagement_score(
-                attention_score=eng.metrics.attention_score,
-                participation_score=participation_score,
-                quiz_accuracy=eng.metrics.quiz_accuracy,
-            )
-
-            interpretation = calculator.interpret_engagement_level(overall_score)
-
-            # 혼동 감지
-            is_confused, confusion_confidence = calculator.detect_confusion(
-                quiz_accuracy=eng.metrics.quiz_accuracy,
-                chat_activity_high=eng.metrics.chat_message_count > 5,
-                confusion_indicators=[],
-            )
+        for doc in docs:
+            interpretation = interpretations[doc["level"]]
 
             student_data.append(
                 {
-                    "student_id": eng.student_id,
-                    "student_name": eng.student_name,
-                    "node_name": eng.node_name,
-                    "overall_score": round(overall_score, 2),
+                    "student_id": doc["student_id"],
+                    "student_name": doc["student_name"],
+                    "node_name": doc["node_name"],
+                    "overall_score": round(doc["overall_score"], 2),
                     "level": interpretation["level"],
                     "color": interpretation["color"],
                     "metrics": {
-                        "quiz_accuracy": round(eng.metrics.quiz_accuracy * 100, 1),
-                        "participation_count": eng.metrics.participation_count,
-                        "chat_message_count": eng.metrics.chat_message_count,
-                        "avg_response_latency_ms": eng.metrics.response_latency_ms,
+                        "quiz_accuracy": round(doc["quiz_accuracy"] * 100, 1),
+                        "participation_count": doc["participation_count"],
+                        "chat_message_count": doc["chat_message_count"],
+                        "avg_response_latency_ms": doc["response_latency_ms"],
                     },
                     "confusion": {
-                        "is_confused": is_confused,
-                        "confidence": round(confusion_confidence, 2),
+                        "is_confused": doc["is_confused"],
+                        "confidence": round(doc["confusion_confidence"], 2),
                     },
                     "recommendations": interpretation["recommendations"],
-                    "updated_at": eng.updated_at.isoformat(),
+                    "updated_at": doc["updated_at"].isoformat(),
                 }
             )
 
-        # 정렬
-        if sort_by == "engagement":
-            student_data.sort(key=lambda x: x["overall_score"], reverse=True)
-        elif sort_by == "name":
-            student_data.sort(key=lambda x: x["student_name"])
-        elif sort_by == "accuracy":
-            student_data.sort(key=lambda x: x["metrics"]["quiz_accuracy"], reverse=True)
-
         return {
             "success": True,
             "session_id": session_id,
@@ -239,6 +233,7 @@ async def get_student_details(
     session_id: str,
     student_id: str,
     session_duration_minutes: float = Query(50.0, description="세션 진행 시간 (분)"),
+    window_minutes: float = Query(10.0, gt=0, description="추세 분석 윈도우 (분)"),
     db=Depends(get_db),
 ):
     """
@@ -248,80 +243,62 @@ async def get_student_details(
         session_id: 세션 ID
         student_id: 학생 ID
         session_duration_minutes: 세션 진행 시간
+        window_minutes: 추세 분석 윈도우 (트래커가 기록한 점수 시계열)
 
     Returns:
         Dict: 학생 상세 정보 (모든 지표, 권장사항 등)
     """
     try:
-        engagements = await db.get_session_engagement(session_id)
-        engagement = None
-
-        for eng in engagements:
-            if eng.student_id == student_id:
-                engagement = eng
-                break
-
-        if not engagement:
+        # (session_id, student_id) 유니크 인덱스 단건 + 점수 계산
+        docs = await db.aggregate_student_engagement(
+            student_detail_pipeline(session_id, student_id, session_duration_minutes)
+        )
+        if not docs:
             raise HTTPException(status_code=404, detail="Student not found in session")
+        doc = docs[0]
 
         calculator = EngagementCalculator()
-
-        # 종합 점수 계산
-        participation_score = calculator.calculate_participation_score(
-            chat_message_count=engagement.metrics.chat_message_count,
-            quiz_response_count=engagement.metrics.participation_count,
-            session_duration_minutes=session_duration_minutes,
-        )
-
-        overall_score = calculator.calculate_overall_engagement_score(
-            attention_score=engagement.metrics.attention_score,
-            participation_score=participation_score,
-            quiz_accuracy=engagement.metrics.quiz_accuracy,
-        )
-
+        overall_score = doc["overall_score"]
         interpretation = calculator.interpret_engagement_level(overall_score)
 
-        # 혼동 감지
-        is_confused, confusion_confidence = calculator.detect_confusion(
-            quiz_accuracy=engagement.metrics.quiz_accuracy,
-            chat_activity_high=engagement.metrics.chat_message_count > 5,
-            confusion_indicators=[],
-        )
-
-        # 추세 분석 (현재는 단일 점수이므로 기본값)
-        trend = calculator.analyze_trend([overall_score])
+        # 추세: 트래커의 학생별 점수 기록 (/api/engagement/trend와 같은 계산)
+        tracker = get_engagement_tracker()
+        if tracker:
+            trend = tracker.get_student_trend(session_id, student_id, window_minutes)
+        else:
+            trend = calculator.analyze_series([], [], window_minutes)
+        last_activity = doc.get("last_activity_time")
 
         return {
             "success": True,
             "session_id": session_id,
             "student": {
-                "student_id": engagement.student_id,
-                "student_name": engagement.student_name,
-                "node_name": engagement.node_name,
+                "student_id": doc["student_id"],
+                "student_name": doc["student_name"],
+                "node_name": doc["node_name"],
             },
             "scores": {
                 "overall": round(overall_score, 2),
-                "attention": round(engagement.metrics.attention_score * 100, 1),
-                "participation": participation_score,
-                "quiz_accuracy": round(engagement.metrics.quiz_accuracy * 100, 1),
+                "attention": round(doc["attention_score"] * 100, 1),
+                "participation": doc["participation_score"],
+                "quiz_accuracy": round(doc["quiz_accuracy"] * 100, 1),
                 "level": interpretation["level"],
                 "color": interpretation["color"],
             },
             "metrics": {
-                "participation_count": engagement.metrics.participation_count,
-                "quiz_accuracy": round(engagement.metrics.quiz_accuracy * 100, 1),
-                "response_latency_ms": engagement.metrics.response_latency_ms,
-                "chat_message_count": engagement.metrics.chat_message_count,
-                "last_activity": engagement.metrics.last_activity_time.isoformat()
-                if engagement.metrics.last_activity_time
-                else None,
+                "participation_count": doc["participation_count"],
+                "quiz_accuracy": round(doc["quiz_accuracy"] * 100, 1),
+                "response_latency_ms": doc["response_latency_ms"],
+                "chat_message_count": doc["chat_message_count"],
+                "last_activity": last_activity.isoformat() if last_activity else None,
             },
             "confusion": {
-                "is_confused": is_confused,
-                "confidence": round(confusion_confidence, 2),
+                "is_confused": doc["is_confused"],
+                "confidence": round(doc["confusion_confidence"], 2),
                 "details": {
-                    "low_accuracy": engagement.metrics.quiz_accuracy < 0.5,
-                    "high_chat_activity": engagement.metrics.chat_message_count > 5,
+                    "low_accuracy": doc["quiz_accuracy"] < 0.5,
+                    "high_chat_activity": doc["chat_message_count"]
+                    > calculator.HIGH_CHAT_THRESHOLD,
                 },
             },
             "trend": trend,
@@ -358,62 +335,59 @@ async def get_alerts(
         List[Dict]: 알림 목록
     """
     try:
-        engagements = await db.get_session_engagement(session_id)
-        calculator = EngagementCalculator()
+        # 알림 대상 학생만 서버에서 걸러서 조회
+        pipeline = alerts_pipeline(session_id, alert_type)
+        docs = await db.aggregate_student_engagement(pipeline) if pipeline else []
 
         alerts = []
+        timestamp = datetime.now(UTC).isoformat()
 
-        for eng in engagements:
-            # 혼동도 감지
-            is_confused, confidence = calculator.detect_confusion(
-                quiz_accuracy=eng.metrics.quiz_accuracy,
-                chat_activity_high=eng.metrics.chat_message_count > 5,
-                confusion_indicators=[],
-            )
+        for doc in docs:
+            student_id = doc["student_id"]
+            student_name = doc["student_name"]
+            confidence = doc["confusion_confidence"]
+            accuracy = doc["quiz_accuracy"]
 
-            if is_confused and confidence > 0.6:
+            if doc["is_confused"] and confidence > CONFUSION_ALERT_CONFIDENCE:
                 if alert_type is None or alert_type == "confusion":
                     alerts.append(
                         {
                             "type": "confusion",
                             "severity": "high" if confidence > 0.8 else "medium",
-                            "student_id": eng.student_id,
-                            "student_name": eng.student_name,
-                            "message": f"{eng.student_name}이(가) 혼동 상태로 보입니다 (확신도: {confidence:.1%})",
+                            "student_id": student_id,
+                            "student_name": student_name,
+                            "message": f"{student_name}이(가) 혼동 상태로 보입니다 (확신도: {confidence:.1%})",
                             "confidence": confidence,
-                            "timestamp": datetime.now(UTC).isoformat(),
+                            "timestamp": timestamp,
                         }
                     )
 
             # 낮은 참여도
-            if eng.metrics.quiz_accuracy < 0.3:
+            if accuracy < LOW_ACCURACY_THRESHOLD:
                 if alert_type is None or alert_type == "low_engagement":
                     alerts.append(
                         {
                             "type": "low_engagement",
                             "severity": "high",
-                            "student_id": eng.student_id,
-                            "student_name": eng.student_name,
-                            "message": f"{eng.student_name}의 정답률이 매우 낮습니다 ({eng.metrics.quiz_accuracy:.1%})",
-                            "accuracy": eng.metrics.quiz_accuracy,
-                            "timestamp": datetime.now(UTC).isoformat(),
+                            "student_id": student_id,
+                            "student_name": student_name,
+                            "message": f"{student_name}의 정답률이 매우 낮습니다 ({accuracy:.1%})",
+                            "accuracy": accuracy,
+                            "timestamp": timestamp,
                         }
                     )
 
             # 응답 부족
-            if (
-                eng.metrics.participation_count == 0
-                and eng.metrics.chat_message_count == 0
-            ):
+            if doc["participation_count"] == 0 and doc["chat_message_count"] == 0:
                 if alert_type is None or alert_type == "no_response":
                     alerts.append(
                         {
                             "type": "no_response",
                             "severity": "medium",
-                            "student_id": eng.student_id,
-                            "student_name": eng.student_name,
-                            "message": f"{eng.student_name}이(가) 아직 응답하지 않았습니다",
-                            "timestamp": datetime.now(UTC).isoformat(),
+                            "student_id": student_id,
+                            "student_name": student_name,
+                            "message": f"{student_name}이(가) 아직 응답하지 않았습니다",
+                            "timestamp": timestamp,
                         }
                     )
 
@@ -447,123 +421,96 @@ async def websocket_session_dashboard(
     session_duration_minutes: float = 50.0,
 ):
     """
-    실시간 세션 대시보드 스트림 (WebSocket)
+    실시간 세션 대시보드 스트림 (WebSocket, push)
+
+    같은 세션을 보는 대시보드는 스냅샷 하나를 공유한다. 참여도가 바뀌면
+    서버가 한 번 재계산해서 모든 구독자에게 보낸다.
+
+    서버 → 클라이언트:
+    - 연결 직후 {"type": "snapshot", "version", "overview", "students", "alerts"}
+    - 이후 변경 시 {"type": "diff", "base_version", "version", ...바뀐 부분만}
+      (overview: 바뀐 키, students/alerts: {"upsert": [...], "removed": [student_id]})
+      base_version이 가진 version과 다르면 전체 snapshot이 대신 전송됨
 
     클라이언트로부터:
-    - "get_overview" → 세션 개요 전송
-    - "get_students" → 학생 목록 전송
-    - "get_alerts" → 현재 알림 전송
+    - "get_overview" / "get_students" / "get_alerts" → 현재 스냅샷에서 해당 부분 전송
     - "ping" → pong 응답
 
+    `airclass.msgpack.v1` 서브프로토콜을 협상하면 응답은 MessagePack 바이너리로 전송
+
     Args:
         session_id: 세션 ID
         session_duration_minutes: 세션 진행 시간
     """
-    db = get_database_manager()
-    messaging = get_messaging_system()
-    tracker = get_engagement_tracker()
+    hub = get_dashboard_hub()
 
-    if not all([db, messaging, tracker]):
+    if hub is None:
         await websocket.close(code=4503, reason="Services not available")
         return
 
-    await websocket.accept()
+    subprotocol = negotiate_subprotocol(websocket)
+    await websocket.accept(subprotocol=subprotocol)
+    protocol = protocol_of(subprotocol)
+    encoder = get_message_encoder()
+
+    async def send(message: dict):
+        await send_frame(websocket, encoder.encode(message, protocol))
 
+    subscriber = None
+    pusher = None
     try:
         logger.info(f"🎧 WebSocket connected: {session_id}")
+        subscriber = await hub.subscribe(session_id, session_duration_minutes)
+        producer = subscriber.producer
 
-        while True:
-            # 클라이언트로부터 메시지 수신
+        async def push_updates():
             try:
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=30)
-            except asyncio.TimeoutError:
-                # 타임아웃: 자동 갱신
-                data = "auto_update"
+                while True:
+                    await send(await subscriber.next_message())
+            except Exception as e:
+                # 소켓이 닫힌 경우: 수신 루프가 정리함
+                logger.debug(f"Dashboard push stopped: {e}")
+
+        pusher = asyncio.create_task(push_updates())
+
+        while True:
+            data = await receive_message(websocket, raw_text=True)
+            snapshot = producer.full_message()
 
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                await send({"type": "pong"})
 
             elif data == "get_overview":
-                stats = await tracker.calculate_session_engagement(
-                    session_id=session_id,
-                    session_duration_minutes=session_duration_minutes,
-                )
-                await websocket.send_json(
-                    {
-                        "type": "overview",
-                        "data": stats,
-                    }
-                )
+                await send({"type": "overview", "data": snapshot["overview"]})
 
             elif data == "get_students":
-                engagements = await db.get_session_engagement(session_id)
-                calculator = EngagementCalculator()
-
-                students = []
-                for eng in engagements:
-                    participation_score = calculator.calculate_participation_score(
-                        chat_message_count=eng.metrics.chat_message_count,
-                        quiz_response_count=eng.metrics.participation_count,
-                        session_duration_minutes=session_duration_minutes,
-                    )
-                    overall_score = calculator.calculate_overall_engagement_score(
-                        attention_score=eng.metrics.attention_score,
-                        participation_score=participation_score,
-                        quiz_accuracy=eng.metrics.quiz_accuracy,
-                    )
-                    interpretation = calculator.interpret_engagement_level(
-                        overall_score
-                    )
-
-                    students.append(
-                        {
-                            "student_id": eng.student_id,
-                            "student_name": eng.student_name,
-                            "overall_score": round(overall_score, 2),
-                            "level": interpretation["level"],
-                        }
-                    )
-
-                await websocket.send_json(
+                await send(
                     {
                         "type": "students",
-                        "count": len(students),
-                        "data": students,
+                        "count": len(snapshot["students"]),
+                        "data": snapshot["students"],
                     }
                 )
 
-            elif data == "get_alerts" or data == "auto_update":
-                engagements = await db.get_session_engagement(session_id)
-                calculator = EngagementCalculator()
-
-                alerts = []
-                for eng in engagements:
-                    is_confused, confidence = calculator.detect_confusion(
-                        quiz_accuracy=eng.metrics.quiz_accuracy,
-                        chat_activity_high=eng.metrics.chat_message_count > 5,
-                        confusion_indicators=[],
-                    )
-                    if is_confused and confidence > 0.6:
-                        alerts.append(
-                            {
-                                "type": "confusion",
-                                "student_id": eng.student_id,
-                                "student_name": eng.student_name,
-                                "confidence": round(confidence, 2),
-                            }
-                        )
-
-                await websocket.send_json(
+            elif data == "get_alerts":
+                await send(
                     {
                         "type": "alerts",
-                        "count": len(alerts),
-                        "data": alerts,
+                        "count": len(snapshot["alerts"]),
+                        "data": snapshot["alerts"],
                     }
                 )
 
+    except WebSocketDisconnect:
+        logger.info(f"🔌 WebSocket disconnected: {session_id}")
     except Exception as e:
         logger.error(f"❌ WebSocket error: {e}")
         await websocket.close(code=4000, reason=str(e))
+    finally:
+        if pusher:
+            pusher.cancel()
+        if subscriber:
+            hub.unsubscribe(subscriber)
 
 
 # ============================================
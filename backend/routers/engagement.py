@@ -11,7 +11,10 @@ from datetime import datetime, UTC
 
 from schemas import ActivityType, StudentEngagement, EngagementMetrics
 from services.engagement_service import get_engagement_tracker, EngagementCalculator
+from services.session_lifecycle import get_session_lifecycle
 from core.database import get_database_manager
+from utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from utils.streaming import STREAM_FORMAT_PATTERN, stream_documents
 
 logger = logging.getLogger(__name__)
 
@@ -200,26 +203,61 @@ async def track_quiz_response(
 @router.get("/students/{session_id}")
 async def get_session_engagement(
     session_id: str,
+    format: str = Query("json", pattern=STREAM_FORMAT_PATTERN),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     db=Depends(get_db),
 ):
     """
-    세션의 모든 학생 참여도 조회
+    세션의 모든 학생 참여도 조회 (커서 스트리밍)
+
+    limit 또는 cursor를 주면 점수순 keyset 페이지 하나만 반환
+    (next_cursor를 다음 요청의 cursor로, 마지막 페이지면 null)
 
     Args:
         session_id: 세션 ID
+        format: json (기존 envelope) 또는 ndjson (한 줄에 학생 하나)
+        limit: 페이지 크기
+        cursor: 직전 페이지의 next_cursor
 
     Returns:
         List[StudentEngagement]: 학생별 참여도 목록
     """
-    try:
-        engagements = await db.get_session_engagement(session_id)
+    if limit is not None or cursor is not None:
+        try:
+            after = decode_cursor(cursor, ("overall_score", "student_id"))
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            docs, next_key = await db.get_session_engagement_page(
+                session_id, limit=limit or 50, after=after
+            )
+        except Exception as e:
+            logger.error(f"❌ Error getting session engagement page: {e}")
+            if _is_service_unavailable(e):
+                raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+            raise HTTPException(status_code=500, detail=str(e))
         return {
             "success": True,
             "session_id": session_id,
-            "total_students": len(engagements),
-            "engagements": [eng.model_dump() for eng in engagements],
+            "count": len(docs),
+            "engagements": [StudentEngagement(**doc).model_dump() for doc in docs],
+            "next_cursor": encode_cursor(next_key),
         }
 
+    async def engagements():
+        async for doc in db.iter_session_engagement(session_id):
+            yield StudentEngagement(**doc).model_dump()
+
+    try:
+        return await stream_documents(
+            engagements(),
+            format,
+            envelope={"success": True, "session_id": session_id},
+            items_key="engagements",
+            count_key="total_students",
+        )
+
     except HTTPException:
         raise
     except Exception as e:
@@ -247,12 +285,7 @@ async def get_student_engagement(
         StudentEngagement: 학생 참여도
     """
     try:
-        engagements = await db.get_session_engagement(session_id)
-        engagement = None
-        for eng in engagements:
-            if eng.student_id == student_id:
-                engagement = eng
-                break
+        engagement = await db.get_student_engagement(session_id, student_id)
 
         if not engagement:
             raise HTTPException(status_code=404, detail="Student engagement not found")
@@ -308,6 +341,62 @@ async def get_session_stats(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/replay/{session_id}")
+async def replay_session_engagement(session_id: str):
+    """
+    이벤트 로그(Redis Streams)로 세션 참여도 재계산
+
+    ENGAGEMENT_EVENT_TRANSPORT=streams 일 때만 사용 가능
+
+    Returns:
+        {success: bool, session_id: str, events_replayed: int}
+    """
+    from services.engagement_listener import get_engagement_listener
+
+    listener = get_engagement_listener()
+    if not listener or not listener.stream:
+        raise HTTPException(
+            status_code=503, detail="Engagement event stream not enabled"
+        )
+
+    try:
+        replayed = await listener.replay_session(session_id)
+        return {
+            "success": True,
+            "session_id": session_id,
+            "events_replayed": replayed,
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Error replaying engagement events: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/session/{session_id}/end")
+async def end_session_engagement(session_id: str, tracker=Depends(get_tracker)):
+    """
+    세션 종료: 아직 DB에 반영되지 않은 참여도 변경을 즉시 저장하고
+    세션 단위 인메모리 상태(참여도, AI 분석 캐시, 종료된 녹화 정보)를 정리
+
+    Returns:
+        {success: bool, session_id: str, flushed: int, evicted: {component: int}}
+    """
+    try:
+        flushed = await tracker.end_session(session_id)
+        lifecycle = get_session_lifecycle()
+        evicted = await lifecycle.end_session(session_id) if lifecycle else {}
+        return {
+            "success": True,
+            "session_id": session_id,
+            "flushed": flushed,
+            "evicted": evicted,
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Error flushing session engagement: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ============================================
 # Engagement Calculation Endpoints
 # ============================================
@@ -569,6 +658,37 @@ async def analyze_trend(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/trend/{session_id}")
+async def get_session_trends(
+    session_id: str,
+    window_minutes: float = Query(10.0, gt=0, description="분석 윈도우 (분)"),
+    tracker=Depends(get_tracker),
+):
+    """
+    세션 학생 전체의 참여도 추세 (트래커가 기록한 점수 시계열 기반)
+
+    Args:
+        session_id: 세션 ID
+        window_minutes: 분석 윈도우
+
+    Returns:
+        Dict: 학생별 trend_direction, slope_per_minute, ewma 등
+    """
+    try:
+        trends = tracker.get_session_trends(session_id, window_minutes)
+        return {
+            "success": True,
+            "session_id": session_id,
+            "window_minutes": window_minutes,
+            "total_students": len(trends),
+            "trends": trends,
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Error getting session trends: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ============================================
 # Health Check
 # ============================================
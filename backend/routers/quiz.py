@@ -3,12 +3,23 @@ AIRClass Quiz API Endpoints
 퀴즈 배포, 응답 수집, 통계
 """
 
-from fastapi import APIRouter, HTTPException, Depends, WebSocket
+from fastapi import APIRouter, HTTPException, Depends, Query, WebSocket, WebSocketDisconnect
 from typing import List, Optional, Dict
+import asyncio
 import logging
 from schemas import *
 from core.database import get_database_manager
 from core.messaging import get_messaging_system
+from services.quiz_ingestion import get_quiz_ingestor
+from services.quiz_stats_stream import get_quiz_stats_hub
+from utils.streaming import STREAM_FORMAT_PATTERN, stream_documents
+from utils.ws_protocol import (
+    get_message_encoder,
+    negotiate_subprotocol,
+    protocol_of,
+    receive_message,
+    send_frame,
+)
 import uuid
 from datetime import datetime
 
@@ -83,6 +94,9 @@ async def delete_quiz(quiz_id: str):
 
     try:
         deleted = await db.delete_quiz(quiz_id)
+        ingestor = get_quiz_ingestor()
+        if ingestor:
+            ingestor.cache.invalidate(quiz_id)
         if not deleted:
             raise HTTPException(status_code=404, detail="Quiz not found")
 
@@ -131,6 +145,9 @@ async def publish_quiz(quiz_id: str):
 
         # 퀴즈 발행 표시
         await db.publish_quiz(quiz_id)
+        ingestor = get_quiz_ingestor()
+        if ingestor:
+            ingestor.cache.invalidate(quiz_id)
 
         # 발행된 퀴즈 반환
         published_quiz = await db.get_quiz(quiz_id)
@@ -192,16 +209,33 @@ async def submit_quiz_response(request: QuizResponseCreate):
         raise HTTPException(status_code=503, detail="Database not available")
 
     try:
-        # 퀴즈가 발행되었는지 확인
-        quiz = await db.get_quiz(request.quiz_id)
+        # 퀴즈가 발행되었는지 확인 (수집기가 있으면 발행된 퀴즈 정의 캐시)
+        ingestor = get_quiz_ingestor()
+        if ingestor:
+            quiz = await ingestor.cache.get(request.quiz_id)
+        else:
+            quiz = await db.get_quiz(request.quiz_id)
         if not quiz:
             raise HTTPException(status_code=404, detail="Quiz not found")
 
         if not quiz.published:
             raise HTTPException(status_code=400, detail="Quiz is not published yet")
 
+        if ingestor:
+            # 다른 응답과 묶어서 저장 (참여도/통계 이벤트는 flush마다 발행)
+            response = await ingestor.submit(quiz, request)
+            if response is None:
+                raise HTTPException(
+                    status_code=409, detail="Student already answered this quiz"
+                )
+            return response
+
         # 응답 저장
         response = await db.create_quiz_response(request)
+        if response is None:
+            raise HTTPException(
+                status_code=409, detail="Student already answered this quiz"
+            )
 
         # 참여도 업데이트 (messaging이 있으면)
         if messaging:
@@ -232,18 +266,27 @@ async def submit_quiz_response(request: QuizResponseCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/responses/{quiz_id}", response_model=List[QuizResponse])
-async def get_quiz_responses(quiz_id: str):
+@router.get(
+    "/responses/{quiz_id}",
+    response_model=List[QuizResponse],
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def get_quiz_responses(
+    quiz_id: str,
+    format: str = Query("json", pattern=STREAM_FORMAT_PATTERN),
+):
     """
     교사: 퀴즈 응답 목록 조회
+
+    커서를 그대로 스트리밍 (응답 수와 무관하게 메모리 일정)
+    format=ndjson이면 한 줄에 응답 하나
     """
     db = get_database_manager()
     if not db:
         raise HTTPException(status_code=503, detail="Database not available")
 
     try:
-        responses = await db.get_quiz_responses(quiz_id)
-        return responses
+        return await stream_documents(db.iter_quiz_responses(quiz_id), format)
     except Exception as e:
         logger.error(f"❌ Failed to get responses: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -272,41 +315,88 @@ async def get_quiz_statistics(quiz_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{quiz_id}/stats/rebuild", response_model=Dict)
+async def rebuild_quiz_statistics(quiz_id: str):
+    """
+    교사/관리자: 응답 문서로 퀴즈 통계 카운터 재구성 (카운터가 어긋났을 때)
+    """
+    db = get_database_manager()
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+
+    try:
+        if not await db.rebuild_quiz_stats(quiz_id):
+            raise HTTPException(status_code=404, detail="Quiz not found")
+
+        stats = await db.get_quiz_stats(quiz_id)
+        hub = get_quiz_stats_hub()
+        if hub and stats:
+            hub.reset(quiz_id, stats)
+        return stats
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Failed to rebuild statistics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # WebSocket: 실시간 퀴즈 통계 스트리밍
 @router.websocket("/ws/statistics/{quiz_id}")
 async def websocket_quiz_statistics(websocket: WebSocket, quiz_id: str):
     """
     교사/모니터: 실시간 퀴즈 통계 스트림
+
+    연결 직후 현재 통계를 보내고, 이후 응답이 들어오면 최대 QUIZ_STATS_MAX_RATE_HZ로
+    최신 통계만 전송 (메모리의 퀴즈별 통계를 모든 구독자가 공유, 요청마다 DB 조회 없음)
+
+    `airclass.msgpack.v1` 서브프로토콜 협상 시 stats_update는 MessagePack으로 전송
     """
-    messaging = get_messaging_system()
-    if not messaging:
+    hub = get_quiz_stats_hub()
+    if not hub:
         await websocket.close(code=4503, reason="Service not available")
         return
 
-    await websocket.accept()
+    subprotocol = negotiate_subprotocol(websocket)
+    await websocket.accept(subprotocol=subprotocol)
+    protocol = protocol_of(subprotocol)
+    encoder = get_message_encoder()
 
+    subscriber = None
+    pusher = None
     try:
-        # 퀴즈 응답 이벤트 콜백
-        async def on_quiz_response(event):
-            if event.get("quiz_id") == quiz_id:
-                # 최신 통계 전송
-                stats = await get_quiz_statistics(quiz_id)
-                await websocket.send_json(
-                    {
-                        "type": "stats_update",
-                        "data": stats,
-                    }
-                )
+        subscriber = await hub.subscribe(quiz_id)
+        if subscriber is None:
+            await websocket.close(code=4404, reason="Quiz not found")
+            return
 
-        # 콜백 등록
-        await messaging.register_callback("quiz_response", on_quiz_response)
+        async def push_updates():
+            try:
+                while True:
+                    stats = await subscriber.next_stats()
+                    await send_frame(
+                        websocket,
+                        encoder.encode({"type": "stats_update", "data": stats}, protocol),
+                    )
+            except Exception as e:
+                # 소켓이 닫힌 경우: 수신 루프가 정리함
+                logger.debug(f"Quiz stats push stopped: {e}")
+
+        pusher = asyncio.create_task(push_updates())
 
         # WebSocket 유지
         while True:
-            data = await websocket.receive_text()
+            data = await receive_message(websocket, raw_text=True)
             if data == "ping":
                 await websocket.send_text("pong")
 
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
         logger.error(f"❌ WebSocket error: {e}")
         await websocket.close(code=4000, reason=str(e))
+    finally:
+        if pusher:
+            pusher.cancel()
+        if subscriber:
+            hub.unsubscribe(subscriber)
@@ -4,16 +4,18 @@ WebSocket Router
 실시간 통신을 위한 WebSocket 엔드포인트
 
 - /ws/teacher: 교사용 WebSocket (채팅, 제어)
-- /ws/student: 학생용 WebSocket (채팅, ping)
+- /ws/student: 학생용 WebSocket (채팅, last_seq 기반 재연결)
 - /ws/monitor: 모니터용 WebSocket (연결 상태 유지)
+  (세 엔드포인트 모두 `airclass.msgpack.v1` 서브프로토콜 협상 지원, 기본은 JSON)
+  (앱 레벨 ping은 ConnectionManager.receive에서 파싱 없이 pong 응답)
 - POST /ws/broadcast/quiz: 퀴즈 발행 알림
 - POST /ws/broadcast/engagement: 참여도 업데이트
 
 Note: 비디오 스트리밍은 MediaMTX WebRTC를 통해 처리됨
 """
 
-import json
 import logging
+import math
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
@@ -62,10 +64,9 @@ async def websocket_teacher(websocket: WebSocket):
 
     try:
         while True:
-            data = await websocket.receive()
+            message = await manager.receive(websocket)
 
-            if "text" in data:
-                message = json.loads(data["text"])
+            if isinstance(message, dict):
                 msg_type = message.get("type")
 
                 if msg_type == "chat":
@@ -97,17 +98,62 @@ async def websocket_teacher(websocket: WebSocket):
         manager.disconnect_teacher()
 
 
+async def _publish_presence(name: str, message: Dict[str, Any]):
+    """학생 presence heartbeat를 참여도 이벤트로 발행"""
+    from core import get_messaging_system
+    from config import NODE_NAME, ENGAGEMENT_PRESENCE_HEARTBEAT_SEC
+
+    messaging = get_messaging_system()
+    if not messaging:
+        return
+
+    # 클라이언트 보고값은 heartbeat 간격을 넘을 수 없음 (숫자가 아니면 기본 간격)
+    try:
+        screen_time = float(message.get("screen_time_seconds"))
+    except (TypeError, ValueError):
+        screen_time = None
+    if screen_time is not None and math.isfinite(screen_time):
+        screen_time = min(max(screen_time, 0.0), ENGAGEMENT_PRESENCE_HEARTBEAT_SEC)
+    else:
+        screen_time = None
+
+    await messaging.publish_engagement_event(
+        message["session_id"],
+        name,
+        "presence",
+        {
+            "student_name": name,
+            "node_name": NODE_NAME,
+            "screen_time_seconds": screen_time,
+        },
+    )
+
+
 @router.websocket("/ws/student")
-async def websocket_student(websocket: WebSocket, name: str):
-    """학생용 WebSocket - 채팅"""
-    await manager.connect_student(websocket, name)
+async def websocket_student(
+    websocket: WebSocket, name: str, last_seq: Optional[int] = None
+):
+    """
+    학생용 WebSocket - 채팅, 시청 heartbeat
+
+    {"type": "presence", "session_id": ..., "screen_time_seconds": N}을
+    주기적으로 보내면 참여도 attention_score의 시청 시간에 반영된다.
+
+    브로드캐스트 메시지에는 seq가 붙는다. 재연결 시 `?last_seq=N`을 주면
+    N 이후 놓친 메시지만 다시 받고, 버퍼 범위를 벗어나면 snapshot을 받는다.
+    재전송이 끝나면 {"type": "sync", "seq": 현재 seq}가 전송된다.
+    접속이 몰려 거절되면 {"type": "retry_after", "retry_after_ms": N} 후
+    1013 코드로 종료되므로 N ms 뒤 재연결한다.
+    """
+    if not await manager.connect_student(websocket, name, last_seq=last_seq):
+        # 접속 폭주로 거절됨 (retry_after 안내 후 이미 종료)
+        return
 
     try:
         # Note: Students now receive video via WebRTC stream from MediaMTX
 
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            message = await manager.receive(websocket)
             msg_type = message.get("type")
 
             if msg_type == "chat":
@@ -116,12 +162,12 @@ async def websocket_student(websocket: WebSocket, name: str):
                     {"type": "chat", "from": name, "message": message.get("message")}
                 )
 
-            elif msg_type == "ping":
-                # 연결 유지를 위한 ping
-                await websocket.send_json({"type": "pong"})
+            elif msg_type == "presence" and message.get("session_id"):
+                # 시청 heartbeat → 참여도 이벤트 (집계·반영은 리스너/트래커에서)
+                await _publish_presence(name, message)
 
     except WebSocketDisconnect:
-        manager.disconnect_student(name)
+        manager.disconnect_student(name, websocket)
         # 교사에게 학생 목록 업데이트 전송
         if manager.teacher:
             await manager.send_to_teacher(
@@ -129,7 +175,7 @@ async def websocket_student(websocket: WebSocket, name: str):
             )
     except Exception as e:
         print(f"Error in student websocket ({name}): {e}")
-        manager.disconnect_student(name)
+        manager.disconnect_student(name, websocket)
 
 
 @router.websocket("/ws/monitor")
@@ -142,12 +188,8 @@ async def websocket_monitor(websocket: WebSocket):
 
         while True:
             # 모니터는 데이터를 보내지 않고 수신만 함
-            # 하지만 연결 유지를 위해 메시지 대기
-            data = await websocket.receive_text()
-            message = json.loads(data)
-
-            if message.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
+            # 하지만 연결 유지를 위해 메시지 대기 (ping은 manager.receive에서 응답)
+            await manager.receive(websocket)
 
     except WebSocketDisconnect:
         manager.disconnect_monitor(websocket)
@@ -16,6 +16,7 @@ class EngagementMetrics(BaseModel):
     quiz_accuracy: float = 0.0  # 0-1
     response_latency_ms: int = 0
     chat_message_count: int = 0
+    screen_time_seconds: float = 0.0  # 누적 시청 시간 (presence heartbeat 병합)
     last_activity_time: Optional[datetime] = None
 
 
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""퀴즈 통계 카운터 복구: 응답 문서로 퀴즈 문서의 option_counts 등을 재구성
+
+    python scripts/rebuild_quiz_stats.py            # 전체 퀴즈
+    python scripts/rebuild_quiz_stats.py --quiz-id quiz_001
+    python scripts/rebuild_quiz_stats.py --stale-only   # 이전 카운터 형식 퀴즈만 (서버 시작 시에도 실행)
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# backend 루트를 path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import MONGO_URL  # noqa: E402
+from core.database import DatabaseManager  # noqa: E402
+
+
+async def run(args) -> int:
+    db = DatabaseManager(args.mongo_url)
+    if not await db.init():
+        print("❌ MongoDB not available")
+        return 1
+    try:
+        rebuilt = await db.rebuild_quiz_stats(args.quiz_id, stale_only=args.stale_only)
+    finally:
+        await db.close()
+    print(f"✅ Rebuilt quiz stats: {rebuilt} quizzes")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quiz-id", default=None)
+    parser.add_argument("--stale-only", action="store_true")
+    parser.add_argument("--mongo-url", default=MONGO_URL)
+    raise SystemExit(asyncio.run(run(parser.parse_args())))
@@ -6,9 +6,12 @@ AI 기반 학생 피드백 및 교사 인사이트 생성
 import logging
 from datetime import datetime
 from typing import Optional, Dict, List, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from enum import Enum
 
+from services.session_lifecycle import touch_session
+from utils.memory import deep_sizeof
+
 logger = logging.getLogger(__name__)
 
 
@@ -179,6 +182,7 @@ class FeedbackGenerator:
             )
 
             self.feedback_cache[feedback_id] = feedback
+            touch_session(session_id)
 
             logger.info(f"✅ Student feedback generated: {feedback_id}")
             return feedback
@@ -442,6 +446,7 @@ class FeedbackGenerator:
             )
 
             self.insight_cache[insight_id] = insight
+            touch_session(session_id)
 
             logger.info(f"✅ Teacher insight generated: {insight_id}")
             return insight
@@ -742,6 +747,26 @@ class FeedbackGenerator:
         """인사이트 조회"""
         return self.insight_cache.get(insight_id)
 
+    def evict_session(self, session_id: str) -> List[Dict]:
+        """세션 피드백/인사이트 제거 (보관용 dict 목록 반환)"""
+        evicted = []
+        for kind, cache in (
+            ("student_feedback", self.feedback_cache),
+            ("teacher_insight", self.insight_cache),
+            ("group_feedback", self.group_feedback_cache),
+        ):
+            for key, item in list(cache.items()):
+                if item.session_id == session_id:
+                    del cache[key]
+                    evicted.append({"kind": kind, **asdict(item)})
+        return evicted
+
+    def memory_bytes(self) -> int:
+        """피드백 캐시 크기 (바이트, 추정치)"""
+        return deep_sizeof(
+            (self.feedback_cache, self.insight_cache, self.group_feedback_cache)
+        )
+
 
 # 전역 인스턴스
 _feedback_generator = None
@@ -7,9 +7,12 @@ import logging
 import json
 from datetime import datetime
 from typing import Optional, Dict, List, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from enum import Enum
 
+from services.session_lifecycle import touch_session
+from utils.memory import deep_sizeof
+
 logger = logging.getLogger(__name__)
 
 
@@ -204,6 +207,7 @@ class NLPAnalyzer:
 
             # 캐시에 저장
             self.message_cache[message_id] = message
+            touch_session(session_id)
 
             # 대화 히스토리 추가
             if session_id not in self.conversation_history:
@@ -588,6 +592,17 @@ class NLPAnalyzer:
         """세션별 메시지 목록"""
         return self.conversation_history.get(session_id, [])
 
+    def evict_session(self, session_id: str) -> List[Dict]:
+        """세션 메시지 분석 결과 제거 (보관용 dict 목록 반환)"""
+        messages = self.conversation_history.pop(session_id, [])
+        for message in messages:
+            self.message_cache.pop(message.message_id, None)
+        return [asdict(message) for message in messages]
+
+    def memory_bytes(self) -> int:
+        """메시지 캐시 크기 (바이트, 추정치)"""
+        return deep_sizeof((self.message_cache, self.conversation_history))
+
 
 # 전역 인스턴스
 _nlp_analyzer = None
@@ -12,6 +12,9 @@ from dataclasses import dataclass, asdict
 import base64
 import io
 
+from services.session_lifecycle import touch_session
+from utils.memory import deep_sizeof
+
 logger = logging.getLogger(__name__)
 
 
@@ -141,6 +144,7 @@ class VisionAnalyzer:
 
             # 캐시에 저장
             self.cache[analysis_id] = analysis
+            touch_session(session_id)
 
             logger.info(f"✅ Screenshot analyzed: {analysis_id}")
             return analysis
@@ -457,6 +461,19 @@ class VisionAnalyzer:
             if analysis.session_id == session_id
         ]
 
+    def evict_session(self, session_id: str) -> List[Dict]:
+        """세션 분석 결과 제거 (보관용 dict 목록 반환)"""
+        analyses = [
+            self.cache.pop(analysis_id)
+            for analysis_id, analysis in list(self.cache.items())
+            if analysis.session_id == session_id
+        ]
+        return [asdict(analysis) for analysis in analyses]
+
+    def memory_bytes(self) -> int:
+        """분석 캐시 크기 (바이트, 추정치)"""
+        return deep_sizeof(self.cache)
+
     def analyze_frame_sequence(
         self, session_id: str, frame_paths: List[str]
     ) -> List[ContentAnalysis]:
@@ -0,0 +1,275 @@
+"""
+AIRClass Dashboard Snapshots
+세션별 대시보드 스냅샷을 한 번만 계산해서 구독 중인 모든 대시보드에 push
+
+- 참여도가 바뀌면 (EngagementTracker 변경 알림) debounce 후 한 번 재계산
+- 결과가 달라졌을 때만 version 증가
+- 구독자는 직전 version이면 diff만, 뒤처졌으면 전체 스냅샷을 받음
+  (느린 소켓이 다른 구독자나 재계산을 막지 않고, 밀린 변경은 하나로 합쳐짐)
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.metrics import dashboard_snapshot_recomputes_total, dashboard_subscribers
+from services.engagement_pipelines import CONFUSION_ALERT_CONFIDENCE
+from services.engagement_service import EngagementCalculator
+
+logger = logging.getLogger(__name__)
+
+SnapshotKey = Tuple[str, float]  # (session_id, session_duration_minutes)
+
+
+def diff_snapshots(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    두 스냅샷의 차이
+
+    Returns:
+        {"overview": {바뀐 키: 값}, "students": {"upsert": [...], "removed": [...]},
+         "alerts": {...}} — 바뀐 부분만 포함
+    """
+    diff: Dict[str, Any] = {}
+    overview = {
+        key: value
+        for key, value in new["overview"].items()
+        if old["overview"].get(key) != value
+    }
+    if overview:
+        diff["overview"] = overview
+
+    for section in ("students", "alerts"):
+        before, after = old[section], new[section]
+        upsert = [item for key, item in after.items() if before.get(key) != item]
+        removed = [key for key in before if key not in after]
+        if upsert or removed:
+            diff[section] = {"upsert": upsert, "removed": removed}
+    return diff
+
+
+class SnapshotSubscriber:
+    """대시보드 소켓 하나의 구독 상태"""
+
+    def __init__(self, producer: "SessionSnapshotProducer"):
+        self.producer = producer
+        self.version = 0  # 이 구독자에게 마지막으로 보낸 version
+        self.updated = asyncio.Event()
+
+    async def next_message(self) -> Dict[str, Any]:
+        """새 version이 나올 때까지 대기 후 보낼 메시지 (diff 또는 전체 스냅샷)"""
+        while self.version >= self.producer.version:
+            self.updated.clear()
+            await self.updated.wait()
+        return self.producer.message_for(self)
+
+
+class SessionSnapshotProducer:
+    """세션 하나의 대시보드 스냅샷 계산기"""
+
+    def __init__(
+        self,
+        tracker,
+        session_id: str,
+        session_duration_minutes: float,
+        debounce: float = 0.25,
+    ):
+        self.tracker = tracker
+        self.session_id = session_id
+        self.session_duration_minutes = session_duration_minutes
+        self.debounce = debounce
+        self.calculator = EngagementCalculator()
+        self.subscribers: List[SnapshotSubscriber] = []
+
+        self.version = 0
+        self.snapshot: Optional[Dict[str, Any]] = None
+        # 마지막 diff: (기준 version, diff)
+        self._last_diff: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def compute(self) -> Dict[str, Any]:
+        """트래커 메모리 상태로 스냅샷 계산"""
+        overview = await self.tracker.calculate_session_engagement(
+            session_id=self.session_id,
+            session_duration_minutes=self.session_duration_minutes,
+        )
+        engagements = await self.tracker.get_session_engagements(self.session_id)
+        scores = self.calculator.score_engagements(
+            engagements, self.session_duration_minutes
+        )
+
+        students: Dict[str, Dict[str, Any]] = {}
+        alerts: Dict[str, Dict[str, Any]] = {}
+        for eng, overall, level, is_confused, confidence in zip(
+            engagements,
+            scores["overall"],
+            scores["level"],
+            scores["is_confused"],
+            scores["confidence"],
+        ):
+            students[eng.student_id] = {
+                "student_id": eng.student_id,
+                "student_name": eng.student_name,
+                "overall_score": round(overall, 2),
+                "level": level,
+            }
+            if is_confused and confidence > CONFUSION_ALERT_CONFIDENCE:
+                alerts[eng.student_id] = {
+                    "type": "confusion",
+                    "student_id": eng.student_id,
+                    "student_name": eng.student_name,
+                    "confidence": round(confidence, 2),
+                }
+
+        return {"overview": overview, "students": students, "alerts": alerts}
+
+    async def refresh(self) -> bool:
+        """
+        스냅샷 재계산 (바뀐 경우만 version 증가 후 구독자 깨움)
+
+        Returns:
+            bool: version이 바뀌었으면 True
+        """
+        snapshot = await self.compute()
+        dashboard_snapshot_recomputes_total.inc()
+        if snapshot == self.snapshot:
+            return False
+
+        if self.snapshot is not None:
+            self._last_diff = (self.version, diff_snapshots(self.snapshot, snapshot))
+        self.snapshot = snapshot
+        self.version += 1
+        for subscriber in self.subscribers:
+            subscriber.updated.set()
+        return True
+
+    def mark_dirty(self):
+        """참여도 변경 알림 → debounce 후 한 번만 재계산"""
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        # 재계산 중 들어온 변경은 다음 바퀴에서 한 번에 반영
+        while self._dirty:
+            await asyncio.sleep(self.debounce)
+            self._dirty = False
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"❌ Dashboard snapshot refresh failed: {e}")
+
+    def message_for(self, subscriber: SnapshotSubscriber) -> Dict[str, Any]:
+        """구독자에게 보낼 메시지 (직전 version이면 diff, 아니면 전체)"""
+        if self._last_diff and subscriber.version == self._last_diff[0]:
+            message = {
+                "type": "diff",
+                "base_version": subscriber.version,
+                "version": self.version,
+                **self._last_diff[1],
+            }
+        else:
+            message = self.full_message()
+        subscriber.version = self.version
+        return message
+
+    def full_message(self) -> Dict[str, Any]:
+        snapshot = self.snapshot or {"overview": {}, "students": {}, "alerts": {}}
+        return {
+            "type": "snapshot",
+            "version": self.version,
+            "overview": snapshot["overview"],
+            "students": list(snapshot["students"].values()),
+            "alerts": list(snapshot["alerts"].values()),
+        }
+
+    def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+class DashboardSnapshotHub:
+    """세션별 스냅샷 생산자 관리 (대시보드 소켓 구독/해제)"""
+
+    def __init__(self, tracker, debounce: float = 0.25):
+        self.tracker = tracker
+        self.debounce = debounce
+        self.producers: Dict[SnapshotKey, SessionSnapshotProducer] = {}
+        tracker.add_change_listener(self.on_engagement_change)
+
+    async def subscribe(
+        self, session_id: str, session_duration_minutes: float
+    ) -> SnapshotSubscriber:
+        """대시보드 구독 (같은 세션·진행 시간이면 스냅샷 공유)"""
+        key = (session_id, session_duration_minutes)
+        producer = self.producers.get(key)
+        if producer is None:
+            producer = SessionSnapshotProducer(
+                self.tracker, session_id, session_duration_minutes, self.debounce
+            )
+            self.producers[key] = producer
+            await producer.refresh()
+
+        subscriber = SnapshotSubscriber(producer)
+        producer.subscribers.append(subscriber)
+        dashboard_subscribers.inc()
+        return subscriber
+
+    def unsubscribe(self, subscriber: SnapshotSubscriber):
+        producer = subscriber.producer
+        if subscriber not in producer.subscribers:
+            return
+        producer.subscribers.remove(subscriber)
+        dashboard_subscribers.dec()
+        if not producer.subscribers:
+            # 보는 대시보드가 없으면 재계산도 하지 않음
+            producer.close()
+            key = (producer.session_id, producer.session_duration_minutes)
+            if self.producers.get(key) is producer:
+                del self.producers[key]
+
+    def on_engagement_change(self, session_id: str):
+        for producer in self.producers.values():
+            if producer.session_id == session_id:
+                producer.mark_dirty()
+
+    def close(self):
+        self.tracker.remove_change_listener(self.on_engagement_change)
+        for producer in self.producers.values():
+            producer.close()
+        self.producers.clear()
+
+
+# 전역 인스턴스
+_dashboard_hub: Optional[DashboardSnapshotHub] = None
+
+
+def init_dashboard_snapshots(tracker) -> Optional[DashboardSnapshotHub]:
+    """DashboardSnapshotHub 초기화"""
+    global _dashboard_hub
+
+    if tracker is None:
+        return None
+
+    from config import DASHBOARD_SNAPSHOT_DEBOUNCE_MS
+
+    _dashboard_hub = DashboardSnapshotHub(
+        tracker, debounce=DASHBOARD_SNAPSHOT_DEBOUNCE_MS / 1000
+    )
+    logger.info("✅ DashboardSnapshotHub initialized")
+    return _dashboard_hub
+
+
+def shutdown_dashboard_snapshots():
+    """DashboardSnapshotHub 종료"""
+    global _dashboard_hub
+
+    if _dashboard_hub:
+        _dashboard_hub.close()
+        _dashboard_hub = None
+
+
+def get_dashboard_hub() -> Optional[DashboardSnapshotHub]:
+    """DashboardSnapshotHub 인스턴스 반환"""
+    return _dashboard_hub
@@ -0,0 +1,107 @@
+"""
+AIRClass Engagement History
+학생별 참여도 점수 시계열 (고정 크기 링 버퍼)
+
+- 학생마다 (시각, 점수) 샘플을 capacity개까지만 보관 → 학생당 메모리 고정
+- 같은 resolution초 구간의 샘플은 하나로 합침 (활동이 몰려도 버퍼가 금방 밀리지 않음)
+- 추세 계산은 EngagementCalculator.analyze_series()에서 수행
+"""
+
+import time
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class ScoreHistory:
+    """(시각, 점수) 링 버퍼"""
+
+    __slots__ = ("times", "scores", "resolution", "_start", "_count")
+
+    def __init__(self, capacity: int = 240, resolution: float = 5.0):
+        """
+        Args:
+            capacity: 보관할 최대 샘플 수
+            resolution: 샘플을 합치는 구간 길이 (초, 0이면 합치지 않음)
+        """
+        self.times = array("d", bytes(8 * capacity))
+        self.scores = array("d", bytes(8 * capacity))
+        self.resolution = resolution
+        self._start = 0
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.times)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _index(self, i: int) -> int:
+        return (self._start + i) % self.capacity
+
+    def add(self, timestamp: float, score: float):
+        """샘플 추가 (가장 오래된 샘플부터 덮어씀)"""
+        if self._count and self.resolution > 0:
+            last = self._index(self._count - 1)
+            # 같은 resolution 구간이면 마지막 샘플 갱신
+            if timestamp // self.resolution == self.times[last] // self.resolution:
+                self.times[last] = timestamp
+                self.scores[last] = score
+                return
+
+        if self._count < self.capacity:
+            slot = self._index(self._count)
+            self._count += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        self.times[slot] = timestamp
+        self.scores[slot] = score
+
+    def samples(self, since: Optional[float] = None) -> Tuple[List[float], List[float]]:
+        """시간순 (시각 목록, 점수 목록), since 이후 샘플만"""
+        times: List[float] = []
+        scores: List[float] = []
+        for i in range(self._count):
+            slot = self._index(i)
+            if since is None or self.times[slot] >= since:
+                times.append(self.times[slot])
+                scores.append(self.scores[slot])
+        return times, scores
+
+
+class EngagementHistory:
+    """세션별 학생 점수 시계열"""
+
+    def __init__(self, capacity: int = 240, resolution: float = 5.0):
+        self.capacity = capacity
+        self.resolution = resolution
+        self.sessions: Dict[str, Dict[str, ScoreHistory]] = {}
+
+    def record(
+        self,
+        session_id: str,
+        student_id: str,
+        score: float,
+        timestamp: Optional[float] = None,
+    ):
+        """학생 점수 샘플 기록"""
+        students = self.sessions.setdefault(session_id, {})
+        history = students.get(student_id)
+        if history is None:
+            history = students[student_id] = ScoreHistory(
+                self.capacity, self.resolution
+            )
+        history.add(time.time() if timestamp is None else timestamp, score)
+
+    def get(self, session_id: str, student_id: str) -> Optional[ScoreHistory]:
+        return self.sessions.get(session_id, {}).get(student_id)
+
+    def students(self, session_id: str) -> Iterator[Tuple[str, ScoreHistory]]:
+        return iter(self.sessions.get(session_id, {}).items())
+
+    def drop_session(self, session_id: str):
+        self.sessions.pop(session_id, None)
+
+    def clear(self):
+        self.sessions.clear()
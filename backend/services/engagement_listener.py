@@ -1,46 +1,110 @@
 """
 AIRClass Engagement Event Listener
 Redis 이벤트를 수신하여 실시간 참여도 추적
+
+- pubsub: 세션 채널 구독 (start), 또는 전체 세션 패턴 구독 후
+          (session, student) 단위로 워커에 분배 (start_all)
+- streams: 노드당 컨슈머 하나가 읽어서 같은 (session, student) 샤드 워커에 분배
+           (start_stream_workers), 처리에 성공한 항목만 ACK
+- 두 방식 모두 Main 노드에서만 소비 (트래커 하나가 세션 전체를 집계)
 """
 
 import logging
-import json
 import asyncio
-from typing import Optional
-from datetime import datetime
+import math
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, UTC
 import redis.asyncio as redis
 
-from engagement import get_engagement_tracker, EngagementTracker
+from services.engagement_service import get_engagement_tracker, EngagementTracker
 from core.database import get_database_manager
-from models import ActivityType
+from core.event_bus import EventBus, RedisEventBus, Subscription
+from core.event_stream import EventStream, entry_position
+from core.metrics import (
+    engagement_worker_queue_depth,
+    engagement_event_processing_seconds,
+    engagement_stream_dead_letters_total,
+)
+from schemas import ActivityType
 
 logger = logging.getLogger(__name__)
 
+# 모든 세션의 참여도 채널
+ENGAGEMENT_CHANNEL_PATTERN = "airclass:session:*:engagement"
+
+# 패턴 구독이 끊겼을 때 다시 구독하기 전 대기 시간 (초, 실패할 때마다 두 배)
+RESUBSCRIBE_BACKOFF_SEC = 1.0
+RESUBSCRIBE_BACKOFF_MAX_SEC = 30.0
+
+
+class InvalidEngagementEventError(ValueError):
+    """다시 처리해도 성공할 수 없는 이벤트 (필드 누락, 알 수 없는 활동 타입)"""
+
+
+def _event_time(event: dict) -> Optional[datetime]:
+    """이벤트 timestamp (ISO 8601) → datetime (없거나 잘못되면 None)"""
+    timestamp = event.get("timestamp")
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
 
 class EngagementEventListener:
     """Engagement 이벤트 리스너"""
 
-    def __init__(self, redis_url: str, tracker: EngagementTracker, db_manager):
+    def __init__(
+        self,
+        redis_url: str,
+        tracker: EngagementTracker,
+        db_manager,
+        bus: Optional[EventBus] = None,
+    ):
         """
         Args:
             redis_url: Redis URL
             tracker: EngagementTracker 인스턴스
             db_manager: DatabaseManager 인스턴스
+            bus: 이벤트 버스 (메모리 버스를 넘기면 Redis 연결 없이 동작)
         """
         self.redis_url = redis_url
         self.tracker = tracker
         self.db_manager = db_manager
         self.redis_client: Optional[redis.Redis] = None
-        self.pubsub: Optional[redis.client.PubSub] = None
+        self.bus = bus
+        self.subscription: Optional[Subscription] = None
         self.running = False
+        self.stream: Optional[EventStream] = None
+        self.stream_workers: List[asyncio.Task] = []
+        # start_all / start_stream_workers: 분배 태스크 + 샤드별 워커/대기열
+        self.shard_queues: List[asyncio.Queue] = []
+        self.shard_tasks: List[asyncio.Task] = []
+        self.max_deliveries = 5
+        # 샤드 대기열에 있거나 처리 중인 스트림 항목 (XAUTOCLAIM으로 다시 분배하지 않도록)
+        self._inflight: Set[str] = set()
+        # 재생 중에는 워커가 새 이벤트를 처리하지 않음
+        self._resume = asyncio.Event()
+        self._resume.set()
+        self._busy = 0
+        self._idle = asyncio.Condition()
+        # 세션별로 재생에 반영된 마지막 스트림 위치 (이후 소비에서 건너뜀)
+        self._replayed_upto: Dict[str, Tuple[int, int]] = {}
 
         logger.info("🎧 EngagementEventListener initialized")
 
     async def connect(self) -> bool:
-        """Redis 연결"""
+        """Redis 연결 (이미 이벤트 버스가 주어졌으면 생략)"""
+        if self.bus is not None:
+            return True
+
         try:
             self.redis_client = await redis.from_url(self.redis_url)
             await self.redis_client.ping()
+            self.bus = RedisEventBus(self.redis_client)
             logger.info("✅ Redis connection established")
             return True
         except Exception as e:
@@ -54,76 +118,336 @@ class EngagementEventListener:
         Args:
             session_id: 세션 ID
         """
-        if not self.redis_client:
-            logger.error("❌ Redis not connected")
+        if not self.bus:
+            logger.error("❌ Event bus not connected")
             return
 
         try:
-            self.pubsub = self.redis_client.pubsub()
-
             # Engagement 이벤트 채널 구독
             channel = f"airclass:session:{session_id}:engagement"
-            await self.pubsub.subscribe(channel)
+            self.subscription = await self.bus.subscribe(channel)
 
-            logger.info(f"🎧 Listening to engagement events: {channel}")
+            logger.info(f"🎧 Listening to engagement events: {channel} ({self.bus.name})")
 
             self.running = True
 
             # 메시지 수신 루프
-            async for message in self.pubsub.listen():
+            async for message in self.subscription.listen():
                 if not self.running:
                     break
 
-                if message["type"] == "message":
-                    try:
-                        event = json.loads(message["data"])
-                        await self._handle_engagement_event(event)
-                    except Exception as e:
-                        logger.error(f"❌ Error handling event: {e}")
+                try:
+                    await self._handle_engagement_event(message["data"])
+                except Exception as e:
+                    logger.error(f"❌ Error handling event: {e}")
 
         except Exception as e:
             logger.error(f"❌ Failed to listen to events: {e}")
             self.running = False
 
+    def _start_shards(self, workers: int, queue_size: int):
+        self.shard_queues = [asyncio.Queue(maxsize=queue_size) for _ in range(workers)]
+        self.shard_tasks = [
+            asyncio.create_task(self._shard_worker(i, queue))
+            for i, queue in enumerate(self.shard_queues)
+        ]
+
+    async def start_all(self, workers: int = 4, queue_size: int = 1000):
+        """
+        모든 세션의 engagement 이벤트를 하나의 패턴 구독으로 수신
+
+        (session_id, student_id) 해시로 워커를 고정하므로 같은 학생의 이벤트는
+        순서대로, 다른 학생의 이벤트는 병렬로 처리된다.
+
+        Args:
+            workers: 워커(샤드) 수
+            queue_size: 워커별 대기열 길이 (가득 차면 분배가 기다림)
+        """
+        if not self.bus:
+            logger.error("❌ Event bus not connected")
+            return
+
+        self.subscription = await self.bus.psubscribe(ENGAGEMENT_CHANNEL_PATTERN)
+        self.running = True
+
+        self._start_shards(workers, queue_size)
+        self.shard_tasks.append(asyncio.create_task(self._dispatch()))
+
+        logger.info(
+            f"🎧 Listening to {ENGAGEMENT_CHANNEL_PATTERN} with {workers} workers "
+            f"({self.bus.name})"
+        )
+
+    async def _enqueue(self, event: dict, entry_id: Optional[str] = None):
+        """이벤트를 (session, student) 샤드 대기열에 넣기"""
+        workers = len(self.shard_queues)
+        shard = hash((event.get("session_id"), event.get("student_id"))) % workers
+        queue = self.shard_queues[shard]
+        await queue.put((time.perf_counter(), event, entry_id))
+        engagement_worker_queue_depth.labels(worker=str(shard)).set(queue.qsize())
+
+    async def _dispatch(self):
+        """
+        구독 이벤트를 (session, student) 샤드 대기열로 분배
+
+        구독이 끊기면 (연결 오류, listen() 종료) 백오프 후 다시 구독
+        """
+        backoff = RESUBSCRIBE_BACKOFF_SEC
+        while self.running:
+            try:
+                if self.subscription is None:
+                    self.subscription = await self.bus.psubscribe(
+                        ENGAGEMENT_CHANNEL_PATTERN
+                    )
+                    logger.info(f"🎧 Resubscribed to {ENGAGEMENT_CHANNEL_PATTERN}")
+                async for message in self.subscription.listen():
+                    if not self.running:
+                        return
+                    backoff = RESUBSCRIBE_BACKOFF_SEC
+                    await self._enqueue(message["data"])
+                if not self.running:
+                    return
+                logger.warning("⚠️ Engagement subscription ended, resubscribing")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Engagement subscription failed: {e}")
+
+            await self._drop_subscription()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RESUBSCRIBE_BACKOFF_MAX_SEC)
+
+    async def _drop_subscription(self):
+        """끊긴 구독 정리 (다음 루프에서 다시 구독)"""
+        subscription, self.subscription = self.subscription, None
+        if subscription is None:
+            return
+        try:
+            await subscription.close()
+        except Exception as e:
+            logger.debug(f"Closing broken subscription failed: {e}")
+
+    async def _shard_worker(self, index: int, queue: asyncio.Queue):
+        """샤드 대기열의 이벤트를 순서대로 처리"""
+        label = str(index)
+        while True:
+            enqueued_at, event, entry_id = await queue.get()
+            try:
+                await self._process(event, entry_id)
+            except Exception as e:
+                logger.error(f"❌ Error handling event: {e}")
+            finally:
+                engagement_event_processing_seconds.observe(
+                    time.perf_counter() - enqueued_at
+                )
+                engagement_worker_queue_depth.labels(worker=label).set(queue.qsize())
+                queue.task_done()
+
+    async def _process(self, event: dict, entry_id: Optional[str] = None):
+        """이벤트 하나 처리 (재생 중이면 끝날 때까지 대기, 실패는 예외)"""
+        await self._resume.wait()
+        self._busy += 1
+        try:
+            if entry_id is None:
+                await self._handle_engagement_event(event)
+            else:
+                await self._process_stream_entry(entry_id, event)
+        finally:
+            self._inflight.discard(entry_id)
+            self._busy -= 1
+            if not self._busy:
+                async with self._idle:
+                    self._idle.notify_all()
+
+    async def _process_stream_entry(self, entry_id: str, event: dict):
+        """
+        스트림 항목 처리 후 ACK
+
+        - 처리 실패: ACK하지 않음 → claim_idle_ms 뒤 XAUTOCLAIM으로 다시 전달
+        - 전달 횟수가 max_deliveries 이상이거나 처리할 수 없는 이벤트: dead-letter 후 ACK
+        """
+        upto = self._replayed_upto.get(event.get("session_id"))
+        if upto is not None and entry_position(entry_id) <= upto:
+            # 재생에서 이미 반영한 이벤트
+            await self.stream.ack(entry_id)
+            return
+
+        try:
+            await self._handle_engagement_event(event)
+        except InvalidEngagementEventError as e:
+            logger.warning(f"⚠️ Dead-lettering invalid engagement event {entry_id}: {e}")
+            await self.stream.dead_letter(entry_id, event, str(e))
+            engagement_stream_dead_letters_total.labels(reason="invalid").inc()
+            return
+        except Exception as e:
+            deliveries = await self.stream.delivery_count(entry_id)
+            if deliveries >= self.max_deliveries:
+                logger.error(
+                    f"❌ Dead-lettering engagement event {entry_id} "
+                    f"after {deliveries} deliveries: {e}"
+                )
+                await self.stream.dead_letter(entry_id, event, repr(e), deliveries)
+                engagement_stream_dead_letters_total.labels(reason="max_deliveries").inc()
+            else:
+                logger.warning(
+                    f"⚠️ Engagement event {entry_id} failed "
+                    f"(delivery {deliveries}/{self.max_deliveries}), will retry: {e}"
+                )
+            return
+
+        await self.stream.ack(entry_id)
+
+    async def start_stream_workers(
+        self,
+        workers: int = 2,
+        consumer: str = "listener",
+        claim_idle_ms: int = 30000,
+        max_deliveries: int = 5,
+        queue_size: int = 1000,
+    ):
+        """
+        Redis Streams 컨슈머 시작 (Main 노드에서만)
+
+        컨슈머 하나가 읽은 항목을 (session_id, student_id) 샤드 워커에 분배하므로
+        같은 학생의 이벤트는 순서대로 처리된다.
+
+        Args:
+            workers: 샤드 워커 수
+            consumer: 컨슈머 이름 (노드 이름, 재시작 후에도 같은 이름이면 남은 항목을 이어서 처리)
+            claim_idle_ms: 이 시간 동안 ACK되지 않은 항목은 다시 가져옴
+            max_deliveries: 항목별 최대 전달 횟수 (넘으면 dead-letter)
+            queue_size: 샤드별 대기열 길이 (가득 차면 읽기가 기다림)
+        """
+        if not self.stream:
+            logger.error("❌ Engagement stream not configured")
+            return
+
+        await self.stream.ensure_group()
+        self.running = True
+        self.max_deliveries = max_deliveries
+        self._start_shards(workers, queue_size)
+        self.stream_workers.append(
+            asyncio.create_task(self._stream_reader(consumer, claim_idle_ms))
+        )
+        logger.info(f"🌊 Engagement stream consumer {consumer} started ({workers} shards)")
+
+    async def _stream_reader(self, consumer: str, claim_idle_ms: int):
+        """스트림 항목을 읽어 샤드 대기열로 분배 (ACK는 샤드 워커가 처리 후)"""
+        while self.running:
+            try:
+                # ACK되지 않은 채 오래된 항목(실패·죽은 컨슈머 몫)을 먼저, 없으면 새 항목 대기
+                entries = [
+                    entry
+                    for entry in await self.stream.claim_stale(consumer, claim_idle_ms)
+                    if entry[0] not in self._inflight
+                ]
+                if not entries:
+                    entries = await self.stream.read(consumer)
+
+                for entry_id, event in entries:
+                    self._inflight.add(entry_id)
+                    await self._enqueue(event, entry_id)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Stream consumer {consumer} error: {e}")
+                await asyncio.sleep(1)
+
+    async def replay_session(self, session_id: str) -> int:
+        """
+        세션 이벤트 로그를 처음부터 재생해 참여도 재계산
+
+        재생하는 동안 워커는 멈추고 (처리 중인 이벤트는 끝날 때까지 기다림),
+        재생에 포함된 항목은 이후 소비에서 건너뜀. 각 이벤트의 timestamp를 그대로 사용.
+
+        Returns:
+            int: 재생한 이벤트 수
+        """
+        if not self.stream:
+            raise RuntimeError("Engagement stream not configured")
+
+        self._resume.clear()
+        try:
+            async with self._idle:
+                await self._idle.wait_for(lambda: self._busy == 0)
+
+            entries = [
+                entry async for entry in self.stream.read_session_entries(session_id)
+            ]
+
+            students: Dict[str, Tuple[str, str]] = {}
+            for _, event in entries:
+                student_id = event.get("student_id")
+                if student_id and student_id not in students:
+                    students[student_id] = (
+                        event.get("student_name", "Unknown"),
+                        event.get("node_name", "unknown"),
+                    )
+            self.tracker.reset_session(session_id, students)
+
+            replayed = 0
+            for entry_id, event in entries:
+                try:
+                    await self._handle_engagement_event(event)
+                    replayed += 1
+                except Exception as e:
+                    logger.warning(f"⚠️ Skipped engagement event {entry_id} in replay: {e}")
+
+            if entries:
+                self._replayed_upto[session_id] = entry_position(entries[-1][0])
+        finally:
+            self._resume.set()
+
+        logger.info(f"🔁 Replayed {replayed} engagement events for {session_id}")
+        return replayed
+
     async def stop(self):
-        """이벤트 수신 중지"""
+        """이벤트 수신 중지 (처리 중이던 스트림 항목은 ACK되지 않아 다시 전달됨)"""
         self.running = False
-        if self.pubsub:
-            await self.pubsub.unsubscribe()
-            await self.pubsub.close()
+        for task in self.stream_workers + self.shard_tasks:
+            task.cancel()
+        await asyncio.gather(
+            *self.stream_workers, *self.shard_tasks, return_exceptions=True
+        )
+        self.stream_workers = []
+        self.shard_tasks = []
+        self.shard_queues = []
+        self._inflight.clear()
+        if self.subscription:
+            await self.subscription.close()
+            self.subscription = None
         logger.info("🛑 Event listener stopped")
 
     async def _handle_engagement_event(self, event: dict):
         """
-        Engagement 이벤트 처리
+        Engagement 이벤트 처리 (실패하면 예외 — 호출자가 재시도/ACK 결정)
 
         Args:
             event: Redis에서 수신한 이벤트
-        """
-        try:
-            activity_type = event.get("activity_type")
-            session_id = event.get("session_id")
-            student_id = event.get("student_id")
 
-            if not all([activity_type, session_id, student_id]):
-                logger.warning(f"⚠️ Invalid event: missing fields - {event}")
-                return
+        Raises:
+            InvalidEngagementEventError: 필드 누락 또는 알 수 없는 활동 타입
+        """
+        activity_type = event.get("activity_type")
+        session_id = event.get("session_id")
+        student_id = event.get("student_id")
 
-            # Activity Type별 처리
-            if activity_type == "chat":
-                await self._handle_chat_activity(event)
+        if not all([activity_type, session_id, student_id]):
+            raise InvalidEngagementEventError(f"missing fields - {event}")
 
-            elif activity_type == "quiz_response":
-                await self._handle_quiz_response(event)
+        # Activity Type별 처리
+        if activity_type == "chat":
+            await self._handle_chat_activity(event)
 
-            elif activity_type == "presence":
-                await self._handle_presence_activity(event)
+        elif activity_type == "quiz_response":
+            await self._handle_quiz_response(event)
 
-            else:
-                logger.warning(f"⚠️ Unknown activity type: {activity_type}")
+        elif activity_type == "presence":
+            await self._handle_presence_activity(event)
 
-        except Exception as e:
-            logger.error(f"❌ Error processing event: {e}")
+        else:
+            raise InvalidEngagementEventError(f"unknown activity type: {activity_type}")
 
     async def _handle_chat_activity(self, event: dict):
         """
@@ -140,31 +464,29 @@ class EngagementEventListener:
             "timestamp": "..."
         }
         """
-        try:
-            session_id = event.get("session_id")
-            student_id = event.get("student_id")
-            student_name = event.get("student_name", "Unknown")
-            node_name = event.get("node_name", "unknown")
-
-            # 참여도 업데이트
-            engagement = await self.tracker.track_activity(
-                session_id=session_id,
-                student_id=student_id,
-                student_name=student_name,
-                node_name=node_name,
-                activity_type=ActivityType.CHAT,
-                activity_data={},
+        session_id = event.get("session_id")
+        student_id = event.get("student_id")
+        student_name = event.get("student_name", "Unknown")
+        node_name = event.get("node_name", "unknown")
+
+        # 참여도 업데이트
+        engagement = await self.tracker.track_activity(
+            session_id=session_id,
+            student_id=student_id,
+            student_name=student_name,
+            node_name=node_name,
+            activity_type=ActivityType.CHAT,
+            activity_data={},
+            timestamp=_event_time(event),
+            raise_errors=True,
+        )
+
+        if engagement:
+            logger.debug(
+                f"💬 Chat activity tracked: {student_id} - "
+                f"total: {engagement.metrics.chat_message_count}"
             )
 
-            if engagement:
-                logger.debug(
-                    f"💬 Chat activity tracked: {student_id} - "
-                    f"total: {engagement.metrics.chat_message_count}"
-                )
-
-        except Exception as e:
-            logger.error(f"❌ Error handling chat activity: {e}")
-
     async def _handle_quiz_response(self, event: dict):
         """
         퀴즈 응답 처리
@@ -183,37 +505,36 @@ class EngagementEventListener:
             "timestamp": "..."
         }
         """
-        try:
-            session_id = event.get("session_id")
-            student_id = event.get("student_id")
-            student_name = event.get("student_name", "Unknown")
-            node_name = event.get("node_name", "unknown")
-            response_time_ms = event.get("response_time_ms", 0)
-            is_correct = event.get("is_correct", False)
-
-            # 참여도 업데이트
-            engagement = await self.tracker.track_activity(
-                session_id=session_id,
-                student_id=student_id,
-                student_name=student_name,
-                node_name=node_name,
-                activity_type=ActivityType.QUIZ_RESPONSE,
-                activity_data={
-                    "response_time_ms": response_time_ms,
-                    "is_correct": is_correct,
-                },
+        session_id = event.get("session_id")
+        student_id = event.get("student_id")
+        student_name = event.get("student_name", "Unknown")
+        node_name = event.get("node_name", "unknown")
+        response_time_ms = event.get("response_time_ms", 0)
+        is_correct = event.get("is_correct", False)
+
+        # 참여도 업데이트
+        engagement = await self.tracker.track_activity(
+            session_id=session_id,
+            student_id=student_id,
+            student_name=student_name,
+            node_name=node_name,
+            activity_type=ActivityType.QUIZ_RESPONSE,
+            activity_data={
+                "quiz_id": event.get("quiz_id"),
+                "response_time_ms": response_time_ms,
+                "is_correct": is_correct,
+            },
+            timestamp=_event_time(event),
+            raise_errors=True,
+        )
+
+        if engagement:
+            logger.debug(
+                f"📝 Quiz response tracked: {student_id} - "
+                f"accuracy: {engagement.metrics.quiz_accuracy:.2%} - "
+                f"response_time: {response_time_ms}ms"
             )
 
-            if engagement:
-                logger.debug(
-                    f"📝 Quiz response tracked: {student_id} - "
-                    f"accuracy: {engagement.metrics.quiz_accuracy:.2%} - "
-                    f"response_time: {response_time_ms}ms"
-                )
-
-        except Exception as e:
-            logger.error(f"❌ Error handling quiz response: {e}")
-
     async def _handle_presence_activity(self, event: dict):
         """
         화면 시청 시간 처리
@@ -226,22 +547,39 @@ class EngagementEventListener:
             "student_id": "...",
             "student_name": "...",
             "node_name": "...",
-            "screen_time_seconds": int,
+            "screen_time_seconds": int,   # 직전 heartbeat 이후 시청 시간 (heartbeat 간격으로 제한)
             "timestamp": "..."
         }
+
+        heartbeat는 메모리 집계만 갱신하고, attention_score와 DB에는
+        트래커의 presence 루프가 주기적으로 일괄 반영
         """
-        try:
-            session_id = event.get("session_id")
-            student_id = event.get("student_id")
-            student_name = event.get("student_name", "Unknown")
-            node_name = event.get("node_name", "unknown")
+        from config import ENGAGEMENT_PRESENCE_HEARTBEAT_SEC
 
-            # 현재는 단순히 로깅만 수행
-            # 추후 screen_time 기반 attention_score 계산에 사용
-            logger.debug(f"👁️  Presence activity: {student_id} on {node_name}")
+        session_id = event.get("session_id")
+        student_id = event.get("student_id")
+        student_name = event.get("student_name", "Unknown")
+        node_name = event.get("node_name", "unknown")
 
-        except Exception as e:
-            logger.error(f"❌ Error handling presence activity: {e}")
+        event_time = _event_time(event)
+        heartbeat_at = event_time.timestamp() if event_time else time.time()
+        # 클라이언트 보고값: 없거나 숫자가 아니면 기본 간격, 범위는 집계기가 제한
+        try:
+            covered = float(event["screen_time_seconds"])
+        except (KeyError, TypeError, ValueError):
+            covered = ENGAGEMENT_PRESENCE_HEARTBEAT_SEC
+        if not math.isfinite(covered):
+            covered = ENGAGEMENT_PRESENCE_HEARTBEAT_SEC
+
+        self.tracker.record_presence(
+            session_id=session_id,
+            student_id=student_id,
+            student_name=student_name,
+            node_name=node_name,
+            timestamp=heartbeat_at,
+            covered_seconds=covered,
+        )
+        logger.debug(f"👁️  Presence activity: {student_id} on {node_name}")
 
     async def close(self):
         """연결 종료"""
@@ -259,14 +597,26 @@ async def init_engagement_listener(
     redis_url: str,
     tracker: EngagementTracker,
     db_manager,
+    bus: Optional[EventBus] = None,
 ) -> Optional[EngagementEventListener]:
-    """EngagementEventListener 초기화"""
+    """EngagementEventListener 초기화 (bus: 공유할 이벤트 버스, 없으면 Redis 연결)"""
     global engagement_listener
 
     try:
-        engagement_listener = EngagementEventListener(redis_url, tracker, db_manager)
+        engagement_listener = EngagementEventListener(
+            redis_url, tracker, db_manager, bus=bus
+        )
 
         if await engagement_listener.connect():
+            from config import ENGAGEMENT_EVENT_TRANSPORT
+
+            if ENGAGEMENT_EVENT_TRANSPORT == "streams" and engagement_listener.redis_client:
+                from core.event_stream import init_engagement_stream
+
+                engagement_listener.stream = init_engagement_stream(
+                    engagement_listener.redis_client
+                )
+
             logger.info("✅ EngagementEventListener initialized successfully")
             return engagement_listener
         else:
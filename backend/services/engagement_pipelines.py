@@ -0,0 +1,194 @@
+"""
+AIRClass Engagement Aggregation Pipelines
+대시보드 조회용 MongoDB 집계 파이프라인
+
+EngagementCalculator의 참여 점수/종합 점수/레벨/혼동 감지 공식을 집계 식으로 옮겨서
+세션 문서를 전부 Python으로 가져와 검증·계산하지 않고 서버에서 계산·필터·정렬
+- 항상 (session_id, ...) 복합 인덱스로 $match 후 필요한 필드만 $project
+- 식의 상수는 EngagementCalculator와 공유 (공식이 바뀌면 같이 수정)
+- 참여/종합 점수 식은 core.database의 저장용 정렬 키와 같은 함수로 생성
+"""
+
+from typing import Any, Dict, List, Optional
+
+from core.database import (
+    engagement_overall_score_expr,
+    engagement_participation_score_expr,
+)
+from services.engagement_service import EngagementCalculator
+
+Stage = Dict[str, Any]
+
+# 대시보드 알림 기준 (혼동 확신도 / 낮은 정답률)
+CONFUSION_ALERT_CONFIDENCE = 0.6
+LOW_ACCURACY_THRESHOLD = 0.3
+
+# 학생 목록 정렬 기준 → $sort (동점은 student_id 순)
+STUDENT_SORTS = {
+    "engagement": {"overall_score": -1, "student_id": 1},
+    "name": {"student_name": 1, "student_id": 1},
+    "accuracy": {"quiz_accuracy": -1, "student_id": 1},
+}
+
+
+def _metric(name: str, default: Any = 0) -> Dict[str, Any]:
+    return {"$ifNull": [f"$metrics.{name}", default]}
+
+
+def scored_engagement_stages(
+    session_duration_minutes: float, extra_fields: Optional[Dict[str, Any]] = None
+) -> List[Stage]:
+    """
+    참여도 문서 → 점수가 붙은 평평한 문서
+
+    결과 필드: student_id, student_name, node_name, updated_at,
+    attention_score, quiz_accuracy, participation_count, chat_message_count,
+    response_latency_ms, participation_score, overall_score, level,
+    is_confused, confusion_confidence (+ extra_fields)
+    """
+    calculator = EngagementCalculator
+    levels = sorted(
+        calculator.LEVEL_MIN_SCORES.items(), key=lambda item: item[1], reverse=True
+    )
+
+    project = {
+        "_id": 0,
+        "student_id": 1,
+        "student_name": 1,
+        "node_name": 1,
+        "updated_at": 1,
+        "attention_score": _metric("attention_score", 0.0),
+        "quiz_accuracy": _metric("quiz_accuracy", 0.0),
+        "participation_count": _metric("participation_count"),
+        "chat_message_count": _metric("chat_message_count"),
+        "response_latency_ms": _metric("response_latency_ms"),
+        **(extra_fields or {}),
+    }
+
+    # calculate_participation_score / calculate_overall_engagement_score
+    # (저장된 정렬 키 overall_score와 같은 식, 진행 시간 0이면 참석 점수 없음)
+    participation = engagement_participation_score_expr(
+        "$chat_message_count",
+        "$participation_count",
+        attendance_points=10 if session_duration_minutes > 0 else 0,
+    )
+    overall = engagement_overall_score_expr(
+        "$attention_score", "$participation_score", "$quiz_accuracy"
+    )
+
+    # detect_confusion (지표 없음): 채팅이 많을 때만 0.3 + 정답률 70% 미만 가중
+    confidence = {
+        "$cond": [
+            {"$gt": ["$chat_message_count", calculator.HIGH_CHAT_THRESHOLD]},
+            {
+                "$min": [
+                    {
+                        "$add": [
+                            {
+                                "$cond": [
+                                    {"$lt": ["$quiz_accuracy", 0.7]},
+                                    {
+                                        "$multiply": [
+                                            {
+                                                "$divide": [
+                                                    {"$subtract": [0.7, "$quiz_accuracy"]},
+                                                    0.7,
+                                                ]
+                                            },
+                                            0.4,
+                                        ]
+                                    },
+                                    0.0,
+                                ]
+                            },
+                            0.3,
+                        ]
+                    },
+                    1.0,
+                ]
+            },
+            0.0,
+        ]
+    }
+
+    # interpret_engagement_level: 하한 점수가 높은 레벨부터
+    level = {
+        "$switch": {
+            "branches": [
+                {"case": {"$gte": ["$overall_score", min_score]}, "then": name}
+                for name, min_score in levels[:-1]
+            ],
+            "default": levels[-1][0],
+        }
+    }
+
+    return [
+        {"$project": project},
+        {"$addFields": {"participation_score": participation}},
+        {"$addFields": {"overall_score": overall, "confusion_confidence": confidence}},
+        {
+            "$addFields": {
+                "level": level,
+                "is_confused": {"$gt": ["$confusion_confidence", 0.5]},
+            }
+        },
+    ]
+
+
+def students_pipeline(
+    session_id: str,
+    session_duration_minutes: float,
+    sort_by: str = "engagement",
+    limit: Optional[int] = None,
+) -> List[Stage]:
+    """세션 학생 목록 (점수 계산 + 정렬 + 선택적 상위 N명)"""
+    pipeline = [
+        {"$match": {"session_id": session_id}},
+        *scored_engagement_stages(session_duration_minutes),
+    ]
+    if sort_by in STUDENT_SORTS:
+        pipeline.append({"$sort": STUDENT_SORTS[sort_by]})
+    if limit:
+        pipeline.append({"$limit": limit})
+    return pipeline
+
+
+def student_detail_pipeline(
+    session_id: str, student_id: str, session_duration_minutes: float
+) -> List[Stage]:
+    """학생 한 명 상세 ((session_id, student_id) 유니크 인덱스 단건)"""
+    return [
+        {"$match": {"session_id": session_id, "student_id": student_id}},
+        {"$limit": 1},
+        *scored_engagement_stages(
+            session_duration_minutes,
+            extra_fields={"last_activity_time": "$metrics.last_activity_time"},
+        ),
+    ]
+
+
+def alerts_pipeline(session_id: str, alert_type: Optional[str] = None) -> List[Stage]:
+    """알림 대상 학생만 (혼동 / 낮은 정답률 / 무응답, 알 수 없는 타입이면 빈 파이프라인)"""
+    conditions = {
+        "confusion": {
+            "is_confused": True,
+            "confusion_confidence": {"$gt": CONFUSION_ALERT_CONFIDENCE},
+        },
+        "low_engagement": {"quiz_accuracy": {"$lt": LOW_ACCURACY_THRESHOLD}},
+        "no_response": {"participation_count": 0, "chat_message_count": 0},
+    }
+    selected = [
+        condition
+        for name, condition in conditions.items()
+        if alert_type is None or alert_type == name
+    ]
+    if not selected:
+        # 알 수 없는 알림 타입: 조회할 것 없음
+        return []
+
+    return [
+        {"$match": {"session_id": session_id}},
+        # 혼동 여부는 점수와 무관하므로 진행 시간 0으로 계산
+        *scored_engagement_stages(0),
+        {"$match": {"$or": selected}},
+    ]
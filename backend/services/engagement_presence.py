@@ -0,0 +1,169 @@
+"""
+AIRClass Presence Aggregation
+학생 시청(presence) heartbeat를 메모리에서 구간 병합하여 누적 시청 시간 계산
+
+- heartbeat 하나 = [timestamp - covered_seconds, timestamp] 시청 구간
+- covered_seconds는 클라이언트 값이므로 heartbeat 간격과 직전 heartbeat 이후 경과로 제한
+- 세션 시작은 첫 heartbeat의 서버 시각 (클라이언트 값으로 앞당겨지지 않음)
+- 겹치거나 맞닿은 구간은 병합 (중복 heartbeat/재전송이 시간을 부풀리지 않음)
+- 오래된 구간은 누적 초로 접어서 학생당 구간 수를 제한
+- DB 반영은 하지 않음: 주기적으로 drain()한 결과를 트래커가 attention_score에 반영
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+# (session_id, student_id)
+PresenceKey = Tuple[str, str]
+
+
+class PresenceIntervals:
+    """한 학생의 시청 구간 (정렬·병합된 [start, end] 목록 + 접힌 누적 초)"""
+
+    __slots__ = ("intervals", "folded_seconds", "folded_until", "gap_tolerance")
+
+    def __init__(self, gap_tolerance: float = 0.0):
+        """
+        Args:
+            gap_tolerance: 이 간격(초) 이하로 떨어진 구간은 이어진 것으로 봄
+        """
+        self.intervals: List[List[float]] = []
+        self.folded_seconds = 0.0
+        self.folded_until = float("-inf")
+        self.gap_tolerance = gap_tolerance
+
+    def add(self, start: float, end: float):
+        """시청 구간 추가 (기존 구간과 병합)"""
+        # 이미 누적 초로 접힌 시간은 다시 세지 않음
+        start = max(start, self.folded_until)
+        if end <= start:
+            return
+
+        i = bisect_left(self.intervals, [start, start])
+        # 왼쪽 이웃과 겹치거나 맞닿으면 그 구간부터 병합
+        if i > 0 and self.intervals[i - 1][1] + self.gap_tolerance >= start:
+            i -= 1
+        j = i
+        while j < len(self.intervals) and self.intervals[j][0] <= end + self.gap_tolerance:
+            start = min(start, self.intervals[j][0])
+            end = max(end, self.intervals[j][1])
+            j += 1
+        self.intervals[i:j] = [[start, end]]
+
+    def fold(self, before: float):
+        """before 이전에 끝난 구간을 누적 초로 접기 (이후 그 시간대 heartbeat는 무시)"""
+        keep = 0
+        while keep < len(self.intervals) and self.intervals[keep][1] < before:
+            start, end = self.intervals[keep]
+            self.folded_seconds += end - start
+            self.folded_until = max(self.folded_until, end)
+            keep += 1
+        del self.intervals[:keep]
+
+    def total_seconds(self) -> float:
+        """누적 시청 시간 (초)"""
+        return self.folded_seconds + sum(end - start for start, end in self.intervals)
+
+
+class PresenceAggregator:
+    """세션·학생별 presence heartbeat 집계기"""
+
+    def __init__(
+        self,
+        gap_tolerance: float = 5.0,
+        fold_after: float = 300.0,
+        max_covered: float = 15.0,
+    ):
+        """
+        Args:
+            gap_tolerance: heartbeat 사이 이 간격(초) 이하는 계속 시청으로 봄
+            fold_after: 이 시간(초)보다 오래된 구간은 누적 초로 접음
+            max_covered: heartbeat 하나가 대표할 수 있는 최대 시청 시간(초)
+        """
+        self.gap_tolerance = gap_tolerance
+        self.fold_after = fold_after
+        self.max_covered = max_covered
+        self.students: Dict[PresenceKey, PresenceIntervals] = {}
+        self.names: Dict[PresenceKey, Tuple[str, str]] = {}
+        self.last_heartbeat: Dict[PresenceKey, float] = {}
+        self.session_started: Dict[str, float] = {}
+        self._dirty: Set[PresenceKey] = set()
+
+    def record(
+        self,
+        session_id: str,
+        student_id: str,
+        timestamp: float,
+        covered_seconds: float,
+        student_name: str = "Unknown",
+        node_name: str = "unknown",
+    ):
+        """
+        heartbeat 기록 (메모리만 갱신)
+
+        Args:
+            timestamp: 서버가 heartbeat를 받은 시각 (epoch 초)
+            covered_seconds: 클라이언트가 보고한 시청 시간 (max_covered와
+                직전 heartbeat 이후 경과 시간으로 제한)
+        """
+        key = (session_id, student_id)
+        intervals = self.students.get(key)
+        if intervals is None:
+            intervals = self.students[key] = PresenceIntervals(self.gap_tolerance)
+
+        covered = max(0.0, min(self.max_covered, covered_seconds))
+        last = self.last_heartbeat.get(key)
+        if last is not None:
+            covered = min(covered, max(timestamp - last, 0.0))
+            self.last_heartbeat[key] = max(last, timestamp)
+        else:
+            self.last_heartbeat[key] = timestamp
+
+        intervals.add(timestamp - covered, timestamp)
+        self.names[key] = (student_name, node_name)
+        started = self.session_started.get(session_id)
+        if started is None or timestamp < started:
+            self.session_started[session_id] = timestamp
+        self._dirty.add(key)
+
+    def watch_seconds(self, session_id: str, student_id: str) -> float:
+        intervals = self.students.get((session_id, student_id))
+        return intervals.total_seconds() if intervals else 0.0
+
+    def drain(self, now: float) -> List[Tuple[str, str, str, str, float]]:
+        """
+        마지막 drain 이후 heartbeat가 온 학생 목록
+
+        Returns:
+            [(session_id, student_id, student_name, node_name, watch_seconds), ...]
+        """
+        dirty, self._dirty = self._dirty, set()
+        result = []
+        for key in dirty:
+            intervals = self.students.get(key)
+            if intervals is None:
+                continue
+            intervals.fold(now - self.fold_after)
+            name, node = self.names[key]
+            result.append((key[0], key[1], name, node, intervals.total_seconds()))
+        return result
+
+    def session_elapsed(self, session_id: str, now: float) -> Optional[float]:
+        """세션 첫 heartbeat 이후 경과 시간 (초)"""
+        started = self.session_started.get(session_id)
+        return None if started is None else max(now - started, 0.0)
+
+    def drop_session(self, session_id: str):
+        for key in [k for k in self.students if k[0] == session_id]:
+            del self.students[key]
+            self.names.pop(key, None)
+            self.last_heartbeat.pop(key, None)
+            self._dirty.discard(key)
+        self.session_started.pop(session_id, None)
+
+    def clear(self):
+        self.students.clear()
+        self.names.clear()
+        self.last_heartbeat.clear()
+        self.session_started.clear()
+        self._dirty.clear()
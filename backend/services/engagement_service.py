@@ -3,10 +3,27 @@ AIRClass Engagement Tracking Engine
 학생 참여도 계산 및 추적 시스템
 """
 
+import asyncio
 import logging
-from typing import Optional, List, Dict, Tuple, Any
+import time
+from bisect import bisect_left, insort
+from typing import Optional, List, Dict, Set, Tuple, Any, Callable
 from datetime import datetime, timedelta, UTC
-from models import StudentEngagement, EngagementMetrics, ActivityType
+from schemas import StudentEngagement, EngagementMetrics, ActivityType
+from services.engagement_history import EngagementHistory
+from services.engagement_presence import PresenceAggregator
+from services.engagement_store import EngagementStore
+from services.engagement_writer import EngagementWriteBuffer
+from services.session_lifecycle import touch_session
+from utils.memory import deep_sizeof
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - 선택 의존성
+    np = None
+    NUMPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +56,22 @@ class EngagementCalculator:
         "slow": (5000, 10000),  # 5-10초: 0.4점
         "very_slow": (10000, float("inf")),  # 10초+: 0.2점
     }
+    LATENCY_SCORES = {
+        "excellent": 1.0,
+        "good": 0.8,
+        "normal": 0.6,
+        "slow": 0.4,
+        "very_slow": 0.2,
+    }
+
+    # 참여도 레벨 하한 점수 (interpret_engagement_level 기준과 동일)
+    LEVEL_MIN_SCORES = {"excellent": 80, "good": 60, "moderate": 40, "low": 0}
+
+    # 채팅이 이 개수를 넘으면 "채팅 활동 많음"으로 봄 (혼동 감지)
+    HIGH_CHAT_THRESHOLD = 5
+
+    # 추세 윈도우 동안 예상 변화량이 이 값(점) 이하면 "stable"
+    TREND_STABLE_DELTA = 2.0
 
     def __init__(self):
         """engagement calculator 초기화"""
@@ -89,14 +122,7 @@ class EngagementCalculator:
         """응답 속도 기반 점수 계산 (0-1)"""
         for threshold, (min_ms, max_ms) in self.LATENCY_THRESHOLDS.items():
             if min_ms <= latency_ms <= max_ms:
-                score_map = {
-                    "excellent": 1.0,
-                    "good": 0.8,
-                    "normal": 0.6,
-                    "slow": 0.4,
-                    "very_slow": 0.2,
-                }
-                return score_map[threshold]
+                return self.LATENCY_SCORES[threshold]
         return 0.0
 
     def calculate_participation_score(
@@ -253,7 +279,7 @@ class EngagementCalculator:
         window_minutes: int = 10,
     ) -> Dict[str, Any]:
         """
-        참여도 추세 분석 (최근 N분 기준)
+        참여도 추세 분석 (점수 목록이 최근 window_minutes 동안 고르게 측정됐다고 가정)
 
         Args:
             recent_scores: 최근 참여도 점수들 (시간순)
@@ -269,25 +295,86 @@ class EngagementCalculator:
                 "average": recent_scores[-1] if recent_scores else 0.0,
             }
 
-        # 선형 회귀로 추세 계산
-        first_half_avg = sum(recent_scores[: len(recent_scores) // 2]) / max(
-            len(recent_scores) // 2, 1
-        )
-        second_half_avg = sum(recent_scores[len(recent_scores) // 2 :]) / max(
-            len(recent_scores) - len(recent_scores) // 2, 1
+        step = window_minutes * 60 / (len(recent_scores) - 1)
+        timestamps = [i * step for i in range(len(recent_scores))]
+        return self.analyze_series(
+            timestamps, recent_scores, window_minutes, now=timestamps[-1]
         )
 
-        trend_direction = (
-            "increasing" if second_half_avg > first_half_avg else "decreasing"
+    def analyze_series(
+        self,
+        timestamps: List[float],
+        scores: List[float],
+        window_minutes: float = 10,
+        now: Optional[float] = None,
+        ewma_halflife_minutes: float = 2.0,
+    ) -> Dict[str, Any]:
+        """
+        시계열 참여도 추세 분석 (최근 window_minutes 구간)
+
+        - 기울기: 최소제곱 선형 회귀 (점/분)
+        - EWMA: 시간 간격을 반영한 지수 이동 평균 (반감기 ewma_halflife_minutes)
+
+        Args:
+            timestamps: 샘플 시각 (epoch 초, 시간순)
+            scores: 샘플 점수 (0-100)
+            window_minutes: 분석 윈도우
+            now: 기준 시각 (기본: 마지막 샘플 시각)
+            ewma_halflife_minutes: EWMA 반감기
+
+        Returns:
+            Dict: trend_direction, trend_strength, average, recent, previous,
+                  slope_per_minute, ewma, samples
+        """
+        if now is None:
+            now = timestamps[-1] if timestamps else 0.0
+        since = now - window_minutes * 60
+        window = [(t, s) for t, s in zip(timestamps, scores) if t >= since]
+
+        if not window:
+            return {
+                "trend_direction": "stable",
+                "trend_strength": 0.0,
+                "average": 0.0,
+                "recent": None,
+                "previous": None,
+                "slope_per_minute": 0.0,
+                "ewma": None,
+                "samples": 0,
+            }
+
+        n = len(window)
+        mean_t = sum(t for t, _ in window) / n
+        mean_s = sum(s for _, s in window) / n
+        var_t = sum((t - mean_t) ** 2 for t, _ in window)
+        slope = (
+            sum((t - mean_t) * (s - mean_s) for t, s in window) / var_t * 60
+            if var_t > 0
+            else 0.0
         )
-        trend_strength = abs(second_half_avg - first_half_avg) / 100.0
+
+        ewma = window[0][1]
+        for (prev_t, _), (t, s) in zip(window, window[1:]):
+            decay = 0.5 ** ((t - prev_t) / 60 / ewma_halflife_minutes)
+            ewma = decay * ewma + (1 - decay) * s
+
+        change = slope * window_minutes
+        if change > self.TREND_STABLE_DELTA:
+            direction = "increasing"
+        elif change < -self.TREND_STABLE_DELTA:
+            direction = "decreasing"
+        else:
+            direction = "stable"
 
         return {
-            "trend_direction": trend_direction,
-            "trend_strength": min(trend_strength, 1.0),
-            "average": sum(recent_scores) / len(recent_scores),
-            "recent": recent_scores[-1],
-            "previous": recent_scores[-2] if len(recent_scores) >= 2 else None,
+            "trend_direction": direction,
+            "trend_strength": min(abs(change) / 100.0, 1.0),
+            "average": mean_s,
+            "recent": window[-1][1],
+            "previous": window[-2][1] if n >= 2 else None,
+            "slope_per_minute": slope,
+            "ewma": ewma,
+            "samples": n,
         }
 
     # ============================================
@@ -335,22 +422,339 @@ class EngagementCalculator:
             }
 
 
+    # ============================================
+    # Batch Scoring (NumPy)
+    # ============================================
+
+    def calculate_latency_scores(self, latency_ms: "np.ndarray") -> "np.ndarray":
+        """_calculate_latency_score의 배열 버전"""
+        latency_ms = np.asarray(latency_ms)
+        conditions = [
+            (latency_ms >= min_ms) & (latency_ms <= max_ms)
+            for min_ms, max_ms in self.LATENCY_THRESHOLDS.values()
+        ]
+        # np.select는 먼저 맞는 조건을 사용 → 경계값은 스칼라 버전처럼 앞 구간에 속함
+        return np.select(conditions, list(self.LATENCY_SCORES.values()), 0.0)
+
+    def calculate_participation_scores(
+        self,
+        chat_message_counts: "np.ndarray",
+        quiz_response_counts: "np.ndarray",
+        session_duration_minutes: float,
+    ) -> "np.ndarray":
+        """calculate_participation_score의 배열 버전"""
+        base = 10 if session_duration_minutes > 0 else 0
+        score = (
+            base
+            + np.minimum(np.asarray(chat_message_counts, dtype=np.int64) * 5, 40)
+            + np.minimum(np.asarray(quiz_response_counts, dtype=np.int64) * 5, 50)
+        )
+        return np.minimum(score, 100)
+
+    def calculate_overall_engagement_scores(
+        self,
+        attention_scores: "np.ndarray",
+        participation_scores: "np.ndarray",
+        quiz_accuracies: "np.ndarray",
+    ) -> "np.ndarray":
+        """calculate_overall_engagement_score의 배열 버전 (연산 순서 동일)"""
+        overall = (
+            (np.asarray(attention_scores, dtype=np.float64) * 100) * 0.4
+            + np.asarray(participation_scores) * 0.4
+            + (np.asarray(quiz_accuracies, dtype=np.float64) * 100) * 0.2
+        )
+        return np.minimum(np.maximum(overall, 0.0), 100.0)
+
+    def interpret_engagement_levels(self, scores: "np.ndarray") -> "np.ndarray":
+        """interpret_engagement_level의 레벨만 배열로"""
+        scores = np.asarray(scores)
+        levels = [level for level in self.LEVEL_MIN_SCORES if level != "low"]
+        return np.select(
+            [scores >= self.LEVEL_MIN_SCORES[level] for level in levels],
+            levels,
+            "low",
+        )
+
+    def detect_confusion_batch(
+        self,
+        quiz_accuracies: "np.ndarray",
+        chat_activity_high: "np.ndarray",
+        indicator_counts: Optional["np.ndarray"] = None,
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        detect_confusion의 배열 버전
+
+        Args:
+            quiz_accuracies: 정답률 (0-1)
+            chat_activity_high: 채팅 활동 많음 여부 (bool)
+            indicator_counts: 학생별 혼동 지표 개수 (없으면 0)
+
+        Returns:
+            (is_confused, confidence) 배열
+        """
+        accuracy = np.asarray(quiz_accuracies, dtype=np.float64)
+        chat_high = np.asarray(chat_activity_high, dtype=bool)
+        indicators = (
+            np.zeros(accuracy.shape, dtype=np.int64)
+            if indicator_counts is None
+            else np.asarray(indicator_counts, dtype=np.int64)
+        )
+
+        confidence = np.where(accuracy < 0.7, (0.7 - accuracy) / 0.7 * 0.4, 0.0)
+        confidence = confidence + np.where(chat_high, 0.3, 0.0)
+        confidence = confidence + np.where(
+            indicators > 0, np.minimum(indicators * 0.1, 0.4), 0.0
+        )
+        confidence = np.minimum(np.maximum(confidence, 0.0), 1.0)
+
+        # 지표·채팅 신호가 전혀 없으면 혼동 없음 (스칼라 버전의 조기 반환)
+        signal = chat_high | (indicators > 0)
+        confidence = np.where(signal, confidence, 0.0)
+        return confidence > 0.5, confidence
+
+    def score_engagements(
+        self,
+        engagements: List[StudentEngagement],
+        session_duration_minutes: float,
+    ) -> Dict[str, List[Any]]:
+        """
+        세션 학생 전체 점수를 한 번에 계산 (NumPy 없으면 스칼라 버전으로 계산)
+
+        Returns:
+            Dict: participation, overall, level, is_confused, confidence
+                  (engagements와 같은 순서의 파이썬 리스트)
+        """
+        if not NUMPY_AVAILABLE:
+            return self._score_engagements_scalar(
+                engagements, session_duration_minutes
+            )
+
+        chat = np.fromiter(
+            (e.metrics.chat_message_count for e in engagements), np.int64, len(engagements)
+        )
+        quiz = np.fromiter(
+            (e.metrics.participation_count for e in engagements), np.int64, len(engagements)
+        )
+        attention = np.fromiter(
+            (e.metrics.attention_score for e in engagements), np.float64, len(engagements)
+        )
+        accuracy = np.fromiter(
+            (e.metrics.quiz_accuracy for e in engagements), np.float64, len(engagements)
+        )
+
+        participation = self.calculate_participation_scores(
+            chat, quiz, session_duration_minutes
+        )
+        overall = self.calculate_overall_engagement_scores(
+            attention, participation, accuracy
+        )
+        is_confused, confidence = self.detect_confusion_batch(
+            accuracy, chat > self.HIGH_CHAT_THRESHOLD
+        )
+        return {
+            "participation": participation.tolist(),
+            "overall": overall.tolist(),
+            "level": self.interpret_engagement_levels(overall).tolist(),
+            "is_confused": is_confused.tolist(),
+            "confidence": confidence.tolist(),
+        }
+
+    def _score_engagements_scalar(
+        self,
+        engagements: List[StudentEngagement],
+        session_duration_minutes: float,
+    ) -> Dict[str, List[Any]]:
+        result: Dict[str, List[Any]] = {
+            "participation": [],
+            "overall": [],
+            "level": [],
+            "is_confused": [],
+            "confidence": [],
+        }
+        for e in engagements:
+            participation = self.calculate_participation_score(
+                e.metrics.chat_message_count,
+                e.metrics.participation_count,
+                session_duration_minutes,
+            )
+            overall = self.calculate_overall_engagement_score(
+                e.metrics.attention_score, participation, e.metrics.quiz_accuracy
+            )
+            is_confused, confidence = self.detect_confusion(
+                quiz_accuracy=e.metrics.quiz_accuracy,
+                chat_activity_high=e.metrics.chat_message_count
+                > self.HIGH_CHAT_THRESHOLD,
+                confusion_indicators=[],
+            )
+            result["participation"].append(participation)
+            result["overall"].append(overall)
+            result["level"].append(self.interpret_engagement_level(overall)["level"])
+            result["is_confused"].append(is_confused)
+            result["confidence"].append(confidence)
+        return result
+
+
+# ============================================
+# Session Aggregates
+# ============================================
+
+ENGAGEMENT_LEVELS = ("excellent", "good", "moderate", "low")
+
+
+class SessionAggregate:
+    """
+    세션 하나의 참여도 누적 집계 (활동마다 증분 갱신)
+
+    - 합계/레벨 분포: 이전 점수를 빼고 새 점수를 더함 (O(1))
+    - 최소/최대/상위 K: (점수, 학생) 정렬 리스트를 bisect로 유지
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.scores: Dict[str, float] = {}
+        self.names: Dict[str, str] = {}
+        self.total = 0.0
+        self.level_counts: Dict[str, int] = {level: 0 for level in ENGAGEMENT_LEVELS}
+        self._ranked: List[Tuple[float, str]] = []  # (score, student_id) 오름차순
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @staticmethod
+    def level_of(score: float) -> str:
+        return EngagementCalculator.interpret_engagement_level(score)["level"]
+
+    def update(self, student_id: str, student_name: str, score: float):
+        """학생 점수 반영 (기존 점수는 대체)"""
+        self.remove(student_id)
+        self.scores[student_id] = score
+        self.names[student_id] = student_name
+        self.total += score
+        self.level_counts[self.level_of(score)] += 1
+        insort(self._ranked, (score, student_id))
+
+    def remove(self, student_id: str):
+        """학생 제외"""
+        score = self.scores.pop(student_id, None)
+        if score is None:
+            return
+        self.names.pop(student_id, None)
+        self.total -= score
+        self.level_counts[self.level_of(score)] -= 1
+        del self._ranked[bisect_left(self._ranked, (score, student_id))]
+
+    def top(self, k: int) -> List[Dict[str, Any]]:
+        """점수 상위 k명"""
+        return [self._detail(sid, score) for score, sid in reversed(self._ranked[-k:])]
+
+    def _detail(self, student_id: str, score: float) -> Dict[str, Any]:
+        return {
+            "student_id": student_id,
+            "student_name": self.names[student_id],
+            "score": score,
+            "level": self.level_of(score),
+        }
+
+    def snapshot(self, top_k: int = 5) -> Dict[str, Any]:
+        """calculate_session_engagement와 같은 형식의 통계"""
+        count = len(self.scores)
+        if not count:
+            return {
+                "session_id": self.session_id,
+                "total_students": 0,
+                "average_score": 0.0,
+                "students_by_level": {},
+            }
+
+        return {
+            "session_id": self.session_id,
+            "total_students": count,
+            "average_score": self.total / count,
+            "max_score": self._ranked[-1][0],
+            "min_score": self._ranked[0][0],
+            "students_by_level": dict(self.level_counts),
+            "top_students": self.top(top_k),
+            "engagement_details": [
+                self._detail(sid, score) for score, sid in reversed(self._ranked)
+            ],
+        }
+
+
 class EngagementTracker:
     """실시간 학생 참여도 추적기"""
 
-    def __init__(self, db_manager):
+    def __init__(
+        self,
+        db_manager,
+        writer: Optional[EngagementWriteBuffer] = None,
+        history: Optional[EngagementHistory] = None,
+        presence: Optional[PresenceAggregator] = None,
+        presence_flush_interval: float = 10.0,
+    ):
         """
         Args:
             db_manager: DatabaseManager 인스턴스
+            writer: write-behind 버퍼 (없으면 활동마다 바로 DB 저장)
+            history: 학생별 점수 시계열 (없으면 기본 크기로 생성)
+            presence: 시청 heartbeat 집계기 (없으면 기본 설정으로 생성)
+            presence_flush_interval: presence 집계를 attention_score에 반영하는 주기 (초)
         """
         self.db_manager = db_manager
+        self.writer = writer
         self.calculator = EngagementCalculator()
-        self.engagement_cache: Dict[
-            str, StudentEngagement
-        ] = {}  # {session_id:student_id: engagement}
+        # 세션별 열 저장소 (StudentEngagement는 조회/반환 시에만 생성)
+        self.store = EngagementStore()
+        # 한 번 통째로 캐시에 올린 세션 (이후 캐시 미스는 신규 학생만)
+        self._warm_sessions: Set[str] = set()
+        # 진행 중인 warm-up (동시에 들어온 첫 이벤트들이 한 번만 조회하도록)
+        self._warming: Dict[str, asyncio.Task] = {}
+        # 세션별 누적 집계 (warm 처리된 세션만 — 전체 학생이 캐시에 있어야 정확)
+        self._aggregates: Dict[str, SessionAggregate] = {}
+        # 학생별 점수 시계열 (추세 분석용 링 버퍼)
+        self.history = history or EngagementHistory()
+        # 시청 heartbeat 집계 (메모리에서 구간 병합, 주기적으로 일괄 반영)
+        self.presence = presence or PresenceAggregator()
+        self.presence_flush_interval = presence_flush_interval
+        self._presence_task: Optional[asyncio.Task] = None
+        # 세션별 출제된 퀴즈 ID (퀴즈 응답률 계산용)
+        self._session_quizzes: Dict[str, Set[str]] = {}
+        # 참여도 변경 알림 (대시보드 스냅샷 등, session_id 인자)
+        self._change_listeners: List[Callable[[str], None]] = []
 
         logger.info("📊 EngagementTracker initialized")
 
+    async def warm_session(self, session_id: str) -> int:
+        """
+        세션 참여도를 한 번에 캐시에 적재 (세션 시작 또는 첫 이벤트 시)
+
+        Returns:
+            int: 적재한 학생 수
+        """
+        if session_id in self._warm_sessions:
+            return 0
+
+        task = self._warming.get(session_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load_session(session_id))
+            self._warming[session_id] = task
+            task.add_done_callback(lambda _: self._warming.pop(session_id, None))
+        return await asyncio.shield(task)
+
+    async def _load_session(self, session_id: str) -> int:
+        engagements = await self.db_manager.get_session_engagement(session_id)
+        loaded = 0
+        for engagement in engagements:
+            # 이미 캐시에 있는 항목(더 최신)은 덮어쓰지 않음
+            if not self.store.contains(session_id, engagement.student_id):
+                self.store.put(engagement)
+                if self.writer:
+                    self.writer.remember(engagement)
+                loaded += 1
+        self._warm_sessions.add(session_id)
+        self._rebuild_aggregate(session_id)
+        logger.debug(f"🔥 Engagement cache warmed: {session_id} ({loaded} students)")
+        return loaded
+
     async def track_activity(
         self,
         session_id: str,
@@ -359,6 +763,8 @@ class EngagementTracker:
         node_name: str,
         activity_type: ActivityType,
         activity_data: Dict,
+        timestamp: Optional[datetime] = None,
+        raise_errors: bool = False,
     ) -> Optional[StudentEngagement]:
         """
         학생 활동 기록 및 참여도 업데이트
@@ -370,22 +776,29 @@ class EngagementTracker:
             node_name: 노드 이름
             activity_type: 활동 타입 (CHAT, QUIZ_RESPONSE, PRESENCE)
             activity_data: 활동 데이터 (예: response_time_ms, is_correct 등)
+            timestamp: 활동 시각 (이벤트 재생 등, 없으면 현재 시각)
+            raise_errors: True면 실패 시 None 대신 예외 (스트림 소비자가 ACK 여부 결정)
 
         Returns:
             Optional[StudentEngagement]: 업데이트된 참여도 객체
         """
+        now = timestamp or datetime.now(UTC)
         try:
+            touch_session(session_id)
+
             # 기존 참여도 조회
-            cache_key = f"{session_id}:{student_id}"
-            engagement = self.engagement_cache.get(cache_key)
+            engagement = self.store.get(session_id, student_id)
+
+            if not engagement and session_id not in self._warm_sessions:
+                # 세션 첫 이벤트: 세션 전체를 한 번만 캐시에 적재
+                await self.warm_session(session_id)
+                engagement = self.store.get(session_id, student_id)
 
             if not engagement:
-                # DB에서 조회
-                engagements = await self.db_manager.get_session_engagement(session_id)
-                for eng in engagements:
-                    if eng.student_id == student_id:
-                        engagement = eng
-                        break
+                # warm-up 이후 들어온 학생: 유니크 인덱스로 단건 조회
+                engagement = await self.db_manager.get_student_engagement(
+                    session_id, student_id
+                )
 
             if not engagement:
                 # 새 참여도 객체 생성
@@ -395,15 +808,23 @@ class EngagementTracker:
                     student_name=student_name,
                     node_name=node_name,
                     metrics=EngagementMetrics(),
-                    updated_at=datetime.now(UTC),
+                    updated_at=now,
                 )
 
+            if self.writer:
+                # 변경 전 카운터를 $inc 기준값으로 (이미 있으면 유지)
+                self.writer.remember(engagement)
+
             # 활동 타입별 처리
             if activity_type == ActivityType.CHAT:
                 engagement.metrics.chat_message_count += 1
 
             elif activity_type == ActivityType.QUIZ_RESPONSE:
                 engagement.metrics.participation_count += 1
+                if activity_data.get("quiz_id"):
+                    self._session_quizzes.setdefault(session_id, set()).add(
+                        activity_data["quiz_id"]
+                    )
                 if "response_time_ms" in activity_data:
                     # 평균 응답 시간 계산
                     prev_latency = engagement.metrics.response_latency_ms
@@ -433,18 +854,34 @@ class EngagementTracker:
                     )
 
             elif activity_type == ActivityType.PRESENCE:
-                # Screen time 기록 (별도 처리)
-                pass
+                # 병합된 누적 시청 시간 (flush_presence()가 전달)
+                if "screen_time_seconds" in activity_data:
+                    engagement.metrics.screen_time_seconds = float(
+                        activity_data["screen_time_seconds"]
+                    )
+
+            if activity_type in (ActivityType.QUIZ_RESPONSE, ActivityType.PRESENCE):
+                # attention_score 입력이 바뀐 경우만 재계산
+                engagement.metrics.attention_score = self._attention_score(
+                    engagement, now.timestamp()
+                )
 
             # 마지막 활동 시간 업데이트
-            engagement.metrics.last_activity_time = datetime.now(UTC)
-            engagement.updated_at = datetime.now(UTC)
+            engagement.metrics.last_activity_time = now
+            engagement.updated_at = now
 
-            # 캐시 업데이트
-            self.engagement_cache[cache_key] = engagement
+            # 캐시, 세션 집계, 점수 시계열 업데이트
+            self.store.put(engagement)
+            score = self._update_aggregate(engagement)
+            self.history.record(session_id, student_id, score)
 
-            # DB 저장
-            await self.db_manager.update_student_engagement(engagement)
+            # DB 저장 (write-behind면 예약만 하고 다음 flush에서 bulk_write)
+            if self.writer:
+                self.writer.mark_dirty(engagement)
+            else:
+                await self.db_manager.update_student_engagement(engagement)
+
+            self._notify_change(session_id)
 
             logger.debug(
                 f"✅ Engagement tracked: {student_id} ({activity_type}) - score: {engagement.metrics.quiz_accuracy:.2f}"
@@ -454,8 +891,179 @@ class EngagementTracker:
 
         except Exception as e:
             logger.error(f"❌ Failed to track activity: {e}")
+            if raise_errors:
+                raise
             return None
 
+    def _attention_score(self, engagement: StudentEngagement, now: float) -> float:
+        """퀴즈 응답률·응답 속도·시청 시간으로 attention_score 계산"""
+        metrics = engagement.metrics
+        quizzes = len(self._session_quizzes.get(engagement.session_id, ()))
+        if quizzes:
+            participation_rate = min(metrics.participation_count / quizzes, 1.0)
+        else:
+            # 출제 정보가 없으면 응답 여부만 반영
+            participation_rate = 1.0 if metrics.participation_count else 0.0
+        # 응답이 없으면 지연 점수 0 (LATENCY_THRESHOLDS 밖의 값)
+        latency_ms = metrics.response_latency_ms if metrics.participation_count else -1
+
+        screen_minutes = metrics.screen_time_seconds / 60
+        elapsed = self.presence.session_elapsed(engagement.session_id, now)
+        max_possible = max((elapsed or 0.0) / 60, screen_minutes)
+
+        return self.calculator.calculate_attention_score(
+            quiz_participation_rate=participation_rate,
+            avg_response_latency_ms=latency_ms,
+            screen_time_minutes=screen_minutes,
+            max_possible_time=max_possible or 1.0,
+        )
+
+    def record_presence(
+        self,
+        session_id: str,
+        student_id: str,
+        student_name: str,
+        node_name: str,
+        timestamp: float,
+        covered_seconds: float,
+    ):
+        """
+        시청 heartbeat 기록 (메모리만 갱신, DB·점수 반영은 flush_presence()에서)
+
+        Args:
+            timestamp: heartbeat 시각 (epoch 초)
+            covered_seconds: heartbeat가 대표하는 시청 시간 (직전 heartbeat 간격)
+        """
+        self.presence.record(
+            session_id, student_id, timestamp, covered_seconds, student_name, node_name
+        )
+
+    async def flush_presence(self) -> int:
+        """
+        heartbeat가 들어온 학생들의 누적 시청 시간을 반영하고 attention_score 재계산
+
+        Returns:
+            int: 반영한 학생 수
+        """
+        drained = self.presence.drain(time.time())
+        for session_id, student_id, student_name, node_name, seconds in drained:
+            await self.track_activity(
+                session_id,
+                student_id,
+                student_name,
+                node_name,
+                ActivityType.PRESENCE,
+                {"screen_time_seconds": seconds},
+            )
+        if drained:
+            logger.debug(f"👀 Presence flushed: {len(drained)} students")
+        return len(drained)
+
+    def start_presence(self):
+        """presence 주기 반영 루프 시작"""
+        if self._presence_task is None:
+            self._presence_task = asyncio.create_task(self._presence_loop())
+
+    async def _presence_loop(self):
+        while True:
+            await asyncio.sleep(self.presence_flush_interval)
+            try:
+                await self.flush_presence()
+            except Exception as e:
+                logger.error(f"❌ Presence flush failed: {e}")
+
+    def add_change_listener(self, listener: Callable[[str], None]):
+        """참여도가 바뀔 때마다 호출할 콜백 등록 (동기, 가벼운 작업만)"""
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[str], None]):
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _notify_change(self, session_id: str):
+        for listener in self._change_listeners:
+            try:
+                listener(session_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Engagement change listener failed: {e}")
+
+    def _attended_score(self, engagement: StudentEngagement) -> float:
+        """세션에 참석 중인 학생의 종합 점수 (진행 시간은 참석 가산점 여부에만 쓰임)"""
+        return self.calculator.calculate_overall_engagement_score(
+            attention_score=engagement.metrics.attention_score,
+            participation_score=self.calculator.calculate_participation_score(
+                engagement.metrics.chat_message_count,
+                engagement.metrics.participation_count,
+                session_duration_minutes=1,
+            ),
+            quiz_accuracy=engagement.metrics.quiz_accuracy,
+        )
+
+    def _update_aggregate(self, engagement: StudentEngagement) -> float:
+        score = self._attended_score(engagement)
+        aggregate = self._aggregates.get(engagement.session_id)
+        if aggregate is not None:
+            aggregate.update(engagement.student_id, engagement.student_name, score)
+        return score
+
+    def _rebuild_aggregate(self, session_id: str):
+        aggregate = SessionAggregate(session_id)
+        self._aggregates[session_id] = aggregate
+        for engagement in self.store.engagements(session_id):
+            self._update_aggregate(engagement)
+
+    async def get_session_engagements(self, session_id: str) -> List[StudentEngagement]:
+        """세션 학생 참여도 목록 (처음 한 번만 DB에서 적재, 이후 메모리)"""
+        await self.warm_session(session_id)
+        return self.store.engagements(session_id)
+
+    def get_session_trends(
+        self, session_id: str, window_minutes: float = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        세션 학생 전체의 점수 추세 (최근 window_minutes, 회귀 기울기 + EWMA)
+
+        Returns:
+            List[Dict]: 학생별 {student_id, student_name, trend_direction, ...}
+        """
+        now = time.time()
+        since = now - window_minutes * 60
+        columns = self.store.session(session_id)
+        trends = []
+        for student_id, history in self.history.students(session_id):
+            timestamps, scores = history.samples(since)
+            slot = columns.slots.get(student_id) if columns is not None else None
+            trends.append(
+                {
+                    "student_id": student_id,
+                    "student_name": (
+                        columns.student_names[slot] if slot is not None else student_id
+                    ),
+                    **self.calculator.analyze_series(
+                        timestamps, scores, window_minutes, now=now
+                    ),
+                }
+            )
+        return trends
+
+    def get_student_trend(
+        self, session_id: str, student_id: str, window_minutes: float = 10
+    ) -> Dict[str, Any]:
+        """
+        학생 한 명의 점수 추세 (최근 window_minutes, 기록이 없으면 stable)
+
+        Returns:
+            Dict: trend_direction, trend_strength, slope_per_minute, ewma 등
+        """
+        now = time.time()
+        history = self.history.get(session_id, student_id)
+        timestamps, scores = (
+            history.samples(now - window_minutes * 60) if history else ([], [])
+        )
+        return self.calculator.analyze_series(
+            timestamps, scores, window_minutes, now=now
+        )
+
     async def calculate_session_engagement(
         self,
         session_id: str,
@@ -472,7 +1080,14 @@ class EngagementTracker:
             Dict: 세션별 참여도 통계
         """
         try:
-            engagements = await self.db_manager.get_session_engagement(session_id)
+            await self.warm_session(session_id)
+            aggregate = self._aggregates.get(session_id)
+            if aggregate is not None and session_duration_minutes > 0:
+                # 증분 집계에서 바로 응답 (DB 재조회/전체 재계산 없음)
+                return aggregate.snapshot()
+
+            # 진행 시간 0 (참석 가산점 없음): 캐시된 학생으로 재계산
+            engagements = self.store.engagements(session_id)
 
             if not engagements:
                 return {
@@ -529,9 +1144,107 @@ class EngagementTracker:
             logger.error(f"❌ Failed to calculate session engagement: {e}")
             return {}
 
+    def reset_session(self, session_id: str, students: Dict[str, Tuple[str, str]]):
+        """
+        세션 참여도를 빈 상태로 초기화 (이벤트 로그 재생 전 호출)
+
+        Args:
+            session_id: 세션 ID
+            students: {student_id: (student_name, node_name)}
+        """
+        self.store.drop_session(session_id)
+        self.history.drop_session(session_id)
+        self.presence.drop_session(session_id)
+        self._session_quizzes.pop(session_id, None)
+        # 재생 중 DB의 이전 값이 캐시에 올라오지 않도록 warm 처리된 것으로 간주
+        self._warm_sessions.add(session_id)
+
+        now = datetime.now(UTC)
+        for student_id, (student_name, node_name) in students.items():
+            engagement = StudentEngagement(
+                session_id=session_id,
+                student_id=student_id,
+                student_name=student_name,
+                node_name=node_name,
+                metrics=EngagementMetrics(),
+                updated_at=now,
+            )
+            self.store.put(engagement)
+            if self.writer:
+                # 재계산한 값으로 문서 전체를 덮어씀 ($inc 기준값과 무관)
+                self.writer.mark_dirty(engagement, replace=True)
+        self._rebuild_aggregate(session_id)
+        self._notify_change(session_id)
+
+    async def end_session(self, session_id: str) -> int:
+        """
+        세션 종료 시 남은 참여도 변경을 즉시 반영
+
+        Returns:
+            int: 반영한 학생 수
+        """
+        if not self.writer:
+            return 0
+        flushed = await self.writer.flush(session_id)
+        self.writer.forget_session(session_id)
+        return flushed
+
+    async def evict_session(self, session_id: str) -> int:
+        """
+        남은 변경을 DB에 반영한 뒤 세션 메모리 상태 제거
+        (이후 조회/활동 시 warm_session()으로 다시 적재)
+
+        Returns:
+            int: 메모리에서 제거한 학생 수
+        """
+        await self.flush_presence()
+        await self.end_session(session_id)
+
+        columns = self.store.session(session_id)
+        students = len(columns) if columns is not None else 0
+        self.store.drop_session(session_id)
+        self.history.drop_session(session_id)
+        self.presence.drop_session(session_id)
+        self._aggregates.pop(session_id, None)
+        self._session_quizzes.pop(session_id, None)
+        self._warm_sessions.discard(session_id)
+        return students
+
+    def memory_bytes(self) -> int:
+        """세션 상태 크기 (바이트, 추정치)"""
+        return deep_sizeof(
+            (
+                self.store,
+                self.history,
+                self.presence,
+                self._aggregates,
+                self._session_quizzes,
+                self._warm_sessions,
+            )
+        )
+
+    async def close(self):
+        """presence 루프 및 write-behind 종료 (남은 변경 모두 반영)"""
+        if self._presence_task:
+            self._presence_task.cancel()
+            try:
+                await self._presence_task
+            except asyncio.CancelledError:
+                pass
+            self._presence_task = None
+        # 마지막 주기 이후 heartbeat도 writer가 멈추기 전에 반영
+        await self.flush_presence()
+        if self.writer:
+            await self.writer.stop()
+
     async def clear_cache(self):
         """캐시 초기화"""
-        self.engagement_cache.clear()
+        self.store.clear()
+        self.history.clear()
+        self.presence.clear()
+        self._session_quizzes.clear()
+        self._warm_sessions.clear()
+        self._aggregates.clear()
         logger.info("🧹 Engagement cache cleared")
 
 
@@ -544,7 +1257,39 @@ async def init_engagement_tracker(db_manager) -> Optional[EngagementTracker]:
     global engagement_tracker
 
     try:
-        engagement_tracker = EngagementTracker(db_manager)
+        from config import (
+            ENGAGEMENT_WRITE_BEHIND,
+            ENGAGEMENT_FLUSH_MS,
+            ENGAGEMENT_TREND_SAMPLES,
+            ENGAGEMENT_TREND_RESOLUTION_SEC,
+            ENGAGEMENT_PRESENCE_HEARTBEAT_SEC,
+            ENGAGEMENT_PRESENCE_FLUSH_SEC,
+        )
+
+        writer = None
+        if ENGAGEMENT_WRITE_BEHIND:
+            writer = EngagementWriteBuffer(
+                db_manager, flush_interval=ENGAGEMENT_FLUSH_MS / 1000
+            )
+            writer.start()
+        history = EngagementHistory(
+            capacity=ENGAGEMENT_TREND_SAMPLES,
+            resolution=ENGAGEMENT_TREND_RESOLUTION_SEC,
+        )
+        # heartbeat 하나를 놓쳐도 연속 시청으로 보도록 간격만큼 허용,
+        # heartbeat 하나가 대표하는 시청 시간은 간격만큼으로 제한
+        presence = PresenceAggregator(
+            gap_tolerance=ENGAGEMENT_PRESENCE_HEARTBEAT_SEC,
+            max_covered=ENGAGEMENT_PRESENCE_HEARTBEAT_SEC,
+        )
+        engagement_tracker = EngagementTracker(
+            db_manager,
+            writer=writer,
+            history=history,
+            presence=presence,
+            presence_flush_interval=ENGAGEMENT_PRESENCE_FLUSH_SEC,
+        )
+        engagement_tracker.start_presence()
         logger.info("✅ EngagementTracker initialized successfully")
         return engagement_tracker
     except Exception as e:
@@ -553,6 +1298,15 @@ async def init_engagement_tracker(db_manager) -> Optional[EngagementTracker]:
         return None
 
 
+async def shutdown_engagement_tracker():
+    """EngagementTracker 종료 (write-behind 대기 변경 반영)"""
+    global engagement_tracker
+
+    if engagement_tracker:
+        await engagement_tracker.close()
+        engagement_tracker = None
+
+
 def get_engagement_tracker() -> Optional[EngagementTracker]:
     """EngagementTracker 인스턴스 반환"""
     return engagement_tracker
@@ -0,0 +1,169 @@
+"""
+AIRClass Engagement Store
+세션별 열(column) 단위 참여도 저장소
+
+학생마다 Pydantic StudentEngagement(중첩 모델 + datetime)를 들고 있지 않고
+세션마다 학생 슬롯 인덱스 + array 기반 열(카운트, 정답률, 지연, 시각)로 보관.
+StudentEngagement는 API 경계(조회/반환)에서만 만들어짐.
+
+- 정수 열: array('q'), 실수 열: array('d') → 학생당 수십 바이트
+- 시각은 UTC epoch 마이크로초 정수 (None은 NO_TIME)
+- 노드 이름은 sys.intern으로 공유
+- column()으로 NumPy 배열을 바로 얻어 배치 점수 계산에 사용 가능
+"""
+
+import sys
+from array import array
+from datetime import datetime, timedelta, UTC
+from typing import Dict, Iterator, List, Optional
+
+from schemas import EngagementMetrics, StudentEngagement
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 선택 의존성
+    np = None
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+NO_TIME = -(2**63)
+_MICROSECOND = timedelta(microseconds=1)
+
+INT_COLUMNS = ("participation_count", "response_latency_ms", "chat_message_count")
+FLOAT_COLUMNS = ("attention_score", "quiz_accuracy", "screen_time_seconds")
+TIME_COLUMNS = ("last_activity_time", "updated_at")
+
+
+def _to_micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return NO_TIME
+    if value.tzinfo is None:
+        # MongoDB에서 읽은 datetime은 naive UTC
+        value = value.replace(tzinfo=UTC)
+    return (value - EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> Optional[datetime]:
+    if value == NO_TIME:
+        return None
+    return EPOCH + timedelta(microseconds=value)
+
+
+class SessionColumns:
+    """세션 하나의 참여도 열 저장소"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.slots: Dict[str, int] = {}
+        self.student_ids: List[str] = []
+        self.student_names: List[str] = []
+        self.node_names: List[str] = []
+        self.columns: Dict[str, array] = {
+            **{name: array("q") for name in INT_COLUMNS},
+            **{name: array("d") for name in FLOAT_COLUMNS},
+            **{name: array("q") for name in TIME_COLUMNS},
+        }
+
+    def __len__(self) -> int:
+        return len(self.student_ids)
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self.slots
+
+    def put(self, engagement: StudentEngagement):
+        """학생 참여도 저장 (없으면 슬롯 추가)"""
+        slot = self.slots.get(engagement.student_id)
+        if slot is None:
+            slot = len(self.student_ids)
+            self.slots[engagement.student_id] = slot
+            self.student_ids.append(engagement.student_id)
+            self.student_names.append(engagement.student_name)
+            self.node_names.append(sys.intern(engagement.node_name))
+            for column in self.columns.values():
+                column.append(0)
+        else:
+            self.student_names[slot] = engagement.student_name
+            self.node_names[slot] = sys.intern(engagement.node_name)
+
+        metrics = engagement.metrics
+        for name in INT_COLUMNS + FLOAT_COLUMNS:
+            self.columns[name][slot] = getattr(metrics, name)
+        self.columns["last_activity_time"][slot] = _to_micros(metrics.last_activity_time)
+        self.columns["updated_at"][slot] = _to_micros(engagement.updated_at)
+
+    def get(self, student_id: str) -> Optional[StudentEngagement]:
+        """학생 참여도를 StudentEngagement로 변환 (없으면 None)"""
+        slot = self.slots.get(student_id)
+        return None if slot is None else self._materialize(slot)
+
+    def _materialize(self, slot: int) -> StudentEngagement:
+        c = self.columns
+        return StudentEngagement(
+            session_id=self.session_id,
+            student_id=self.student_ids[slot],
+            student_name=self.student_names[slot],
+            node_name=self.node_names[slot],
+            metrics=EngagementMetrics(
+                attention_score=c["attention_score"][slot],
+                participation_count=c["participation_count"][slot],
+                quiz_accuracy=c["quiz_accuracy"][slot],
+                response_latency_ms=c["response_latency_ms"][slot],
+                chat_message_count=c["chat_message_count"][slot],
+                screen_time_seconds=c["screen_time_seconds"][slot],
+                last_activity_time=_from_micros(c["last_activity_time"][slot]),
+            ),
+            updated_at=_from_micros(c["updated_at"][slot]),
+        )
+
+    def engagements(self) -> List[StudentEngagement]:
+        """세션 전체를 StudentEngagement 목록으로 변환 (슬롯 순서)"""
+        return [self._materialize(slot) for slot in range(len(self.student_ids))]
+
+    def column(self, name: str) -> "np.ndarray":
+        """열 복사본을 NumPy 배열로 (슬롯 순서)"""
+        # array 버퍼를 그대로 노출하면 이후 append가 막히므로 복사
+        return np.array(self.columns[name])
+
+    def nbytes(self) -> int:
+        """열 데이터 크기 (바이트, 문자열/인덱스 제외)"""
+        return sum(c.itemsize * len(c) for c in self.columns.values())
+
+
+class EngagementStore:
+    """세션별 SessionColumns 모음"""
+
+    def __init__(self):
+        self.sessions: Dict[str, SessionColumns] = {}
+
+    def __len__(self) -> int:
+        return sum(len(columns) for columns in self.sessions.values())
+
+    def __iter__(self) -> Iterator[SessionColumns]:
+        return iter(self.sessions.values())
+
+    def session(self, session_id: str, create: bool = False) -> Optional[SessionColumns]:
+        """세션 열 저장소 (create=True면 없을 때 생성)"""
+        columns = self.sessions.get(session_id)
+        if columns is None and create:
+            columns = self.sessions[session_id] = SessionColumns(session_id)
+        return columns
+
+    def get(self, session_id: str, student_id: str) -> Optional[StudentEngagement]:
+        columns = self.sessions.get(session_id)
+        return columns.get(student_id) if columns is not None else None
+
+    def contains(self, session_id: str, student_id: str) -> bool:
+        columns = self.sessions.get(session_id)
+        return columns is not None and student_id in columns
+
+    def put(self, engagement: StudentEngagement):
+        self.session(engagement.session_id, create=True).put(engagement)
+
+    def engagements(self, session_id: str) -> List[StudentEngagement]:
+        columns = self.sessions.get(session_id)
+        return columns.engagements() if columns is not None else []
+
+    def drop_session(self, session_id: str):
+        self.sessions.pop(session_id, None)
+
+    def clear(self):
+        self.sessions.clear()
@@ -0,0 +1,245 @@
+"""
+AIRClass Engagement Write-Behind
+참여도 변경을 모아서 MongoDB에 bulk_write 한 번으로 반영
+
+- 요청 경로는 mark_dirty()만 호출 (DB 대기 없음)
+- 같은 학생의 여러 변경은 하나로 합쳐짐 (마지막으로 예약한 상태)
+- 카운터는 마지막 반영값 대비 $inc, 나머지 필드는 $set (필드 단위 변경)
+- 재생 등으로 값이 통째로 바뀐 학생은 전체 문서 $set
+- flush 실패 시 기준값을 유지하고 다시 dirty 처리 → 다음 flush에서 재시도
+  (일부만 실패하면 반영된 학생은 기준값을 올리고 실패한 학생만 재시도 → $inc 중복 없음)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pymongo.errors import BulkWriteError
+
+from schemas import StudentEngagement
+from core.metrics import (
+    engagement_write_flush_lag_seconds,
+    engagement_write_batch_size,
+)
+
+logger = logging.getLogger(__name__)
+
+# $inc로 반영하는 누적 카운터 (여러 노드가 동시에 써도 합산됨)
+COUNTER_FIELDS = ("chat_message_count", "participation_count")
+# $set으로 반영하는 지표 필드
+METRIC_SET_FIELDS = (
+    "attention_score",
+    "quiz_accuracy",
+    "response_latency_ms",
+    "screen_time_seconds",
+    "last_activity_time",
+)
+
+
+def _key(session_id: str, student_id: str) -> str:
+    return f"{session_id}:{student_id}"
+
+
+def _counters(engagement: StudentEngagement) -> Dict[str, int]:
+    return {f: getattr(engagement.metrics, f) for f in COUNTER_FIELDS}
+
+
+class EngagementWriteBuffer:
+    """참여도 write-behind 버퍼"""
+
+    def __init__(self, db_manager, flush_interval: float = 0.2):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+            flush_interval: flush 간격 (초)
+        """
+        self.db_manager = db_manager
+        self.flush_interval = flush_interval
+        self._dirty: Dict[str, StudentEngagement] = {}
+        self._dirty_since: Dict[str, float] = {}
+        self._replace: Set[str] = set()
+        # 마지막으로 DB에 반영된 카운터 값 ($inc 기준)
+        self._baseline: Dict[str, Dict[str, int]] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self.flushed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        """반영 대기 중인 학생 수"""
+        return len(self._dirty)
+
+    @property
+    def flush_lag(self) -> float:
+        """가장 오래된 미반영 변경이 기다린 시간 (초)"""
+        if not self._dirty_since:
+            return 0.0
+        return time.monotonic() - min(self._dirty_since.values())
+
+    def remember(self, engagement: StudentEngagement):
+        """DB에서 읽었거나 새로 만든 참여도의 현재 카운터를 반영 기준값으로 기록"""
+        key = _key(engagement.session_id, engagement.student_id)
+        self._baseline.setdefault(key, _counters(engagement))
+
+    def mark_dirty(self, engagement: StudentEngagement, replace: bool = False):
+        """
+        변경 예약 (다음 flush에서 반영)
+
+        Args:
+            engagement: 변경된 참여도 (같은 학생은 마지막으로 예약한 상태가 반영됨)
+            replace: True면 필드 단위가 아닌 전체 문서로 덮어쓰기
+        """
+        key = _key(engagement.session_id, engagement.student_id)
+        self._dirty[key] = engagement
+        self._dirty_since.setdefault(key, time.monotonic())
+        if replace:
+            self._replace.add(key)
+
+    def forget_session(self, session_id: str):
+        """종료된 세션의 기준값 정리 (flush 이후 호출)"""
+        prefix = f"{session_id}:"
+        for key in [k for k in self._baseline if k.startswith(prefix)]:
+            if key not in self._dirty:
+                del self._baseline[key]
+
+    def _build_update(
+        self, key: str, engagement: StudentEngagement
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, int]]:
+        """(filter, update, 반영 후 기준값) 생성"""
+        filter_ = {
+            "session_id": engagement.session_id,
+            "student_id": engagement.student_id,
+        }
+        counters = _counters(engagement)
+
+        if key in self._replace:
+            return filter_, {"$set": engagement.model_dump()}, counters
+
+        baseline = self._baseline.get(key, {})
+        update: Dict[str, Any] = {
+            "$set": {
+                "student_name": engagement.student_name,
+                "node_name": engagement.node_name,
+                "updated_at": engagement.updated_at,
+                **{
+                    f"metrics.{f}": getattr(engagement.metrics, f)
+                    for f in METRIC_SET_FIELDS
+                },
+            }
+        }
+        inc = {
+            f"metrics.{f}": counters[f] - baseline.get(f, 0)
+            for f in COUNTER_FIELDS
+            if counters[f] != baseline.get(f, 0)
+        }
+        if inc:
+            update["$inc"] = inc
+        return filter_, update, counters
+
+    async def flush(self, session_id: Optional[str] = None) -> int:
+        """
+        예약된 변경을 bulk_write 한 번으로 반영
+
+        Args:
+            session_id: 지정하면 해당 세션의 변경만 반영
+
+        Returns:
+            int: 반영한 학생 수
+        """
+        async with self._lock:
+            if session_id is None:
+                keys = list(self._dirty)
+            else:
+                prefix = f"{session_id}:"
+                keys = [k for k in self._dirty if k.startswith(prefix)]
+            if not keys:
+                engagement_write_flush_lag_seconds.set(self.flush_lag)
+                return 0
+
+            # 스냅샷을 뜬 뒤 dirty 해제 (flush 중 들어온 변경은 다시 dirty)
+            batch = []
+            updates = []
+            for key in keys:
+                engagement = self._dirty.pop(key)
+                filter_, update, counters = self._build_update(key, engagement)
+                replace = key in self._replace
+                self._replace.discard(key)
+                since = self._dirty_since.pop(key)
+                batch.append((key, engagement, counters, replace, since))
+                updates.append((filter_, update))
+
+            failed: List[Tuple[str, StudentEngagement, Dict[str, int], bool, float]]
+            try:
+                await self.db_manager.bulk_update_student_engagement(updates)
+                failed = []
+            except BulkWriteError as e:
+                # ordered=False: writeErrors에 없는 업데이트는 반영됨
+                indexes = {error["index"] for error in e.details.get("writeErrors", [])}
+                failed = [item for i, item in enumerate(batch) if i in indexes]
+                logger.error(
+                    f"❌ Failed to flush {len(failed)}/{len(batch)} engagement updates: "
+                    f"{e.details.get('writeErrors', [])[:1]}"
+                )
+            except Exception as e:
+                failed = batch
+                logger.error(f"❌ Failed to flush {len(batch)} engagement updates: {e}")
+
+            if failed:
+                self._requeue(failed)
+            failed_keys = {item[0] for item in failed}
+            written = [item for item in batch if item[0] not in failed_keys]
+            for key, _, counters, _, _ in written:
+                self._baseline[key] = counters
+
+            self.flushed += len(written)
+            if written:
+                engagement_write_batch_size.observe(len(written))
+            engagement_write_flush_lag_seconds.set(self.flush_lag)
+            return len(written)
+
+    def _requeue(
+        self, items: List[Tuple[str, StudentEngagement, Dict[str, int], bool, float]]
+    ):
+        """반영하지 못한 변경을 기준값 그대로 다시 예약 (delta가 누적되어 다음에 반영)"""
+        self.failed += len(items)
+        for key, engagement, _, replace, since in items:
+            self._dirty.setdefault(key, engagement)
+            self._dirty_since[key] = min(since, self._dirty_since.get(key, since))
+            if replace:
+                self._replace.add(key)
+
+    async def _run(self):
+        # bulk_write 도중 취소되면 반영 여부를 알 수 없으므로 취소 대신 이벤트로 종료
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self):
+        """백그라운드 flush 시작"""
+        if not self.running:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"💾 Engagement write-behind started "
+                f"(flush={self.flush_interval * 1000:g}ms)"
+            )
+
+    async def stop(self):
+        """백그라운드 flush 종료 (남은 변경은 모두 반영)"""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
@@ -0,0 +1,346 @@
+"""
+AIRClass Quiz Response Ingestion
+학생 퀴즈 응답을 모아서 MongoDB에 한 번에 저장 (group commit)
+
+- 발행된 퀴즈 정의는 read-through 캐시 (발행/삭제 시 무효화, TTL로 다른 노드 변경 반영)
+- 응답 요청은 대기열에 넣고 다음 flush 결과를 기다림 (저장 후 응답 → 유실 없음)
+- flush마다 응답 bulk_write 1회 + 퀴즈별 카운터 갱신 1회
+- (quiz_id, student_id) upsert로 중복 응답은 저장/집계하지 않음
+- 통계 이벤트는 응답마다가 아니라 flush마다 퀴즈별로 1건 발행
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, UTC
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from schemas import Quiz, QuizResponse, QuizResponseCreate
+from core.database import quiz_counter_inc
+from core.metrics import (
+    quiz_definition_cache_total,
+    quiz_ingest_batch_size,
+    quiz_responses_ingested_total,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QuizDefinitionCache:
+    """발행된 퀴즈 정의 read-through 캐시"""
+
+    def __init__(self, db_manager, ttl: float = 30.0, max_entries: int = 1024):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+            ttl: 캐시 유지 시간 (초)
+            max_entries: 최대 퀴즈 수 (넘으면 가장 오래 안 쓴 퀴즈부터 제거)
+        """
+        self.db_manager = db_manager
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Quiz, float]]" = OrderedDict()
+
+    async def get(self, quiz_id: str) -> Optional[Quiz]:
+        """퀴즈 조회 (발행된 퀴즈만 캐시, 미발행 퀴즈는 매번 DB 조회)"""
+        entry = self._entries.get(quiz_id)
+        if entry and entry[1] > time.monotonic():
+            self._entries.move_to_end(quiz_id)
+            quiz_definition_cache_total.labels(result="hit").inc()
+            return entry[0]
+
+        quiz_definition_cache_total.labels(result="miss").inc()
+        quiz = await self.db_manager.get_quiz(quiz_id)
+        if quiz and quiz.published:
+            self._entries[quiz_id] = (quiz, time.monotonic() + self.ttl)
+            self._entries.move_to_end(quiz_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.pop(quiz_id, None)
+        return quiz
+
+    def invalidate(self, quiz_id: str):
+        """퀴즈 발행/삭제 시 호출"""
+        self._entries.pop(quiz_id, None)
+
+
+@dataclass
+class PendingResponse:
+    """저장 대기 중인 응답 하나"""
+
+    session_id: str
+    doc: Dict[str, Any]
+    future: asyncio.Future
+
+
+class QuizResponseIngestor:
+    """퀴즈 응답 group commit"""
+
+    def __init__(
+        self,
+        db_manager,
+        messaging=None,
+        batch_size: int = 200,
+        flush_interval: float = 0.05,
+        cache_ttl: float = 30.0,
+    ):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+            messaging: MessagingSystem (없으면 이벤트 발행 생략)
+            batch_size: bulk_write 한 번에 저장할 최대 응답 수
+            flush_interval: flush 간격 (초, 응답 지연의 상한)
+            cache_ttl: 퀴즈 정의 캐시 유지 시간 (초)
+        """
+        self.db_manager = db_manager
+        self.messaging = messaging
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.cache = QuizDefinitionCache(db_manager, ttl=cache_ttl)
+        self._pending: List[PendingResponse] = []
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self._stats_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self.accepted = 0
+        self.duplicates = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        """저장 대기 중인 응답 수"""
+        return len(self._pending)
+
+    def add_stats_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """flush 후 퀴즈별 최신 통계를 받을 콜백 등록 (동기, 가벼운 작업만)"""
+        self._stats_listeners.append(listener)
+
+    def remove_stats_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        if listener in self._stats_listeners:
+            self._stats_listeners.remove(listener)
+
+    async def submit(
+        self, quiz: Quiz, request: QuizResponseCreate
+    ) -> Optional[QuizResponse]:
+        """
+        응답 예약 후 저장될 때까지 대기
+
+        Args:
+            quiz: 발행된 퀴즈 (QuizDefinitionCache에서 조회)
+            request: 학생 응답
+
+        Returns:
+            QuizResponse: 저장된 응답 (이미 응답한 학생이면 None)
+        """
+        doc = {
+            **request.model_dump(),
+            "is_correct": request.selected_option_id == quiz.correct_option_id,
+            "responded_at": datetime.now(UTC),
+        }
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(PendingResponse(quiz.session_id, doc, future))
+        if not self.running:
+            # 백그라운드 flush가 없으면 (종료 후 등) 바로 저장
+            await self.flush()
+        elif len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+        if not await future:
+            return None
+        return QuizResponse(**doc)
+
+    async def flush(self) -> int:
+        """
+        대기 중인 응답 저장
+
+        Returns:
+            int: 새로 저장한 응답 수
+        """
+        async with self._lock:
+            accepted = 0
+            while self._pending:
+                batch = self._pending[: self.batch_size]
+                del self._pending[: self.batch_size]
+                accepted += await self._write(batch)
+            return accepted
+
+    async def _write(self, batch: List[PendingResponse]) -> int:
+        # 같은 batch 안의 중복은 먼저 들어온 응답만
+        unique: Dict[Tuple[str, str], PendingResponse] = {}
+        for item in batch:
+            unique.setdefault((item.doc["quiz_id"], item.doc["student_id"]), item)
+        items = list(unique.values())
+
+        try:
+            inserted = await self.db_manager.bulk_insert_quiz_responses(
+                [item.doc for item in items]
+            )
+        except Exception as e:
+            self.failed += len(batch)
+            quiz_responses_ingested_total.labels(result="failed").inc(len(batch))
+            logger.error(f"❌ Failed to store {len(batch)} quiz responses: {e}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return 0
+
+        accepted = [item for item, ok in zip(items, inserted) if ok]
+        accepted_ids = {id(item) for item in accepted}
+        quiz_ingest_batch_size.observe(len(items))
+
+        # 퀴즈별 카운터 증가량 합산
+        incs: Dict[str, Dict[str, Any]] = {}
+        sessions: Dict[str, str] = {}
+        for item in accepted:
+            quiz_id = item.doc["quiz_id"]
+            sessions[quiz_id] = item.session_id
+            inc = incs.setdefault(quiz_id, {})
+            for field, amount in quiz_counter_inc(
+                item.doc["selected_option_id"],
+                item.doc["is_correct"],
+                item.doc["response_time"],
+            ).items():
+                inc[field] = inc.get(field, 0) + amount
+
+        stats: Dict[str, Dict[str, Any]] = {}
+        for quiz_id, inc in incs.items():
+            try:
+                updated = await self.db_manager.increment_quiz_counters(quiz_id, inc)
+                if updated:
+                    stats[quiz_id] = updated
+            except Exception as e:
+                # 응답은 저장됨: 카운터는 rebuild_quiz_stats로 복구
+                logger.error(f"❌ Failed to update quiz counters ({quiz_id}): {e}")
+        for quiz_id, quiz_stats in stats.items():
+            for listener in self._stats_listeners:
+                try:
+                    listener(quiz_id, quiz_stats)
+                except Exception as e:
+                    logger.warning(f"⚠️ Quiz stats listener failed: {e}")
+
+        # 저장 결과 전달 (카운터 반영 후라서 통계 조회에 바로 포함됨)
+        for item in batch:
+            if not item.future.done():
+                item.future.set_result(id(item) in accepted_ids)
+
+        duplicates = len(batch) - len(accepted)
+        self.accepted += len(accepted)
+        self.duplicates += duplicates
+        quiz_responses_ingested_total.labels(result="accepted").inc(len(accepted))
+        if duplicates:
+            quiz_responses_ingested_total.labels(result="duplicate").inc(duplicates)
+
+        await self._publish(accepted, sessions, stats)
+        return len(accepted)
+
+    async def _publish(
+        self,
+        accepted: List[PendingResponse],
+        sessions: Dict[str, str],
+        stats: Dict[str, Dict[str, Any]],
+    ):
+        """퀴즈별 통계 이벤트 1건 + 학생별 참여도 이벤트 (배치 발행기로 묶여서 전송)"""
+        if not self.messaging:
+            return
+        try:
+            for quiz_id, quiz_stats in stats.items():
+                await self.messaging.publish_quiz_event(
+                    session_id=sessions[quiz_id],
+                    quiz_id=quiz_id,
+                    event_type="stats",
+                    data={"stats": quiz_stats},
+                )
+            for item in accepted:
+                await self.messaging.publish_engagement_event(
+                    session_id=item.session_id,
+                    student_id=item.doc["student_id"],
+                    activity_type="quiz_response",
+                    data={
+                        "quiz_id": item.doc["quiz_id"],
+                        "is_correct": item.doc["is_correct"],
+                        "response_time": item.doc["response_time"],
+                    },
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to publish quiz ingestion events: {e}")
+
+    async def _run(self):
+        # bulk_write 도중 취소되면 저장 여부를 알 수 없으므로 취소 대신 이벤트로 종료
+        while not self._stopping.is_set():
+            if len(self._pending) < self.batch_size:
+                self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self):
+        """백그라운드 flush 시작"""
+        if not self.running:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"📝 Quiz response ingestion started "
+                f"(batch_size={self.batch_size}, flush={self.flush_interval * 1000:g}ms)"
+            )
+
+    async def stop(self):
+        """백그라운드 flush 종료 (대기 중인 응답은 모두 저장)"""
+        if self._task is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+# 전역 인스턴스
+quiz_ingestor: Optional[QuizResponseIngestor] = None
+
+
+async def init_quiz_ingestor(db_manager, messaging=None) -> Optional[QuizResponseIngestor]:
+    """QuizResponseIngestor 초기화"""
+    global quiz_ingestor
+
+    if db_manager is None:
+        return None
+
+    from config import (
+        QUIZ_INGEST_BATCH_SIZE,
+        QUIZ_INGEST_FLUSH_MS,
+        QUIZ_DEFINITION_CACHE_TTL_SEC,
+    )
+
+    quiz_ingestor = QuizResponseIngestor(
+        db_manager,
+        messaging=messaging,
+        batch_size=QUIZ_INGEST_BATCH_SIZE,
+        flush_interval=QUIZ_INGEST_FLUSH_MS / 1000,
+        cache_ttl=QUIZ_DEFINITION_CACHE_TTL_SEC,
+    )
+    quiz_ingestor.start()
+    logger.info("✅ QuizResponseIngestor initialized")
+    return quiz_ingestor
+
+
+async def shutdown_quiz_ingestor():
+    """QuizResponseIngestor 종료 (대기 중인 응답 저장)"""
+    global quiz_ingestor
+
+    if quiz_ingestor:
+        await quiz_ingestor.stop()
+        quiz_ingestor = None
+
+
+def get_quiz_ingestor() -> Optional[QuizResponseIngestor]:
+    """QuizResponseIngestor 인스턴스 반환"""
+    return quiz_ingestor
@@ -0,0 +1,245 @@
+"""
+AIRClass Live Quiz Statistics
+퀴즈별 최신 통계를 메모리에 두고 구독 중인 교사/모니터 소켓에 제한된 속도로 push
+
+- 통계는 응답 수집기(같은 노드)와 퀴즈 "stats" 이벤트(다른 노드)로 갱신
+  (둘 다 DB 카운터 기준의 전체 통계라서 중복 반영되어도 결과가 같음)
+- total_responses가 줄어든 통계는 늦게 도착한 이벤트로 보고 무시 (재구성 시에만 reset)
+- 구독자는 최대 max_rate Hz로 최신 통계만 받음 (그 사이 변경은 하나로 합쳐짐)
+- MongoDB는 퀴즈를 처음 구독할 때 한 번만 조회
+- 이벤트 구독이 끊기면 백오프 후 다시 구독 (잘못된 이벤트는 건너뜀)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from core.metrics import quiz_stats_pushes_total, quiz_stats_subscribers
+
+logger = logging.getLogger(__name__)
+
+QUIZ_CHANNEL_PATTERN = "airclass:session:*:quiz"
+
+# 구독이 끊겼을 때 다시 구독하기 전 대기 시간 (초, 실패할 때마다 두 배)
+RESUBSCRIBE_BACKOFF_SEC = 1.0
+RESUBSCRIBE_BACKOFF_MAX_SEC = 30.0
+
+
+class LiveQuizStats:
+    """퀴즈 하나의 최신 통계"""
+
+    def __init__(self, quiz_id: str, stats: Dict[str, Any]):
+        self.quiz_id = quiz_id
+        self.stats = stats
+        self.version = 1
+        self.subscribers: List["QuizStatsSubscriber"] = []
+
+    def apply(self, stats: Dict[str, Any], force: bool = False) -> bool:
+        """
+        새 통계 반영
+
+        Args:
+            stats: get_quiz_stats 형식의 전체 통계
+            force: True면 응답 수가 줄어도 반영 (카운터 재구성 후)
+
+        Returns:
+            bool: 바뀌었으면 True
+        """
+        if stats == self.stats:
+            return False
+        if not force and stats["total_responses"] < self.stats["total_responses"]:
+            return False
+        self.stats = stats
+        self.version += 1
+        for subscriber in self.subscribers:
+            subscriber.updated.set()
+        return True
+
+
+class QuizStatsSubscriber:
+    """통계 소켓 하나의 구독 상태"""
+
+    def __init__(self, live: LiveQuizStats, min_interval: float):
+        self.live = live
+        self.min_interval = min_interval
+        self.version = 0  # 이 구독자에게 마지막으로 보낸 version
+        self.updated = asyncio.Event()
+        self._last_sent = 0.0
+
+    async def next_stats(self) -> Dict[str, Any]:
+        """새 통계가 나올 때까지 대기 (직전 전송 후 min_interval이 지나야 반환)"""
+        while self.version >= self.live.version:
+            self.updated.clear()
+            await self.updated.wait()
+
+        wait = self._last_sent + self.min_interval - time.monotonic()
+        if wait > 0:
+            # 기다리는 동안 들어온 변경은 이번 전송에 합쳐짐
+            await asyncio.sleep(wait)
+
+        self.version = self.live.version
+        self._last_sent = time.monotonic()
+        quiz_stats_pushes_total.inc()
+        return self.live.stats
+
+
+class QuizStatsHub:
+    """구독 중인 퀴즈의 실시간 통계 관리"""
+
+    def __init__(self, db_manager, bus=None, max_rate: float = 4.0):
+        """
+        Args:
+            db_manager: DatabaseManager (처음 구독할 때 통계 조회)
+            bus: 이벤트 버스 (다른 노드의 통계 이벤트 수신, 없으면 같은 노드만)
+            max_rate: 구독자별 최대 전송 횟수 (Hz)
+        """
+        self.db_manager = db_manager
+        self.bus = bus
+        self.min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.quizzes: Dict[str, LiveQuizStats] = {}
+        self._subscription = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def subscribe(self, quiz_id: str) -> Optional[QuizStatsSubscriber]:
+        """
+        퀴즈 통계 구독
+
+        Returns:
+            QuizStatsSubscriber: 없는 퀴즈면 None
+        """
+        live = self.quizzes.get(quiz_id)
+        if live is None:
+            stats = await self.db_manager.get_quiz_stats(quiz_id)
+            if stats is None:
+                return None
+            # 조회하는 동안 다른 구독자가 먼저 만들었으면 그쪽에 합침
+            live = self.quizzes.get(quiz_id)
+            if live is None:
+                live = self.quizzes[quiz_id] = LiveQuizStats(quiz_id, stats)
+            else:
+                live.apply(stats)
+
+        subscriber = QuizStatsSubscriber(live, self.min_interval)
+        live.subscribers.append(subscriber)
+        quiz_stats_subscribers.inc()
+        return subscriber
+
+    def unsubscribe(self, subscriber: QuizStatsSubscriber):
+        live = subscriber.live
+        if subscriber not in live.subscribers:
+            return
+        live.subscribers.remove(subscriber)
+        quiz_stats_subscribers.dec()
+        if not live.subscribers and self.quizzes.get(live.quiz_id) is live:
+            # 보는 소켓이 없으면 통계도 들고 있지 않음
+            del self.quizzes[live.quiz_id]
+
+    def on_stats(self, quiz_id: str, stats: Dict[str, Any]):
+        """최신 통계 반영 (구독 중인 퀴즈만)"""
+        live = self.quizzes.get(quiz_id)
+        if live is not None:
+            live.apply(stats)
+
+    def reset(self, quiz_id: str, stats: Dict[str, Any]):
+        """카운터 재구성 후 통계 교체 (응답 수가 줄어도 반영)"""
+        live = self.quizzes.get(quiz_id)
+        if live is not None:
+            live.apply(stats, force=True)
+
+    def _handle_event(self, event: Dict[str, Any]):
+        if event.get("event_type") == "stats" and "stats" in event:
+            self.on_stats(event["quiz_id"], event["stats"])
+
+    async def _listen(self):
+        """다른 노드의 통계 이벤트 수신 (구독이 끊기면 백오프 후 다시 구독)"""
+        backoff = RESUBSCRIBE_BACKOFF_SEC
+        while True:
+            try:
+                if self._subscription is None:
+                    self._subscription = await self.bus.psubscribe(QUIZ_CHANNEL_PATTERN)
+                    logger.info(f"🎧 Resubscribed to {QUIZ_CHANNEL_PATTERN}")
+                async for message in self._subscription.listen():
+                    backoff = RESUBSCRIBE_BACKOFF_SEC
+                    try:
+                        self._handle_event(message["data"])
+                    except Exception as e:
+                        logger.error(f"❌ Error handling quiz stats event: {e}")
+                logger.warning("⚠️ Quiz stats subscription ended, resubscribing")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Quiz stats subscription failed: {e}")
+
+            subscription, self._subscription = self._subscription, None
+            if subscription is not None:
+                try:
+                    await subscription.close()
+                except Exception as e:
+                    logger.debug(f"Closing broken subscription failed: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RESUBSCRIBE_BACKOFF_MAX_SEC)
+
+    async def start(self):
+        """다른 노드의 통계 이벤트 수신 시작"""
+        if self.bus is None or self._task is not None:
+            return
+        self._subscription = await self.bus.psubscribe(QUIZ_CHANNEL_PATTERN)
+        self._task = asyncio.create_task(self._listen())
+        logger.info(f"🎧 Listening to {QUIZ_CHANNEL_PATTERN} for quiz stats")
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._subscription:
+            await self._subscription.close()
+            self._subscription = None
+        self.quizzes.clear()
+
+
+# 전역 인스턴스
+_quiz_stats_hub: Optional[QuizStatsHub] = None
+
+
+async def init_quiz_stats_hub(
+    db_manager, messaging=None, ingestor=None
+) -> Optional[QuizStatsHub]:
+    """QuizStatsHub 초기화 (수집기 통계 콜백 + 퀴즈 이벤트 구독)"""
+    global _quiz_stats_hub
+
+    if db_manager is None:
+        return None
+
+    from config import QUIZ_STATS_MAX_RATE_HZ
+
+    bus = messaging.bus if messaging else None
+    _quiz_stats_hub = QuizStatsHub(db_manager, bus=bus, max_rate=QUIZ_STATS_MAX_RATE_HZ)
+    if ingestor:
+        ingestor.add_stats_listener(_quiz_stats_hub.on_stats)
+    await _quiz_stats_hub.start()
+    logger.info(f"✅ QuizStatsHub initialized (max {QUIZ_STATS_MAX_RATE_HZ:g} Hz)")
+    return _quiz_stats_hub
+
+
+async def shutdown_quiz_stats_hub():
+    """QuizStatsHub 종료"""
+    global _quiz_stats_hub
+
+    if _quiz_stats_hub:
+        from services.quiz_ingestion import get_quiz_ingestor
+
+        ingestor = get_quiz_ingestor()
+        if ingestor:
+            ingestor.remove_stats_listener(_quiz_stats_hub.on_stats)
+        await _quiz_stats_hub.close()
+        _quiz_stats_hub = None
+
+
+def get_quiz_stats_hub() -> Optional[QuizStatsHub]:
+    """QuizStatsHub 인스턴스 반환"""
+    return _quiz_stats_hub
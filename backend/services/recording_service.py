@@ -10,6 +10,9 @@ from datetime import datetime, UTC
 from typing import Optional, Dict, List
 from pathlib import Path
 
+from services.session_lifecycle import touch_session
+from utils.memory import deep_sizeof
+
 logger = logging.getLogger(__name__)
 
 
@@ -83,6 +86,7 @@ class RecordingManager:
                 "output_format": output_format
             }
             
+            touch_session(session_id)
             logger.info(f"🎬 Recording started: {recording_id}")
             
             return {
@@ -300,6 +304,31 @@ class RecordingManager:
             logger.warning(f"⚠️ Failed to get video duration: {e}")
             return 0
 
+    def evict_session(self, session_id: str) -> List[Dict]:
+        """
+        종료된 녹화 정보를 메모리에서 제거 (녹화 중인 항목은 유지)
+        
+        Returns:
+            보관용 녹화 메타데이터 목록 (파일은 그대로 유지)
+        """
+        evicted = []
+        for recording_id, recording in list(self.active_recordings.items()):
+            if recording["session_id"] != session_id or recording["status"] == "recording":
+                continue
+            del self.active_recordings[recording_id]
+            metadata = {k: v for k, v in recording.items() if k != "process"}
+            evicted.append({"recording_id": recording_id, **metadata})
+        return evicted
+
+    def memory_bytes(self) -> int:
+        """녹화 정보 크기 (바이트, 추정치 — ffmpeg 프로세스 핸들 제외)"""
+        return deep_sizeof(
+            [
+                {k: v for k, v in recording.items() if k != "process"}
+                for recording in self.active_recordings.values()
+            ]
+        )
+
     def get_all_recordings(self) -> List[Dict]:
         """
         모든 녹화 조회
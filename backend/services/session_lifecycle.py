@@ -0,0 +1,255 @@
+"""
+AIRClass Session Lifecycle
+세션 단위 인메모리 상태의 수명 관리
+
+- 세션 종료(end_session) 또는 유휴 TTL 경과 시 각 컴포넌트의 세션 상태를
+  flush → MongoDB로 spill → 메모리에서 제거
+- 컴포넌트별 메모리 사용량(바이트)을 주기적으로 집계해 메트릭으로 노출하고,
+  전체 예산을 넘으면 가장 오래 쉬고 있는 세션부터 정리
+  (직전 점검 주기 안에 활동한 세션은 제외, 정리해도 사용량이 줄지 않으면
+  — 녹화 중·스트림 할당 등 정리할 수 없는 상태 — 그 회차는 중단)
+
+컴포넌트 규약 (모두 선택):
+    evict_session(session_id) -> int | List[dict] (동기/비동기)
+        세션 상태 제거. dict 목록을 돌려주면 session_archive에 보관
+    memory_bytes() -> int
+        보유 중인 캐시 크기 (추정치)
+    prune_idle(idle_seconds) -> int
+        세션에 묶이지 않은 항목 중 오래된 것 정리 (예: 스트림 할당)
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from core.metrics import (
+    session_state_bytes,
+    session_state_budget_bytes,
+    session_lifecycle_sessions,
+    session_evictions_total,
+    session_spilled_documents_total,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SessionLifecycleManager:
+    """세션 상태 수명 관리자"""
+
+    def __init__(
+        self,
+        db_manager=None,
+        idle_ttl: float = 3600.0,
+        sweep_interval: float = 60.0,
+        byte_budget: int = 0,
+    ):
+        """
+        Args:
+            db_manager: DatabaseManager (없으면 spill 없이 제거만)
+            idle_ttl: 마지막 활동 후 이 시간(초)이 지나면 세션 정리
+            sweep_interval: 유휴 세션/메모리 점검 주기 (초)
+            byte_budget: 전체 메모리 예산 (바이트, 0이면 제한 없음)
+        """
+        self.db_manager = db_manager
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self.byte_budget = byte_budget
+        self.components: Dict[str, Any] = {}
+        # 세션별 마지막 활동 시각 (monotonic) — 삽입 순서 = 오래된 순
+        self.last_seen: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        session_state_budget_bytes.set(byte_budget)
+        logger.info("♻️ SessionLifecycleManager initialized")
+
+    def register(self, name: str, component: Any):
+        """세션 상태를 가진 컴포넌트 등록"""
+        if component is not None:
+            self.components[name] = component
+
+    def touch(self, session_id: str):
+        """세션 활동 기록 (유휴 판정 기준)"""
+        # 끝으로 옮겨서 last_seen이 항상 오래된 순으로 유지되게 함
+        self.last_seen.pop(session_id, None)
+        self.last_seen[session_id] = time.monotonic()
+
+    async def end_session(self, session_id: str, reason: str = "ended") -> Dict[str, int]:
+        """
+        세션 상태를 모든 컴포넌트에서 정리
+
+        Returns:
+            Dict[str, int]: 컴포넌트별 정리한 항목 수
+        """
+        evicted: Dict[str, int] = {}
+        for name, component in list(self.components.items()):
+            evict = getattr(component, "evict_session", None)
+            if evict is None:
+                continue
+            try:
+                result = evict(session_id)
+                if inspect.isawaitable(result):
+                    result = await result
+                if isinstance(result, list):
+                    await self._spill(session_id, name, result)
+                    result = len(result)
+                evicted[name] = result or 0
+            except Exception as e:
+                logger.error(f"❌ Failed to evict {name} state for {session_id}: {e}")
+
+        self.last_seen.pop(session_id, None)
+        session_evictions_total.labels(reason=reason).inc()
+        session_lifecycle_sessions.set(len(self.last_seen))
+        logger.info(f"♻️ Session state evicted ({reason}): {session_id} {evicted}")
+        return evicted
+
+    async def _spill(self, session_id: str, component: str, documents: List[dict]):
+        """제거하는 상태를 MongoDB에 보관"""
+        if not documents or not self.db_manager:
+            return
+        if await self.db_manager.archive_session_state(session_id, component, documents):
+            session_spilled_documents_total.labels(component=component).inc(
+                len(documents)
+            )
+
+    def memory_usage(self) -> Dict[str, int]:
+        """컴포넌트별 메모리 사용량 (바이트) 집계 및 메트릭 갱신"""
+        usage: Dict[str, int] = {}
+        for name, component in self.components.items():
+            measure = getattr(component, "memory_bytes", None)
+            if measure is None:
+                continue
+            try:
+                usage[name] = measure()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to measure {name} memory: {e}")
+                continue
+            session_state_bytes.labels(component=name).set(usage[name])
+        return usage
+
+    async def sweep(self) -> int:
+        """
+        유휴 세션 정리 + 메모리 예산 점검
+
+        Returns:
+            int: 정리한 세션 수
+        """
+        now = time.monotonic()
+        idle = [s for s, seen in self.last_seen.items() if now - seen >= self.idle_ttl]
+        for session_id in idle:
+            await self.end_session(session_id, reason="idle")
+
+        for name, component in self.components.items():
+            prune = getattr(component, "prune_idle", None)
+            if prune is not None:
+                pruned = prune(self.idle_ttl)
+                if pruned:
+                    logger.debug(f"♻️ Pruned {pruned} idle {name} entries")
+
+        evicted = len(idle)
+        total = sum(self.memory_usage().values())
+        if self.byte_budget and total > self.byte_budget:
+            # 예산 초과: 가장 오래 쉬고 있는 세션부터 정리 (방금 활동한 세션은 제외)
+            candidates = [
+                s for s, seen in self.last_seen.items()
+                if now - seen >= self.sweep_interval
+            ]
+            for session_id in candidates:
+                if total <= self.byte_budget:
+                    break
+                await self.end_session(session_id, reason="budget")
+                evicted += 1
+                remaining = sum(self.memory_usage().values())
+                if remaining >= total:
+                    logger.warning(
+                        f"⚠️ Evicting {session_id} freed nothing "
+                        f"({remaining} > {self.byte_budget} bytes), stopping budget sweep"
+                    )
+                    break
+                total = remaining
+
+        session_lifecycle_sessions.set(len(self.last_seen))
+        return evicted
+
+    def start(self):
+        """주기 점검 루프 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"❌ Session sweep failed: {e}")
+
+    async def stop(self):
+        """주기 점검 루프 종료"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# 전역 인스턴스
+_session_lifecycle: Optional[SessionLifecycleManager] = None
+
+
+def touch_session(session_id: Optional[str]):
+    """세션 활동 기록 (수명 관리자가 없으면 무시)"""
+    if _session_lifecycle is not None and session_id:
+        _session_lifecycle.touch(session_id)
+
+
+async def init_session_lifecycle(db_manager=None) -> SessionLifecycleManager:
+    """SessionLifecycleManager 초기화 (이미 초기화된 컴포넌트 등록)"""
+    global _session_lifecycle
+
+    from config import (
+        SESSION_IDLE_TTL_SEC,
+        SESSION_SWEEP_INTERVAL_SEC,
+        SESSION_MEMORY_BUDGET_MB,
+    )
+    from core.cluster import cluster_manager
+    from services.engagement_service import get_engagement_tracker
+    from services.recording_service import get_recording_manager
+    from services.ai.nlp import get_nlp_analyzer
+    from services.ai.vision import get_vision_analyzer
+    from services.ai.feedback import get_feedback_generator
+
+    manager = SessionLifecycleManager(
+        db_manager,
+        idle_ttl=SESSION_IDLE_TTL_SEC,
+        sweep_interval=SESSION_SWEEP_INTERVAL_SEC,
+        byte_budget=int(SESSION_MEMORY_BUDGET_MB * 1024 * 1024),
+    )
+    manager.register("engagement", get_engagement_tracker())
+    manager.register("nlp", get_nlp_analyzer())
+    manager.register("vision", get_vision_analyzer())
+    manager.register("feedback", get_feedback_generator())
+    manager.register("recording", get_recording_manager())
+    manager.register("cluster", cluster_manager)
+    manager.start()
+
+    _session_lifecycle = manager
+    logger.info(f"✅ SessionLifecycleManager initialized ({list(manager.components)})")
+    return manager
+
+
+async def shutdown_session_lifecycle():
+    """SessionLifecycleManager 종료"""
+    global _session_lifecycle
+
+    if _session_lifecycle:
+        await _session_lifecycle.stop()
+        _session_lifecycle = None
+
+
+def get_session_lifecycle() -> Optional[SessionLifecycleManager]:
+    """SessionLifecycleManager 인스턴스 반환"""
+    return _session_lifecycle
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+AIRClass Dashboard Query Benchmark
+대시보드 학생 목록/알림/학생 상세: 세션 전체 조회 후 Python 계산 vs 집계 파이프라인
+
+MongoDB 필요 (임시 세션을 만들고 끝나면 삭제):
+    python tests/load/load_test_dashboard_queries.py --students 5000 --repeat 10
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, UTC
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from config import MONGO_URL  # noqa: E402
+from core.database import DatabaseManager  # noqa: E402
+from services.engagement_pipelines import (  # noqa: E402
+    CONFUSION_ALERT_CONFIDENCE,
+    LOW_ACCURACY_THRESHOLD,
+    alerts_pipeline,
+    student_detail_pipeline,
+    students_pipeline,
+)
+from services.engagement_service import EngagementCalculator  # noqa: E402
+
+SESSION_ID = "bench-dashboard-queries"
+DURATION = 50.0
+
+
+async def seed(db: DatabaseManager, students: int):
+    """임의 지표를 가진 세션 학생 문서"""
+    rng = random.Random(0)
+    now = datetime.now(UTC)
+    await db.db.student_engagement.delete_many({"session_id": SESSION_ID})
+    await db.db.student_engagement.insert_many(
+        [
+            {
+                "session_id": SESSION_ID,
+                "student_id": f"student-{i:05d}",
+                "student_name": f"학생{i}",
+                "node_name": "node-1",
+                "metrics": {
+                    "attention_score": rng.random(),
+                    "participation_count": rng.randrange(15),
+                    "quiz_accuracy": rng.random(),
+                    "response_latency_ms": rng.randrange(15000),
+                    "chat_message_count": rng.randrange(12),
+                    "last_activity_time": now,
+                },
+                "updated_at": now,
+            }
+            for i in range(students)
+        ]
+    )
+
+
+async def python_students(db: DatabaseManager, calculator: EngagementCalculator):
+    engagements = await db.get_session_engagement(SESSION_ID)
+    scores = calculator.score_engagements(engagements, DURATION)
+    return sorted(
+        zip(scores["overall"], (eng.student_id for eng in engagements)),
+        key=lambda item: (-item[0], item[1]),
+    )
+
+
+async def python_alerts(db: DatabaseManager, calculator: EngagementCalculator):
+    engagements = await db.get_session_engagement(SESSION_ID)
+    scores = calculator.score_engagements(engagements, 0)
+    return [
+        eng.student_id
+        for eng, is_confused, confidence in zip(
+            engagements, scores["is_confused"], scores["confidence"]
+        )
+        if (is_confused and confidence > CONFUSION_ALERT_CONFIDENCE)
+        or eng.metrics.quiz_accuracy < LOW_ACCURACY_THRESHOLD
+        or (eng.metrics.participation_count == 0 and eng.metrics.chat_message_count == 0)
+    ]
+
+
+async def python_detail(db: DatabaseManager, student_id: str):
+    # 기존 상세 조회: 세션 전체를 가져와서 선형 탐색
+    for eng in await db.get_session_engagement(SESSION_ID):
+        if eng.student_id == student_id:
+            return eng
+    return None
+
+
+async def bench(fn, repeat: int) -> float:
+    """repeat회 실행 평균 (초)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await fn()
+    return (time.perf_counter() - start) / repeat
+
+
+async def run(args) -> int:
+    db = DatabaseManager(args.mongo_url)
+    if not await db.init():
+        print("❌ MongoDB not available")
+        return 1
+
+    calculator = EngagementCalculator()
+    detail_id = f"student-{args.students // 2:05d}"
+    try:
+        await seed(db, args.students)
+
+        # 결과가 같은지 먼저 확인
+        expected = await python_students(db, calculator)
+        docs = await db.aggregate_student_engagement(
+            students_pipeline(SESSION_ID, DURATION)
+        )
+        if [d["student_id"] for d in docs] != [sid for _, sid in expected]:
+            print("❌ Pipeline student order differs from Python scoring")
+            return 1
+        alert_docs = await db.aggregate_student_engagement(alerts_pipeline(SESSION_ID))
+        if {d["student_id"] for d in alert_docs} != set(
+            await python_alerts(db, calculator)
+        ):
+            print("❌ Pipeline alerts differ from Python filtering")
+            return 1
+
+        results = [
+            (
+                "students (fetch all + score + sort)",
+                await bench(lambda: python_students(db, calculator), args.repeat),
+            ),
+            (
+                "students (pipeline)",
+                await bench(
+                    lambda: db.aggregate_student_engagement(
+                        students_pipeline(SESSION_ID, DURATION)
+                    ),
+                    args.repeat,
+                ),
+            ),
+            (
+                "students top 20 (pipeline)",
+                await bench(
+                    lambda: db.aggregate_student_engagement(
+                        students_pipeline(SESSION_ID, DURATION, limit=20)
+                    ),
+                    args.repeat,
+                ),
+            ),
+            (
+                "alerts (fetch all + filter)",
+                await bench(lambda: python_alerts(db, calculator), args.repeat),
+            ),
+            (
+                "alerts (pipeline)",
+                await bench(
+                    lambda: db.aggregate_student_engagement(alerts_pipeline(SESSION_ID)),
+                    args.repeat,
+                ),
+            ),
+            (
+                "detail (fetch all + scan)",
+                await bench(lambda: python_detail(db, detail_id), args.repeat),
+            ),
+            (
+                "detail (pipeline)",
+                await bench(
+                    lambda: db.aggregate_student_engagement(
+                        student_detail_pipeline(SESSION_ID, detail_id, DURATION)
+                    ),
+                    args.repeat,
+                ),
+            ),
+        ]
+    finally:
+        await db.db.student_engagement.delete_many({"session_id": SESSION_ID})
+        await db.close()
+
+    print("=" * 70)
+    print(f"📊 Dashboard queries ({args.students} students, {args.repeat} runs)")
+    print("=" * 70)
+    for name, seconds in results:
+        print(f"  {name}".ljust(45) + f"{seconds * 1000:9.2f} ms")
+    print(f"  results identical".ljust(45) + "      yes")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--students", type=int, default=int(os.getenv("STUDENTS", "5000"))
+    )
+    parser.add_argument("--repeat", type=int, default=int(os.getenv("REPEAT", "10")))
+    parser.add_argument("--mongo-url", default=MONGO_URL)
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+AIRClass Engagement Memory Benchmark
+학생별 StudentEngagement 캐시(dict) vs 세션 열 저장소(EngagementStore) 메모리 비교
+
+서버 없이 실행 가능:
+    python tests/load/load_test_engagement_memory.py --students 10000 --sessions 1
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, UTC
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from schemas import EngagementMetrics, StudentEngagement  # noqa: E402
+from services.engagement_store import EngagementStore  # noqa: E402
+
+
+def make_engagement(rng: random.Random, session_id: str, i: int) -> StudentEngagement:
+    now = datetime.now(UTC)
+    return StudentEngagement(
+        session_id=session_id,
+        student_id=f"student-{i}",
+        student_name=f"학생{i}",
+        node_name=f"sub-{i % 8}",
+        metrics=EngagementMetrics(
+            attention_score=rng.random(),
+            participation_count=rng.randrange(20),
+            quiz_accuracy=rng.random(),
+            response_latency_ms=rng.randrange(15000),
+            chat_message_count=rng.randrange(15),
+            last_activity_time=now - timedelta(seconds=rng.randrange(3000)),
+        ),
+        updated_at=now,
+    )
+
+
+def measure(build) -> tuple[int, float]:
+    """build()가 만든 객체가 차지하는 메모리 (바이트, 초)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--students", type=int, default=int(os.getenv("STUDENTS", "10000"))
+    )
+    parser.add_argument("--sessions", type=int, default=int(os.getenv("SESSIONS", "1")))
+    args = parser.parse_args()
+
+    def engagements():
+        rng = random.Random(0)
+        for s in range(args.sessions):
+            for i in range(args.students):
+                yield make_engagement(rng, f"session-{s}", i)
+
+    def build_models():
+        return {f"{e.session_id}:{e.student_id}": e for e in engagements()}
+
+    def build_store():
+        store = EngagementStore()
+        for e in engagements():
+            store.put(e)
+        return store
+
+    total = args.students * args.sessions
+    model_bytes, model_sec = measure(build_models)
+    store_bytes, store_sec = measure(build_store)
+
+    print("=" * 70)
+    print(f"🧠 Engagement cache memory ({args.sessions} sessions × {args.students} students)")
+    print("=" * 70)
+    print(
+        "  store".ljust(30) + "total MB".rjust(10) + "B/student".rjust(12) + "build s".rjust(10)
+    )
+    for name, size, sec in (
+        ("pydantic models (dict)", model_bytes, model_sec),
+        ("columnar (EngagementStore)", store_bytes, store_sec),
+    ):
+        print(
+            f"  {name}".ljust(30)
+            + f"{size / 1e6:10.2f}"
+            + f"{size / total:12.0f}"
+            + f"{sec:10.2f}"
+        )
+    print(f"  reduction".ljust(30) + f"{model_bytes / store_bytes:9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+AIRClass Quiz Response Ingestion Load Test
+반 전체가 짧은 시간에 퀴즈에 답하는 상황 재현 (POST /api/quiz/response)
+
+- 임시 퀴즈를 만들어 발행한 뒤 --rate 응답/초로 --duration초 동안 전송 (끝나면 삭제)
+- --duplicates 비율만큼은 이미 답한 학생이 다시 제출 (409 예상)
+- 측정 항목: 응답 지연(p50/p95/p99/max), 처리량, 상태 코드별 개수,
+  통계 API의 total_responses가 저장된 응답 수와 같은지
+- --max-p99-ms 기준을 넘거나 통계가 어긋나면 exit 1
+
+실행 중인 서버 대상 (MongoDB 필요):
+    python tests/load/load_test_quiz_ingest.py --base-url http://localhost:8000 \\
+        --rate 500 --duration 10
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import Counter
+from typing import List
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """정렬 후 백분위수 (값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(len(ordered) * pct / 100), len(ordered) - 1)
+    return ordered[index]
+
+
+async def create_quiz(client: httpx.AsyncClient, quiz_id: str):
+    options = [{"id": f"opt_{c}", "text": c.upper()} for c in "abcd"]
+    response = await client.post(
+        "/api/quiz/create",
+        json={
+            "quiz_id": quiz_id,
+            "session_id": f"load-{quiz_id}",
+            "question": "부하 테스트 문제",
+            "options": options,
+            "correct_option_id": "opt_b",
+            "topic": "load-test",
+        },
+    )
+    response.raise_for_status()
+    response = await client.post("/api/quiz/publish", params={"quiz_id": quiz_id})
+    response.raise_for_status()
+
+
+async def drive(client: httpx.AsyncClient, args, quiz_id: str):
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    rng = random.Random(0)
+    answered: List[str] = []
+    tasks = []
+
+    async def send(student_id: str):
+        start = time.perf_counter()
+        try:
+            response = await client.post(
+                "/api/quiz/response",
+                json={
+                    "quiz_id": quiz_id,
+                    "student_id": student_id,
+                    "selected_option_id": rng.choice(["opt_a", "opt_b", "opt_c", "opt_d"]),
+                    "response_time": rng.uniform(1.0, 20.0),
+                },
+            )
+            statuses[response.status_code] += 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    total = int(args.rate * args.duration)
+    started = time.perf_counter()
+    for i in range(total):
+        # 일정한 속도로 전송 (응답을 기다리지 않음)
+        delay = started + i / args.rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if answered and rng.random() < args.duplicates:
+            student_id = rng.choice(answered)
+        else:
+            student_id = f"student-{i}"
+            answered.append(student_id)
+        tasks.append(asyncio.create_task(send(student_id)))
+
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    return latencies, statuses, elapsed
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rate", type=float, default=500, help="응답/초")
+    parser.add_argument("--duration", type=float, default=10, help="초")
+    parser.add_argument("--duplicates", type=float, default=0.05, help="중복 제출 비율")
+    parser.add_argument("--max-p99-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    quiz_id = f"load-{uuid.uuid4().hex[:8]}"
+    limits = httpx.Limits(max_connections=1000, max_keepalive_connections=1000)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=30.0, limits=limits
+    ) as client:
+        await create_quiz(client, quiz_id)
+        try:
+            latencies, statuses, elapsed = await drive(client, args, quiz_id)
+            stats = (await client.get(f"/api/quiz/{quiz_id}/stats")).json()
+        finally:
+            await client.delete(f"/api/quiz/{quiz_id}")
+
+    accepted = statuses.get(200, 0)
+    p99 = percentile(latencies, 99)
+    print("=" * 70)
+    print(
+        f"📝 Quiz ingestion ({args.rate:g} answers/s for {args.duration:g}s, "
+        f"{args.duplicates:.0%} duplicates)"
+    )
+    print("=" * 70)
+    print(f"  sent".ljust(30) + f"{sum(statuses.values()):>10}")
+    print(f"  throughput".ljust(30) + f"{len(latencies) / elapsed:>10.1f} /s")
+    for status, count in sorted(statuses.items(), key=str):
+        print(f"  status {status}".ljust(30) + f"{count:>10}")
+    print(
+        f"  latency ms".ljust(30)
+        + f"p50={percentile(latencies, 50):.1f} p95={percentile(latencies, 95):.1f} "
+        + f"p99={p99:.1f} max={max(latencies, default=0):.1f}"
+    )
+    print(f"  stats total_responses".ljust(30) + f"{stats.get('total_responses'):>10}")
+
+    failed = False
+    if stats.get("total_responses") != accepted:
+        print(f"❌ Stats total {stats.get('total_responses')} != accepted {accepted}")
+        failed = True
+    if args.max_p99_ms is not None and p99 > args.max_p99_ms:
+        print(f"❌ p99 {p99:.1f} ms exceeds {args.max_p99_ms:g} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+AIRClass Engagement Scoring Benchmark
+세션 전체 참여도 점수 계산: 학생별 스칼라 루프 vs NumPy 배치
+
+서버 없이 실행 가능 (EngagementCalculator만 측정):
+    python tests/load/load_test_scoring.py --students 10000 --repeat 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, UTC
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from schemas import EngagementMetrics, StudentEngagement  # noqa: E402
+from services.engagement_service import (  # noqa: E402
+    NUMPY_AVAILABLE,
+    EngagementCalculator,
+)
+
+
+def sample_engagements(students: int, seed: int = 0) -> list[StudentEngagement]:
+    """임의 지표를 가진 세션 학생 목록"""
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    return [
+        StudentEngagement(
+            session_id="bench",
+            student_id=f"student-{i}",
+            student_name=f"학생{i}",
+            node_name="node-1",
+            metrics=EngagementMetrics(
+                attention_score=rng.random(),
+                participation_count=rng.randrange(20),
+                quiz_accuracy=rng.random(),
+                response_latency_ms=rng.randrange(15000),
+                chat_message_count=rng.randrange(15),
+            ),
+            updated_at=now,
+        )
+        for i in range(students)
+    ]
+
+
+def bench(fn, repeat: int) -> float:
+    """repeat회 실행 평균 (초)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--students", type=int, default=int(os.getenv("STUDENTS", "10000"))
+    )
+    parser.add_argument("--repeat", type=int, default=int(os.getenv("REPEAT", "20")))
+    parser.add_argument("--duration", type=float, default=50.0)
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("❌ numpy not installed (pip install numpy)")
+        return 1
+
+    calculator = EngagementCalculator()
+    engagements = sample_engagements(args.students)
+
+    scalar = calculator._score_engagements_scalar(engagements, args.duration)
+    batch = calculator.score_engagements(engagements, args.duration)
+    if scalar != batch:
+        print("❌ Batch results differ from scalar results")
+        return 1
+
+    scalar_sec = bench(
+        lambda: calculator._score_engagements_scalar(engagements, args.duration),
+        args.repeat,
+    )
+    batch_sec = bench(
+        lambda: calculator.score_engagements(engagements, args.duration),
+        args.repeat,
+    )
+
+    print("=" * 70)
+    print(f"🧮 Session scoring ({args.students} students, {args.repeat} runs)")
+    print("=" * 70)
+    print(f"  scalar loop".ljust(45) + f"{scalar_sec * 1000:9.2f} ms")
+    print(f"  numpy batch".ljust(45) + f"{batch_sec * 1000:9.2f} ms")
+    print(f"  speedup".ljust(45) + f"{scalar_sec / batch_sec:9.1f} x")
+    print(f"  results identical".ljust(45) + "      yes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+AIRClass WebSocket Fan-out Load Test
+수천 개의 /ws/student, /ws/monitor 연결로 브로드캐스트 성능 측정
+
+- 교사 채팅(/ws/teacher), 퀴즈 발행(POST /ws/broadcast/quiz),
+  참여도 업데이트(POST /ws/broadcast/engagement)를 번갈아 발생
+- 측정 항목: 종단 간 전달 지연(p50/p95/p99/max), 메시지 유실률,
+  연결당 메모리(RSS 증가분), 이벤트 루프 지연(lag)
+- --max-p99-ms / --max-loss 기준을 넘으면 exit 1 (회귀 기준으로 사용)
+
+실행 중인 서버 대상:
+    python tests/load/load_test_websocket.py --base-url http://localhost:8000 \\
+        --students 2000 --monitors 20 --server-pid $(pgrep -f "uvicorn main:app")
+
+서버 없이 프로세스 내 uvicorn으로 실행 (WebSocket 라우터만 띄움):
+    python tests/load/load_test_websocket.py --in-process --students 2000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import socket
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+import websockets
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+MSGPACK_SUBPROTOCOL = "airclass.msgpack.v1"
+KINDS = ("chat", "quiz", "engagement")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """정렬 후 백분위수 (값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(len(ordered) * pct / 100), len(ordered) - 1)
+    return ordered[index]
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """프로세스 RSS (Linux /proc 기준, 읽을 수 없으면 None)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def raise_fd_limit(connections: int):
+    """연결 수만큼 파일 디스크립터 한도 상향 (soft → hard)"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, max(soft, connections * 2 + 256))
+    if wanted > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+
+class LoadStats:
+    """수신 결과 집계"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.sent: Dict[str, int] = defaultdict(int)
+        self.connect_retries = 0
+        self.connect_failures = 0
+        self.loop_lag: List[float] = []
+
+    def record(self, kind: str, sent_at: float):
+        self.latencies[kind].append((time.time() - sent_at) * 1000)
+
+
+class LoadClient:
+    """학생/모니터 시뮬레이터"""
+
+    def __init__(self, ws_url: str, stats: LoadStats, protocol: str):
+        self.ws_url = ws_url
+        self.stats = stats
+        self.protocol = protocol
+        self.ready = asyncio.Event()
+        self.ws = None
+
+    def _decode(self, frame) -> dict:
+        if isinstance(frame, bytes):
+            return msgpack.unpackb(frame, raw=False)
+        return json.loads(frame)
+
+    def _on_message(self, message: dict):
+        msg_type = message.get("type")
+        if msg_type == "chat":
+            text = message.get("message") or ""
+            if text.startswith("lt:"):
+                self.stats.record("chat", float(text.split(":")[2]))
+        elif msg_type == "quiz_published":
+            metadata = message.get("data", {}).get("metadata", {})
+            if "sent_at" in metadata:
+                self.stats.record("quiz", metadata["sent_at"])
+        elif msg_type == "engagement_update":
+            metadata = message.get("data", {}).get("metadata", {})
+            if "sent_at" in metadata:
+                self.stats.record("engagement", metadata["sent_at"])
+
+    async def run(self, ready_types: tuple, max_attempts: int = 20):
+        """연결 후 종료될 때까지 수신 (retry_after 안내 시 재시도)"""
+        subprotocols = [MSGPACK_SUBPROTOCOL] if self.protocol == "msgpack" else None
+        for _ in range(max_attempts):
+            try:
+                async with websockets.connect(
+                    self.ws_url,
+                    subprotocols=subprotocols,
+                    max_queue=None,
+                    ping_interval=None,
+                    open_timeout=30,
+                ) as ws:
+                    self.ws = ws
+                    if not ready_types:
+                        self.ready.set()
+                    async for frame in ws:
+                        message = self._decode(frame)
+                        if message.get("type") == "retry_after":
+                            self.stats.connect_retries += 1
+                            await asyncio.sleep(message["retry_after_ms"] / 1000)
+                            break
+                        if message.get("type") in ready_types:
+                            self.ready.set()
+                        self._on_message(message)
+                    else:
+                        return
+            except (OSError, websockets.exceptions.WebSocketException):
+                self.stats.connect_retries += 1
+                await asyncio.sleep(0.5)
+        self.stats.connect_failures += 1
+        self.ready.set()
+
+
+async def measure_loop_lag(stats: LoadStats, interval: float = 0.01):
+    """이벤트 루프 지연 측정 (sleep 초과 시간)"""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        stats.loop_lag.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def start_in_process_server() -> tuple:
+    """WebSocket 라우터만 포함한 uvicorn을 같은 이벤트 루프에서 시작"""
+    import uvicorn
+    from fastapi import FastAPI
+
+    from routers.websocket_routes import router
+
+    logging.getLogger("utils.websocket").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    app = FastAPI()
+    app.include_router(router)
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, host="127.0.0.1", port=port, log_level="warning", backlog=4096
+        )
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return f"http://127.0.0.1:{port}", server, task
+
+
+async def open_clients(
+    base_ws: str,
+    stats: LoadStats,
+    args: argparse.Namespace,
+) -> tuple:
+    """학생/모니터 연결 (connect_concurrency 단위로 나눠서)"""
+    clients: List[LoadClient] = []
+    tasks: List[asyncio.Task] = []
+    gate = asyncio.Semaphore(args.connect_concurrency)
+
+    async def open_one(client: LoadClient, ready_types: tuple):
+        async with gate:
+            task = asyncio.create_task(client.run(ready_types))
+            tasks.append(task)
+            await client.ready.wait()
+
+    openers = []
+    for i in range(args.students):
+        client = LoadClient(f"{base_ws}/ws/student?name=lt-student-{i}", stats, args.protocol)
+        clients.append(client)
+        openers.append(open_one(client, ("sync", "snapshot")))
+    for _ in range(args.monitors):
+        client = LoadClient(f"{base_ws}/ws/monitor", stats, args.protocol)
+        clients.append(client)
+        openers.append(open_one(client, ()))
+
+    await asyncio.gather(*openers)
+    return clients, tasks
+
+
+async def drive(
+    base_url: str, teacher, stats: LoadStats, args: argparse.Namespace
+):
+    """채팅/퀴즈/참여도 메시지를 rate에 맞춰 발생"""
+    interval = 1.0 / args.rate
+    total = int(args.duration * args.rate)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        next_at = time.perf_counter()
+        for i in range(total):
+            kind = KINDS[i % len(KINDS)]
+            sent_at = time.time()
+            if kind == "chat":
+                await teacher.send(
+                    json.dumps({"type": "chat", "message": f"lt:{i}:{sent_at}"})
+                )
+            elif kind == "quiz":
+                await client.post(
+                    "/ws/broadcast/quiz",
+                    json={
+                        "quiz_id": f"lt-quiz-{i}",
+                        "session_id": "lt-session",
+                        "question": "부하 테스트 문제",
+                        "options": ["a", "b", "c", "d"],
+                        "metadata": {"sent_at": sent_at},
+                    },
+                )
+            else:
+                await client.post(
+                    "/ws/broadcast/engagement",
+                    json={
+                        "session_id": "lt-session",
+                        "student_id": f"lt-student-{i % max(args.students, 1)}",
+                        "student_name": "부하 테스트",
+                        "engagement_score": 50.0,
+                        "metadata": {"sent_at": sent_at},
+                    },
+                )
+            stats.sent[kind] += 1
+
+            next_at += interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+
+def report(stats: LoadStats, args: argparse.Namespace, rss_per_conn) -> int:
+    """결과 출력 및 기준 충족 여부 반환 (0=통과)"""
+    recipients = {
+        "chat": args.students,
+        "quiz": args.students,
+        "engagement": args.monitors,
+    }
+
+    print()
+    print("=" * 78)
+    print(
+        f"📊 Fan-out results ({args.students} students, {args.monitors} monitors, "
+        f"{args.protocol})"
+    )
+    print("=" * 78)
+    print(
+        "  kind".ljust(14)
+        + "sent".rjust(7)
+        + "expected".rjust(10)
+        + "received".rjust(10)
+        + "loss".rjust(8)
+        + "p50 ms".rjust(9)
+        + "p95 ms".rjust(9)
+        + "p99 ms".rjust(9)
+        + "max ms".rjust(9)
+    )
+
+    worst_p99 = 0.0
+    worst_loss = 0.0
+    for kind in KINDS:
+        latencies = stats.latencies[kind]
+        expected = stats.sent[kind] * recipients[kind]
+        loss = (1 - len(latencies) / expected) * 100 if expected else 0.0
+        p99 = percentile(latencies, 99)
+        if expected:
+            worst_p99 = max(worst_p99, p99)
+            worst_loss = max(worst_loss, loss)
+        print(
+            f"  {kind}".ljust(14)
+            + f"{stats.sent[kind]:7d}"
+            + f"{expected:10d}"
+            + f"{len(latencies):10d}"
+            + f"{loss:7.2f}%"
+            + f"{percentile(latencies, 50):9.1f}"
+            + f"{percentile(latencies, 95):9.1f}"
+            + f"{p99:9.1f}"
+            + f"{max(latencies, default=0.0):9.1f}"
+        )
+
+    print()
+    print(f"  connect retries: {stats.connect_retries}, failures: {stats.connect_failures}")
+    if rss_per_conn is not None:
+        scope = "server+clients" if args.in_process else "server"
+        print(f"  memory per connection ({scope}): {rss_per_conn / 1024:.1f} KiB")
+    print(
+        f"  event loop lag: p50={percentile(stats.loop_lag, 50):.2f} ms "
+        f"p99={percentile(stats.loop_lag, 99):.2f} ms "
+        f"max={max(stats.loop_lag, default=0.0):.2f} ms"
+    )
+
+    failed = False
+    if args.max_p99_ms and worst_p99 > args.max_p99_ms:
+        print(f"❌ p99 latency {worst_p99:.1f} ms > {args.max_p99_ms} ms")
+        failed = True
+    if args.max_loss is not None and worst_loss > args.max_loss:
+        print(f"❌ message loss {worst_loss:.2f}% > {args.max_loss}%")
+        failed = True
+    if stats.connect_failures:
+        print(f"❌ {stats.connect_failures} clients failed to connect")
+        failed = True
+    if not failed:
+        print("✅ Within thresholds")
+    return 1 if failed else 0
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--base-url", default=os.getenv("BASE_URL", "http://localhost:8000")
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="WebSocket 라우터만 띄운 uvicorn을 같은 프로세스에서 실행",
+    )
+    parser.add_argument(
+        "--students", type=int, default=int(os.getenv("STUDENTS", "1000"))
+    )
+    parser.add_argument(
+        "--monitors", type=int, default=int(os.getenv("MONITORS", "10"))
+    )
+    parser.add_argument(
+        "--rate", type=float, default=float(os.getenv("RATE", "30")),
+        help="초당 발생 메시지 수 (chat/quiz/engagement 순환)",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=float(os.getenv("DURATION", "10"))
+    )
+    parser.add_argument(
+        "--drain", type=float, default=float(os.getenv("DRAIN", "3")),
+        help="발생 종료 후 수신 대기 시간 (초)",
+    )
+    parser.add_argument(
+        "--connect-concurrency", type=int,
+        default=int(os.getenv("CONNECT_CONCURRENCY", "200")),
+    )
+    parser.add_argument("--protocol", choices=("json", "msgpack"), default="json")
+    parser.add_argument(
+        "--server-pid", type=int, default=None,
+        help="서버 RSS 측정용 PID (--in-process면 자기 자신)",
+    )
+    parser.add_argument("--max-p99-ms", type=float, default=None)
+    parser.add_argument("--max-loss", type=float, default=None, help="허용 유실률 (%%)")
+    args = parser.parse_args()
+
+    if args.protocol == "msgpack" and not MSGPACK_AVAILABLE:
+        print("❌ msgpack not installed (pip install msgpack)")
+        return 1
+
+    raise_fd_limit(args.students + args.monitors + 1)
+    stats = LoadStats()
+
+    server = server_task = None
+    base_url = args.base_url.rstrip("/")
+    if args.in_process:
+        base_url, server, server_task = await start_in_process_server()
+        args.server_pid = os.getpid()
+    base_ws = base_url.replace("http://", "ws://").replace("https://", "wss://")
+
+    lag_task = asyncio.create_task(measure_loop_lag(stats))
+    rss_before = rss_bytes(args.server_pid) if args.server_pid else None
+
+    print(f"🔌 Opening {args.students} students + {args.monitors} monitors → {base_ws}")
+    start = time.perf_counter()
+    teacher = await websockets.connect(f"{base_ws}/ws/teacher", max_queue=None)
+    teacher_drain = asyncio.create_task(teacher.wait_closed())
+    clients, client_tasks = await open_clients(base_ws, stats, args)
+    print(f"✅ Connected in {time.perf_counter() - start:.2f}s")
+
+    rss_after = rss_bytes(args.server_pid) if args.server_pid else None
+    connections = args.students + args.monitors
+    rss_per_conn = None
+    if rss_before is not None and rss_after is not None and connections:
+        rss_per_conn = (rss_after - rss_before) / connections
+
+    # 접속 단계의 지연은 제외하고 메시지 단계만 측정
+    stats.loop_lag.clear()
+    print(f"🚀 Driving {args.rate:g} msg/s for {args.duration:g}s")
+    await drive(base_url, teacher, stats, args)
+    await asyncio.sleep(args.drain)
+    lag_task.cancel()
+
+    for client in clients:
+        if client.ws is not None:
+            await client.ws.close()
+    await teacher.close()
+    teacher_drain.cancel()
+    await asyncio.gather(*client_tasks, return_exceptions=True)
+
+    if server is not None:
+        server.should_exit = True
+        await server_task
+
+    return report(stats, args, rss_per_conn)
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+AIRClass WebSocket Protocol Benchmark
+JSON vs MessagePack(airclass.msgpack.v1) 프레임 크기 및 인코딩 CPU 비교
+
+서버 없이 실행 가능 (인코더만 측정):
+    python tests/load/load_test_ws_protocol.py --messages 20000 --recipients 40
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from utils.ws_protocol import (  # noqa: E402
+    JSON_PROTOCOL,
+    MSGPACK_AVAILABLE,
+    MSGPACK_SUBPROTOCOL,
+    EncodedMessage,
+    MessageEncoder,
+)
+
+
+def sample_messages() -> dict:
+    """고빈도 채널 대표 메시지"""
+    return {
+        "chat": {
+            "type": "chat",
+            "from": "student-017",
+            "message": "선생님 2번 문제에서 분모가 왜 바뀌는지 잘 모르겠어요",
+        },
+        "engagement_update": {
+            "type": "engagement_update",
+            "data": {
+                "session_id": "session-2026-10-19-1",
+                "student_id": "student-017",
+                "student_name": "김학생",
+                "engagement_score": 72.5,
+                "attention_score": 0.81,
+                "participation_score": 45,
+                "quiz_accuracy": 0.66,
+                "metadata": {},
+            },
+        },
+        "stats_update": {
+            "type": "stats_update",
+            "data": {
+                "quiz_id": "quiz-042",
+                "total_responses": 38,
+                "correct_responses": 27,
+                "accuracy": 71.05,
+                "option_distribution": {"a": 4, "b": 27, "c": 5, "d": 2},
+                "average_response_time": 6.42,
+            },
+        },
+    }
+
+
+def bench_encode(message: dict, protocol: str, messages: int) -> tuple[float, int]:
+    """메시지 N개 인코딩 → (초, 프레임당 바이트)"""
+    encoder = MessageEncoder()
+    frame = encoder.encode(message, protocol)
+    size = len(frame) if isinstance(frame, bytes) else len(frame.encode("utf-8"))
+
+    start = time.perf_counter()
+    for _ in range(messages):
+        encoder.encode(message, protocol)
+    return time.perf_counter() - start, size
+
+
+def bench_fanout(message: dict, recipients: int, messages: int) -> tuple[float, float]:
+    """
+    브로드캐스트 비용: 수신자별 재인코딩 vs EncodedMessage 공유
+
+    Returns:
+        (수신자별 인코딩 초, 공유 인코딩 초)
+    """
+    encoder = MessageEncoder()
+
+    start = time.perf_counter()
+    for _ in range(messages):
+        for _ in range(recipients):
+            encoder.encode(message, JSON_PROTOCOL)
+    per_recipient = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(messages):
+        encoded = EncodedMessage(message, encoder)
+        for _ in range(recipients):
+            encoded.frame(JSON_PROTOCOL)
+    shared = time.perf_counter() - start
+
+    return per_recipient, shared
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--messages", type=int, default=int(os.getenv("MESSAGES", "20000"))
+    )
+    parser.add_argument(
+        "--recipients", type=int, default=int(os.getenv("RECIPIENTS", "40"))
+    )
+    args = parser.parse_args()
+
+    if not MSGPACK_AVAILABLE:
+        print("❌ msgpack not installed (pip install msgpack)")
+        return 1
+
+    print("=" * 70)
+    print(f"📦 WebSocket frame encoding ({args.messages} messages per type)")
+    print("=" * 70)
+    print(
+        "  type".ljust(22)
+        + "json B".rjust(8)
+        + "mpack B".rjust(9)
+        + "saved".rjust(8)
+        + "json µs".rjust(10)
+        + "mpack µs".rjust(10)
+    )
+
+    for name, message in sample_messages().items():
+        json_sec, json_size = bench_encode(message, JSON_PROTOCOL, args.messages)
+        mp_sec, mp_size = bench_encode(message, MSGPACK_SUBPROTOCOL, args.messages)
+        saved = (1 - mp_size / json_size) * 100 if json_size else 0.0
+        print(
+            f"  {name}".ljust(22)
+            + f"{json_size:8d}"
+            + f"{mp_size:9d}"
+            + f"{saved:7.1f}%"
+            + f"{json_sec / args.messages * 1e6:10.2f}"
+            + f"{mp_sec / args.messages * 1e6:10.2f}"
+        )
+
+    print()
+    print("=" * 70)
+    print(f"📢 Broadcast fan-out ({args.recipients} recipients)")
+    print("=" * 70)
+    message = sample_messages()["chat"]
+    fanout_messages = max(args.messages // args.recipients, 1)
+    per_recipient, shared = bench_fanout(message, args.recipients, fanout_messages)
+    print(f"  encode per recipient".ljust(45) + f"{per_recipient * 1000:9.2f} ms")
+    print(f"  encode once (EncodedMessage)".ljust(45) + f"{shared * 1000:9.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+"""
+Redis 배치 발행기 테스트
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from core.batch_publisher import BatchPublisher
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def publish(self, channel, payload):
+        self.commands.append((channel, payload))
+        return self
+
+    async def execute(self):
+        if self.redis.delay:
+            await asyncio.sleep(self.redis.delay)
+        if self.redis.fail:
+            raise ConnectionError("redis down")
+        self.redis.pipelines.append(list(self.commands))
+        return [1] * len(self.commands)
+
+
+class FakeRedis:
+    def __init__(self, fail=False, delay=0.0):
+        self.fail = fail
+        self.delay = delay
+        self.pipelines = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    @property
+    def published(self):
+        return [cmd for batch in self.pipelines for cmd in batch]
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_size_reached():
+    redis = FakeRedis()
+    publisher = BatchPublisher(redis, batch_size=5, flush_interval=10.0)
+    publisher.start()
+
+    for i in range(5):
+        await publisher.publish("ch", {"i": i})
+    await asyncio.sleep(0.01)
+
+    assert [len(batch) for batch in redis.pipelines] == [5]
+    await publisher.stop()
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval_and_preserves_order():
+    redis = FakeRedis()
+    publisher = BatchPublisher(redis, batch_size=100, flush_interval=0.01)
+    publisher.start()
+
+    for i in range(3):
+        await publisher.publish("a", {"i": i})
+        await publisher.publish("b", {"i": i})
+    await asyncio.sleep(0.05)
+
+    assert len(redis.pipelines) == 1
+    by_channel = {"a": [], "b": []}
+    for channel, payload in redis.published:
+        by_channel[channel].append(json.loads(payload)["i"])
+    assert by_channel == {"a": [0, 1, 2], "b": [0, 1, 2]}
+    await publisher.stop()
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_rejects_when_queue_full():
+    publisher = BatchPublisher(FakeRedis(), max_queue=2, overflow="drop")
+
+    assert await publisher.publish("ch", {"i": 0})
+    assert await publisher.publish("ch", {"i": 1})
+    assert not await publisher.publish("ch", {"i": 2})
+    assert publisher.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending_messages():
+    redis = FakeRedis()
+    publisher = BatchPublisher(redis, batch_size=2, flush_interval=10.0)
+
+    for i in range(5):
+        await publisher.publish("ch", {"i": i})
+    await publisher.stop()
+
+    assert [json.loads(p)["i"] for _, p in redis.published] == [0, 1, 2, 3, 4]
+    assert [len(batch) for batch in redis.pipelines] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_flush_error_counts_dropped_messages():
+    publisher = BatchPublisher(FakeRedis(fail=True), batch_size=10)
+
+    await publisher.publish("ch", {"i": 0})
+    await publisher.stop()
+
+    assert publisher.dropped == 1
+    assert publisher.published == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_during_pipeline_execute_keeps_the_batch():
+    redis = FakeRedis(delay=0.05)
+    publisher = BatchPublisher(redis, batch_size=3, flush_interval=10.0)
+    publisher.start()
+
+    for i in range(5):
+        await publisher.publish("ch", {"i": i})
+    await asyncio.sleep(0.01)  # 첫 배치가 execute() 안에 있는 동안 종료
+    await publisher.stop()
+
+    assert [json.loads(p)["i"] for _, p in redis.published] == [0, 1, 2, 3, 4]
+    assert publisher.published == 5 and publisher.dropped == 0
+    assert not publisher.running
+
+
+@pytest.mark.asyncio
+async def test_stop_wakes_idle_consumer():
+    publisher = BatchPublisher(FakeRedis(), flush_interval=10.0)
+    publisher.start()
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(publisher.stop(), timeout=1)
+    assert not publisher.running
@@ -0,0 +1,109 @@
+"""
+DatabaseManager iter_* 스트리밍 조회 테스트 (커서 batch_size, _id 제외, 목록 조회 호환)
+"""
+
+import pytest
+
+from core.database import STREAM_BATCH_SIZE, DatabaseManager
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.batch = None
+        self.sorted_by = None
+
+    def sort(self, keys):
+        self.sorted_by = keys
+        for key, direction in reversed(keys):
+            self.docs = sorted(self.docs, key=lambda d: d.get(key, 0), reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    def batch_size(self, n):
+        self.batch = n
+        return self
+
+    def to_list(self, length):
+        raise AssertionError("streaming reads must not buffer the whole result")
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.cursors = []
+        self.projections = []
+
+    def find(self, query, projection=None):
+        self.projections.append(projection)
+        matched = [
+            {k: v for k, v in doc.items() if k != "_id"}
+            for doc in self.docs
+            if all(doc.get(k) == v for k, v in query.items())
+        ]
+        cursor = FakeCursor(matched)
+        self.cursors.append(cursor)
+        return cursor
+
+
+class FakeDB:
+    def __init__(self):
+        self.quiz_responses = FakeCollection(
+            [
+                {
+                    "_id": i,
+                    "quiz_id": "quiz_001",
+                    "student_id": f"s{i}",
+                    "selected_option_id": "opt_a",
+                    "is_correct": False,
+                    "response_time": 1.5,
+                    "responded_at": "2024-01-01T09:00:00",
+                }
+                for i in range(5)
+            ]
+        )
+        self.chat_analytics = FakeCollection(
+            [
+                {"_id": i, "session_id": "s1", "student_id": "a", "message": f"m{i}", "message_time": i}
+                for i in range(4)
+            ]
+        )
+
+
+@pytest.fixture
+def manager():
+    manager = DatabaseManager()
+    manager.db = FakeDB()
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_iter_quiz_responses_streams_with_batch_size(manager):
+    docs = [doc async for doc in manager.iter_quiz_responses("quiz_001", batch_size=2)]
+
+    assert [d["student_id"] for d in docs] == [f"s{i}" for i in range(5)]
+    collection = manager.db.quiz_responses
+    assert collection.projections == [{"_id": 0}]
+    assert collection.cursors[0].batch == 2
+
+    # 기존 목록 조회도 같은 커서 경로 (기본 배치 크기)
+    responses = await manager.get_quiz_responses("quiz_001")
+    assert len(responses) == 5
+    assert collection.cursors[1].batch == STREAM_BATCH_SIZE
+
+
+@pytest.mark.asyncio
+async def test_iter_chat_messages_newest_first_with_limit(manager):
+    docs = [doc async for doc in manager.iter_chat_messages("s1", limit=2)]
+
+    assert [d["message"] for d in docs] == ["m3", "m2"]
+    cursor = manager.db.chat_analytics.cursors[0]
+    assert cursor.sorted_by[0] == ("message_time", -1)
+    assert manager.db.chat_analytics.projections[0]["_id"] == 0
@@ -0,0 +1,195 @@
+"""
+이벤트 버스 (메모리/Redis 공통 인터페이스) 테스트
+"""
+
+import asyncio
+
+import pytest
+
+import config
+from core.event_bus import InMemoryEventBus, RedisSubscription
+from core.messaging import MessagingSystem
+from services import engagement_listener
+from services.engagement_listener import EngagementEventListener
+
+
+async def next_event(subscription):
+    return await asyncio.wait_for(subscription.listen().__anext__(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_memory_bus_delivers_only_to_channel_subscribers():
+    bus = InMemoryEventBus()
+    chat = await bus.subscribe("airclass:session:s1:chat")
+    quiz = await bus.subscribe("airclass:session:s1:quiz")
+
+    await bus.publish("airclass:session:s1:chat", {"message": "hi"})
+
+    event = await next_event(chat)
+    assert event == {"channel": "airclass:session:s1:chat", "data": {"message": "hi"}}
+    assert quiz.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_memory_bus_drops_oldest_when_subscriber_full():
+    bus = InMemoryEventBus(max_queue=2)
+    subscription = await bus.subscribe("ch")
+
+    for i in range(3):
+        await bus.publish("ch", {"i": i})
+
+    assert subscription.dropped == 1
+    assert (await next_event(subscription))["data"] == {"i": 1}
+
+
+@pytest.mark.asyncio
+async def test_memory_bus_close_ends_listen():
+    bus = InMemoryEventBus()
+    subscription = await bus.subscribe("ch")
+    await subscription.close()
+
+    assert [e async for e in subscription.listen()] == []
+    assert await bus.publish("ch", {"i": 0})
+
+
+@pytest.mark.asyncio
+async def test_messaging_uses_memory_bus_in_standalone_mode(monkeypatch):
+    monkeypatch.setattr(config, "EVENT_BUS", "auto")
+    monkeypatch.setattr(config, "MODE", "standalone")
+    messaging = MessagingSystem("redis://unused")
+
+    assert await messaging.init()
+    assert messaging.bus.name == "memory"
+    assert messaging.redis_client is None
+
+    await messaging.add_student_to_session("s1", "alice")
+    await messaging.add_student_to_session("s2", "bob")
+    assert await messaging.get_all_students() == {"alice", "bob"}
+    assert await messaging.get_online_count() == 2
+
+    await messaging.remove_student_from_session("s2", "bob")
+    assert await messaging.get_session_student_count("s2") == 0
+    await messaging.close()
+
+
+@pytest.mark.asyncio
+async def test_messaging_falls_back_when_redis_unreachable(monkeypatch):
+    monkeypatch.setattr(config, "EVENT_BUS", "auto")
+    monkeypatch.setattr(config, "MODE", "main")
+    messaging = MessagingSystem("redis://127.0.0.1:1")
+
+    assert await messaging.init()
+    assert messaging.bus.name == "memory"
+    await messaging.close()
+
+
+class FakeTracker:
+    def __init__(self):
+        self.tracked = asyncio.Event()
+        self.student_id = None
+
+    async def track_activity(self, **kwargs):
+        self.student_id = kwargs["student_id"]
+        self.tracked.set()
+
+
+@pytest.mark.asyncio
+async def test_listener_receives_engagement_over_memory_bus(monkeypatch):
+    monkeypatch.setattr(config, "EVENT_BUS", "memory")
+    messaging = MessagingSystem()
+    await messaging.init()
+
+    tracker = FakeTracker()
+    listener = EngagementEventListener("redis://unused", tracker, None, bus=messaging.bus)
+    assert await listener.connect()
+    task = asyncio.create_task(listener.start("s1"))
+    await asyncio.sleep(0)
+
+    await messaging.publish_engagement_event("s1", "alice", "chat")
+    await asyncio.wait_for(tracker.tracked.wait(), timeout=1)
+
+    assert tracker.student_id == "alice"
+    await listener.stop()
+    await asyncio.wait_for(task, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_memory_bus_psubscribe_matches_pattern():
+    bus = InMemoryEventBus()
+    subscription = await bus.psubscribe("airclass:session:*:engagement")
+
+    await bus.publish("airclass:session:s1:chat", {"i": 0})
+    await bus.publish("airclass:session:s2:engagement", {"i": 1})
+
+    event = await next_event(subscription)
+    assert event["channel"] == "airclass:session:s2:engagement"
+    assert subscription.queue.empty()
+
+
+class FakePubSub:
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    async def listen(self):
+        yield {"type": "psubscribe", "channel": b"ch:*", "data": 1}
+        for payload in self.payloads:
+            yield {"type": "pmessage", "channel": b"ch:1", "data": payload}
+
+
+@pytest.mark.asyncio
+async def test_redis_subscription_skips_malformed_messages():
+    subscription = RedisSubscription(
+        FakePubSub([b"not json", b'"a string"', b'{"i": 1}', b"\xff", b'{"i": 2}']),
+        pattern=True,
+    )
+
+    events = [event async for event in subscription.listen()]
+
+    assert events == [
+        {"channel": "ch:1", "data": {"i": 1}},
+        {"channel": "ch:1", "data": {"i": 2}},
+    ]
+
+
+class BrokenSubscription:
+    async def listen(self):
+        raise ConnectionError("connection reset")
+        yield
+
+    async def close(self):
+        pass
+
+
+class FlakyBus(InMemoryEventBus):
+    """첫 패턴 구독은 연결이 끊긴 상태로 반환"""
+
+    def __init__(self):
+        super().__init__()
+        self.psubscribes = 0
+
+    async def psubscribe(self, *patterns):
+        self.psubscribes += 1
+        if self.psubscribes == 1:
+            return BrokenSubscription()
+        return await super().psubscribe(*patterns)
+
+
+@pytest.mark.asyncio
+async def test_pattern_listener_resubscribes_after_connection_error(monkeypatch):
+    monkeypatch.setattr(engagement_listener, "RESUBSCRIBE_BACKOFF_SEC", 0)
+    bus = FlakyBus()
+    tracker = FakeTracker()
+    listener = EngagementEventListener("redis://unused", tracker, None, bus=bus)
+
+    await listener.start_all(workers=1)
+    for _ in range(10):
+        await asyncio.sleep(0)
+    await bus.publish(
+        "airclass:session:s1:engagement",
+        {"activity_type": "chat", "session_id": "s1", "student_id": "alice"},
+    )
+    await asyncio.wait_for(tracker.tracked.wait(), timeout=1)
+    await listener.stop()
+
+    assert bus.psubscribes == 2
+    assert tracker.student_id == "alice"
@@ -0,0 +1,373 @@
+"""
+Redis Streams 참여도 이벤트 로그 테스트
+"""
+
+import asyncio
+from datetime import datetime, UTC
+
+import pytest
+from redis.exceptions import ResponseError
+
+from core.event_stream import EventStream, dead_letter_key, session_log_key
+from services.engagement_listener import (
+    EngagementEventListener,
+    InvalidEngagementEventError,
+)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def xadd(self, *args, **kwargs):
+        self.commands.append((self.redis.xadd, args, kwargs))
+        return self
+
+    def xack(self, *args):
+        self.commands.append((self.redis.xack, args, {}))
+        return self
+
+    async def execute(self):
+        return [await command(*a, **kw) for command, a, kw in self.commands]
+
+
+class FakeStreamRedis:
+    """단일 컨슈머 그룹만 지원하는 메모리 Streams"""
+
+    def __init__(self):
+        self.streams = {}
+        self.groups = set()
+        self.delivered = 0  # 그룹에 전달된 마지막 인덱스
+        self.pending = {}  # entry_id -> [consumer, idle_ms, times_delivered]
+        self.counter = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def eval(self, script, numkeys, *args):
+        # APPEND_SCRIPT: 전체 스트림 XADD 후 같은 ID로 세션 로그에 XADD
+        keys, (maxlen, session_maxlen, data) = args[:numkeys], args[numkeys:]
+        entry_id = await self.xadd(keys[0], {"data": data})
+        if len(keys) > 1:
+            self._append(keys[1], entry_id, {"data": data})
+        return entry_id
+
+    def _append(self, key, entry_id, fields):
+        encoded = {k.encode(): str(v).encode() for k, v in fields.items()}
+        self.streams.setdefault(key, []).append((entry_id, encoded))
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.counter += 1
+        entry_id = f"{self.counter}-0".encode()
+        self._append(key, entry_id, fields)
+        return entry_id
+
+    async def xgroup_create(self, key, group, id="0", mkstream=False):
+        if group in self.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        self.groups.add(group)
+        self.streams.setdefault(key, [])
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        (key, _), = streams.items()
+        entries = self.streams.get(key, [])[self.delivered : self.delivered + count]
+        if not entries:
+            await asyncio.sleep(0)
+            return []
+        self.delivered += len(entries)
+        for entry_id, _ in entries:
+            self.pending[entry_id.decode()] = [consumer, 0, 1]
+        return [[key.encode(), entries]]
+
+    async def xautoclaim(self, key, group, consumer, min_idle_time, start_id, count):
+        claimed = []
+        for entry_id, fields in self.streams.get(key, []):
+            owner = self.pending.get(entry_id.decode())
+            if owner and owner[1] >= min_idle_time:
+                owner[:2] = [consumer, 0]
+                owner[2] += 1
+                claimed.append((entry_id, fields))
+        return [b"0-0", claimed, []]
+
+    async def xpending_range(self, key, group, min, max, count):
+        owner = self.pending.get(min)
+        if not owner:
+            return []
+        return [{"message_id": min.encode(), "consumer": owner[0].encode(),
+                 "time_since_delivered": owner[1], "times_delivered": owner[2]}]
+
+    async def xack(self, key, group, *entry_ids):
+        return sum(self.pending.pop(i, None) is not None for i in entry_ids)
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        entries = self.streams.get(key, [])
+        if min.startswith("("):
+            after = int(min[1:].split("-")[0])
+            entries = [e for e in entries if int(e[0].decode().split("-")[0]) > after]
+        return entries[:count]
+
+
+class FakeTracker:
+    def __init__(self, failures=0):
+        self.activities = []
+        self.timestamps = []
+        self.reset = None
+        self.failures = failures  # 처음 N번 호출은 실패 (-1이면 항상)
+
+    async def track_activity(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("db down")
+        self.activities.append((kwargs["student_id"], kwargs["activity_type"].value))
+        self.timestamps.append(kwargs.get("timestamp"))
+        return None
+
+    def reset_session(self, session_id, students):
+        self.reset = (session_id, dict(students))
+
+
+def chat_event(session_id, student_id):
+    return {
+        "type": "engagement",
+        "activity_type": "chat",
+        "session_id": session_id,
+        "student_id": student_id,
+        "student_name": student_id.upper(),
+        "timestamp": "2026-03-02T09:00:00+00:00",
+    }
+
+
+def make_listener(tracker, redis=None):
+    listener = EngagementEventListener("redis://unused", tracker, db_manager=None)
+    listener.stream = EventStream(redis or FakeStreamRedis())
+    return listener
+
+
+async def settle(rounds=50):
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_append_writes_global_stream_and_session_log():
+    redis = FakeStreamRedis()
+    stream = EventStream(redis)
+
+    await stream.append(chat_event("s1", "alice"))
+
+    (global_id, _), = redis.streams[stream.stream_key]
+    (session_id, _), = redis.streams[session_log_key("s1")]
+    assert global_id == session_id
+
+
+@pytest.mark.asyncio
+async def test_read_and_ack_clears_pending():
+    redis = FakeStreamRedis()
+    stream = EventStream(redis)
+    await stream.ensure_group()
+    await stream.ensure_group()  # BUSYGROUP 무시
+
+    await stream.append(chat_event("s1", "alice"))
+    entries = await stream.read("worker-0")
+
+    assert [event["student_id"] for _, event in entries] == ["alice"]
+    assert await stream.ack(entries[0][0]) == 1
+    assert redis.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_claim_stale_reassigns_unacked_entries():
+    redis = FakeStreamRedis()
+    stream = EventStream(redis)
+    await stream.ensure_group()
+    await stream.append(chat_event("s1", "alice"))
+    (entry_id, _), = await stream.read("crashed-worker")
+
+    redis.pending[entry_id] = ["crashed-worker", 60000, 1]
+    claimed = await stream.claim_stale("worker-1", min_idle_ms=30000)
+
+    assert [eid for eid, _ in claimed] == [entry_id]
+    assert redis.pending[entry_id][0] == "worker-1"
+    assert await stream.delivery_count(entry_id) == 2
+
+
+@pytest.mark.asyncio
+async def test_read_session_pages_in_order():
+    stream = EventStream(FakeStreamRedis())
+    for i in range(5):
+        await stream.append(chat_event("s1", f"student-{i}"))
+    await stream.append(chat_event("s2", "other"))
+
+    events = [e async for e in stream.read_session("s1", batch_size=2)]
+
+    assert [e["student_id"] for e in events] == [f"student-{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_listener_replay_rebuilds_session_from_log():
+    stream = EventStream(FakeStreamRedis())
+    for student_id in ["alice", "bob", "alice"]:
+        await stream.append(chat_event("s1", student_id))
+
+    tracker = FakeTracker()
+    listener = EngagementEventListener("redis://unused", tracker, db_manager=None)
+    listener.stream = stream
+
+    assert await listener.replay_session("s1") == 3
+    assert tracker.reset == ("s1", {"alice": ("ALICE", "unknown"), "bob": ("BOB", "unknown")})
+    assert tracker.activities == [("alice", "chat"), ("bob", "chat"), ("alice", "chat")]
+
+
+@pytest.mark.asyncio
+async def test_stream_workers_process_and_ack():
+    redis = FakeStreamRedis()
+    stream = EventStream(redis)
+    tracker = FakeTracker()
+    listener = EngagementEventListener("redis://unused", tracker, db_manager=None)
+    listener.stream = stream
+
+    await listener.start_stream_workers(workers=2)
+    for student_id in ["alice", "bob"]:
+        await stream.append(chat_event("s1", student_id))
+    await settle()
+    await listener.stop()
+
+    assert sorted(sid for sid, _ in tracker.activities) == ["alice", "bob"]
+    assert tracker.timestamps[0] == datetime(2026, 3, 2, 9, tzinfo=UTC)
+    assert redis.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_entry_stays_pending_and_is_retried():
+    redis = FakeStreamRedis()
+    tracker = FakeTracker(failures=1)
+    listener = make_listener(tracker, redis)
+    await listener.stream.append(chat_event("s1", "alice"))
+
+    # claim_idle_ms=0: 실패한 항목을 곧바로 다시 가져옴
+    await listener.start_stream_workers(workers=1, claim_idle_ms=0)
+    await settle()
+    await listener.stop()
+
+    assert tracker.activities == [("alice", "chat")]
+    assert redis.pending == {}
+    assert dead_letter_key(listener.stream.stream_key) not in redis.streams
+
+
+@pytest.mark.asyncio
+async def test_failure_without_retry_is_not_acked():
+    redis = FakeStreamRedis()
+    listener = make_listener(FakeTracker(failures=-1), redis)
+    await listener.stream.append(chat_event("s1", "alice"))
+
+    await listener.start_stream_workers(workers=1, claim_idle_ms=60000)
+    await settle()
+    await listener.stop()
+
+    assert list(redis.pending) == ["1-0"]
+
+
+@pytest.mark.asyncio
+async def test_poison_entry_dead_lettered_after_max_deliveries():
+    redis = FakeStreamRedis()
+    listener = make_listener(FakeTracker(failures=-1), redis)
+    await listener.stream.append(chat_event("s1", "alice"))
+
+    await listener.start_stream_workers(workers=1, claim_idle_ms=0, max_deliveries=3)
+    await settle(100)
+    await listener.stop()
+
+    assert redis.pending == {}
+    (_, fields), = redis.streams[dead_letter_key(listener.stream.stream_key)]
+    assert fields[b"entry_id"] == b"1-0"
+    assert int(fields[b"deliveries"]) >= 3
+
+
+@pytest.mark.asyncio
+async def test_invalid_event_dead_lettered_without_retry():
+    redis = FakeStreamRedis()
+    tracker = FakeTracker()
+    listener = make_listener(tracker, redis)
+    event = chat_event("s1", "alice")
+    event["activity_type"] = "dance"
+    await listener.stream.append(event)
+
+    await listener.start_stream_workers(workers=1, claim_idle_ms=0)
+    await settle()
+    await listener.stop()
+
+    assert tracker.activities == []
+    assert redis.pending == {}
+    (_, fields), = redis.streams[dead_letter_key(listener.stream.stream_key)]
+    assert b"dance" in fields[b"error"]
+
+
+@pytest.mark.asyncio
+async def test_handle_event_raises_for_invalid_events():
+    listener = make_listener(FakeTracker())
+
+    with pytest.raises(InvalidEngagementEventError):
+        await listener._handle_engagement_event({"activity_type": "chat"})
+
+
+class GatedTracker(FakeTracker):
+    """첫 호출이 gate가 열릴 때까지 멈춤"""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.entered = asyncio.Event()
+
+    async def track_activity(self, **kwargs):
+        if not self.entered.is_set():
+            self.entered.set()
+            await self.gate.wait()
+        return await super().track_activity(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_replay_waits_for_in_flight_event_and_pauses_workers():
+    tracker = GatedTracker()
+    listener = make_listener(tracker)
+    await listener.stream.append(chat_event("s1", "alice"))
+
+    in_flight = asyncio.create_task(listener._process(chat_event("s1", "bob")))
+    await tracker.entered.wait()
+    replay = asyncio.create_task(listener.replay_session("s1"))
+    await settle()
+
+    # 처리 중인 이벤트가 끝나기 전에는 초기화하지 않음
+    assert tracker.reset is None
+    # 재생 중 들어온 이벤트는 재생이 끝날 때까지 대기
+    waiting = asyncio.create_task(listener._process(chat_event("s1", "carol")))
+    await settle()
+
+    tracker.gate.set()
+    assert await replay == 1
+    await in_flight
+    await waiting
+
+    assert tracker.activities == [("bob", "chat"), ("alice", "chat"), ("carol", "chat")]
+
+
+@pytest.mark.asyncio
+async def test_entries_covered_by_replay_are_acked_without_reprocessing():
+    redis = FakeStreamRedis()
+    tracker = FakeTracker()
+    listener = make_listener(tracker, redis)
+    await listener.stream.ensure_group()
+    await listener.stream.append(chat_event("s1", "alice"))
+    (entry_id, event), = await listener.stream.read("main")
+
+    await listener.replay_session("s1")
+    await listener._process(event, entry_id)
+
+    assert tracker.activities == [("alice", "chat")]
+    assert redis.pending == {}
@@ -0,0 +1,161 @@
+"""
+채팅 / 참여도 keyset 페이지네이션 테스트
+
+MongoDB 없이 find(query).sort().limit().to_list()만 흉내내는 컬렉션으로 확인
+- 페이지를 끝까지 넘기면 전체 정렬 결과와 같음 (동점 포함, 중복/누락 없음)
+- 모든 페이지가 limit + 1개만 읽음
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from core.database import ENGAGEMENT_SCORE_UPDATE, DatabaseManager
+
+
+def _matches(doc, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(_matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict) and any(k.startswith("$") for k in condition):
+            value = doc.get(field)
+            for op, operand in condition.items():
+                if op == "$lt" and not (value is not None and value < operand):
+                    return False
+                if op == "$gt" and not (value is not None and value > operand):
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$exists" and (field in doc) != operand:
+                    return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, collection, docs):
+        self.collection = collection
+        self.docs = docs
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.docs.sort(key=lambda d: d[field], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, length):
+        self.collection.reads.append(len(self.docs))
+        return self.docs
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.reads = []
+        self.update_many_calls = []
+
+    def find(self, query, projection=None):
+        matched = [dict(doc) for doc in self.docs if _matches(doc, query)]
+        if projection and projection.get("_id") == 0:
+            for doc in matched:
+                doc.pop("_id", None)
+        return FakeCursor(self, matched)
+
+    async def update_many(self, query, update):
+        self.update_many_calls.append((query, update))
+
+        class Result:
+            modified_count = 0
+
+        return Result()
+
+
+async def walk(fetch, limit):
+    pages, after = [], None
+    while True:
+        docs, after = await fetch(limit=limit, after=after)
+        pages.append(docs)
+        if after is None:
+            return pages
+
+
+@pytest.mark.asyncio
+async def test_chat_pages_cover_history_newest_first_with_equal_timestamps():
+    base = datetime(2024, 3, 1, 9, 0)
+    docs = [
+        {
+            "_id": ObjectId(),
+            "session_id": "s1",
+            "student_id": f"st{i % 3}",
+            "message": f"m{i}",
+            "message_time": base + timedelta(seconds=i // 3),  # 3개씩 같은 시각
+        }
+        for i in range(23)
+    ]
+    docs.append({**docs[0], "_id": ObjectId(), "session_id": "other"})
+
+    manager = DatabaseManager()
+    manager.db = type("DB", (), {})()
+    manager.db.chat_analytics = FakeCollection(docs)
+
+    pages = await walk(
+        lambda **kw: manager.get_chat_messages_page("s1", **kw), limit=5
+    )
+
+    messages = [m["message"] for page in pages for m in page]
+    expected = sorted(
+        (d for d in docs if d["session_id"] == "s1"),
+        key=lambda d: (d["message_time"], d["_id"]),
+        reverse=True,
+    )
+    assert messages == [d["message"] for d in expected]
+    assert [len(p) for p in pages] == [5, 5, 5, 5, 3]
+    assert all("_id" not in m for page in pages for m in page)
+    assert max(manager.db.chat_analytics.reads) == 6
+
+
+@pytest.mark.asyncio
+async def test_engagement_pages_by_score_then_student_id():
+    docs = [
+        {
+            "session_id": "s1",
+            "student_id": f"s{i:02d}",
+            "overall_score": float(i % 4) * 10,  # 동점이 많은 점수
+        }
+        for i in range(10)
+    ]
+
+    manager = DatabaseManager()
+    manager.db = type("DB", (), {})()
+    manager.db.student_engagement = FakeCollection(docs)
+
+    pages = await walk(
+        lambda **kw: manager.get_session_engagement_page("s1", **kw), limit=4
+    )
+
+    order = [(d["overall_score"], d["student_id"]) for page in pages for d in page]
+    assert order == sorted(order, key=lambda k: (-k[0], k[1]))
+    assert len(set(order)) == 10
+    assert max(manager.db.student_engagement.reads) == 5
+
+    # 조회는 쓰기를 하지 않음 (정렬 키 백필은 서버 시작 시)
+    assert manager.db.student_engagement.update_many_calls == []
+
+
+@pytest.mark.asyncio
+async def test_refresh_engagement_scores_backfills_missing_sort_keys_once():
+    manager = DatabaseManager()
+    manager.db = type("DB", (), {})()
+    manager.db.student_engagement = FakeCollection([])
+
+    await manager.refresh_engagement_scores()
+
+    (query, update), = manager.db.student_engagement.update_many_calls
+    assert query == {"overall_score": {"$exists": False}}
+    assert update is ENGAGEMENT_SCORE_UPDATE
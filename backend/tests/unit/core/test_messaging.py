@@ -0,0 +1,216 @@
+"""
+MessagingSystem 학생 집합 인덱스 테스트
+"""
+
+import fnmatch
+
+import pytest
+
+from core.messaging import (
+    ACTIVE_SESSIONS_KEY,
+    ONLINE_COUNT_KEY,
+    REMOVE_STUDENT_SCRIPT,
+    MessagingSystem,
+)
+
+
+class FakePipeline:
+    """명령을 모았다가 execute()에서 한 번에 실행"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.commands.append((name, args))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        results = []
+        for name, args in self.commands:
+            results.append(await getattr(self.redis, name)(*args, _counted=False))
+        self.commands = []
+        return results
+
+
+class FakeRedis:
+    """테스트에 필요한 명령만 구현한 메모리 Redis (왕복 횟수 기록)"""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+        self.keys_called = False
+
+    def _count(self, counted):
+        if counted:
+            self.round_trips += 1
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def keys(self, pattern, _counted=True):
+        self.keys_called = True
+        return [k for k in self.data if fnmatch.fnmatch(k, pattern)]
+
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.data):
+            if match is None or fnmatch.fnmatch(key, match):
+                yield key.encode()
+
+    async def exists(self, key, _counted=True):
+        self._count(_counted)
+        return int(key in self.data)
+
+    async def sadd(self, key, *members, _counted=True):
+        self._count(_counted)
+        target = self.data.setdefault(key, set())
+        before = len(target)
+        target.update(str(m).encode() for m in members)
+        return len(target) - before
+
+    async def srem(self, key, member, _counted=True):
+        self._count(_counted)
+        target = self.data.get(key, set())
+        encoded = str(member).encode()
+        if encoded in target:
+            target.discard(encoded)
+            if not target:
+                del self.data[key]
+            return 1
+        return 0
+
+    async def scard(self, key, _counted=True):
+        self._count(_counted)
+        return len(self.data.get(key, set()))
+
+    async def smembers(self, key, _counted=True):
+        self._count(_counted)
+        return set(self.data.get(key, set()))
+
+    async def sunion(self, keys, _counted=True):
+        self._count(_counted)
+        result = set()
+        for key in keys:
+            result |= self.data.get(key, set())
+        return result
+
+    async def incr(self, key, _counted=True):
+        self._count(_counted)
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    async def decr(self, key, _counted=True):
+        self._count(_counted)
+        self.data[key] = int(self.data.get(key, 0)) - 1
+        return self.data[key]
+
+    async def get(self, key, _counted=True):
+        self._count(_counted)
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+
+    async def set(self, key, value, _counted=True):
+        self._count(_counted)
+        self.data[key] = value
+
+    async def eval(self, script, numkeys, *keys_and_args, _counted=True):
+        """스크립트 실행은 한 번의 왕복 (원자적) — 사용하는 스크립트만 흉내"""
+        assert script == REMOVE_STUDENT_SCRIPT
+        self._count(_counted)
+        students_key, active_key, online_key = keys_and_args[:numkeys]
+        session_id, student_id = keys_and_args[numkeys:]
+        removed = await self.srem(students_key, student_id, _counted=False)
+        if removed:
+            await self.decr(online_key, _counted=False)
+        if not await self.scard(students_key, _counted=False):
+            await self.srem(active_key, session_id, _counted=False)
+        return removed
+
+    async def delete(self, key, _counted=True):
+        self._count(_counted)
+        return int(self.data.pop(key, None) is not None)
+
+
+@pytest.fixture
+def messaging():
+    system = MessagingSystem()
+    system.redis_client = FakeRedis()
+    return system
+
+
+@pytest.mark.asyncio
+async def test_get_all_students_uses_index_without_keys(messaging):
+    await messaging.add_student_to_session("s1", "alice")
+    await messaging.add_student_to_session("s1", "bob")
+    await messaging.add_student_to_session("s2", "carol")
+
+    redis = messaging.redis_client
+    redis.round_trips = 0
+    students = await messaging.get_all_students()
+
+    assert students == {b"alice", b"bob", b"carol"}
+    assert redis.round_trips == 2  # SMEMBERS(index) + SUNION
+    assert not redis.keys_called
+
+
+@pytest.mark.asyncio
+async def test_online_counter_ignores_duplicate_joins(messaging):
+    await messaging.add_student_to_session("s1", "alice")
+    await messaging.add_student_to_session("s1", "alice")
+    await messaging.add_student_to_session("s2", "bob")
+    await messaging.remove_student_from_session("s2", "bob")
+    await messaging.remove_student_from_session("s2", "bob")
+
+    assert await messaging.get_online_count() == 1
+    assert messaging.redis_client.data[ACTIVE_SESSIONS_KEY] == {b"s1"}
+
+
+@pytest.mark.asyncio
+async def test_remove_student_is_single_atomic_round_trip(messaging):
+    await messaging.add_student_to_session("s1", "alice")
+    await messaging.add_student_to_session("s1", "bob")
+
+    redis = messaging.redis_client
+    redis.round_trips = 0
+    await messaging.remove_student_from_session("s1", "alice")
+    assert redis.round_trips == 1  # 확인과 제거가 한 스크립트 안에서
+    assert redis.data[ACTIVE_SESSIONS_KEY] == {b"s1"}
+
+    await messaging.remove_student_from_session("s1", "bob")
+    assert ACTIVE_SESSIONS_KEY not in redis.data
+    assert await messaging.get_online_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_session_count_cached_and_invalidated(messaging):
+    await messaging.add_student_to_session("s1", "alice")
+    assert await messaging.get_session_student_count("s1") == 1
+
+    redis = messaging.redis_client
+    redis.round_trips = 0
+    assert await messaging.get_session_student_count("s1") == 1
+    assert redis.round_trips == 0
+
+    await messaging.add_student_to_session("s1", "bob")
+    assert await messaging.get_session_student_count("s1") == 2
+
+
+@pytest.mark.asyncio
+async def test_rebuild_session_index_from_existing_keys(messaging):
+    redis = messaging.redis_client
+    redis.data["airclass:students:s1"] = {b"alice", b"bob"}
+    redis.data["airclass:students:s2"] = {b"carol"}
+
+    assert await messaging.rebuild_session_index() == 2
+    assert redis.data[ACTIVE_SESSIONS_KEY] == {b"s1", b"s2"}
+    assert redis.data[ONLINE_COUNT_KEY] == 3
@@ -0,0 +1,142 @@
+"""
+학생당 퀴즈 응답 하나 (유니크 인덱스 교체, 기존 중복 정리, E11000 처리) 테스트
+
+MongoDB 없이 사용하는 연산만 흉내내는 컬렉션으로 확인
+"""
+
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from core.database import DatabaseManager
+
+
+class FakeResponses:
+    def __init__(self, docs=None, indexes=None):
+        self.docs = list(docs or [])
+        self.indexes = dict(indexes or {"_id_": {"key": [("_id", 1)]}})
+        self.dropped = []
+        self.bulk_error = None
+
+    async def index_information(self):
+        return dict(self.indexes)
+
+    async def drop_index(self, name):
+        self.dropped.append(name)
+        del self.indexes[name]
+
+    async def create_index(self, keys, name, unique=False):
+        pairs = {(d["quiz_id"], d["student_id"]) for d in self.docs}
+        assert len(pairs) == len(self.docs), "duplicates left behind a unique index"
+        self.indexes[name] = {"key": keys, "unique": unique}
+
+    async def aggregate(self, pipeline, allowDiskUse=False):
+        # $sort(responded_at, _id) + $group(quiz_id, student_id) + $match(count > 1)
+        groups = {}
+        for doc in sorted(self.docs, key=lambda d: (d["responded_at"], d["_id"])):
+            key = (doc["quiz_id"], doc["student_id"])
+            groups.setdefault(key, []).append(doc["_id"])
+        for (quiz_id, student_id), ids in groups.items():
+            if len(ids) > 1:
+                yield {
+                    "_id": {"quiz_id": quiz_id, "student_id": student_id},
+                    "ids": ids,
+                    "count": len(ids),
+                }
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.bulk_error:
+            raise self.bulk_error
+        for op in operations:
+            removed = set(op._filter["_id"]["$in"])
+            self.docs = [d for d in self.docs if d["_id"] not in removed]
+
+
+class FakeDB:
+    def __init__(self, responses):
+        self.quiz_responses = responses
+
+
+def response(_id, quiz_id, student_id, minutes):
+    return {
+        "_id": _id,
+        "quiz_id": quiz_id,
+        "student_id": student_id,
+        "responded_at": datetime(2026, 3, 2, 9, tzinfo=UTC) + timedelta(minutes=minutes),
+    }
+
+
+def manager_with(responses):
+    manager = DatabaseManager()
+    manager.db = FakeDB(responses)
+    manager.rebuilt = []
+
+    async def rebuild_quiz_stats(quiz_id=None, stale_only=False):
+        manager.rebuilt.append(quiz_id)
+        return 1
+
+    manager.rebuild_quiz_stats = rebuild_quiz_stats
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_non_unique_index_is_replaced_after_keeping_first_answer():
+    responses = FakeResponses(
+        docs=[
+            response(1, "q1", "alice", 2),
+            response(2, "q1", "alice", 0),
+            response(3, "q1", "bob", 1),
+            response(4, "q2", "alice", 5),
+        ],
+        indexes={"quiz_id_1_student_id_1": {"key": [("quiz_id", 1), ("student_id", 1)]}},
+    )
+    manager = manager_with(responses)
+
+    await manager._ensure_unique_quiz_response_index()
+
+    assert sorted(d["_id"] for d in responses.docs) == [2, 3, 4]
+    assert responses.dropped == ["quiz_id_1_student_id_1"]
+    assert responses.indexes["quiz_id_1_student_id_1"]["unique"] is True
+    # 정리한 퀴즈의 통계 카운터 재구성
+    assert manager.rebuilt == ["q1"]
+
+
+@pytest.mark.asyncio
+async def test_existing_unique_index_is_left_alone():
+    responses = FakeResponses(
+        indexes={"quiz_id_1_student_id_1": {"key": [], "unique": True}}
+    )
+    manager = manager_with(responses)
+
+    await manager._ensure_unique_quiz_response_index()
+
+    assert responses.dropped == []
+    assert manager.rebuilt == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_treats_duplicate_key_errors_as_duplicates():
+    responses = FakeResponses()
+    responses.bulk_error = BulkWriteError(
+        {
+            "writeErrors": [{"index": 1, "code": 11000, "errmsg": "E11000 duplicate key"}],
+            "upserted": [{"index": 0, "_id": "a"}, {"index": 2, "_id": "c"}],
+        }
+    )
+    manager = manager_with(responses)
+    docs = [{"quiz_id": "q1", "student_id": s} for s in ("alice", "bob", "carol")]
+
+    assert await manager.bulk_insert_quiz_responses(docs) == [True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_reraises_other_write_errors():
+    responses = FakeResponses()
+    responses.bulk_error = BulkWriteError(
+        {"writeErrors": [{"index": 0, "code": 121, "errmsg": "validation failed"}]}
+    )
+    manager = manager_with(responses)
+
+    with pytest.raises(BulkWriteError):
+        await manager.bulk_insert_quiz_responses([{"quiz_id": "q1", "student_id": "a"}])
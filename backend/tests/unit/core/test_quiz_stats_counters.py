@@ -0,0 +1,233 @@
+"""
+퀴즈 통계 카운터 테스트 (응답 시 $inc 누적 → 단건 조회, 응답 문서로 재구성)
+
+MongoDB 없이 사용하는 연산만 흉내내는 컬렉션으로 확인
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core.database import DatabaseManager, option_counter_key
+from schemas import QuizCreate, QuizOption, QuizResponseCreate
+
+
+class FakeQuizzes:
+    def __init__(self):
+        self.docs = {}
+        self.find_one_calls = []
+
+    async def insert_one(self, doc):
+        self.docs[doc["quiz_id"]] = dict(doc)
+
+    async def find_one(self, query, projection=None):
+        self.find_one_calls.append(projection)
+        doc = self.docs.get(query["quiz_id"])
+        if doc is None:
+            return None
+        if projection is None:
+            return dict(doc)
+        return {key: doc[key] for key in projection if projection[key] and key in doc}
+
+    async def update_one(self, query, update):
+        doc = self.docs[query["quiz_id"]]
+        for path, amount in update.get("$inc", {}).items():
+            target = doc
+            *parents, leaf = path.split(".")
+            for part in parents:
+                target = target.setdefault(part, {})
+            target[leaf] = target.get(leaf, 0) + amount
+        doc.update(update.get("$set", {}))
+
+    async def distinct(self, field, query):
+        stale = "counters_version" in query
+        return [
+            qid
+            for qid, doc in self.docs.items()
+            if query.get("quiz_id", qid) == qid
+            and not (stale and doc.get("counters_version") == 1)
+        ]
+
+    async def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            await self.update_one(op._filter, op._doc)
+
+
+class FakeResponses:
+    def __init__(self):
+        self.docs = []
+        self.aggregations = 0
+
+    async def update_one(self, query, update, upsert=False):
+        # (quiz_id, student_id) $setOnInsert upsert만 지원
+        if any(all(doc.get(k) == v for k, v in query.items()) for doc in self.docs):
+            return SimpleNamespace(upserted_id=None)
+        self.docs.append(dict(update["$setOnInsert"]))
+        return SimpleNamespace(upserted_id=len(self.docs))
+
+    def find(self, *args, **kwargs):
+        raise AssertionError("stats must not scan quiz responses")
+
+    async def aggregate(self, pipeline):
+        # $match(quiz_id 또는 quiz_id $in) + $group(quiz_id, selected_option_id)
+        match = pipeline[0]["$match"].get("quiz_id")
+        self.aggregations += 1
+        groups = {}
+        for doc in self.docs:
+            if isinstance(match, dict):
+                if doc["quiz_id"] not in match["$in"]:
+                    continue
+            elif match not in (None, doc["quiz_id"]):
+                continue
+            key = (doc["quiz_id"], doc["selected_option_id"])
+            group = groups.setdefault(
+                key,
+                {
+                    "_id": {"quiz_id": key[0], "option_id": key[1]},
+                    "count": 0,
+                    "correct": 0,
+                    "response_time": 0.0,
+                },
+            )
+            group["count"] += 1
+            group["correct"] += int(doc["is_correct"])
+            group["response_time"] += doc["response_time"]
+        for group in groups.values():
+            yield group
+
+
+class FakeDB:
+    def __init__(self):
+        self.quizzes = FakeQuizzes()
+        self.quiz_responses = FakeResponses()
+
+
+@pytest.fixture
+async def db():
+    manager = DatabaseManager()
+    manager.db = FakeDB()
+    await manager.create_quiz(
+        QuizCreate(
+            quiz_id="quiz_001",
+            session_id="s1",
+            question="2 + 2 = ?",
+            options=[
+                QuizOption(id="opt_a", text="3"),
+                QuizOption(id="opt_b", text="4"),
+                QuizOption(id="opt.c", text="5"),
+            ],
+            correct_option_id="opt_b",
+            topic="math",
+        )
+    )
+    return manager
+
+
+async def answer(db, student_id, option_id, response_time):
+    return await db.create_quiz_response(
+        QuizResponseCreate(
+            quiz_id="quiz_001",
+            student_id=student_id,
+            selected_option_id=option_id,
+            response_time=response_time,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_stats_come_from_counters_in_one_projected_lookup(db):
+    await answer(db, "s1", "opt_b", 3.0)
+    await answer(db, "s2", "opt_b", 4.0)
+    await answer(db, "s3", "opt_a", 2.5)
+    await answer(db, "s4", "opt.c", 5.0)
+    db.db.quizzes.find_one_calls.clear()
+
+    stats = await db.get_quiz_stats("quiz_001")
+
+    assert stats == {
+        "quiz_id": "quiz_001",
+        "total_responses": 4,
+        "correct_responses": 2,
+        "accuracy": 50.0,
+        "option_distribution": {"opt_b": 2, "opt_a": 1, "opt.c": 1},
+        "average_response_time": 3.62,
+    }
+    assert len(db.db.quizzes.find_one_calls) == 1
+    assert "options" not in db.db.quizzes.find_one_calls[0]
+
+
+@pytest.mark.asyncio
+async def test_repeat_answer_is_rejected_and_not_counted(db):
+    assert await answer(db, "s1", "opt_b", 3.0) is not None
+    assert await answer(db, "s1", "opt_a", 1.0) is None
+
+    stats = await db.get_quiz_stats("quiz_001")
+    assert stats["total_responses"] == 1
+    assert stats["option_distribution"] == {"opt_b": 1}
+    assert len(db.db.quiz_responses.docs) == 1
+
+
+@pytest.mark.asyncio
+async def test_no_responses_and_missing_quiz(db):
+    stats = await db.get_quiz_stats("quiz_001")
+
+    assert stats["total_responses"] == 0
+    assert stats["accuracy"] == 0.0
+    assert stats["option_distribution"] == {}
+    assert await db.get_quiz_stats("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_rebuild_repairs_drifted_counters(db):
+    await answer(db, "s1", "opt_b", 3.0)
+    await answer(db, "s2", "opt_a", 1.0)
+    quiz = db.db.quizzes.docs["quiz_001"]
+    quiz["total_responses"] = 7
+    quiz["option_counts"][option_counter_key("opt_b")] = 5
+
+    assert await db.rebuild_quiz_stats("quiz_001") == 1
+
+    stats = await db.get_quiz_stats("quiz_001")
+    assert stats["total_responses"] == 2
+    assert stats["correct_responses"] == 1
+    assert stats["option_distribution"] == {"opt_b": 1, "opt_a": 1}
+    assert stats["average_response_time"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_stats_read_never_rebuilds_counters(db):
+    await answer(db, "s1", "opt_b", 3.0)
+    del db.db.quizzes.docs["quiz_001"]["option_counts"]
+
+    await db.get_quiz_stats("quiz_001")
+
+    assert db.db.quiz_responses.aggregations == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_only_rebuild_repairs_partial_legacy_counters(db):
+    # 카운터 도입 전 응답 2건 + 배포 후 응답 1건 → option_counts에는 1건만
+    db.db.quiz_responses.docs = [
+        {
+            "quiz_id": "quiz_001",
+            "selected_option_id": option_id,
+            "is_correct": option_id == "opt_b",
+            "response_time": response_time,
+        }
+        for option_id, response_time in [("opt_b", 2.0), ("opt_a", 4.0)]
+    ]
+    quiz = db.db.quizzes.docs["quiz_001"]
+    quiz.update(total_responses=2, correct_count=1, option_counts={}, response_time_sum=0.0)
+    del quiz["counters_version"]
+    await answer(db, "s3", "opt_b", 3.0)
+    assert (await db.get_quiz_stats("quiz_001"))["option_distribution"] == {"opt_b": 1}
+
+    assert await db.rebuild_quiz_stats(stale_only=True) == 1
+
+    stats = await db.get_quiz_stats("quiz_001")
+    assert stats["total_responses"] == 3
+    assert stats["option_distribution"] == {"opt_b": 2, "opt_a": 1}
+    assert stats["average_response_time"] == 3.0
+    assert quiz["counters_version"] == 1
+    # 재구성한 퀴즈는 다시 대상이 되지 않음
+    assert await db.rebuild_quiz_stats(stale_only=True) == 0
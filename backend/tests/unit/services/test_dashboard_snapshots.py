@@ -0,0 +1,126 @@
+"""
+대시보드 스냅샷 공유/debounce/diff push 테스트
+"""
+
+import asyncio
+
+import pytest
+
+from schemas import ActivityType
+from services.dashboard_snapshots import DashboardSnapshotHub, diff_snapshots
+from services.engagement_service import EngagementTracker
+
+
+class NullDB:
+    async def get_session_engagement(self, session_id, summary_only=False):
+        return []
+
+    async def get_student_engagement(self, session_id, student_id):
+        return None
+
+    async def update_student_engagement(self, engagement):
+        return True
+
+
+async def chat(tracker, session_id, student_id):
+    await tracker.track_activity(
+        session_id, student_id, student_id.upper(), "node-1", ActivityType.CHAT, {}
+    )
+
+
+def test_diff_contains_only_changed_parts():
+    old = {
+        "overview": {"total_students": 2, "average_score": 50.0},
+        "students": {"a": {"student_id": "a", "overall_score": 40}, "b": {"student_id": "b"}},
+        "alerts": {},
+    }
+    new = {
+        "overview": {"total_students": 2, "average_score": 55.0},
+        "students": {"a": {"student_id": "a", "overall_score": 60}},
+        "alerts": {},
+    }
+
+    assert diff_snapshots(old, new) == {
+        "overview": {"average_score": 55.0},
+        "students": {"upsert": [{"student_id": "a", "overall_score": 60}], "removed": ["b"]},
+    }
+
+
+@pytest.mark.asyncio
+async def test_observers_share_one_debounced_recompute(monkeypatch):
+    tracker = EngagementTracker(NullDB())
+    await chat(tracker, "s1", "alice")
+    hub = DashboardSnapshotHub(tracker, debounce=0.01)
+
+    first = await hub.subscribe("s1", 50.0)
+    second = await hub.subscribe("s1", 50.0)
+    assert first.producer is second.producer
+
+    snapshot = await first.next_message()
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["overview"]["total_students"] == 1
+    await second.next_message()
+
+    refreshes = 0
+    original = first.producer.refresh
+
+    async def counting_refresh():
+        nonlocal refreshes
+        refreshes += 1
+        return await original()
+
+    monkeypatch.setattr(first.producer, "refresh", counting_refresh)
+
+    # 연속된 변경 여러 건 → 재계산 1회
+    await chat(tracker, "s1", "bob")
+    await chat(tracker, "s1", "alice")
+    await chat(tracker, "s1", "alice")
+
+    diffs = await asyncio.wait_for(
+        asyncio.gather(first.next_message(), second.next_message()), timeout=1
+    )
+
+    assert refreshes == 1
+    for diff in diffs:
+        assert diff["type"] == "diff"
+        assert diff["base_version"] == 1 and diff["version"] == 2
+        assert diff["overview"]["total_students"] == 2
+        assert {s["student_id"] for s in diff["students"]["upsert"]} == {"alice", "bob"}
+
+    hub.close()
+
+
+@pytest.mark.asyncio
+async def test_lagging_subscriber_gets_full_snapshot():
+    tracker = EngagementTracker(NullDB())
+    hub = DashboardSnapshotHub(tracker, debounce=0)
+
+    subscriber = await hub.subscribe("s1", 50.0)
+    await subscriber.next_message()
+
+    # 구독자가 읽기 전에 두 번 바뀜 → diff 체인이 끊겨 전체 스냅샷
+    await chat(tracker, "s1", "alice")
+    await subscriber.producer.refresh()
+    await chat(tracker, "s1", "bob")
+    await subscriber.producer.refresh()
+
+    message = await subscriber.next_message()
+    assert message["type"] == "snapshot"
+    assert message["version"] == 3
+    assert len(message["students"]) == 2
+
+    hub.close()
+
+
+@pytest.mark.asyncio
+async def test_last_unsubscribe_drops_producer_and_other_sessions_are_ignored():
+    tracker = EngagementTracker(NullDB())
+    hub = DashboardSnapshotHub(tracker, debounce=0)
+    subscriber = await hub.subscribe("s1", 50.0)
+
+    await chat(tracker, "other", "alice")
+    assert subscriber.producer._task is None
+
+    hub.unsubscribe(subscriber)
+    assert hub.producers == {}
+    hub.close()
@@ -0,0 +1,117 @@
+"""
+세션 참여도 증분 집계 테스트
+"""
+
+import random
+from datetime import datetime, UTC
+
+import pytest
+
+from schemas import ActivityType, EngagementMetrics, StudentEngagement
+from services.engagement_service import EngagementTracker, SessionAggregate
+
+
+class MemoryDB:
+    def __init__(self, stored=()):
+        self.stored = list(stored)
+        self.session_loads = 0
+
+    async def get_session_engagement(self, session_id, summary_only=False):
+        self.session_loads += 1
+        return [e.model_copy(deep=True) for e in self.stored]
+
+    async def get_student_engagement(self, session_id, student_id):
+        return None
+
+    async def update_student_engagement(self, engagement):
+        return True
+
+
+def make_engagement(student_id, chat=0, quiz=0, accuracy=0.0):
+    return StudentEngagement(
+        session_id="s1",
+        student_id=student_id,
+        student_name=student_id.upper(),
+        node_name="node-1",
+        metrics=EngagementMetrics(
+            chat_message_count=chat,
+            participation_count=quiz,
+            quiz_accuracy=accuracy,
+        ),
+        updated_at=datetime.now(UTC),
+    )
+
+
+def full_recompute(tracker, engagements, duration):
+    calc = tracker.calculator
+    return sorted(
+        calc.calculate_overall_engagement_score(
+            attention_score=e.metrics.attention_score,
+            participation_score=calc.calculate_participation_score(
+                e.metrics.chat_message_count, e.metrics.participation_count, duration
+            ),
+            quiz_accuracy=e.metrics.quiz_accuracy,
+        )
+        for e in engagements
+    )
+
+
+def test_aggregate_replaces_previous_score():
+    aggregate = SessionAggregate("s1")
+    aggregate.update("a", "A", 90.0)
+    aggregate.update("b", "B", 30.0)
+    aggregate.update("a", "A", 50.0)
+
+    snapshot = aggregate.snapshot(top_k=1)
+    assert snapshot["total_students"] == 2
+    assert snapshot["average_score"] == 40.0
+    assert (snapshot["min_score"], snapshot["max_score"]) == (30.0, 50.0)
+    assert snapshot["students_by_level"] == {
+        "excellent": 0,
+        "good": 0,
+        "moderate": 1,
+        "low": 1,
+    }
+    assert [s["student_id"] for s in snapshot["top_students"]] == ["a"]
+
+    aggregate.remove("a")
+    assert aggregate.snapshot()["average_score"] == 30.0
+
+
+@pytest.mark.asyncio
+async def test_incremental_stats_match_full_recompute_without_db():
+    db = MemoryDB([make_engagement(f"st-{i}", chat=i, quiz=i % 3) for i in range(10)])
+    tracker = EngagementTracker(db)
+    rng = random.Random(7)
+
+    for _ in range(200):
+        student_id = f"st-{rng.randrange(14)}"
+        if rng.random() < 0.5:
+            activity, data = ActivityType.CHAT, {}
+        else:
+            activity = ActivityType.QUIZ_RESPONSE
+            data = {"response_time_ms": 1500, "is_correct": rng.random() < 0.6}
+        await tracker.track_activity("s1", student_id, student_id, "node-1", activity, data)
+
+    stats = await tracker.calculate_session_engagement("s1", 50.0)
+    engagements = await tracker.get_session_engagements("s1")
+    expected = full_recompute(tracker, engagements, 50.0)
+
+    assert db.session_loads == 1
+    assert stats["total_students"] == len(engagements) == 14
+    assert stats["average_score"] == pytest.approx(sum(expected) / len(expected))
+    assert stats["max_score"] == pytest.approx(expected[-1])
+    assert stats["min_score"] == pytest.approx(expected[0])
+    assert sum(stats["students_by_level"].values()) == 14
+
+
+@pytest.mark.asyncio
+async def test_zero_duration_falls_back_to_cached_recompute():
+    db = MemoryDB([make_engagement("alice", chat=2)])
+    tracker = EngagementTracker(db)
+
+    stats = await tracker.calculate_session_engagement("s1", 0)
+
+    assert stats["average_score"] == pytest.approx(4.0)
+    assert "top_students" not in stats
+    assert db.session_loads == 1
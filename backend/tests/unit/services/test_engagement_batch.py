@@ -0,0 +1,70 @@
+"""
+EngagementCalculator 배치(NumPy) 점수 계산 테스트
+스칼라 버전과 결과가 완전히 같은지 검증
+"""
+
+import random
+from datetime import datetime, UTC
+
+import numpy as np
+import pytest
+
+from schemas import EngagementMetrics, StudentEngagement
+from services.engagement_service import EngagementCalculator
+
+
+@pytest.fixture
+def calculator():
+    return EngagementCalculator()
+
+
+def test_latency_scores_match_scalar_including_boundaries(calculator):
+    latencies = [-1, 0, 999, 1000, 1001, 3000, 3001, 5000, 5001, 10000, 10001, 60000]
+
+    batch = calculator.calculate_latency_scores(np.array(latencies))
+
+    assert batch.tolist() == [calculator._calculate_latency_score(ms) for ms in latencies]
+
+
+@pytest.mark.parametrize("duration", [0, 50.0])
+def test_scores_match_scalar(calculator, duration):
+    rng = random.Random(42)
+    engagements = [
+        StudentEngagement(
+            session_id="s1",
+            student_id=f"st-{i}",
+            student_name=f"ST-{i}",
+            node_name="node-1",
+            metrics=EngagementMetrics(
+                attention_score=rng.random(),
+                participation_count=rng.randrange(15),
+                quiz_accuracy=rng.choice([0.0, 0.3, 0.7, 1.0, rng.random()]),
+                chat_message_count=rng.randrange(12),
+            ),
+            updated_at=datetime.now(UTC),
+        )
+        for i in range(500)
+    ]
+
+    batch = calculator.score_engagements(engagements, duration)
+    scalar = calculator._score_engagements_scalar(engagements, duration)
+
+    assert batch == scalar
+
+
+def test_confusion_batch_with_indicators_matches_scalar(calculator):
+    cases = [
+        (0.2, False, 0),
+        (0.2, True, 0),
+        (0.9, True, 3),
+        (0.0, False, 5),
+        (0.69, True, 1),
+    ]
+    accuracy, chat, indicators = map(np.array, zip(*cases))
+
+    is_confused, confidence = calculator.detect_confusion_batch(accuracy, chat, indicators)
+
+    expected = [
+        calculator.detect_confusion(a, c, ["x"] * n) for a, c, n in cases
+    ]
+    assert list(zip(is_confused.tolist(), confidence.tolist())) == expected
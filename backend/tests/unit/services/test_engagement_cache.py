@@ -0,0 +1,110 @@
+"""
+EngagementTracker 캐시 미스 처리 테스트
+세션 warm-up 1회 + 이후 신규 학생은 단건 조회
+"""
+
+import asyncio
+from datetime import datetime, UTC
+
+import pytest
+
+from schemas import ActivityType, EngagementMetrics, StudentEngagement
+from services.engagement_service import EngagementTracker
+
+
+def make_engagement(session_id, student_id, chat_count=0):
+    return StudentEngagement(
+        session_id=session_id,
+        student_id=student_id,
+        student_name=student_id.upper(),
+        node_name="node-1",
+        metrics=EngagementMetrics(chat_message_count=chat_count),
+        updated_at=datetime.now(UTC),
+    )
+
+
+class CountingDB:
+    """조회 횟수를 세는 DatabaseManager 대역"""
+
+    def __init__(self, stored):
+        self.stored = {e.student_id: e for e in stored}
+        self.session_loads = 0
+        self.point_lookups = 0
+        self.writes = 0
+
+    async def get_session_engagement(self, session_id, summary_only=False):
+        self.session_loads += 1
+        await asyncio.sleep(0)
+        return [e.model_copy(deep=True) for e in self.stored.values()]
+
+    async def get_student_engagement(self, session_id, student_id):
+        self.point_lookups += 1
+        engagement = self.stored.get(student_id)
+        return engagement.model_copy(deep=True) if engagement else None
+
+    async def update_student_engagement(self, engagement):
+        self.writes += 1
+        return True
+
+
+async def track_chat(tracker, student_id):
+    return await tracker.track_activity(
+        session_id="s1",
+        student_id=student_id,
+        student_name=student_id.upper(),
+        node_name="node-1",
+        activity_type=ActivityType.CHAT,
+        activity_data={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_events_load_session_once():
+    db = CountingDB([make_engagement("s1", f"student-{i}", 3) for i in range(40)])
+    tracker = EngagementTracker(db)
+
+    results = await asyncio.gather(
+        *(track_chat(tracker, f"student-{i}") for i in range(40))
+    )
+
+    assert db.session_loads == 1
+    assert db.point_lookups == 0
+    assert all(r.metrics.chat_message_count == 4 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_late_joiner_uses_point_lookup():
+    db = CountingDB([make_engagement("s1", "alice")])
+    tracker = EngagementTracker(db)
+    await tracker.warm_session("s1")
+
+    db.stored["bob"] = make_engagement("s1", "bob", 7)
+    await track_chat(tracker, "bob")
+    engagement = await track_chat(tracker, "bob")
+
+    assert db.session_loads == 1
+    assert db.point_lookups == 1
+    assert engagement.metrics.chat_message_count == 9
+
+
+@pytest.mark.asyncio
+async def test_warm_does_not_overwrite_newer_cache_entries():
+    db = CountingDB([make_engagement("s1", "alice", 1)])
+    tracker = EngagementTracker(db)
+    tracker.store.put(make_engagement("s1", "alice", 5))
+
+    assert await tracker.warm_session("s1") == 0
+    assert tracker.store.get("s1", "alice").metrics.chat_message_count == 5
+
+
+@pytest.mark.asyncio
+async def test_clear_cache_allows_rewarm():
+    db = CountingDB([make_engagement("s1", "alice")])
+    tracker = EngagementTracker(db)
+    await tracker.warm_session("s1")
+    await tracker.warm_session("s1")
+
+    await tracker.clear_cache()
+    await tracker.warm_session("s1")
+
+    assert db.session_loads == 2
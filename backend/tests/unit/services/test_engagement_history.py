@@ -0,0 +1,104 @@
+"""
+학생별 점수 시계열 (링 버퍼) 및 추세 분석 테스트
+"""
+
+import itertools
+import time
+
+import pytest
+
+from schemas import ActivityType
+from services.engagement_history import EngagementHistory, ScoreHistory
+from services.engagement_service import EngagementCalculator, EngagementTracker
+
+
+def test_ring_buffer_keeps_latest_samples_in_order():
+    history = ScoreHistory(capacity=3, resolution=0)
+    for t in range(5):
+        history.add(float(t), float(t * 10))
+
+    assert len(history) == 3
+    assert history.samples() == ([2.0, 3.0, 4.0], [20.0, 30.0, 40.0])
+    assert history.samples(since=3.0) == ([3.0, 4.0], [30.0, 40.0])
+
+
+def test_samples_within_resolution_are_merged():
+    history = ScoreHistory(capacity=4, resolution=5)
+    history.add(0.0, 10.0)
+    history.add(2.0, 20.0)
+    history.add(6.0, 30.0)
+
+    assert history.samples() == ([2.0, 6.0], [20.0, 30.0])
+
+
+def test_analyze_series_uses_regression_within_window():
+    calculator = EngagementCalculator()
+    # 10분 전 급락 후 최근 5분은 분당 2점씩 상승
+    timestamps = [0.0] + [300.0 + 60 * i for i in range(6)]
+    scores = [90.0] + [40.0 + 2 * i for i in range(6)]
+
+    trend = calculator.analyze_series(timestamps, scores, window_minutes=5)
+
+    assert trend["samples"] == 6
+    assert trend["slope_per_minute"] == pytest.approx(2.0)
+    assert trend["trend_direction"] == "increasing"
+    assert 40.0 < trend["ewma"] < 50.0
+
+
+def test_analyze_series_empty_window_is_stable():
+    trend = EngagementCalculator().analyze_series([0.0], [50.0], 1, now=600.0)
+
+    assert trend["trend_direction"] == "stable"
+    assert trend["samples"] == 0
+
+
+class NullDB:
+    async def get_session_engagement(self, session_id, summary_only=False):
+        return []
+
+    async def get_student_engagement(self, session_id, student_id):
+        return None
+
+    async def update_student_engagement(self, engagement):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_tracker_reports_trends_for_all_students(monkeypatch):
+    clock = itertools.count(time.time() - 60, 10)
+    monkeypatch.setattr("services.engagement_history.time.time", lambda: next(clock))
+    tracker = EngagementTracker(NullDB(), history=EngagementHistory(resolution=0))
+
+    for student_id in ["alice", "alice", "alice", "bob"]:
+        await tracker.track_activity(
+            "s1", student_id, student_id.upper(), "node-1", ActivityType.CHAT, {}
+        )
+
+    trends = {t["student_id"]: t for t in tracker.get_session_trends("s1")}
+
+    assert set(trends) == {"alice", "bob"}
+    assert trends["alice"]["student_name"] == "ALICE"
+    assert trends["alice"]["samples"] == 3
+    assert trends["alice"]["trend_direction"] == "increasing"
+    assert trends["bob"]["trend_direction"] == "stable"
+
+
+@pytest.mark.asyncio
+async def test_student_trend_uses_recorded_history(monkeypatch):
+    clock = itertools.count(time.time() - 60, 10)
+    monkeypatch.setattr("services.engagement_history.time.time", lambda: next(clock))
+    tracker = EngagementTracker(NullDB(), history=EngagementHistory(resolution=0))
+
+    for _ in range(3):
+        await tracker.track_activity(
+            "s1", "alice", "Alice", "node-1", ActivityType.CHAT, {}
+        )
+
+    trend = tracker.get_student_trend("s1", "alice")
+    assert trend["samples"] == 3
+    assert trend["trend_direction"] == "increasing"
+
+    # 기록이 없는 학생은 stable
+    missing = tracker.get_student_trend("s1", "nobody")
+    assert missing["samples"] == 0
+    assert missing["trend_direction"] == "stable"
@@ -0,0 +1,84 @@
+"""
+참여도 이벤트 리스너 (전체 세션 패턴 구독 + 샤드 워커) 테스트
+"""
+
+import asyncio
+
+import pytest
+
+from core.event_bus import InMemoryEventBus
+from services.engagement_listener import EngagementEventListener
+
+
+class SlowTracker:
+    """학생별 처리 순서와 동시 처리 수를 기록"""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.order = {}
+        self.in_flight = 0
+        self.peak = 0
+        self.done = 0
+
+    async def track_activity(self, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        key = (kwargs["session_id"], kwargs["student_id"])
+        self.order.setdefault(key, []).append(kwargs["activity_data"].get("response_time_ms"))
+        self.in_flight -= 1
+        self.done += 1
+
+
+def quiz_event(session_id, student_id, seq):
+    return {
+        "type": "engagement",
+        "activity_type": "quiz_response",
+        "session_id": session_id,
+        "student_id": student_id,
+        "response_time_ms": seq,
+    }
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_start_all_covers_every_session_with_one_subscription():
+    bus = InMemoryEventBus()
+    tracker = SlowTracker(delay=0)
+    listener = EngagementEventListener("redis://unused", tracker, None, bus=bus)
+    await listener.start_all(workers=2)
+
+    for session_id in ["s1", "s2", "s3"]:
+        await bus.publish(
+            f"airclass:session:{session_id}:engagement", quiz_event(session_id, "a", 1)
+        )
+    await wait_until(lambda: tracker.done == 3)
+
+    assert set(tracker.order) == {("s1", "a"), ("s2", "a"), ("s3", "a")}
+    await listener.stop()
+
+
+@pytest.mark.asyncio
+async def test_start_all_keeps_student_order_and_runs_students_in_parallel():
+    bus = InMemoryEventBus()
+    tracker = SlowTracker(delay=0.01)
+    listener = EngagementEventListener("redis://unused", tracker, None, bus=bus)
+    await listener.start_all(workers=8)
+
+    students = [f"student-{i}" for i in range(8)]
+    for seq in range(3):
+        for student_id in students:
+            await bus.publish(
+                "airclass:session:s1:engagement", quiz_event("s1", student_id, seq)
+            )
+    await wait_until(lambda: tracker.done == 24)
+
+    assert all(order == [0, 1, 2] for order in tracker.order.values())
+    assert tracker.peak > 1
+    await listener.stop()
@@ -0,0 +1,269 @@
+"""
+대시보드 집계 파이프라인 테스트
+
+MongoDB 없이 파이프라인에 쓰인 연산자만 해석하는 작은 평가기로 실행해서
+EngagementCalculator(Python) 계산 결과와 같은지 확인
+"""
+
+import random
+from datetime import datetime, UTC
+
+import pytest
+
+from core.database import ENGAGEMENT_SCORE_UPDATE, engagement_update_pipeline
+from services.engagement_pipelines import (
+    alerts_pipeline,
+    student_detail_pipeline,
+    students_pipeline,
+)
+from services.engagement_service import EngagementCalculator
+
+
+# ============================================
+# 최소 집계 평가기 (파이프라인에 쓰인 연산자만)
+# ============================================
+
+
+def _path(doc, path):
+    value = doc
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def _eval(expr, doc):
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _path(doc, expr[1:])
+    if not isinstance(expr, dict):
+        return expr
+    (op, args), = expr.items()
+    if op == "$literal":
+        return args
+    if op == "$switch":
+        for branch in args["branches"]:
+            if _eval(branch["case"], doc):
+                return _eval(branch["then"], doc)
+        return args["default"]
+    values = [_eval(arg, doc) for arg in args]
+    if op == "$ifNull":
+        return values[0] if values[0] is not None else values[1]
+    if op == "$add":
+        total = 0
+        for value in values:
+            total += value
+        return total
+    if op == "$multiply":
+        return values[0] * values[1]
+    if op == "$divide":
+        return values[0] / values[1]
+    if op == "$subtract":
+        return values[0] - values[1]
+    if op == "$min":
+        return min(values)
+    if op == "$max":
+        return max(values)
+    if op == "$cond":
+        return values[1] if values[0] else values[2]
+    comparisons = {
+        "$gt": lambda a, b: a > b,
+        "$gte": lambda a, b: a >= b,
+        "$lt": lambda a, b: a < b,
+    }
+    return comparisons[op](*values)
+
+
+def _matches(doc, query):
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = _path(doc, key)
+            for op, operand in condition.items():
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+        elif _path(doc, key) != condition:
+            return False
+    return True
+
+
+def run_pipeline(docs, pipeline):
+    for stage in pipeline:
+        (op, spec), = stage.items()
+        if op == "$match":
+            docs = [doc for doc in docs if _matches(doc, spec)]
+        elif op == "$project":
+            docs = [
+                {
+                    key: doc.get(key) if value == 1 else _eval(value, doc)
+                    for key, value in spec.items()
+                    if value != 0 and (value != 1 or key in doc)
+                }
+                for doc in docs
+            ]
+        elif op == "$addFields":
+            docs = [{**doc, **{k: _eval(v, doc) for k, v in spec.items()}} for doc in docs]
+        elif op == "$sort":
+            for key, direction in reversed(list(spec.items())):
+                docs = sorted(docs, key=lambda d: d[key], reverse=direction < 0)
+        elif op == "$limit":
+            docs = docs[:spec]
+        else:
+            raise AssertionError(f"unsupported stage {op}")
+    return docs
+
+
+# ============================================
+# Tests
+# ============================================
+
+
+def make_docs(count, seed=0):
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    docs = []
+    for i in range(count):
+        metrics = {
+            "attention_score": rng.random(),
+            "participation_count": rng.randrange(15),
+            "quiz_accuracy": rng.choice([0.0, 0.1, 0.25, 0.5, rng.random()]),
+            "response_latency_ms": rng.randrange(15000),
+            "chat_message_count": rng.randrange(12),
+        }
+        if i % 7 == 0:
+            # 필드가 없는 예전 문서
+            metrics = {"chat_message_count": metrics["chat_message_count"]}
+        docs.append(
+            {
+                "session_id": "s1" if i % 5 else "other",
+                "student_id": f"student-{i:03d}",
+                "student_name": f"학생{i}",
+                "node_name": "node-1",
+                "metrics": metrics,
+                "updated_at": now,
+            }
+        )
+    return docs
+
+
+def expected_scores(doc, duration):
+    calculator = EngagementCalculator()
+    metrics = doc["metrics"]
+    chat = metrics.get("chat_message_count", 0)
+    accuracy = metrics.get("quiz_accuracy", 0.0)
+    participation = calculator.calculate_participation_score(
+        chat, metrics.get("participation_count", 0), duration
+    )
+    overall = calculator.calculate_overall_engagement_score(
+        metrics.get("attention_score", 0.0), participation, accuracy
+    )
+    is_confused, confidence = calculator.detect_confusion(
+        accuracy, chat > calculator.HIGH_CHAT_THRESHOLD, []
+    )
+    level = calculator.interpret_engagement_level(overall)["level"]
+    return participation, overall, level, is_confused, confidence
+
+
+@pytest.mark.parametrize("duration", [50.0, 0])
+def test_scores_match_engagement_calculator(duration):
+    docs = make_docs(300)
+    result = run_pipeline(docs, students_pipeline("s1", duration, sort_by=None))
+    by_id = {doc["student_id"]: doc for doc in docs}
+
+    assert len(result) == sum(1 for d in docs if d["session_id"] == "s1")
+    for row in result:
+        participation, overall, level, is_confused, confidence = expected_scores(
+            by_id[row["student_id"]], duration
+        )
+        assert row["participation_score"] == participation
+        assert row["overall_score"] == pytest.approx(overall)
+        assert row["level"] == level
+        assert row["is_confused"] == is_confused
+        assert row["confusion_confidence"] == pytest.approx(confidence)
+        assert "metrics" not in row
+
+
+def test_stored_sort_key_matches_attending_student_score():
+    """문서에 저장하는 정렬 키 overall_score = 참석 중인 학생의 종합 점수"""
+    (stage,) = ENGAGEMENT_SCORE_UPDATE
+    expr = stage["$set"]["overall_score"]
+    for doc in make_docs(100):
+        _, overall, *_ = expected_scores(doc, 50.0)
+        assert _eval(expr, doc) == pytest.approx(overall)
+
+
+def _apply_update_pipeline(doc, pipeline):
+    for stage in pipeline:
+        (fields,) = stage.values()
+        values = {path: _eval(expr, doc) for path, expr in fields.items()}
+        for path, value in values.items():
+            *parents, leaf = path.split(".")
+            target = doc
+            for part in parents:
+                target = target.setdefault(part, {})
+            target[leaf] = value
+    return doc
+
+
+def test_update_pipeline_applies_deltas_and_sort_key_in_one_write():
+    """$inc/$set 필드 업데이트와 정렬 키 재계산이 업데이트 하나로"""
+    doc = make_docs(1)[0]
+    chats = doc["metrics"]["chat_message_count"]
+    pipeline = engagement_update_pipeline(
+        {
+            "$set": {"metrics.attention_score": 0.5, "student_name": "$not_a_path"},
+            "$inc": {"metrics.chat_message_count": 2},
+        }
+    )
+
+    _apply_update_pipeline(doc, pipeline)
+
+    assert doc["metrics"]["chat_message_count"] == chats + 2
+    assert doc["metrics"]["attention_score"] == 0.5
+    assert doc["student_name"] == "$not_a_path"
+    _, overall, *_ = expected_scores(doc, 50.0)
+    assert doc["overall_score"] == pytest.approx(overall)
+
+
+def test_students_sorted_and_limited_server_side():
+    result = run_pipeline(make_docs(100), students_pipeline("s1", 50.0, limit=10))
+
+    scores = [row["overall_score"] for row in result]
+    assert len(result) == 10
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_student_detail_is_single_document_lookup():
+    pipeline = student_detail_pipeline("s1", "student-003", 50.0)
+
+    assert pipeline[0] == {"$match": {"session_id": "s1", "student_id": "student-003"}}
+    (row,) = run_pipeline(make_docs(20), pipeline)
+    assert row["student_id"] == "student-003"
+    assert "last_activity_time" in row
+
+
+@pytest.mark.parametrize("alert_type", [None, "confusion", "low_engagement", "no_response"])
+def test_alerts_pipeline_returns_only_alerting_students(alert_type):
+    docs = make_docs(300)
+    result = run_pipeline(docs, alerts_pipeline("s1", alert_type))
+
+    def alerting(doc):
+        metrics = doc["metrics"]
+        _, _, _, is_confused, confidence = expected_scores(doc, 0)
+        checks = {
+            "confusion": is_confused and confidence > 0.6,
+            "low_engagement": metrics.get("quiz_accuracy", 0.0) < 0.3,
+            "no_response": metrics.get("participation_count", 0) == 0
+            and metrics.get("chat_message_count", 0) == 0,
+        }
+        return any(v for k, v in checks.items() if alert_type in (None, k))
+
+    expected = {d["student_id"] for d in docs if d["session_id"] == "s1" and alerting(d)}
+    assert expected
+    assert {row["student_id"] for row in result} == expected
+
+
+def test_unknown_alert_type_has_no_pipeline():
+    assert alerts_pipeline("s1", "unknown") == []
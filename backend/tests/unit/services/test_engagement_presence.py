@@ -0,0 +1,144 @@
+"""
+시청(presence) heartbeat 구간 병합 및 attention_score 반영 테스트
+"""
+
+import time
+
+import pytest
+
+from schemas import ActivityType
+from services.engagement_presence import PresenceAggregator, PresenceIntervals
+from services.engagement_service import EngagementTracker
+from services.engagement_writer import EngagementWriteBuffer
+
+
+def test_overlapping_and_duplicate_heartbeats_are_not_double_counted():
+    intervals = PresenceIntervals()
+    intervals.add(0, 15)
+    intervals.add(10, 25)  # 겹침
+    intervals.add(10, 25)  # 재전송
+    intervals.add(40, 55)
+
+    assert intervals.intervals == [[0, 25], [40, 55]]
+    assert intervals.total_seconds() == 40
+
+
+def test_gap_tolerance_bridges_missed_heartbeat():
+    intervals = PresenceIntervals(gap_tolerance=5)
+    intervals.add(0, 10)
+    intervals.add(14, 24)
+    intervals.add(60, 70)
+
+    assert intervals.intervals == [[0, 24], [60, 70]]
+
+
+def test_fold_keeps_total_and_ignores_late_heartbeats():
+    intervals = PresenceIntervals()
+    intervals.add(0, 10)
+    intervals.add(20, 30)
+    intervals.fold(before=25)
+
+    assert intervals.intervals == [[20, 30]]
+    assert intervals.total_seconds() == 20
+
+    # 접힌 구간에 늦게 도착한 heartbeat는 다시 세지 않음
+    intervals.add(2, 9)
+    assert intervals.total_seconds() == 20
+
+
+def test_drain_returns_only_students_with_new_heartbeats():
+    aggregator = PresenceAggregator(gap_tolerance=0)
+    aggregator.record("s1", "alice", 100, 15, "Alice", "node-1")
+    aggregator.record("s1", "bob", 100, 15, "Bob", "node-2")
+
+    drained = sorted(aggregator.drain(now=100))
+    assert drained == [
+        ("s1", "alice", "Alice", "node-1", 15),
+        ("s1", "bob", "Bob", "node-2", 15),
+    ]
+    assert aggregator.drain(now=100) == []
+
+    aggregator.record("s1", "alice", 115, 15)
+    assert aggregator.drain(now=115) == [("s1", "alice", "Unknown", "unknown", 30)]
+    # 세션 시작은 첫 heartbeat의 서버 시각
+    assert aggregator.session_elapsed("s1", now=115) == 15
+
+
+def test_client_reported_coverage_is_clamped():
+    aggregator = PresenceAggregator(gap_tolerance=0, max_covered=15)
+    aggregator.record("s1", "alice", 1000, 1e7)
+
+    assert aggregator.watch_seconds("s1", "alice") == 15
+    assert aggregator.session_elapsed("s1", now=1000) == 0
+
+    # 직전 heartbeat 이후 경과보다 길게 주장할 수 없음
+    aggregator.record("s1", "alice", 1005, 15)
+    assert aggregator.watch_seconds("s1", "alice") == 20
+
+    aggregator.record("s1", "alice", 1010, -30)
+    assert aggregator.watch_seconds("s1", "alice") == 20
+
+
+class CountingDB:
+    def __init__(self):
+        self.bulk_writes = 0
+        self.single_writes = 0
+
+    async def get_session_engagement(self, session_id, summary_only=False):
+        return []
+
+    async def get_student_engagement(self, session_id, student_id):
+        return None
+
+    async def update_student_engagement(self, engagement):
+        self.single_writes += 1
+        return True
+
+    async def bulk_update_student_engagement(self, updates):
+        self.bulk_writes += 1
+        return len(updates)
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_update_attention_in_batches():
+    db = CountingDB()
+    writer = EngagementWriteBuffer(db)
+    tracker = EngagementTracker(db, writer=writer)
+
+    start = time.time() - 45
+    for t in range(0, 60, 15):
+        tracker.record_presence("s1", "alice", "Alice", "node-1", start + t, 15)
+        tracker.record_presence("s1", "bob", "Bob", "node-1", start + t, 15)
+    # heartbeat만으로는 DB·캐시를 건드리지 않음
+    assert tracker.store.get("s1", "alice") is None
+    assert db.single_writes == db.bulk_writes == 0
+
+    assert await tracker.flush_presence() == 2
+    alice = tracker.store.get("s1", "alice")
+    assert alice.metrics.screen_time_seconds == 60
+    # 시청만 한 학생: 세션 내내 시청했으므로 screen_time 가중치만큼
+    assert alice.metrics.attention_score == pytest.approx(0.3, abs=0.01)
+
+    await tracker.close()
+    assert db.single_writes == 0
+    assert db.bulk_writes == 1
+
+
+@pytest.mark.asyncio
+async def test_quiz_response_raises_attention_score():
+    tracker = EngagementTracker(CountingDB())
+    tracker.record_presence("s1", "alice", "Alice", "node-1", time.time(), 15)
+    await tracker.flush_presence()
+    before = tracker.store.get("s1", "alice").metrics.attention_score
+
+    engagement = await tracker.track_activity(
+        "s1",
+        "alice",
+        "Alice",
+        "node-1",
+        ActivityType.QUIZ_RESPONSE,
+        {"quiz_id": "q1", "response_time_ms": 2000, "is_correct": True},
+    )
+
+    assert engagement.metrics.attention_score > before
+    assert engagement.metrics.screen_time_seconds == 15
@@ -0,0 +1,73 @@
+"""
+열 단위 참여도 저장소 테스트
+"""
+
+from datetime import datetime, UTC
+
+from schemas import EngagementMetrics, StudentEngagement
+from services.engagement_store import EngagementStore
+
+
+def make_engagement(student_id, session_id="s1", **metrics):
+    return StudentEngagement(
+        session_id=session_id,
+        student_id=student_id,
+        student_name=student_id.upper(),
+        node_name="node-1",
+        metrics=EngagementMetrics(**metrics),
+        updated_at=datetime(2026, 10, 19, 9, 30, 15, 123456, tzinfo=UTC),
+    )
+
+
+def test_round_trip_preserves_model():
+    store = EngagementStore()
+    engagement = make_engagement(
+        "alice",
+        attention_score=0.42,
+        participation_count=3,
+        quiz_accuracy=2 / 3,
+        response_latency_ms=1800,
+        chat_message_count=7,
+        last_activity_time=datetime(2026, 10, 19, 9, 31, tzinfo=UTC),
+    )
+
+    store.put(engagement)
+
+    assert store.get("s1", "alice") == engagement
+    assert store.get("s1", "bob") is None
+    assert store.get("s2", "alice") is None
+
+
+def test_naive_mongo_datetime_is_read_as_utc_and_none_is_kept():
+    store = EngagementStore()
+    engagement = make_engagement("alice")
+    engagement.updated_at = datetime(2026, 10, 19, 9, 30)
+
+    store.put(engagement)
+    loaded = store.get("s1", "alice")
+
+    assert loaded.updated_at == datetime(2026, 10, 19, 9, 30, tzinfo=UTC)
+    assert loaded.metrics.last_activity_time is None
+
+
+def test_put_updates_existing_slot():
+    store = EngagementStore()
+    store.put(make_engagement("alice", chat_message_count=1))
+    store.put(make_engagement("bob"))
+    store.put(make_engagement("alice", chat_message_count=2))
+
+    columns = store.session("s1")
+    assert len(columns) == 2
+    assert columns.column("chat_message_count").tolist() == [2, 0]
+    assert [e.student_id for e in store.engagements("s1")] == ["alice", "bob"]
+
+
+def test_drop_session_only_removes_that_session():
+    store = EngagementStore()
+    store.put(make_engagement("alice", session_id="s1"))
+    store.put(make_engagement("alice", session_id="s2"))
+
+    store.drop_session("s1")
+
+    assert store.engagements("s1") == []
+    assert len(store) == 1
@@ -0,0 +1,193 @@
+"""
+참여도 write-behind (bulk_write 델타 반영) 테스트
+"""
+
+import asyncio
+from datetime import datetime, UTC
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from schemas import ActivityType, EngagementMetrics, StudentEngagement
+from services.engagement_service import EngagementTracker
+from services.engagement_writer import EngagementWriteBuffer
+
+
+class BulkDB:
+    """bulk_write 호출을 기록하는 DatabaseManager 대역"""
+
+    def __init__(self, stored=()):
+        self.stored = {e.student_id: e for e in stored}
+        self.bulk_calls = []
+        self.single_writes = 0
+        self.fail_next = False
+        self.fail_students = set()  # 이 학생들의 업데이트만 writeErrors로 실패
+
+    async def get_session_engagement(self, session_id, summary_only=False):
+        return [e.model_copy(deep=True) for e in self.stored.values()]
+
+    async def get_student_engagement(self, session_id, student_id):
+        return None
+
+    async def update_student_engagement(self, engagement):
+        self.single_writes += 1
+        return True
+
+    async def bulk_update_student_engagement(self, updates):
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("mongo down")
+        self.bulk_calls.append(updates)
+        errors = [
+            {"index": i, "code": 121, "errmsg": "write failed"}
+            for i, (f, _) in enumerate(updates)
+            if f["student_id"] in self.fail_students
+        ]
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+        return len(updates)
+
+
+def make_engagement(student_id, chat_count=0):
+    return StudentEngagement(
+        session_id="s1",
+        student_id=student_id,
+        student_name=student_id.upper(),
+        node_name="node-1",
+        metrics=EngagementMetrics(chat_message_count=chat_count),
+        updated_at=datetime.now(UTC),
+    )
+
+
+async def track(tracker, student_id, activity_type=ActivityType.CHAT, data=None):
+    return await tracker.track_activity(
+        session_id="s1",
+        student_id=student_id,
+        student_name=student_id.upper(),
+        node_name="node-1",
+        activity_type=activity_type,
+        activity_data=data or {},
+    )
+
+
+def updates_by_student(updates):
+    return {f["student_id"]: u for f, u in updates}
+
+
+@pytest.mark.asyncio
+async def test_activities_are_coalesced_into_one_bulk_write():
+    db = BulkDB([make_engagement("alice", 10)])
+    tracker = EngagementTracker(db, writer=EngagementWriteBuffer(db))
+
+    for _ in range(3):
+        await track(tracker, "alice")
+    await track(tracker, "bob")
+    await track(
+        tracker,
+        "bob",
+        ActivityType.QUIZ_RESPONSE,
+        {"response_time_ms": 2000, "is_correct": True},
+    )
+
+    assert db.single_writes == 0
+    assert await tracker.writer.flush() == 2
+
+    (updates,) = db.bulk_calls
+    by_student = updates_by_student(updates)
+    assert by_student["alice"]["$inc"] == {"metrics.chat_message_count": 3}
+    assert by_student["bob"]["$inc"] == {
+        "metrics.chat_message_count": 1,
+        "metrics.participation_count": 1,
+    }
+    assert by_student["bob"]["$set"]["metrics.quiz_accuracy"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_next_flush_sends_only_new_deltas():
+    db = BulkDB()
+    tracker = EngagementTracker(db, writer=EngagementWriteBuffer(db))
+    await track(tracker, "alice")
+    await tracker.writer.flush()
+
+    await track(tracker, "alice")
+    await tracker.writer.flush()
+
+    assert updates_by_student(db.bulk_calls[-1])["alice"]["$inc"] == {
+        "metrics.chat_message_count": 1
+    }
+    assert await tracker.writer.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried_with_accumulated_delta():
+    db = BulkDB()
+    writer = EngagementWriteBuffer(db)
+    tracker = EngagementTracker(db, writer=writer)
+    await track(tracker, "alice")
+
+    db.fail_next = True
+    assert await writer.flush() == 0
+    assert writer.pending == 1
+    assert writer.flush_lag > 0
+
+    await track(tracker, "alice")
+    assert await writer.flush() == 1
+    assert updates_by_student(db.bulk_calls[-1])["alice"]["$inc"] == {
+        "metrics.chat_message_count": 2
+    }
+    assert writer.flush_lag == 0
+
+
+@pytest.mark.asyncio
+async def test_partial_bulk_failure_retries_only_failed_students():
+    db = BulkDB()
+    writer = EngagementWriteBuffer(db)
+    tracker = EngagementTracker(db, writer=writer)
+    await track(tracker, "alice")
+    await track(tracker, "bob")
+
+    db.fail_students = {"bob"}
+    assert await writer.flush() == 1
+    assert writer.pending == 1
+
+    db.fail_students = set()
+    await track(tracker, "alice")
+    assert await writer.flush() == 2
+    retried = updates_by_student(db.bulk_calls[-1])
+    # alice는 반영된 1건 이후 델타만, bob은 실패한 델타 그대로
+    assert retried["alice"]["$inc"] == {"metrics.chat_message_count": 1}
+    assert retried["bob"]["$inc"] == {"metrics.chat_message_count": 1}
+    assert writer.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_end_session_and_stop_flush_pending_changes():
+    db = BulkDB()
+    writer = EngagementWriteBuffer(db, flush_interval=60)
+    tracker = EngagementTracker(db, writer=writer)
+    writer.start()
+
+    await track(tracker, "alice")
+    assert await tracker.end_session("s1") == 1
+
+    await track(tracker, "bob")
+    await asyncio.wait_for(tracker.close(), timeout=1)
+
+    assert [len(u) for u in db.bulk_calls] == [1, 1]
+    assert writer.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_reset_session_replaces_whole_document():
+    db = BulkDB([make_engagement("alice", 10)])
+    writer = EngagementWriteBuffer(db)
+    tracker = EngagementTracker(db, writer=writer)
+    await tracker.warm_session("s1")
+
+    tracker.reset_session("s1", {"alice": ("ALICE", "node-1")})
+    await track(tracker, "alice")
+    await writer.flush()
+
+    update = updates_by_student(db.bulk_calls[-1])["alice"]
+    assert "$inc" not in update
+    assert update["$set"]["metrics"]["chat_message_count"] == 1
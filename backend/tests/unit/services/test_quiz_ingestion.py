@@ -0,0 +1,188 @@
+"""
+퀴즈 응답 수집 (group commit, 중복 응답 방지, flush당 통계 이벤트, 정의 캐시) 테스트
+"""
+
+import asyncio
+from datetime import datetime, UTC
+
+import pytest
+
+from core.database import quiz_stats_from_counters
+from schemas import Quiz, QuizOption, QuizResponseCreate
+from services.quiz_ingestion import QuizDefinitionCache, QuizResponseIngestor
+
+
+def make_quiz(quiz_id="quiz_001", published=True):
+    return Quiz(
+        quiz_id=quiz_id,
+        session_id="s1",
+        question="2 + 2 = ?",
+        options=[QuizOption(id="opt_a", text="3"), QuizOption(id="opt_b", text="4")],
+        correct_option_id="opt_b",
+        topic="math",
+        created_at=datetime.now(UTC),
+        published=published,
+    )
+
+
+class FakeDB:
+    """수집기가 쓰는 DatabaseManager 메서드만"""
+
+    def __init__(self):
+        self.quizzes = {"quiz_001": make_quiz()}
+        self.get_quiz_calls = 0
+        self.bulk_calls = []
+        self.counter_calls = []
+        self.responses = {}
+        self.counters = {}
+
+    async def get_quiz(self, quiz_id):
+        self.get_quiz_calls += 1
+        return self.quizzes.get(quiz_id)
+
+    async def bulk_insert_quiz_responses(self, docs):
+        self.bulk_calls.append(len(docs))
+        inserted = []
+        for doc in docs:
+            key = (doc["quiz_id"], doc["student_id"])
+            inserted.append(key not in self.responses)
+            self.responses.setdefault(key, doc)
+        return inserted
+
+    async def increment_quiz_counters(self, quiz_id, inc):
+        self.counter_calls.append((quiz_id, inc))
+        counters = self.counters.setdefault(quiz_id, {"option_counts": {}})
+        for path, amount in inc.items():
+            if path.startswith("option_counts."):
+                options = counters["option_counts"]
+                key = path.split(".", 1)[1]
+                options[key] = options.get(key, 0) + amount
+            else:
+                counters[path] = counters.get(path, 0) + amount
+        return quiz_stats_from_counters(quiz_id, counters)
+
+
+class FakeMessaging:
+    def __init__(self):
+        self.quiz_events = []
+        self.engagement_events = []
+
+    async def publish_quiz_event(self, session_id, quiz_id, event_type, data):
+        self.quiz_events.append((quiz_id, event_type, data))
+        return True
+
+    async def publish_engagement_event(self, session_id, student_id, activity_type, data=None):
+        self.engagement_events.append((student_id, activity_type, data))
+        return True
+
+
+def answer(student_id, option_id="opt_b", response_time=2.0):
+    return QuizResponseCreate(
+        quiz_id="quiz_001",
+        student_id=student_id,
+        selected_option_id=option_id,
+        response_time=response_time,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_answers_share_one_bulk_write_and_one_stats_event():
+    db, messaging = FakeDB(), FakeMessaging()
+    ingestor = QuizResponseIngestor(db, messaging, batch_size=100, flush_interval=0.01)
+    seen = []
+    ingestor.add_stats_listener(lambda quiz_id, stats: seen.append(stats["total_responses"]))
+    ingestor.start()
+    quiz = make_quiz()
+
+    responses = await asyncio.gather(
+        *(
+            ingestor.submit(quiz, answer(f"student-{i}", "opt_b" if i % 2 else "opt_a"))
+            for i in range(40)
+        )
+    )
+    await ingestor.stop()
+
+    assert all(r is not None for r in responses)
+    assert sum(r.is_correct for r in responses) == 20
+    assert db.bulk_calls == [40]
+    assert len(db.counter_calls) == 1
+    assert db.counter_calls[0][1]["total_responses"] == 40
+
+    (quiz_id, event_type, data), = messaging.quiz_events
+    assert event_type == "stats"
+    assert data["stats"]["total_responses"] == 40
+    assert data["stats"]["option_distribution"] == {"opt_a": 20, "opt_b": 20}
+    assert len(messaging.engagement_events) == 40
+    assert seen == [40]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_answers_are_not_stored_or_counted():
+    db = FakeDB()
+    ingestor = QuizResponseIngestor(db, batch_size=100, flush_interval=0.01)
+    ingestor.start()
+    quiz = make_quiz()
+
+    first, same_batch = await asyncio.gather(
+        ingestor.submit(quiz, answer("alice", "opt_b")),
+        ingestor.submit(quiz, answer("alice", "opt_a")),
+    )
+    later = await ingestor.submit(quiz, answer("alice", "opt_a"))
+    await ingestor.stop()
+
+    assert first is not None and first.is_correct
+    assert same_batch is None
+    assert later is None
+    assert ingestor.accepted == 1 and ingestor.duplicates == 2
+    assert db.counters["quiz_001"]["total_responses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_size_splits_bulk_writes():
+    db = FakeDB()
+    ingestor = QuizResponseIngestor(db, batch_size=10, flush_interval=1.0)
+    ingestor.start()
+    quiz = make_quiz()
+
+    await asyncio.wait_for(
+        asyncio.gather(*(ingestor.submit(quiz, answer(f"s{i}")) for i in range(25))),
+        timeout=2,
+    )
+    await ingestor.stop()
+
+    assert sum(db.bulk_calls) == 25
+    assert max(db.bulk_calls) == 10
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_reported_to_callers():
+    class FailingDB(FakeDB):
+        async def bulk_insert_quiz_responses(self, docs):
+            raise RuntimeError("mongo down")
+
+    ingestor = QuizResponseIngestor(FailingDB(), flush_interval=0.01)
+
+    with pytest.raises(RuntimeError):
+        # 백그라운드 flush 없이 바로 저장하는 경로
+        await ingestor.submit(make_quiz(), answer("alice"))
+    assert ingestor.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_definition_cache_reads_through_and_invalidates():
+    db = FakeDB()
+    db.quizzes["draft"] = make_quiz("draft", published=False)
+    cache = QuizDefinitionCache(db, ttl=60)
+
+    for _ in range(3):
+        assert (await cache.get("quiz_001")).quiz_id == "quiz_001"
+    assert db.get_quiz_calls == 1
+
+    # 미발행 퀴즈는 캐시하지 않음 (발행 직후 바로 보이도록)
+    await cache.get("draft")
+    await cache.get("draft")
+    assert db.get_quiz_calls == 3
+
+    cache.invalidate("quiz_001")
+    del db.quizzes["quiz_001"]
+    assert await cache.get("quiz_001") is None
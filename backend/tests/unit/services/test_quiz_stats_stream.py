@@ -0,0 +1,163 @@
+"""
+실시간 퀴즈 통계 (메모리 통계 공유, 전송 속도 제한, 다른 노드 이벤트) 테스트
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.event_bus import InMemoryEventBus
+from services import quiz_stats_stream
+from services.quiz_stats_stream import QuizStatsHub
+
+
+def stats(total, quiz_id="quiz_001"):
+    return {
+        "quiz_id": quiz_id,
+        "total_responses": total,
+        "correct_responses": total // 2,
+        "accuracy": 50.0 if total else 0.0,
+        "option_distribution": {"opt_a": total} if total else {},
+        "average_response_time": 2.0 if total else 0.0,
+    }
+
+
+class StatsDB:
+    def __init__(self):
+        self.reads = 0
+
+    async def get_quiz_stats(self, quiz_id):
+        self.reads += 1
+        return stats(0, quiz_id) if quiz_id == "quiz_001" else None
+
+
+@pytest.mark.asyncio
+async def test_observers_share_stats_and_updates_are_coalesced():
+    db = StatsDB()
+    hub = QuizStatsHub(db, max_rate=10)  # 최대 10 Hz
+
+    subscribers = [await hub.subscribe("quiz_001") for _ in range(20)]
+    assert db.reads == 1
+
+    # 연결 직후 현재 통계
+    for subscriber in subscribers:
+        assert (await subscriber.next_stats())["total_responses"] == 0
+
+    # 전송 간격 안의 연속 변경 → 마지막 통계 한 번
+    for total in range(1, 30):
+        hub.on_stats("quiz_001", stats(total))
+
+    start = time.monotonic()
+    results = await asyncio.wait_for(
+        asyncio.gather(*(s.next_stats() for s in subscribers)), timeout=1
+    )
+    assert {r["total_responses"] for r in results} == {29}
+    assert time.monotonic() - start >= 0.05
+    assert db.reads == 1
+
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_stats_are_ignored_until_reset():
+    hub = QuizStatsHub(StatsDB(), max_rate=0)
+    subscriber = await hub.subscribe("quiz_001")
+    await subscriber.next_stats()
+
+    hub.on_stats("quiz_001", stats(5))
+    hub.on_stats("quiz_001", stats(3))  # 늦게 도착한 이벤트
+    assert (await subscriber.next_stats())["total_responses"] == 5
+
+    # 카운터 재구성으로 줄어든 경우만 반영
+    hub.reset("quiz_001", stats(4))
+    assert (await subscriber.next_stats())["total_responses"] == 4
+
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_stats_events_from_other_nodes_reach_subscribers():
+    bus = InMemoryEventBus()
+    hub = QuizStatsHub(StatsDB(), bus=bus, max_rate=0)
+    await hub.start()
+    subscriber = await hub.subscribe("quiz_001")
+    await subscriber.next_stats()
+
+    await bus.publish(
+        "airclass:session:s1:quiz",
+        {"type": "quiz", "event_type": "published", "quiz_id": "quiz_001"},
+    )
+    await bus.publish(
+        "airclass:session:s1:quiz",
+        {"type": "quiz", "event_type": "stats", "quiz_id": "quiz_001", "stats": stats(7)},
+    )
+
+    update = await asyncio.wait_for(subscriber.next_stats(), timeout=1)
+    assert update["total_responses"] == 7
+
+    await hub.close()
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_unknown_quiz_and_last_unsubscribe():
+    hub = QuizStatsHub(StatsDB())
+    assert await hub.subscribe("missing") is None
+
+    subscriber = await hub.subscribe("quiz_001")
+    hub.on_stats("other", stats(3, "other"))  # 구독하지 않은 퀴즈는 들고 있지 않음
+    assert list(hub.quizzes) == ["quiz_001"]
+
+    hub.unsubscribe(subscriber)
+    assert hub.quizzes == {}
+    await hub.close()
+
+
+class BrokenSubscription:
+    async def listen(self):
+        raise ConnectionError("connection reset")
+        yield
+
+    async def close(self):
+        pass
+
+
+class FlakyBus(InMemoryEventBus):
+    """첫 패턴 구독은 연결이 끊긴 상태로 반환"""
+
+    def __init__(self):
+        super().__init__()
+        self.psubscribes = 0
+
+    async def psubscribe(self, *patterns):
+        self.psubscribes += 1
+        if self.psubscribes == 1:
+            return BrokenSubscription()
+        return await super().psubscribe(*patterns)
+
+
+@pytest.mark.asyncio
+async def test_bad_events_and_dropped_subscription_do_not_stop_stats(monkeypatch):
+    monkeypatch.setattr(quiz_stats_stream, "RESUBSCRIBE_BACKOFF_SEC", 0)
+    bus = FlakyBus()
+    hub = QuizStatsHub(StatsDB(), bus=bus, max_rate=0)
+    await hub.start()
+    subscriber = await hub.subscribe("quiz_001")
+    await subscriber.next_stats()
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    # quiz_id 없는 통계 이벤트는 건너뜀
+    await bus.publish("airclass:session:s1:quiz", {"event_type": "stats", "stats": {}})
+    await bus.publish(
+        "airclass:session:s1:quiz",
+        {"type": "quiz", "event_type": "stats", "quiz_id": "quiz_001", "stats": stats(7)},
+    )
+
+    update = await asyncio.wait_for(subscriber.next_stats(), timeout=1)
+    assert update["total_responses"] == 7
+    assert bus.psubscribes == 2
+
+    await hub.close()
+    await bus.close()
@@ -0,0 +1,219 @@
+"""
+세션 수명 관리 (종료/유휴/메모리 예산 정리) 테스트
+"""
+
+import pytest
+
+from schemas import ActivityType
+from services import session_lifecycle
+from services.ai.nlp import NLPAnalyzer
+from services.engagement_service import EngagementTracker
+from services.engagement_writer import EngagementWriteBuffer
+from services.recording_service import RecordingManager
+from services.session_lifecycle import SessionLifecycleManager
+from core.cluster import ClusterManager
+from utils.memory import deep_sizeof
+
+
+class ArchiveDB:
+    """session_archive + 참여도 저장만 흉내내는 DB"""
+
+    def __init__(self):
+        self.archived = []
+        self.bulk_updates = []
+
+    async def archive_session_state(self, session_id, component, documents):
+        self.archived.append((session_id, component, documents))
+        return True
+
+    async def get_session_engagement(self, session_id, summary_only=False):
+        return []
+
+    async def get_student_engagement(self, session_id, student_id):
+        return None
+
+    async def bulk_update_student_engagement(self, updates):
+        self.bulk_updates.extend(updates)
+        return len(updates)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(session_lifecycle.time, "monotonic", clock)
+    return clock
+
+
+def test_deep_sizeof_grows_with_contents_and_counts_shared_once():
+    shared = "x" * 1000
+    small = deep_sizeof({"a": [1, 2]})
+    large = deep_sizeof({"a": [shared, shared], "b": shared})
+
+    assert large > small + 1000
+    assert large < small + 2000
+
+
+@pytest.mark.asyncio
+async def test_end_session_evicts_and_spills_only_that_session(tmp_path):
+    db = ArchiveDB()
+    nlp = NLPAnalyzer()
+    nlp.analyze_message("s1", "m1", "alice", "student", "함수가 이해가 안돼요")
+    nlp.analyze_message("s2", "m2", "bob", "student", "재귀 질문 있어요")
+    recordings = RecordingManager(str(tmp_path))
+    recordings.active_recordings = {
+        "s1_done": {"session_id": "s1", "status": "completed", "process": object()},
+        "s1_live": {"session_id": "s1", "status": "recording", "process": object()},
+    }
+
+    manager = SessionLifecycleManager(db)
+    manager.register("nlp", nlp)
+    manager.register("recording", recordings)
+    manager.touch("s1")
+
+    evicted = await manager.end_session("s1")
+
+    assert evicted == {"nlp": 1, "recording": 1}
+    assert nlp.list_messages_by_session("s1") == []
+    assert nlp.get_message("m1") is None
+    assert nlp.get_message("m2") is not None
+    # 녹화 중인 항목은 유지
+    assert list(recordings.active_recordings) == ["s1_live"]
+    assert "s1" not in manager.last_seen
+
+    spilled = {component: docs for _, component, docs in db.archived}
+    assert spilled["nlp"][0]["message_id"] == "m1"
+    assert spilled["recording"][0]["recording_id"] == "s1_done"
+    assert "process" not in spilled["recording"][0]
+
+
+@pytest.mark.asyncio
+async def test_engagement_eviction_flushes_then_reloads_on_demand():
+    db = ArchiveDB()
+    tracker = EngagementTracker(db, writer=EngagementWriteBuffer(db))
+    await tracker.track_activity("s1", "alice", "Alice", "n1", ActivityType.CHAT, {})
+    assert tracker.memory_bytes() > 0
+
+    manager = SessionLifecycleManager(db)
+    manager.register("engagement", tracker)
+
+    assert await manager.end_session("s1") == {"engagement": 1}
+    # 정리 전에 대기 중인 변경이 DB에 반영됨
+    assert len(db.bulk_updates) == 1
+    assert tracker.store.session("s1") is None
+    assert "s1" not in tracker._aggregates
+
+    # 다시 조회하면 DB에서 적재 (warm 상태도 초기화됨)
+    assert "s1" not in tracker._warm_sessions
+    await tracker.get_session_engagements("s1")
+    assert "s1" in tracker._warm_sessions
+
+
+@pytest.mark.asyncio
+async def test_sweep_evicts_idle_sessions(clock):
+    nlp = NLPAnalyzer()
+    manager = SessionLifecycleManager(idle_ttl=60)
+    manager.register("nlp", nlp)
+
+    for session_id in ("old", "new"):
+        nlp.analyze_message(session_id, f"m-{session_id}", "u", "student", "질문")
+        manager.touch(session_id)
+        clock.now += 50
+
+    assert await manager.sweep() == 1
+    assert nlp.list_messages_by_session("old") == []
+    assert nlp.list_messages_by_session("new")
+    assert list(manager.last_seen) == ["new"]
+
+
+@pytest.mark.asyncio
+async def test_sweep_enforces_byte_budget_least_recently_active_first(clock):
+    nlp = NLPAnalyzer()
+    manager = SessionLifecycleManager(idle_ttl=3600, sweep_interval=1)
+    manager.register("nlp", nlp)
+
+    for session_id in ("a", "b", "c"):
+        for i in range(5):
+            nlp.analyze_message(session_id, f"{session_id}{i}", "u", "student", "질문 " * 20)
+        manager.touch(session_id)
+        clock.now += 1
+    manager.touch("a")  # a가 가장 최근 활동
+
+    per_session = manager.memory_usage()["nlp"] / 3
+    manager.byte_budget = int(per_session * 2)
+
+    assert await manager.sweep() >= 1
+    assert nlp.list_messages_by_session("b") == []
+    assert nlp.list_messages_by_session("a")
+    assert manager.memory_usage()["nlp"] <= manager.byte_budget
+
+
+class PinnedState:
+    """세션을 정리해도 줄지 않는 상태 (녹화 중 프로세스 등)"""
+
+    def __init__(self, size):
+        self.size = size
+        self.evicted = []
+
+    def evict_session(self, session_id):
+        self.evicted.append(session_id)
+        return 0
+
+    def memory_bytes(self):
+        return self.size
+
+
+@pytest.mark.asyncio
+async def test_budget_sweep_stops_when_eviction_frees_nothing(clock):
+    pinned = PinnedState(10_000)
+    manager = SessionLifecycleManager(idle_ttl=3600, sweep_interval=60, byte_budget=1000)
+    manager.register("recording", pinned)
+
+    for session_id in ("a", "b", "c"):
+        manager.touch(session_id)
+    clock.now += 120
+
+    assert await manager.sweep() == 1
+    assert pinned.evicted == ["a"]
+    assert list(manager.last_seen) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_budget_sweep_skips_recently_touched_sessions(clock):
+    nlp = NLPAnalyzer()
+    manager = SessionLifecycleManager(idle_ttl=3600, sweep_interval=60, byte_budget=1)
+    manager.register("nlp", nlp)
+
+    nlp.analyze_message("old", "m1", "u", "student", "질문")
+    manager.touch("old")
+    clock.now += 120
+    nlp.analyze_message("live", "m2", "u", "student", "질문")
+    manager.touch("live")
+    clock.now += 10
+
+    assert await manager.sweep() == 1
+    assert nlp.list_messages_by_session("old") == []
+    assert nlp.list_messages_by_session("live")
+
+
+@pytest.mark.asyncio
+async def test_cluster_stream_assignments_are_pruned(clock, monkeypatch):
+    monkeypatch.setattr("core.cluster.time.monotonic", clock)
+    cluster = ClusterManager()
+    cluster.stream_assignments = {"old": "node-1", "new": "node-1"}
+    cluster.stream_assigned_at = {"old": 1000.0, "new": 1050.0}
+    clock.now = 1070.0
+
+    manager = SessionLifecycleManager(idle_ttl=60)
+    manager.register("cluster", cluster)
+    await manager.sweep()
+
+    assert cluster.stream_assignments == {"new": "node-1"}
+    assert manager.memory_usage()["cluster"] > 0
@@ -0,0 +1,81 @@
+"""
+WebSocket 접속 대기열(Admission Controller) 테스트
+"""
+
+import asyncio
+
+import pytest
+
+from utils.admission import AdmissionController, AdmissionRejectedError
+
+
+@pytest.mark.asyncio
+async def test_admit_limits_concurrency():
+    controller = AdmissionController(max_concurrent=2, max_queue=10, queue_timeout=1.0)
+    peak = 0
+
+    async def handshake():
+        nonlocal peak
+        async with controller.admit():
+            peak = max(peak, controller.active)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[handshake() for _ in range(6)])
+
+    assert peak == 2
+    assert controller.active == 0
+    assert controller.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_admit_rejects_when_queue_full():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1.0)
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.admit():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        async with controller.admit():
+            pass
+    assert exc_info.value.reason == "queue_full"
+    assert exc_info.value.retry_after >= controller.retry_after_base
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+
+
+@pytest.mark.asyncio
+async def test_admit_times_out_after_deadline():
+    controller = AdmissionController(max_concurrent=1, max_queue=5, queue_timeout=0.01)
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.admit():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        async with controller.admit():
+            pass
+    assert exc_info.value.reason == "timeout"
+    assert controller.waiting == 0
+
+    release.set()
+    await holder
+
+
+def test_retry_after_is_jittered():
+    controller = AdmissionController(retry_after=1.0)
+    values = {round(controller.retry_after(), 6) for _ in range(20)}
+
+    assert len(values) > 1
+    assert all(1.0 <= v <= 2.0 for v in values)
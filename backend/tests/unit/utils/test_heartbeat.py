@@ -0,0 +1,116 @@
+"""
+WebSocket 연결 정리(Heartbeat Monitor) 테스트
+"""
+
+import json
+
+import pytest
+from starlette.websockets import WebSocketState
+
+from utils.heartbeat import HeartbeatMonitor
+from utils.websocket import ConnectionManager
+
+
+class FakeWebSocket:
+    """accept/send/close/receive를 기록하는 테스트용 WebSocket"""
+
+    def __init__(self, frames=None):
+        self.scope = {"subprotocols": []}
+        self.client_state = WebSocketState.CONNECTED
+        self.application_state = WebSocketState.CONNECTED
+        self.sent = []
+        self.closed_with = None
+        self.frames = list(frames or [])
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000, reason=None):
+        self.closed_with = code
+        self.application_state = WebSocketState.DISCONNECTED
+
+    async def receive(self):
+        return self.frames.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_reap_removes_disconnected_sockets():
+    manager = ConnectionManager()
+    alive, dead = FakeWebSocket(), FakeWebSocket()
+    await manager.connect_student(alive, "alice")
+    await manager.connect_student(dead, "bob")
+    dead.client_state = WebSocketState.DISCONNECTED
+
+    monitor = HeartbeatMonitor(manager, idle_timeout=0)
+    assert await monitor.run_once() == 1
+
+    assert list(manager.students) == ["alice"]
+    assert dead not in manager.protocols
+    assert dead not in manager.last_seen
+
+
+@pytest.mark.asyncio
+async def test_reap_closes_idle_sockets_and_updates_teacher():
+    manager = ConnectionManager()
+    teacher = FakeWebSocket()
+    await manager.connect_teacher(teacher)
+    idle = FakeWebSocket()
+    await manager.connect_student(idle, "alice")
+    manager.last_seen[idle] -= 120
+    manager.last_seen[teacher] -= 1
+
+    reaped = await manager.reap(idle_timeout=60)
+
+    assert reaped == 1
+    assert idle.closed_with == 1001
+    assert manager.students == {}
+    assert manager.teacher is teacher
+    assert teacher.sent[-1] == {"type": "student_list", "students": []}
+
+
+@pytest.mark.asyncio
+async def test_idle_timeout_zero_keeps_quiet_connections():
+    manager = ConnectionManager()
+    quiet = FakeWebSocket()
+    await manager.connect_monitor(quiet)
+    manager.last_seen[quiet] -= 3600
+
+    assert await manager.reap(idle_timeout=0) == 0
+    assert quiet in manager.monitors
+
+
+@pytest.mark.asyncio
+async def test_receive_answers_ping_without_returning_it():
+    manager = ConnectionManager()
+    ws = FakeWebSocket(
+        frames=[
+            {"type": "websocket.receive", "text": '{"type":"ping"}'},
+            {"type": "websocket.receive", "text": '{"type": "chat", "message": "hi"}'},
+        ]
+    )
+    await manager.connect_monitor(ws)
+    manager.last_seen[ws] -= 100
+
+    message = await manager.receive(ws)
+
+    assert message == {"type": "chat", "message": "hi"}
+    assert ws.sent == [{"type": "pong"}]
+    assert manager.last_seen[ws] > 0
+
+
+@pytest.mark.asyncio
+async def test_stale_disconnect_does_not_remove_reconnected_student():
+    manager = ConnectionManager()
+    old, new = FakeWebSocket(), FakeWebSocket()
+    await manager.connect_student(old, "alice")
+    await manager.connect_student(new, "alice")
+
+    manager.disconnect_student("alice", old)
+
+    assert manager.students["alice"] is new
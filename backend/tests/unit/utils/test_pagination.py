@@ -0,0 +1,41 @@
+"""
+keyset 페이지 커서 (인코딩/복원, 잘못된 커서) 테스트
+"""
+
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_datetime_and_object_id():
+    key = {"message_time": datetime(2024, 3, 1, 9, 30, 15, 120000), "_id": ObjectId()}
+
+    cursor = encode_cursor(key)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+    assert decode_cursor(cursor, ("message_time", "_id")) == key
+
+    score_key = {"overall_score": 72.5, "student_id": "s-017"}
+    assert decode_cursor(encode_cursor(score_key), ("overall_score", "student_id")) == score_key
+
+
+def test_missing_cursor_means_first_page():
+    assert encode_cursor(None) is None
+    assert decode_cursor(None, ("overall_score", "student_id")) is None
+    assert decode_cursor("", ("overall_score", "student_id")) is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64 !",
+        "bm90IGpzb24",  # "not json"
+        encode_cursor({"overall_score": 1.0, "student_id": "a"}),  # 다른 목록의 커서
+        encode_cursor({"message_time": 1, "_id": {"$oid": "zz"}}),
+    ],
+)
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, ("message_time", "_id"))
@@ -0,0 +1,81 @@
+"""
+WebSocket 재연결 버퍼 테스트
+"""
+
+import json
+
+import pytest
+
+from utils.replay_buffer import ReplayBuffer
+from utils.websocket import ConnectionManager
+
+
+class FakeWebSocket:
+    """accept/send만 기록하는 테스트용 WebSocket"""
+
+    def __init__(self):
+        self.scope = {"subprotocols": []}
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+def test_append_assigns_increasing_seq():
+    buffer = ReplayBuffer(capacity=4)
+    original = {"type": "chat", "message": "a"}
+
+    stamped = buffer.append(original)
+
+    assert stamped["seq"] == 1
+    assert "seq" not in original
+    assert buffer.append({"type": "chat"})["seq"] == 2
+
+
+def test_since_returns_only_missed_messages():
+    buffer = ReplayBuffer(capacity=4)
+    for i in range(3):
+        buffer.append({"type": "chat", "message": str(i)})
+
+    assert [m["seq"] for m in buffer.since(1)] == [2, 3]
+    assert buffer.since(3) == []
+
+
+def test_since_gap_beyond_capacity_requires_snapshot():
+    buffer = ReplayBuffer(capacity=2)
+    buffer.append({"type": "quiz_published", "data": {"quiz_id": "q1"}})
+    for i in range(3):
+        buffer.append({"type": "chat", "message": str(i)})
+
+    assert len(buffer) == 2
+    assert buffer.since(1) is None
+    assert buffer.since(99) is None  # 서버 재시작 등
+
+    snapshot = buffer.snapshot()
+    assert snapshot["seq"] == 4
+    assert snapshot["state"]["quiz_published"]["data"]["quiz_id"] == "q1"
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_missed_broadcasts():
+    manager = ConnectionManager(replay_buffer_size=8)
+    first = FakeWebSocket()
+    await manager.connect_student(first, "alice")
+    await manager.send_to_all_students({"type": "chat", "message": "m1"})
+    manager.disconnect_student("alice")
+
+    await manager.send_to_all_students({"type": "chat", "message": "m2"})
+    await manager.send_to_all_students({"type": "chat", "message": "m3"})
+
+    second = FakeWebSocket()
+    await manager.connect_student(second, "alice", last_seq=first.sent[-1]["seq"])
+
+    assert [m.get("message") for m in second.sent] == ["m2", "m3", None]
+    assert second.sent[-1] == {"type": "sync", "seq": 3}
+    assert "alice" in manager.students
@@ -0,0 +1,80 @@
+"""
+NDJSON / JSON 배열 스트리밍 응답 테스트
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from utils import streaming
+from utils.streaming import NDJSON_MEDIA_TYPE, stream_documents
+
+
+async def docs_of(items):
+    for item in items:
+        yield item
+
+
+async def body_chunks(response):
+    return [chunk async for chunk in response.body_iterator]
+
+
+@pytest.mark.asyncio
+async def test_json_array_and_ndjson():
+    items = [{"n": i, "at": datetime(2024, 1, 1, 9, 0, i)} for i in range(3)]
+
+    response = await stream_documents(docs_of(items))
+    body = b"".join(await body_chunks(response))
+    assert response.media_type == "application/json"
+    assert json.loads(body) == [
+        {"n": i, "at": f"2024-01-01T09:00:0{i}"} for i in range(3)
+    ]
+
+    response = await stream_documents(docs_of(items), "ndjson")
+    lines = b"".join(await body_chunks(response)).decode().splitlines()
+    assert response.media_type == NDJSON_MEDIA_TYPE
+    assert [json.loads(line)["n"] for line in lines] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_envelope_counts_documents_at_the_end():
+    response = await stream_documents(
+        docs_of([{"id": "a"}, {"id": "b"}]),
+        envelope={"success": True, "session_id": "s1"},
+        items_key="engagements",
+        count_key="total_students",
+    )
+    body = json.loads(b"".join(await body_chunks(response)))
+    assert body == {
+        "success": True,
+        "session_id": "s1",
+        "engagements": [{"id": "a"}, {"id": "b"}],
+        "total_students": 2,
+    }
+
+    response = await stream_documents(
+        docs_of([]), envelope={}, items_key="items", count_key="count"
+    )
+    assert json.loads(b"".join(await body_chunks(response))) == {"items": [], "count": 0}
+
+
+@pytest.mark.asyncio
+async def test_large_streams_are_sent_in_bounded_chunks(monkeypatch):
+    monkeypatch.setattr(streaming, "CHUNK_BYTES", 1024)
+    items = [{"i": i, "text": "x" * 100} for i in range(200)]
+
+    chunks = await body_chunks(await stream_documents(docs_of(items)))
+    assert len(chunks) > 10
+    assert max(len(c) for c in chunks) < 1024 + 200
+    assert len(json.loads(b"".join(chunks))) == 200
+
+
+@pytest.mark.asyncio
+async def test_errors_before_first_document_raise_before_response():
+    async def failing():
+        raise RuntimeError("mongo down")
+        yield
+
+    with pytest.raises(RuntimeError):
+        await stream_documents(failing())
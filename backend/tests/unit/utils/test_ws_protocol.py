@@ -0,0 +1,121 @@
+"""
+WebSocket 프로토콜 협상 및 인코딩 테스트
+"""
+
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from utils.websocket import ConnectionManager
+from utils.ws_protocol import (
+    JSON_PROTOCOL,
+    MSGPACK_SUBPROTOCOL,
+    EncodedMessage,
+    MessageEncoder,
+    decode_frame,
+    negotiate_subprotocol,
+)
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+# 바이너리 프로토콜 테스트는 msgpack이 있을 때만
+requires_msgpack = pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+
+
+class FakeWebSocket:
+    """accept/send만 기록하는 테스트용 WebSocket"""
+
+    def __init__(self, subprotocols=None):
+        self.scope = {"subprotocols": subprotocols or []}
+        self.accepted_subprotocol = None
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        self.accepted_subprotocol = subprotocol
+
+    async def send_text(self, data):
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+def test_negotiate_defaults_to_json():
+    assert negotiate_subprotocol(FakeWebSocket()) is None
+    assert negotiate_subprotocol(FakeWebSocket(["other.v1"])) is None
+
+
+@requires_msgpack
+def test_negotiate_msgpack():
+    ws = FakeWebSocket(["other.v1", MSGPACK_SUBPROTOCOL])
+    assert negotiate_subprotocol(ws) == MSGPACK_SUBPROTOCOL
+
+
+@requires_msgpack
+def test_encode_binary_only_for_high_frequency_types():
+    encoder = MessageEncoder()
+    chat = {"type": "chat", "from": "teacher", "message": "안녕하세요"}
+
+    frame = encoder.encode(chat, MSGPACK_SUBPROTOCOL)
+    assert isinstance(frame, bytes)
+    assert msgpack.unpackb(frame, raw=False) == chat
+
+    # 제어 메시지는 msgpack 연결이어도 JSON 텍스트
+    control = encoder.encode({"type": "student_list", "students": []}, MSGPACK_SUBPROTOCOL)
+    assert isinstance(control, str)
+
+    # JSON 연결은 항상 텍스트
+    text = encoder.encode(chat, JSON_PROTOCOL)
+    assert json.loads(text) == chat
+    assert encoder.stats["chat:json"]["frames"] == 1
+
+
+@requires_msgpack
+def test_encoded_message_encodes_once_per_protocol():
+    encoder = MessageEncoder()
+    encoded = EncodedMessage({"type": "chat", "message": "hi"}, encoder)
+
+    for _ in range(10):
+        encoded.frame(JSON_PROTOCOL)
+        encoded.frame(MSGPACK_SUBPROTOCOL)
+
+    assert encoder.stats["chat:json"]["frames"] == 1
+    assert encoder.stats[f"chat:{MSGPACK_SUBPROTOCOL}"]["frames"] == 1
+
+
+@requires_msgpack
+def test_decode_frame():
+    payload = {"type": "ping"}
+    assert decode_frame({"type": "websocket.receive", "text": json.dumps(payload)}) == payload
+    assert (
+        decode_frame({"type": "websocket.receive", "bytes": msgpack.packb(payload)})
+        == payload
+    )
+    assert decode_frame({"type": "websocket.receive", "text": "ping"}, raw_text=True) == "ping"
+
+    with pytest.raises(WebSocketDisconnect):
+        decode_frame({"type": "websocket.disconnect", "code": 1001})
+
+
+@requires_msgpack
+@pytest.mark.asyncio
+async def test_broadcast_mixed_protocols():
+    manager = ConnectionManager()
+    json_ws = FakeWebSocket()
+    msgpack_ws = FakeWebSocket([MSGPACK_SUBPROTOCOL])
+
+    await manager.connect_student(json_ws, "alice")
+    await manager.connect_student(msgpack_ws, "bob")
+    assert msgpack_ws.accepted_subprotocol == MSGPACK_SUBPROTOCOL
+
+    await manager.send_to_all_students({"type": "chat", "from": "teacher", "message": "hi"})
+
+    assert json.loads(json_ws.sent[-1])["message"] == "hi"
+    assert msgpack.unpackb(msgpack_ws.sent[-1], raw=False)["message"] == "hi"
+
+    manager.disconnect_student("bob")
+    assert msgpack_ws not in manager.protocols
@@ -41,6 +41,23 @@ from .websocket import (
     get_connection_manager,
 )
 
+from .replay_buffer import ReplayBuffer
+from .heartbeat import HeartbeatMonitor, init_heartbeat_monitor, shutdown_heartbeat_monitor
+
+from .ws_protocol import (
+    JSON_PROTOCOL,
+    MSGPACK_SUBPROTOCOL,
+    MessageEncoder,
+    EncodedMessage,
+    negotiate_subprotocol,
+    receive_message,
+    get_message_encoder,
+)
+
+from .streaming import NDJSON_MEDIA_TYPE, STREAM_FORMAT_PATTERN, stream_documents
+
+from .pagination import InvalidCursorError, decode_cursor, encode_cursor
+
 __all__ = [
     # MediaMTX removed
     # "start_mediamtx",
@@ -69,4 +86,24 @@ __all__ = [
     # WebSocket
     "ConnectionManager",
     "get_connection_manager",
+    "ReplayBuffer",
+    "HeartbeatMonitor",
+    "init_heartbeat_monitor",
+    "shutdown_heartbeat_monitor",
+    # WebSocket Protocol
+    "JSON_PROTOCOL",
+    "MSGPACK_SUBPROTOCOL",
+    "MessageEncoder",
+    "EncodedMessage",
+    "negotiate_subprotocol",
+    "receive_message",
+    "get_message_encoder",
+    # Streaming Responses
+    "NDJSON_MEDIA_TYPE",
+    "STREAM_FORMAT_PATTERN",
+    "stream_documents",
+    # Keyset Pagination
+    "InvalidCursorError",
+    "decode_cursor",
+    "encode_cursor",
 ]
@@ -0,0 +1,111 @@
+"""
+WebSocket Admission Controller
+수업 시작 시 몰리는 학생 접속(join storm)을 평탄화
+
+- 동시에 진행되는 핸드셰이크(accept + 재전송 + 교사 명단 갱신) 수 제한
+- 초과 요청은 짧은 기한(deadline)까지 대기열에서 기다림
+- 대기열이 가득 찼거나 기한이 지나면 지터가 섞인 retry-after로 거절
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+
+from core.metrics import (
+    websocket_admission_queue_depth,
+    websocket_admission_wait_seconds,
+    websocket_admission_rejected_total,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejectedError(Exception):
+    """접속 거절 (retry_after 초 후 재시도 권장)"""
+
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(f"{reason} (retry after {retry_after:.2f}s)")
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionController:
+    """동시 핸드셰이크 제한 + 기한부 대기열"""
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_queue: int = 64,
+        queue_timeout: float = 2.0,
+        retry_after: float = 1.0,
+    ):
+        """
+        Args:
+            max_concurrent: 동시에 처리할 최대 핸드셰이크 수
+            max_queue: 대기열 최대 길이 (초과 시 즉시 거절)
+            queue_timeout: 대기열 최대 대기 시간 (초)
+            retry_after: 거절 시 재시도 기본 대기 시간 (초, 0~100% 지터 추가)
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after_base = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.waiting = 0
+        self.active = 0
+
+    def retry_after(self) -> float:
+        """
+        지터가 섞인 재시도 시간
+
+        모든 클라이언트가 같은 시각에 재시도하면 다시 폭주하므로
+        기본값에 대기열 혼잡도를 반영하고 무작위 지터를 더한다.
+        """
+        congestion = 1.0 + self.waiting / max(self.max_queue, 1)
+        base = self.retry_after_base * congestion
+        return base + random.uniform(0, base)
+
+    def _reject(self, reason: str) -> AdmissionRejectedError:
+        websocket_admission_rejected_total.labels(reason=reason).inc()
+        return AdmissionRejectedError(self.retry_after(), reason)
+
+    async def _wait_for_slot(self):
+        """대기열에서 슬롯을 기다림 (기한 초과 시 거절)"""
+        if self.waiting >= self.max_queue:
+            raise self._reject("queue_full")
+
+        self.waiting += 1
+        websocket_admission_queue_depth.set(self.waiting)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject("timeout")
+        finally:
+            self.waiting -= 1
+            websocket_admission_queue_depth.set(self.waiting)
+            websocket_admission_wait_seconds.observe(time.perf_counter() - start)
+
+    @asynccontextmanager
+    async def admit(self):
+        """
+        핸드셰이크 슬롯 확보
+
+        Raises:
+            AdmissionRejectedError: 대기열 초과 또는 대기 기한 초과
+        """
+        if not self._semaphore.locked():
+            # 빈 슬롯이 있으면 대기 없이 바로 진입
+            await self._semaphore.acquire()
+            websocket_admission_wait_seconds.observe(0.0)
+        else:
+            await self._wait_for_slot()
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
@@ -0,0 +1,104 @@
+"""
+WebSocket Heartbeat Monitor
+죽은/유휴 WebSocket 연결을 주기적으로 정리하는 백그라운드 작업
+
+- 프로토콜 레벨 ping/pong은 uvicorn이 처리 (--ws-ping-interval / --ws-ping-timeout)
+- 이 모니터는 프로세스당 하나의 태스크로 모든 연결을 일괄 점검
+  (연결마다 타이머/태스크를 두지 않음)
+- 이미 끊긴 연결과 WS_IDLE_TIMEOUT 동안 수신이 없는 연결을 한 번에 정리
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from utils.websocket import ConnectionManager, get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+
+class HeartbeatMonitor:
+    """주기적 연결 정리 작업"""
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        interval: float = 15.0,
+        idle_timeout: float = 0,
+    ):
+        """
+        Args:
+            manager: 점검할 ConnectionManager
+            interval: 점검 주기 (초)
+            idle_timeout: 유휴 판정 시간 (초, 0이면 끊긴 연결만 정리)
+        """
+        self.manager = manager
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.reaped_total = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        """한 번 점검하고 정리한 연결 수 반환"""
+        reaped = await self.manager.reap(self.idle_timeout)
+        self.reaped_total += reaped
+        return reaped
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"❌ WebSocket reap failed: {e}")
+
+    def start(self):
+        """백그라운드 점검 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"💓 WebSocket heartbeat monitor started "
+                f"(interval={self.interval}s, idle_timeout={self.idle_timeout}s)"
+            )
+
+    async def stop(self):
+        """백그라운드 점검 종료"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# 전역 인스턴스
+_heartbeat_monitor: Optional[HeartbeatMonitor] = None
+
+
+async def init_heartbeat_monitor() -> HeartbeatMonitor:
+    """HeartbeatMonitor 초기화 및 시작"""
+    global _heartbeat_monitor
+    if _heartbeat_monitor is None:
+        from config import WS_REAP_INTERVAL, WS_IDLE_TIMEOUT
+
+        _heartbeat_monitor = HeartbeatMonitor(
+            get_connection_manager(),
+            interval=WS_REAP_INTERVAL,
+            idle_timeout=WS_IDLE_TIMEOUT,
+        )
+        _heartbeat_monitor.start()
+    return _heartbeat_monitor
+
+
+async def shutdown_heartbeat_monitor():
+    """HeartbeatMonitor 종료"""
+    global _heartbeat_monitor
+    if _heartbeat_monitor is not None:
+        await _heartbeat_monitor.stop()
+        _heartbeat_monitor = None
+
+
+def get_heartbeat_monitor() -> Optional[HeartbeatMonitor]:
+    """HeartbeatMonitor 인스턴스 반환 (초기화 전이면 None)"""
+    return _heartbeat_monitor
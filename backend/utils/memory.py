@@ -0,0 +1,50 @@
+"""
+Memory Accounting
+인메모리 캐시의 대략적인 바이트 크기 계산 (세션 수명 관리/메트릭용)
+"""
+
+import sys
+from types import FunctionType, ModuleType
+from typing import Any
+
+# 공유 객체라 캐시 크기에 넣지 않는 타입
+_SKIP_TYPES = (type, ModuleType, FunctionType)
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    객체 그래프 전체 크기 (바이트, 추정치)
+
+    dict/list/tuple/set, __dict__·__slots__ 객체를 따라가며
+    sys.getsizeof 합계를 구한다. 같은 객체는 한 번만 센다.
+    array/bytes/str 등은 getsizeof에 버퍼가 포함된다.
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif isinstance(current, (str, bytes, bytearray, int, float)):
+            continue
+        else:
+            attrs = getattr(current, "__dict__", None)
+            if attrs is not None:
+                stack.append(attrs)
+            for cls in type(current).__mro__:
+                slots = getattr(cls, "__slots__", ())
+                for slot in (slots,) if isinstance(slots, str) else slots:
+                    if hasattr(current, slot):
+                        stack.append(getattr(current, slot))
+
+    return total
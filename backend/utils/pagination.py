@@ -0,0 +1,75 @@
+"""
+AIRClass Keyset Pagination Cursors
+직전 페이지의 마지막 정렬 키를 클라이언트에 넘기는 불투명 커서 (base64url JSON)
+
+- datetime / ObjectId 값은 타입 태그를 붙여서 원래 타입으로 복원
+- 필드가 맞지 않거나 깨진 커서는 InvalidCursorError (라우터에서 400)
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+class InvalidCursorError(ValueError):
+    """해석할 수 없는 페이지 커서"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$oid" in value:
+            return ObjectId(value["$oid"])
+    return value
+
+
+def encode_cursor(key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """다음 페이지 키 → 커서 문자열 (마지막 페이지면 None)"""
+    if key is None:
+        return None
+    payload = json.dumps(
+        {field: _encode_value(value) for field, value in key.items()},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: Optional[str], fields: Iterable[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    커서 문자열 → 다음 페이지 키
+
+    Args:
+        cursor: 응답의 next_cursor (없으면 첫 페이지)
+        fields: 키에 있어야 하는 필드
+
+    Raises:
+        InvalidCursorError: 깨졌거나 다른 목록의 커서
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(raw, dict) or set(raw) != set(fields):
+            raise InvalidCursorError("cursor does not match this listing")
+        return {field: _decode_value(value) for field, value in raw.items()}
+    except InvalidCursorError:
+        raise
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, InvalidId) as e:
+        raise InvalidCursorError("malformed cursor") from e
@@ -0,0 +1,83 @@
+"""
+WebSocket Replay Buffer
+재연결한 학생에게 놓친 브로드캐스트를 다시 보내기 위한 순번 + 링 버퍼
+
+- 방(room)으로 나가는 메시지마다 서버가 seq를 1씩 증가시켜 부여
+- 최근 N개 메시지만 deque(maxlen=N)에 보관 (메모리 고정)
+- 클라이언트가 last_seq로 재연결하면 그 이후 메시지만 재전송
+- 버퍼 범위를 벗어난 경우 스냅샷(상태 유지 메시지의 최신값)으로 대체
+"""
+
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional
+
+# 스냅샷에 최신값을 유지할 메시지 타입 (재연결 시 현재 상태 복원용)
+SNAPSHOT_MESSAGE_TYPES = frozenset({"quiz_published"})
+
+
+class ReplayBuffer:
+    """방 단위 순번 부여 및 최근 메시지 링 버퍼"""
+
+    def __init__(self, capacity: int = 256):
+        """
+        Args:
+            capacity: 보관할 최근 메시지 수
+        """
+        self.capacity = capacity
+        self.last_seq = 0
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._state: Dict[str, Dict[str, Any]] = {}
+
+    def append(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        메시지에 seq를 부여하고 버퍼에 저장
+
+        Returns:
+            seq가 포함된 새 메시지 (원본은 변경하지 않음)
+        """
+        self.last_seq += 1
+        stamped = {**message, "seq": self.last_seq}
+        self._buffer.append(stamped)
+
+        if stamped.get("type") in SNAPSHOT_MESSAGE_TYPES:
+            self._state[stamped["type"]] = stamped
+
+        return stamped
+
+    def since(self, last_seq: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        last_seq 이후 메시지 조회
+
+        Returns:
+            놓친 메시지 목록 (없으면 빈 리스트),
+            버퍼로 복구할 수 없으면 None (스냅샷 필요)
+        """
+        if last_seq == self.last_seq:
+            return []
+
+        # 서버 재시작 등으로 클라이언트 seq가 더 큰 경우 → 스냅샷
+        if last_seq > self.last_seq or not self._buffer:
+            return None
+
+        first_seq = self._buffer[0]["seq"]
+        if last_seq + 1 < first_seq:
+            return None
+
+        return list(islice(self._buffer, last_seq + 1 - first_seq, None))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """버퍼로 복구할 수 없을 때 보낼 현재 상태"""
+        return {
+            "type": "snapshot",
+            "seq": self.last_seq,
+            "state": dict(self._state),
+        }
+
+    def clear(self):
+        """버퍼 및 상태 초기화 (seq는 유지)"""
+        self._buffer.clear()
+        self._state.clear()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
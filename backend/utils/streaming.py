@@ -0,0 +1,122 @@
+"""
+AIRClass Streaming Responses
+DB 커서를 그대로 흘려보내는 NDJSON / JSON 배열 응답
+
+- 문서를 하나씩 직렬화해서 CHUNK_BYTES 단위로 전송 (문서 수와 무관하게 메모리 일정)
+- format="json": JSON 배열 (envelope를 주면 {..., items_key: [...], count_key: N})
+- format="ndjson": 한 줄에 문서 하나 (application/x-ndjson)
+- 첫 문서를 미리 읽어서 DB 오류는 응답 시작 전에 예외로 올라옴
+  (전송 도중 오류는 연결이 끊기는 것으로 드러남)
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_FORMAT_PATTERN = "^(json|ndjson)$"
+CHUNK_BYTES = 64 * 1024
+
+
+def json_default(value: Any) -> Any:
+    """datetime 등 JSON 기본 타입이 아닌 값 (ObjectId 등은 문자열)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(doc: Any) -> str:
+    return json.dumps(doc, ensure_ascii=False, default=json_default, separators=(",", ":"))
+
+
+async def _chunked(parts: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    buffer = []
+    size = 0
+    async for part in parts:
+        data = part.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+async def _ndjson_lines(docs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for doc in docs:
+        yield dumps(doc) + "\n"
+
+
+async def _json_array_parts(
+    docs: AsyncIterator[Dict[str, Any]],
+    envelope: Optional[Dict[str, Any]],
+    items_key: str,
+    count_key: Optional[str],
+) -> AsyncIterator[str]:
+    if envelope is None:
+        yield "["
+    else:
+        head = dumps(envelope)[:-1]  # 닫는 "}" 제외
+        yield head + ("," if envelope else "") + dumps(items_key) + ":["
+
+    count = 0
+    async for doc in docs:
+        yield ("," if count else "") + dumps(doc)
+        count += 1
+
+    yield "]"
+    if envelope is not None:
+        if count_key:
+            yield f",{dumps(count_key)}:{count}"
+        yield "}"
+
+
+async def _prefetched(
+    first: Dict[str, Any], rest: AsyncIterator[Dict[str, Any]]
+) -> AsyncIterator[Dict[str, Any]]:
+    yield first
+    async for doc in rest:
+        yield doc
+
+
+async def _empty() -> AsyncIterator[Dict[str, Any]]:
+    return
+    yield
+
+
+async def stream_documents(
+    docs: AsyncIterator[Dict[str, Any]],
+    format: str = "json",
+    envelope: Optional[Dict[str, Any]] = None,
+    items_key: str = "items",
+    count_key: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    문서 스트림 → StreamingResponse
+
+    Args:
+        docs: 문서 async iterator (DatabaseManager.iter_* 등)
+        format: "json" 또는 "ndjson"
+        envelope: JSON 배열을 감쌀 객체의 나머지 필드 (json일 때만)
+        items_key: envelope 안에서 배열을 담을 키
+        count_key: envelope 끝에 문서 수를 담을 키
+    """
+    iterator = docs.__aiter__()
+    try:
+        first = await iterator.__anext__()
+        docs = _prefetched(first, iterator)
+    except StopAsyncIteration:
+        docs = _empty()
+
+    if format == "ndjson":
+        return StreamingResponse(
+            _chunked(_ndjson_lines(docs)), media_type=NDJSON_MEDIA_TYPE
+        )
+    return StreamingResponse(
+        _chunked(_json_array_parts(docs, envelope, items_key, count_key)),
+        media_type="application/json",
+    )
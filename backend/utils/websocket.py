@@ -4,8 +4,25 @@ WebSocket Connection Manager
 """
 
 from fastapi import WebSocket
-from typing import Dict, Set
+from starlette.websockets import WebSocketState
+from typing import Any, Dict, List, Optional, Set
+import asyncio
 import logging
+import time
+
+from .admission import AdmissionController, AdmissionRejectedError
+from .replay_buffer import ReplayBuffer
+from .ws_protocol import (
+    JSON_PROTOCOL,
+    PONG_TEXT_FRAME,
+    EncodedMessage,
+    decode_frame,
+    get_message_encoder,
+    is_ping_frame,
+    negotiate_subprotocol,
+    protocol_of,
+    send_frame,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,16 +30,71 @@ logger = logging.getLogger(__name__)
 class ConnectionManager:
     """WebSocket 연결 관리"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        replay_buffer_size: int = 256,
+        admission: AdmissionController | None = None,
+    ):
         self.teacher: WebSocket | None = None
         self.students: Dict[str, WebSocket] = {}
         self.monitors: Set[WebSocket] = set()
+        # 연결별 협상된 프로토콜 (json 또는 airclass.msgpack.v1)
+        self.protocols: Dict[WebSocket, str] = {}
+        # 연결별 마지막 수신 시각 (time.monotonic, 유휴 연결 정리용)
+        self.last_seen: Dict[WebSocket, float] = {}
+        self.encoder = get_message_encoder()
+        # 학생 브로드캐스트 순번 + 재연결용 링 버퍼
+        self.replay = ReplayBuffer(replay_buffer_size)
+        # 학생 접속 폭주 완화 (동시 핸드셰이크 제한 + 대기열)
+        self.admission = admission or AdmissionController()
+
+    async def _accept(self, websocket: WebSocket):
+        """서브프로토콜 협상 후 연결 수락"""
+        subprotocol = negotiate_subprotocol(websocket)
+        await websocket.accept(subprotocol=subprotocol)
+        self.protocols[websocket] = protocol_of(subprotocol)
+        self.last_seen[websocket] = time.monotonic()
+
+    def _forget(self, websocket: WebSocket):
+        """연결별 부가 상태 제거"""
+        self.protocols.pop(websocket, None)
+        self.last_seen.pop(websocket, None)
+
+    async def receive(self, websocket: WebSocket) -> Any:
+        """
+        다음 메시지 수신
+
+        - 수신 시각을 기록 (유휴 연결 판정용)
+        - 앱 레벨 ping은 JSON 파싱 없이 바로 pong 응답 후 다음 메시지 대기
+
+        Raises:
+            WebSocketDisconnect: 연결 종료 시
+        """
+        while True:
+            frame = await websocket.receive()
+            self.last_seen[websocket] = time.monotonic()
+            if is_ping_frame(frame):
+                await websocket.send_text(PONG_TEXT_FRAME)
+                continue
+            return decode_frame(frame)
+
+    def _encode(self, message: dict | EncodedMessage) -> EncodedMessage:
+        if isinstance(message, EncodedMessage):
+            return message
+        return EncodedMessage(message, self.encoder)
+
+    async def send_message(self, websocket: WebSocket, message: dict | EncodedMessage):
+        """연결의 프로토콜에 맞게 메시지 전송 (예외는 호출자가 처리)"""
+        encoded = self._encode(message)
+        protocol = self.protocols.get(websocket, JSON_PROTOCOL)
+        await send_frame(websocket, encoded.frame(protocol))
 
     async def connect_teacher(self, websocket: WebSocket):
         """교사 연결"""
-        await websocket.accept()
+        await self._accept(websocket)
         if self.teacher:
             # 기존 교사가 있으면 연결 해제
+            self._forget(self.teacher)
             try:
                 await self.teacher.close()
             except:
@@ -30,33 +102,103 @@ class ConnectionManager:
         self.teacher = websocket
         logger.info("👨‍🏫 Teacher connected")
 
-    async def connect_student(self, websocket: WebSocket, name: str):
-        """학생 연결"""
-        await websocket.accept()
-        self.students[name] = websocket
-        logger.info(f"👨‍🎓 Student '{name}' connected ({len(self.students)} total)")
+    async def connect_student(
+        self, websocket: WebSocket, name: str, last_seq: Optional[int] = None
+    ) -> bool:
+        """
+        학생 연결
 
-        # 교사에게 학생 목록 업데이트 전송
-        if self.teacher:
-            await self.send_to_teacher(
-                {"type": "student_list", "students": list(self.students.keys())}
+        Args:
+            websocket: 학생 WebSocket
+            name: 학생 이름
+            last_seq: 재연결 시 마지막으로 받은 브로드캐스트 seq
+
+        Returns:
+            bool: 연결 성공 여부 (접속 폭주로 거절되면 False)
+        """
+        try:
+            async with self.admission.admit():
+                await self._accept(websocket)
+                await self._sync_student(websocket, last_seq)
+                self.students[name] = websocket
+                logger.info(
+                    f"👨‍🎓 Student '{name}' connected ({len(self.students)} total)"
+                )
+
+                # 교사에게 학생 목록 업데이트 전송
+                if self.teacher:
+                    await self.send_to_teacher(
+                        {"type": "student_list", "students": list(self.students.keys())}
+                    )
+        except AdmissionRejectedError as e:
+            logger.warning(f"⏳ Student '{name}' admission rejected: {e}")
+            await self._reject(websocket, e.retry_after)
+            return False
+
+        return True
+
+    async def _reject(self, websocket: WebSocket, retry_after: float):
+        """재시도 시간을 알리고 연결 종료 (1013: Try Again Later)"""
+        retry_after_ms = int(retry_after * 1000)
+        try:
+            await websocket.accept()
+            await websocket.send_json(
+                {"type": "retry_after", "retry_after_ms": retry_after_ms}
             )
+            await websocket.close(code=1013, reason=f"retry_after_ms={retry_after_ms}")
+        except Exception:
+            pass
+
+    async def _sync_student(self, websocket: WebSocket, last_seq: Optional[int]):
+        """
+        놓친 브로드캐스트 재전송 후 현재 seq 알림
+
+        재전송 중(await)에 새 브로드캐스트가 생길 수 있으므로 버퍼를 따라잡을 때까지
+        반복하고, 마지막 확인과 students 등록 사이에는 await가 없도록 한다.
+        """
+        if last_seq is not None:
+            sent_seq = last_seq
+            while sent_seq != self.replay.last_seq:
+                missed = self.replay.since(sent_seq)
+                if missed is None:
+                    # 버퍼 범위를 벗어남 → 스냅샷으로 대체
+                    snapshot = self.replay.snapshot()
+                    await self.send_message(websocket, snapshot)
+                    sent_seq = snapshot["seq"]
+                    continue
+                for message in missed:
+                    await self.send_message(websocket, message)
+                    sent_seq = message["seq"]
+
+        await self.send_message(websocket, {"type": "sync", "seq": self.replay.last_seq})
 
     async def connect_monitor(self, websocket: WebSocket):
         """모니터 연결"""
-        await websocket.accept()
+        await self._accept(websocket)
         self.monitors.add(websocket)
         logger.info(f"📺 Monitor connected ({len(self.monitors)} total)")
 
     def disconnect_teacher(self):
         """교사 연결 해제"""
+        if self.teacher:
+            self._forget(self.teacher)
         self.teacher = None
         logger.info("👨‍🏫 Teacher disconnected")
 
-    def disconnect_student(self, name: str):
-        """학생 연결 해제"""
+    def disconnect_student(self, name: str, websocket: Optional[WebSocket] = None):
+        """
+        학생 연결 해제
+
+        Args:
+            name: 학생 이름
+            websocket: 주어지면 현재 등록된 연결과 같을 때만 해제
+                       (같은 이름으로 재접속한 새 연결을 지우지 않도록)
+        """
+        if websocket is not None and self.students.get(name) is not websocket:
+            self._forget(websocket)
+            return
         if name in self.students:
-            del self.students[name]
+            self._forget(self.students.pop(name))
             logger.info(
                 f"👨‍🎓 Student '{name}' disconnected ({len(self.students)} remaining)"
             )
@@ -64,32 +206,97 @@ class ConnectionManager:
     def disconnect_monitor(self, ws: WebSocket):
         """모니터 연결 해제"""
         self.monitors.discard(ws)
+        self._forget(ws)
         logger.info(f"📺 Monitor disconnected ({len(self.monitors)} remaining)")
 
-    async def send_to_teacher(self, message: dict):
+    async def reap(self, idle_timeout: float = 0) -> int:
+        """
+        죽은/유휴 연결 일괄 정리
+
+        Args:
+            idle_timeout: 이 시간(초) 동안 수신이 없으면 종료 (0이면 유휴 판정 안 함)
+
+        Returns:
+            int: 정리한 연결 수
+        """
+        now = time.monotonic()
+
+        def is_stale(ws: WebSocket) -> bool:
+            if (
+                ws.client_state == WebSocketState.DISCONNECTED
+                or ws.application_state == WebSocketState.DISCONNECTED
+            ):
+                return True
+            if idle_timeout <= 0:
+                return False
+            return now - self.last_seen.get(ws, now) > idle_timeout
+
+        stale_students = [name for name, ws in self.students.items() if is_stale(ws)]
+        stale_monitors = [ws for ws in self.monitors if is_stale(ws)]
+        stale_teacher = self.teacher is not None and is_stale(self.teacher)
+
+        targets: List[WebSocket] = [self.students[name] for name in stale_students]
+        targets += stale_monitors
+        if stale_teacher:
+            targets.append(self.teacher)
+        if not targets:
+            return 0
+
+        # 상태 정리를 먼저 하고 종료는 한꺼번에 (브로드캐스트 대상에서 즉시 제외)
+        for name in stale_students:
+            self.disconnect_student(name)
+        for ws in stale_monitors:
+            self.disconnect_monitor(ws)
+        if stale_teacher:
+            self.disconnect_teacher()
+
+        await asyncio.gather(
+            *[self._close_quietly(ws, 1001, "idle timeout") for ws in targets]
+        )
+
+        if stale_students and self.teacher:
+            await self.send_to_teacher(
+                {"type": "student_list", "students": list(self.students.keys())}
+            )
+
+        logger.info(f"🧹 Reaped {len(targets)} stale WebSocket connections")
+        return len(targets)
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket, code: int, reason: str):
+        if websocket.application_state == WebSocketState.DISCONNECTED:
+            return
+        try:
+            await websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    async def send_to_teacher(self, message: dict | EncodedMessage):
         """교사에게 메시지 전송"""
         if self.teacher:
             try:
-                await self.teacher.send_json(message)
+                await self.send_message(self.teacher, message)
             except Exception as e:
                 logger.error(f"Error sending to teacher: {e}")
                 self.disconnect_teacher()
 
-    async def send_to_student(self, name: str, message: dict):
+    async def send_to_student(self, name: str, message: dict | EncodedMessage):
         """특정 학생에게 메시지 전송"""
         if name in self.students:
             try:
-                await self.students[name].send_json(message)
+                await self.send_message(self.students[name], message)
             except Exception as e:
                 logger.error(f"Error sending to student {name}: {e}")
                 self.disconnect_student(name)
 
     async def send_to_all_students(self, message: dict):
-        """모든 학생에게 메시지 브로드캐스트"""
+        """모든 학생에게 메시지 브로드캐스트 (seq 부여 후 재연결 버퍼에 저장)"""
+        # 프로토콜별로 한 번만 인코딩해서 모든 학생에게 재사용
+        encoded = self._encode(self.replay.append(message))
         disconnected = []
-        for name, ws in self.students.items():
+        for name, ws in list(self.students.items()):
             try:
-                await ws.send_json(message)
+                await self.send_message(ws, encoded)
             except Exception as e:
                 logger.error(f"Error broadcasting to student {name}: {e}")
                 disconnected.append(name)
@@ -98,12 +305,13 @@ class ConnectionManager:
         for name in disconnected:
             self.disconnect_student(name)
 
-    async def send_to_monitors(self, message: dict):
+    async def send_to_monitors(self, message: dict | EncodedMessage):
         """모든 모니터에게 메시지 브로드캐스트"""
+        encoded = self._encode(message)
         disconnected = []
-        for ws in self.monitors:
+        for ws in list(self.monitors):
             try:
-                await ws.send_json(message)
+                await self.send_message(ws, encoded)
             except Exception as e:
                 logger.error(f"Error broadcasting to monitor: {e}")
                 disconnected.append(ws)
@@ -132,12 +340,12 @@ class ConnectionManager:
         Args:
             engagement_data: 참여도 정보 (session_id, student_id, engagement_score 등)
         """
-        message = {"type": "engagement_update", "data": engagement_data}
+        message = self._encode({"type": "engagement_update", "data": engagement_data})
 
         # 교사에게 전송
         if self.teacher:
             try:
-                await self.teacher.send_json(message)
+                await self.send_message(self.teacher, message)
             except Exception as e:
                 logger.error(f"Error sending engagement to teacher: {e}")
 
@@ -157,5 +365,21 @@ def get_connection_manager() -> ConnectionManager:
     """ConnectionManager 싱글톤 인스턴스 반환"""
     global _connection_manager
     if _connection_manager is None:
-        _connection_manager = ConnectionManager()
+        from config import (
+            WS_REPLAY_BUFFER_SIZE,
+            WS_ADMISSION_MAX_CONCURRENT,
+            WS_ADMISSION_MAX_QUEUE,
+            WS_ADMISSION_QUEUE_TIMEOUT,
+            WS_ADMISSION_RETRY_AFTER,
+        )
+
+        _connection_manager = ConnectionManager(
+            replay_buffer_size=WS_REPLAY_BUFFER_SIZE,
+            admission=AdmissionController(
+                max_concurrent=WS_ADMISSION_MAX_CONCURRENT,
+                max_queue=WS_ADMISSION_MAX_QUEUE,
+                queue_timeout=WS_ADMISSION_QUEUE_TIMEOUT,
+                retry_after=WS_ADMISSION_RETRY_AFTER,
+            ),
+        )
     return _connection_manager
@@ -0,0 +1,218 @@
+"""
+WebSocket Wire Protocol
+JSON(기본) / MessagePack(선택) 서브프로토콜 협상 및 프레임 인코딩
+
+클라이언트가 연결 시 `Sec-WebSocket-Protocol: airclass.msgpack.v1` 을 요청하면
+고빈도 메시지(채팅, 참여도 업데이트, 퀴즈 통계)는 MessagePack 바이너리 프레임으로,
+그 외 제어 메시지는 기존과 동일하게 JSON 텍스트 프레임으로 전송한다.
+서브프로토콜을 요청하지 않은 클라이언트는 지금처럼 JSON만 주고받는다.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from core.metrics import websocket_frame_bytes_total
+
+try:
+    import msgpack  # type: ignore
+
+    MSGPACK_AVAILABLE = True
+except ImportError:  # pragma: no cover - 선택 의존성
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 프로토콜 식별자
+JSON_PROTOCOL = "json"
+MSGPACK_SUBPROTOCOL = "airclass.msgpack.v1"
+
+# MessagePack 연결에서 바이너리로 보낼 메시지 타입 (고빈도 채널)
+BINARY_MESSAGE_TYPES = frozenset(
+    {
+        "chat",
+        "engagement_update",
+        # 대시보드 스트림 (참여도)
+        "overview",
+        "students",
+        "alerts",
+        # 퀴즈 통계 스트림
+        "stats_update",
+    }
+)
+
+
+# 앱 레벨 ping (구버전 클라이언트 호환) - JSON 파싱 없이 원문 비교로 처리
+PING_TEXT_FRAMES = frozenset({'{"type":"ping"}', '{"type": "ping"}'})
+PING_BINARY_FRAME = msgpack.packb({"type": "ping"}) if MSGPACK_AVAILABLE else None
+PONG_TEXT_FRAME = '{"type":"pong"}'
+
+
+def is_ping_frame(frame: dict) -> bool:
+    """수신 프레임이 앱 레벨 ping인지 확인 (디코딩 없이)"""
+    text = frame.get("text")
+    if text is not None:
+        return text in PING_TEXT_FRAMES
+    data = frame.get("bytes")
+    return data is not None and data == PING_BINARY_FRAME
+
+
+def negotiate_subprotocol(websocket: WebSocket) -> Optional[str]:
+    """
+    클라이언트가 요청한 서브프로토콜 중 서버가 지원하는 것을 선택
+
+    Returns:
+        accept()에 넘길 서브프로토콜 (없으면 None → JSON)
+    """
+    requested = websocket.scope.get("subprotocols") or []
+    if MSGPACK_AVAILABLE and MSGPACK_SUBPROTOCOL in requested:
+        return MSGPACK_SUBPROTOCOL
+    return None
+
+
+def protocol_of(subprotocol: Optional[str]) -> str:
+    """accept()에 사용한 서브프로토콜 → 내부 프로토콜 이름"""
+    return MSGPACK_SUBPROTOCOL if subprotocol == MSGPACK_SUBPROTOCOL else JSON_PROTOCOL
+
+
+def encode_json(message: Any) -> str:
+    """Starlette send_json과 동일한 형식의 JSON 텍스트"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class MessageEncoder:
+    """
+    메시지 타입별 인코더 캐시
+
+    - 타입별로 msgpack.Packer를 재사용 (매 호출마다 Packer 생성 방지)
+    - 타입/프로토콜별 프레임 수, 바이트 수, 인코딩 시간 누적
+    """
+
+    def __init__(self):
+        self._packers: Dict[str, Any] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _packer_for(self, message_type: str):
+        packer = self._packers.get(message_type)
+        if packer is None:
+            packer = msgpack.Packer(use_bin_type=True)
+            self._packers[message_type] = packer
+        return packer
+
+    def encode(self, message: dict, protocol: str) -> str | bytes:
+        """
+        메시지를 프로토콜에 맞는 프레임으로 인코딩
+
+        Args:
+            message: 전송할 메시지 (dict, "type" 필드 포함)
+            protocol: JSON_PROTOCOL 또는 MSGPACK_SUBPROTOCOL
+
+        Returns:
+            str(텍스트 프레임) 또는 bytes(바이너리 프레임)
+        """
+        message_type = message.get("type", "unknown")
+        binary = (
+            protocol == MSGPACK_SUBPROTOCOL
+            and MSGPACK_AVAILABLE
+            and message_type in BINARY_MESSAGE_TYPES
+        )
+
+        start = time.perf_counter()
+        if binary:
+            frame = self._packer_for(message_type).pack(message)
+            size = len(frame)
+        else:
+            frame = encode_json(message)
+            size = len(frame.encode("utf-8"))
+        elapsed = time.perf_counter() - start
+
+        wire = MSGPACK_SUBPROTOCOL if binary else JSON_PROTOCOL
+        stats = self.stats.setdefault(
+            f"{message_type}:{wire}",
+            {"frames": 0, "bytes": 0, "encode_seconds": 0.0},
+        )
+        stats["frames"] += 1
+        stats["bytes"] += size
+        stats["encode_seconds"] += elapsed
+        websocket_frame_bytes_total.labels(protocol=wire, message_type=message_type).inc(
+            size
+        )
+
+        return frame
+
+
+class EncodedMessage:
+    """
+    브로드캐스트용 메시지 래퍼
+
+    프로토콜별 프레임을 최초 요청 시 한 번만 인코딩해서 수신자 전체가 공유한다.
+    (수신자 N명이어도 JSON 1회 + MessagePack 1회 인코딩)
+    """
+
+    __slots__ = ("message", "_encoder", "_frames")
+
+    def __init__(self, message: dict, encoder: MessageEncoder):
+        self.message = message
+        self._encoder = encoder
+        self._frames: Dict[str, str | bytes] = {}
+
+    def frame(self, protocol: str) -> str | bytes:
+        frame = self._frames.get(protocol)
+        if frame is None:
+            frame = self._encoder.encode(self.message, protocol)
+            self._frames[protocol] = frame
+        return frame
+
+
+async def send_frame(websocket: WebSocket, frame: str | bytes):
+    """인코딩된 프레임 전송 (bytes → 바이너리, str → 텍스트)"""
+    if isinstance(frame, bytes):
+        await websocket.send_bytes(frame)
+    else:
+        await websocket.send_text(frame)
+
+
+def decode_frame(frame: dict, raw_text: bool = False) -> Any:
+    """
+    websocket.receive() 결과를 메시지로 디코딩
+
+    Args:
+        frame: ASGI websocket.receive 이벤트
+        raw_text: True면 텍스트 프레임을 JSON 파싱 없이 그대로 반환
+
+    Raises:
+        WebSocketDisconnect: 연결 종료 이벤트인 경우
+    """
+    if frame.get("type") == "websocket.disconnect":
+        raise WebSocketDisconnect(frame.get("code", 1000))
+
+    if frame.get("bytes") is not None:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Binary frame received but msgpack is not installed")
+        return msgpack.unpackb(frame["bytes"], raw=False)
+
+    text = frame.get("text")
+    if text is None:
+        return None
+    return text if raw_text else json.loads(text)
+
+
+async def receive_message(websocket: WebSocket, raw_text: bool = False) -> Any:
+    """텍스트/바이너리 프레임 모두 수신해서 디코딩"""
+    return decode_frame(await websocket.receive(), raw_text=raw_text)
+
+
+# Singleton instance
+_message_encoder: MessageEncoder | None = None
+
+
+def get_message_encoder() -> MessageEncoder:
+    """MessageEncoder 싱글톤 인스턴스 반환"""
+    global _message_encoder
+    if _message_encoder is None:
+        _message_encoder = MessageEncoder()
+    return _message_encoder